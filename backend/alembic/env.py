@@ -38,10 +38,19 @@ config.set_main_option("sqlalchemy.url", get_url())
 # ... etc.
 
 
+# Managed only by raw SQL migrations (generated tsvector column and its GIN index)
+RAW_SQL_OBJECTS = {
+    ("column", "search_vector"),
+    ("index", "idx_saved_content_search_vector"),
+}
+
+
 def include_object(object, name, type_, reflected, compare_to):
-    """Ignore raw PostgreSQL HNSW vector indexes during autogenerate and drift check."""
+    """Ignore raw PostgreSQL HNSW vector indexes and full-text objects during autogenerate and drift check."""
     if type_ == "index" and name and "hnsw" in name:
         return False
+    if (type_, name) in RAW_SQL_OBJECTS:
+        return False
     return True
 
 
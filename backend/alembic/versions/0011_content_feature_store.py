@@ -0,0 +1,49 @@
+"""Precomputed content feature store: feature_terms vocabulary + content_features table
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # 1. Global vocabulary: canonical tech / concept strings -> stable integer ids
+    op.execute("""
+    CREATE TABLE IF NOT EXISTS feature_terms (
+        id SERIAL PRIMARY KEY,
+        kind VARCHAR(20) NOT NULL,
+        term VARCHAR(100) NOT NULL,
+        CONSTRAINT _feature_term_unique UNIQUE (kind, term)
+    );
+    """)
+
+    # 2. One materialized feature row per analyzed bookmark
+    op.execute("""
+    CREATE TABLE IF NOT EXISTS content_features (
+        content_id INTEGER PRIMARY KEY REFERENCES saved_content(id) ON DELETE CASCADE,
+        user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        tech_ids INTEGER[] NOT NULL,
+        concept_ids INTEGER[] NOT NULL,
+        content_type SMALLINT NOT NULL,
+        difficulty SMALLINT NOT NULL,
+        quality_score INTEGER,
+        relevance_score INTEGER,
+        snippet TEXT,
+        feature_version SMALLINT NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    );
+    """)
+
+    # Per-user columnar loads
+    op.execute("CREATE INDEX IF NOT EXISTS ix_content_features_user_id ON content_features (user_id);")
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS content_features CASCADE;")
+    op.execute("DROP TABLE IF EXISTS feature_terms CASCADE;")
@@ -0,0 +1,33 @@
+"""Generated weighted tsvector column + GIN index for full-text bookmark search
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 14:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # 1. Stored generated tsvector: title (A), notes (B), extracted body (C).
+    #    The body is capped so very large pages stay under the 1MB tsvector limit.
+    op.execute("""
+    ALTER TABLE saved_content ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(notes, '')), 'B') ||
+        setweight(to_tsvector('english'::regconfig, left(coalesce(extracted_text, ''), 200000)), 'C')
+    ) STORED;
+    """)
+
+    # 2. GIN index for @@ websearch_to_tsquery lookups
+    op.execute("CREATE INDEX IF NOT EXISTS idx_saved_content_search_vector ON saved_content USING gin (search_vector);")
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS idx_saved_content_search_vector;")
+    op.execute("ALTER TABLE saved_content DROP COLUMN IF EXISTS search_vector;")
@@ -0,0 +1,205 @@
+"""
+Tenant-aware ANN scan strategy for per-user vector search.
+
+Problem: the global HNSW index (0003) returns the globally nearest rows and only
+then applies WHERE user_id = ..., so with many tenants a user's true neighbours
+are discarded (low recall) or the planner gives up on the index. The 0006 RPCs
+also forced enable_seqscan = off, which cannot be SET inside a STABLE function.
+
+Solution: ann_prepare_scan_v1(user_id, k) picks the scan per user:
+  - small libraries  -> exact KNN over the user's rows (callers ORDER BY distance + 0,
+                        which the HNSW index cannot serve, so the user_id index is used)
+  - large libraries  -> HNSW with ef_search sized to k and iterative index scans
+                        (pgvector >= 0.8; silently skipped on older versions)
+Settings are transaction-local. The search RPCs are replaced to use it.
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18 16:20:00.000000
+"""
+
+from alembic import op
+
+revision = '0013'
+down_revision = '0012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE OR REPLACE FUNCTION ann_prepare_scan_v1(
+            p_user_id         INTEGER,
+            p_k               INTEGER,
+            p_exact_max_rows  INTEGER DEFAULT 5000
+        )
+        RETURNS BOOLEAN
+        LANGUAGE plpgsql
+        VOLATILE
+        AS $$
+        DECLARE
+            v_rows INTEGER;
+        BEGIN
+            SELECT count(*) INTO v_rows
+            FROM (
+                SELECT 1 FROM saved_content
+                WHERE user_id = p_user_id AND embedding IS NOT NULL
+                LIMIT p_exact_max_rows + 1
+            ) capped;
+
+            IF v_rows <= p_exact_max_rows THEN
+                RETURN TRUE;
+            END IF;
+
+            PERFORM set_config('hnsw.ef_search', LEAST(1000, GREATEST(100, p_k * 4))::TEXT, true);
+            BEGIN
+                PERFORM set_config('hnsw.iterative_scan', 'strict_order', true);
+            EXCEPTION WHEN others THEN
+                NULL;  -- pgvector < 0.8: no iterative scans
+            END;
+            RETURN FALSE;
+        END;
+        $$;
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION search_bookmarks_semantic_v1(
+            p_user_id    INTEGER,
+            p_embedding  vector(384),
+            p_limit      INTEGER DEFAULT 20
+        )
+        RETURNS TABLE (
+            id              INTEGER,
+            title           TEXT,
+            url             TEXT,
+            notes           TEXT,
+            extracted_text  TEXT,
+            distance        FLOAT
+        )
+        LANGUAGE plpgsql
+        VOLATILE
+        AS $$
+        BEGIN
+            -- Enforce dimension guard: reject mismatched embeddings early
+            IF vector_dims(p_embedding) != 384 THEN
+                RAISE EXCEPTION 'query embedding must be 384 dimensions, got %',
+                    vector_dims(p_embedding);
+            END IF;
+
+            IF ann_prepare_scan_v1(p_user_id, p_limit) THEN
+                RETURN QUERY
+                SELECT sc.id, sc.title::TEXT, sc.url::TEXT, sc.notes::TEXT, sc.extracted_text::TEXT,
+                       (sc.embedding <=> p_embedding)::FLOAT AS distance
+                FROM saved_content sc
+                WHERE sc.user_id = p_user_id
+                  AND sc.embedding IS NOT NULL
+                ORDER BY (sc.embedding <=> p_embedding) + 0
+                LIMIT p_limit;
+            ELSE
+                RETURN QUERY
+                SELECT sc.id, sc.title::TEXT, sc.url::TEXT, sc.notes::TEXT, sc.extracted_text::TEXT,
+                       (sc.embedding <=> p_embedding)::FLOAT AS distance
+                FROM saved_content sc
+                WHERE sc.user_id = p_user_id
+                  AND sc.embedding IS NOT NULL
+                ORDER BY sc.embedding <=> p_embedding
+                LIMIT p_limit;
+            END IF;
+        END;
+        $$;
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION search_bookmarks_hybrid_v1(
+            p_user_id     INTEGER,
+            p_embedding   vector(384),
+            p_text_query  TEXT,
+            p_limit       INTEGER DEFAULT 20,
+            p_vector_weight FLOAT DEFAULT 0.7,
+            p_text_weight   FLOAT DEFAULT 0.3
+        )
+        RETURNS TABLE (
+            id              INTEGER,
+            title           TEXT,
+            url             TEXT,
+            notes           TEXT,
+            extracted_text  TEXT,
+            hybrid_score    FLOAT
+        )
+        LANGUAGE plpgsql
+        VOLATILE
+        AS $$
+        DECLARE
+            v_tsquery tsquery;
+            v_ids     INTEGER[];
+        BEGIN
+            IF vector_dims(p_embedding) != 384 THEN
+                RAISE EXCEPTION 'query embedding must be 384 dimensions, got %',
+                    vector_dims(p_embedding);
+            END IF;
+
+            -- Build tsquery safely; fall back to plainto_tsquery if phrase fails
+            BEGIN
+                v_tsquery := phraseto_tsquery('english', p_text_query);
+            EXCEPTION WHEN others THEN
+                v_tsquery := plainto_tsquery('english', p_text_query);
+            END;
+
+            -- Vector candidates, over-fetched for re-ranking
+            IF ann_prepare_scan_v1(p_user_id, p_limit * 3) THEN
+                v_ids := ARRAY(
+                    SELECT sc.id FROM saved_content sc
+                    WHERE sc.user_id = p_user_id AND sc.embedding IS NOT NULL
+                    ORDER BY (sc.embedding <=> p_embedding) + 0
+                    LIMIT p_limit * 3
+                );
+            ELSE
+                v_ids := ARRAY(
+                    SELECT sc.id FROM saved_content sc
+                    WHERE sc.user_id = p_user_id AND sc.embedding IS NOT NULL
+                    ORDER BY sc.embedding <=> p_embedding
+                    LIMIT p_limit * 3
+                );
+            END IF;
+
+            RETURN QUERY
+            SELECT
+                sc.id,
+                sc.title::TEXT,
+                sc.url::TEXT,
+                sc.notes::TEXT,
+                sc.extracted_text::TEXT,
+                (
+                    p_vector_weight * (1.0 - (sc.embedding <=> p_embedding) / 2.0)
+                    + p_text_weight * COALESCE(
+                        ts_rank(
+                            to_tsvector('english', COALESCE(sc.title, '') || ' ' ||
+                                        COALESCE(sc.notes, '') || ' ' ||
+                                        COALESCE(LEFT(sc.extracted_text, 2000), '')),
+                            v_tsquery
+                        ),
+                        0.0
+                    )
+                )::FLOAT AS hybrid_score
+            FROM saved_content sc
+            WHERE sc.id = ANY(v_ids)
+            ORDER BY hybrid_score DESC
+            LIMIT p_limit;
+        END;
+        $$;
+    """)
+
+
+def downgrade():
+    # Restore the 0006 definitions, then drop the helper they no longer call
+    import importlib.util
+    from pathlib import Path
+
+    spec = importlib.util.spec_from_file_location(
+        'revision_0006', Path(__file__).with_name('0006_search_rpc_functions.py')
+    )
+    revision_0006 = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(revision_0006)
+    revision_0006.upgrade()
+
+    op.execute("DROP FUNCTION IF EXISTS ann_prepare_scan_v1(INTEGER, INTEGER, INTEGER)")
@@ -0,0 +1,50 @@
+"""Per-user dashboard counters (user_stats) and daily snapshots (user_stats_daily)
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-18 22:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0014'
+down_revision = '0013'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # 1. One counter row per user, seeded lazily by a full recount on first read
+    op.execute("""
+    CREATE TABLE IF NOT EXISTS user_stats (
+        user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+        bookmark_count INTEGER NOT NULL DEFAULT 0,
+        saved_total INTEGER NOT NULL DEFAULT 0,
+        content_count INTEGER NOT NULL DEFAULT 0,
+        analyzed_count INTEGER NOT NULL DEFAULT 0,
+        quality_count INTEGER NOT NULL DEFAULT 0,
+        scraping_count INTEGER NOT NULL DEFAULT 0,
+        embedding_count INTEGER NOT NULL DEFAULT 0,
+        analyzing_count INTEGER NOT NULL DEFAULT 0,
+        project_count INTEGER NOT NULL DEFAULT 0,
+        reconciled_at TIMESTAMP WITH TIME ZONE,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    );
+    """)
+
+    # 2. Daily copies of the counters for week/month-over-month comparisons
+    op.execute("""
+    CREATE TABLE IF NOT EXISTS user_stats_daily (
+        user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        day DATE NOT NULL,
+        bookmark_count INTEGER NOT NULL,
+        saved_total INTEGER NOT NULL,
+        quality_count INTEGER NOT NULL,
+        project_count INTEGER NOT NULL,
+        PRIMARY KEY (user_id, day)
+    );
+    """)
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS user_stats_daily CASCADE;")
+    op.execute("DROP TABLE IF EXISTS user_stats CASCADE;")
@@ -0,0 +1,21 @@
+"""Record the input digest of each content_features row so stale rows are ignored
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0015'
+down_revision = '0014'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Existing rows keep NULL and are normalized per request until the next analysis rewrites them
+    op.execute("ALTER TABLE content_features ADD COLUMN IF NOT EXISTS source_hash VARCHAR(40);")
+
+def downgrade():
+    op.execute("ALTER TABLE content_features DROP COLUMN IF EXISTS source_hash;")
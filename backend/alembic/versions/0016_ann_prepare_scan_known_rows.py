@@ -0,0 +1,58 @@
+"""Let callers pass a cached row count to the ANN scan strategy
+
+ann_prepare_scan_v1 (0013) counts the user's embedded rows on every search just
+to choose between an exact scan and HNSW. ann_prepare_scan_v2 returns that capped
+count so the application can cache it per user, and skips the count when the
+caller passes it back in p_known_rows. The v1 function stays for the search RPCs.
+
+Revision ID: 0016
+Revises: 0015
+Create Date: 2026-10-19 14:30:00.000000
+
+"""
+from alembic import op
+
+revision = '0016'
+down_revision = '0015'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.execute("""
+        CREATE OR REPLACE FUNCTION ann_prepare_scan_v2(
+            p_user_id         INTEGER,
+            p_k               INTEGER,
+            p_exact_max_rows  INTEGER DEFAULT 5000,
+            p_known_rows      INTEGER DEFAULT NULL
+        )
+        RETURNS INTEGER
+        LANGUAGE plpgsql
+        VOLATILE
+        AS $$
+        DECLARE
+            v_rows INTEGER := p_known_rows;
+        BEGIN
+            IF v_rows IS NULL THEN
+                SELECT count(*) INTO v_rows
+                FROM (
+                    SELECT 1 FROM saved_content
+                    WHERE user_id = p_user_id AND embedding IS NOT NULL
+                    LIMIT p_exact_max_rows + 1
+                ) capped;
+            END IF;
+
+            IF v_rows > p_exact_max_rows THEN
+                PERFORM set_config('hnsw.ef_search', LEAST(1000, GREATEST(100, p_k * 4))::TEXT, true);
+                BEGIN
+                    PERFORM set_config('hnsw.iterative_scan', 'strict_order', true);
+                EXCEPTION WHEN others THEN
+                    NULL;  -- pgvector < 0.8: no iterative scans
+                END;
+            END IF;
+            RETURN v_rows;
+        END;
+        $$;
+    """)
+
+def downgrade():
+    op.execute("DROP FUNCTION IF EXISTS ann_prepare_scan_v2(INTEGER, INTEGER, INTEGER, INTEGER)")
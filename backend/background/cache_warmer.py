@@ -173,7 +173,7 @@ def _warm_bookmarks(user_id: int) -> str:
         if redis_cache.redis_client and bookmarks:
             import json
             serialized = json.dumps(
-                [b.to_dict() if hasattr(b, "to_dict") else {"id": getattr(b, "id", None)}
+                [b._asdict() if hasattr(b, "_asdict") else {"id": getattr(b, "id", None)}
                  for b in (bookmarks if isinstance(bookmarks, list) else [])],
                 default=str,
             )
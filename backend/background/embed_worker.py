@@ -8,7 +8,8 @@ Jobs:
   embed_project_job(project_id)     — generate and store embedding for one project
 
 Design principles:
-  - Idempotent: checks embedding IS NULL before generating (safe to retry)
+  - Idempotent: skips bookmarks whose stored embedding was derived from the same input
+    by the same model (embedding_metadata["derived_from"]), so retries and rescrapes are cheap
   - Isolated: each job opens its own UnitOfWork (no shared session state)
   - Gated: respects the ASYNC_EMBEDDINGS / 'async_embeddings' feature flag
   - No side effects on failure: raises so RQ retry logic fires correctly
@@ -32,13 +33,16 @@ def embed_bookmark_job(bookmark_id: int) -> dict:
     """
     RQ job: generate embedding for a single bookmark and persist it.
 
-    Idempotent — if embedding already exists, returns early without re-generating.
+    Idempotent — if the stored embedding is current for this content and model, returns early.
     Raises on unrecoverable failure so RQ retry fires.
     """
     from uow.unit_of_work import UnitOfWork
     from services.bookmark_processing_service import (
         generate_comprehensive_embedding,
         validate_embedding,
+        embedding_derivation,
+        embedding_is_current,
+        store_embedding,
     )
 
     logger.info("embed_bookmark_job_started", extra={"bookmark_id": bookmark_id})
@@ -52,23 +56,30 @@ def embed_bookmark_job(bookmark_id: int) -> dict:
                 logger.warning("embed_bookmark_job_not_found", extra={"bookmark_id": bookmark_id})
                 return {"status": "not_found", "bookmark_id": bookmark_id}
 
-            # Idempotency guard: skip if already embedded
-            existing_embedding = getattr(bookmark, "embedding", None)
-            if existing_embedding is not None:
-                logger.info(
-                    "embed_bookmark_job_already_embedded",
-                    extra={"bookmark_id": bookmark_id},
-                )
-                return {"status": "already_embedded", "bookmark_id": bookmark_id}
-
             # Snapshot fields we need outside the UoW
             title = getattr(bookmark, "title", "") or ""
             notes = getattr(bookmark, "notes", "") or ""
             meta_description = getattr(bookmark, "meta_description", "") or ""
             headings_raw = getattr(bookmark, "headings", None)
             extracted_text = getattr(bookmark, "extracted_text", "") or ""
+            headings = headings_raw if isinstance(headings_raw, list) else []
+
+            derivation = embedding_derivation(
+                title=title,
+                description=notes,
+                meta_description=meta_description,
+                headings=headings,
+                extracted_text=extracted_text,
+                content_hash=getattr(bookmark, "content_hash", None),
+            )
 
-        headings = headings_raw if isinstance(headings_raw, list) else []
+            # Idempotency guard: skip if the stored embedding came from this input and model
+            if embedding_is_current(bookmark, derivation):
+                logger.info(
+                    "embed_bookmark_job_already_embedded",
+                    extra={"bookmark_id": bookmark_id},
+                )
+                return {"status": "already_embedded", "bookmark_id": bookmark_id}
 
         # Generate embedding outside any transaction (heavy ML inference)
         from core.metrics import embedding_generation_duration
@@ -104,7 +115,7 @@ def embed_bookmark_job(bookmark_id: int) -> dict:
                 )
                 return {"status": "deleted_during_generation", "bookmark_id": bookmark_id}
 
-            bookmark.embedding = embedding
+            store_embedding(bookmark, embedding, derivation)
 
         # Invalidate caches that may have stale representation
         try:
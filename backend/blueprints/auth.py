@@ -16,6 +16,7 @@ import bcrypt
 
 from uow.unit_of_work import UnitOfWork
 from services.auth_service import AuthService, AuthenticationFailed, RegistrationFailed
+from core.password_pool import password_pool, PasswordPoolSaturated
 from utils.database_utils import retry_on_connection_error
 from middleware.rate_limiting import limiter
 
@@ -34,7 +35,7 @@ _TIMING_DUMMY_HASH = "$2b$12$AoiBV.KGmITlyHz1NWAY3eFksSfQnfebA9Fpmla92wdkacTPAf8
 def _constant_time_fail(password: str) -> None:
     """Always fails. Runs bcrypt so user-not-found timing == wrong-password timing."""
     pw = password.encode('utf-8') if isinstance(password, str) else password
-    bcrypt.checkpw(pw, _TIMING_DUMMY_HASH.encode('utf-8'))
+    password_pool.run(bcrypt.checkpw, pw, _TIMING_DUMMY_HASH.encode('utf-8'))
 
 def hash_password(password: str) -> str:
     """Helper for password hashing - delegates to AuthService."""
@@ -190,6 +191,8 @@ def register():
     except IntegrityError as e:
         logger.warning(f"IntegrityError during registration: {e}")
         return jsonify({'message': 'An account already exists with those credentials.'}), 409
+    except PasswordPoolSaturated:
+        raise
     except Exception as e:
         logger.error(f"Registration error: {str(e)}", exc_info=True)
         return jsonify({'message': 'Registration failed. Please try again.'}), 500
@@ -308,6 +311,8 @@ def login():
         logger.info(f"Login success: user_id={user_id} ({elapsed:.0f}ms)")
         return response, 200
 
+    except PasswordPoolSaturated:
+        raise
     except Exception as e:
         logger.error(f"Login error: {str(e)}", exc_info=True)
         error_str = str(e).lower()
@@ -350,6 +355,8 @@ def set_password():
 
         return jsonify({'message': 'Password updated successfully'}), 200
 
+    except PasswordPoolSaturated:
+        raise
     except Exception as e:
         logger.error(f"Set password error: {e}", exc_info=True)
         return jsonify({'message': 'Failed to update password'}), 500
@@ -9,14 +9,19 @@ except ImportError:
 from bs4 import BeautifulSoup
 import numpy as np
 from sqlalchemy.exc import IntegrityError
+from werkzeug.exceptions import ClientDisconnected
 from scrapers.scrapling_enhanced_scraper import scrape_url_enhanced
 from urllib.parse import urlparse, urljoin, urlunparse
 import re
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from utils.redis_utils import redis_cache
+from utils.realtime_bus import realtime_bus, publish_progress
 from middleware.security_middleware import validate_request_data, sanitize_string
+import json
 import logging
+import os
 import traceback
+import uuid
 from datetime import datetime, timedelta
 from sqlalchemy import func
 
@@ -27,6 +32,18 @@ logger = logging.getLogger(__name__)
 
 bookmarks_bp = Blueprint('bookmarks', __name__, url_prefix='/api/bookmarks')
 
+# Realtime bus message types relayed by the combined progress stream
+COMBINED_PROGRESS_TYPES = {'progress.import': 'import', 'progress.analysis': 'analysis'}
+
+INVALID_IMPORT_SCHEMES = ('javascript:', 'chrome://', 'chrome-extension://', 'file://', 'about:', 'data:', 'mailto:', 'tel:')
+
+# Streaming import: records committed per transaction, resumable session lifetime, longest accepted NDJSON line
+IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', '500'))
+IMPORT_SESSION_TTL = int(os.getenv('IMPORT_SESSION_TTL', '86400'))
+IMPORT_MAX_LINE_BYTES = 64 * 1024
+IMPORT_SESSION_ID_RE = re.compile(r'^[A-Za-z0-9_-]{8,64}$')
+NDJSON_CONTENT_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl', 'application/x-jsonlines', 'text/plain')
+
 def normalize_url(url):
     """Normalize URL to handle different formats of the same URL"""
     if not url:
@@ -508,29 +525,138 @@ def save_bookmark():
         'wasDuplicate': False
     }), 201
 
+def _load_import_dedup_sets(user_id):
+    """Exact and normalized URL sets of the user's existing bookmarks, for import dedup."""
+    cached_bookmarks = redis_cache.get_cached_user_bookmarks(user_id)
+    if cached_bookmarks:
+        logger.debug(f"Using cached bookmarks for user {user_id}")
+        existing_urls = set(bm['url'] for bm in cached_bookmarks)
+        normalized_urls = set(normalize_url(bm['url']) for bm in cached_bookmarks)
+        return existing_urls, normalized_urls
+
+    # Fallback to database query
+    logger.debug(f"Loading bookmarks from database for user {user_id}")
+
+    from uow.unit_of_work import UnitOfWork
+    from services.bookmark_service import BookmarkService
+
+    with UnitOfWork() as uow:
+        service = BookmarkService(uow)
+        existing_bms = service.uow.bookmarks.get_bookmark_refs(user_id)
+
+        existing_urls = set(bm.url for bm in existing_bms)
+        normalized_urls = set(normalize_url(bm.url) for bm in existing_bms)
+
+        # Cache the bookmarks for future use
+        bookmarks_data = [{'url': bm.url, 'title': bm.title, 'id': bm.id} for bm in existing_bms]
+
+    redis_cache.cache_user_bookmarks(user_id, bookmarks_data)
+    return existing_urls, normalized_urls
+
+
+def _prepare_import_entry(bm_data, user_id, existing_urls, normalized_urls):
+    """
+    Validate one imported bookmark against the dedup sets.
+    Returns (SavedContent, None) and records the URL in the sets, or (None, skip_reason).
+    """
+    if not isinstance(bm_data, dict):
+        return None, 'invalid_entry'
+
+    url = (bm_data.get('url') or '').strip()
+    title = (bm_data.get('title') or '').strip() or 'Untitled Bookmark'
+    category = bm_data.get('category', 'other')
+
+    if not url:
+        return None, 'empty_url'
+
+    if url.lower().startswith(INVALID_IMPORT_SCHEMES):
+        return None, 'invalid_scheme'
+
+    try:
+        parsed = urlparse(url)
+        if not parsed.scheme or not parsed.netloc:
+            return None, 'invalid_format'
+    except Exception:
+        return None, 'invalid_format'
+
+    norm_url = normalize_url(url)
+    if url in existing_urls or norm_url in normalized_urls:
+        return None, 'duplicate'
+
+    if len(title) > 200:
+        title = title[:197] + "..."
+
+    existing_urls.add(url)
+    normalized_urls.add(norm_url)
+    return SavedContent(
+        user_id=user_id,
+        url=url[:2048],
+        title=title,
+        notes='',
+        category=category,
+        quality_score=0
+    ), None
+
+
+def _insert_import_batch(user_id, bookmarks):
+    """
+    Insert a batch of new bookmarks in one transaction and enqueue their processing.
+    A unique-constraint race with a concurrent save falls back to row-by-row inserts.
+    Returns the number of bookmarks inserted.
+    """
+    from uow.unit_of_work import UnitOfWork
+
+    try:
+        with UnitOfWork() as uow:
+            for bm in bookmarks:
+                uow.bookmarks.add(bm)
+            uow.flush()
+            created_ids_urls = [(bm.id, bm.url) for bm in bookmarks]
+    except IntegrityError:
+        created_ids_urls = []
+        for bm in bookmarks:
+            try:
+                with UnitOfWork() as uow:
+                    uow.bookmarks.add(bm)
+                    uow.flush()
+                    created_ids_urls.append((bm.id, bm.url))
+            except IntegrityError:
+                continue
+
+    if created_ids_urls:
+        from services.task_queue import enqueue_bookmark_processing_many
+        jobs = enqueue_bookmark_processing_many(
+            (bm_id, bm_url, user_id) for bm_id, bm_url in created_ids_urls
+        )
+        if len(jobs) < len(created_ids_urls):
+            logger.warning(f"Could not enqueue bulk processing for {len(created_ids_urls) - len(jobs)} of {len(created_ids_urls)} bookmarks")
+
+        from services.cache_invalidation_service import cache_invalidator
+        cache_invalidator.invalidate_tfidf_corpus(user_id)
+        redis_cache.invalidate_query_cache(f"bookmarks:{user_id}:*")
+
+    return len(created_ids_urls)
+
+
 @bookmarks_bp.route('/import', methods=['POST'])
 @jwt_required()
 def bulk_import_bookmarks():
     """Bulk import bookmarks from Chrome extension (optimized with Redis and progress tracking)"""
     user_id = int(get_jwt_identity())
-    logger.info(f"[IMPORT] Starting bulk import for user {user_id} - received {len(request.get_json()) if isinstance(request.get_json(), list) else 0} bookmarks")
-    data = request.get_json()
+    data = request.get_json(silent=True)
 
     if not isinstance(data, list):
         return jsonify({'message': 'Expected array of bookmarks'}), 400
 
+    logger.info(f"[IMPORT] Starting bulk import for user {user_id} - received {len(data)} bookmarks")
+
     total_count = len(data)
     added_count = 0
     skipped_count = 0
-    updated_count = 0
-    errors = []
     skip_reasons = {}  # Track skip reasons: {reason: count}
-    new_bookmarks = []
-    max_workers = 8  # Tune as needed
 
-    # Store import progress in Redis for real-time updates
-    import_key = f"import_progress:{user_id}"
-    redis_cache.set_cache(import_key, {
+    # Store import progress in Redis and push it to open progress streams
+    publish_progress(user_id, 'import', {
         'total': total_count,
         'processed': 0,
         'added': 0,
@@ -538,108 +664,26 @@ def bulk_import_bookmarks():
         'updated': 0,
         'errors': 0,
         'status': 'processing'
-    }, ttl=3600)  # Expire in 1 hour
+    })
 
-    # Try to get cached user bookmarks first
-    cached_bookmarks = redis_cache.get_cached_user_bookmarks(user_id)
-    if cached_bookmarks:
-        logger.debug(f"Using cached bookmarks for user {user_id}")
-        existing_urls = set(bm['url'] for bm in cached_bookmarks)
-        normalized_urls = set(normalize_url(bm['url']) for bm in cached_bookmarks)
-    else:
-        # Fallback to database query
-        logger.debug(f"Loading bookmarks from database for user {user_id}")
-        
-        from uow.unit_of_work import UnitOfWork
-        from services.bookmark_service import BookmarkService
-        
-        with UnitOfWork() as uow:
-            service = BookmarkService(uow)
-            existing_bms = service.uow.bookmarks.get_all_by_user(user_id)
-            
-            existing_urls = set(bm.url for bm in existing_bms)
-            normalized_urls = set(normalize_url(bm.url) for bm in existing_bms)
-            
-            # Cache the bookmarks for future use
-            bookmarks_data = [{'url': bm.url, 'title': bm.title, 'id': bm.id} for bm in existing_bms]
-            
-        redis_cache.cache_user_bookmarks(user_id, bookmarks_data)
+    existing_urls, normalized_urls = _load_import_dedup_sets(user_id)
 
     created_bookmarks = []
-    
     for bm_data in data:
-        if not isinstance(bm_data, dict):
-            skipped_count += 1
-            continue
-            
-        url = (bm_data.get('url') or '').strip()
-        title = (bm_data.get('title') or '').strip() or 'Untitled Bookmark'
-        category = bm_data.get('category', 'other')
-        
-        if not url:
-            skipped_count += 1
-            skip_reasons['empty_url'] = skip_reasons.get('empty_url', 0) + 1
-            continue
-            
-        invalid_schemes = ['javascript:', 'chrome://', 'chrome-extension://', 'file://', 'about:', 'data:', 'mailto:', 'tel:']
-        if any(url.lower().startswith(s) for s in invalid_schemes):
-            skipped_count += 1
-            skip_reasons['invalid_scheme'] = skip_reasons.get('invalid_scheme', 0) + 1
-            continue
-            
-        try:
-            parsed = urlparse(url)
-            if not parsed.scheme or not parsed.netloc:
-                skipped_count += 1
-                skip_reasons['invalid_format'] = skip_reasons.get('invalid_format', 0) + 1
-                continue
-        except Exception:
-            skipped_count += 1
-            skip_reasons['invalid_format'] = skip_reasons.get('invalid_format', 0) + 1
-            continue
-            
-        norm_url = normalize_url(url)
-        if url in existing_urls or norm_url in normalized_urls:
+        new_bm, skip_reason = _prepare_import_entry(bm_data, user_id, existing_urls, normalized_urls)
+        if new_bm is None:
             skipped_count += 1
-            skip_reasons['duplicate'] = skip_reasons.get('duplicate', 0) + 1
+            skip_reasons[skip_reason] = skip_reasons.get(skip_reason, 0) + 1
             continue
-            
-        if len(title) > 200:
-            title = title[:197] + "..."
-            
-        new_bm = SavedContent(
-            user_id=user_id,
-            url=url[:2048],
-            title=title,
-            notes='',
-            category=category,
-            quality_score=0
-        )
         created_bookmarks.append(new_bm)
-        existing_urls.add(url)
-        normalized_urls.add(norm_url)
 
-    added_count = len(created_bookmarks)
-    
     if created_bookmarks:
-        from uow.unit_of_work import UnitOfWork
-        with UnitOfWork() as uow:
-            for bm in created_bookmarks:
-                uow.bookmarks.add(bm)
-            uow.flush()
-            created_ids_urls = [(bm.id, bm.url) for bm in created_bookmarks]
-
-        for bm_id, bm_url in created_ids_urls:
-            try:
-                process_bookmark_content_async(bm_id, bm_url, user_id)
-            except Exception as enqueue_err:
-                logger.warning(f"Could not enqueue bulk processing for bookmark {bm_id}: {enqueue_err}")
-
-        redis_cache.invalidate_query_cache(f"bookmarks:{user_id}:*")
+        added_count = _insert_import_batch(user_id, created_bookmarks)
+        skipped_count += len(created_bookmarks) - added_count
         from blueprints.recommendations import invalidate_user_recommendations
         invalidate_user_recommendations(user_id)
 
-    redis_cache.set_cache(import_key, {
+    publish_progress(user_id, 'import', {
         'total': total_count,
         'processed': total_count,
         'added': added_count,
@@ -648,7 +692,7 @@ def bulk_import_bookmarks():
         'errors': 0,
         'skip_reasons': skip_reasons,
         'status': 'completed'
-    }, ttl=3600)
+    })
 
     logger.info(f"[IMPORT] Completed bulk import for user {user_id}: added={added_count}, skipped={skipped_count}")
     return jsonify({
@@ -662,6 +706,175 @@ def bulk_import_bookmarks():
         'status': 'completed'
     }), 200
 
+
+def _iter_ndjson(stream, max_line_bytes=IMPORT_MAX_LINE_BYTES):
+    """
+    Yield one decoded record per non-blank NDJSON line read incrementally from stream.
+    Lines that are not valid JSON, or longer than max_line_bytes, yield None so record indexes stay stable.
+    """
+    while True:
+        line = stream.readline(max_line_bytes + 1)
+        if not line:
+            return
+        if len(line) > max_line_bytes and not line.endswith(b'\n'):
+            # Discard the remainder of an oversized line
+            while line and not line.endswith(b'\n'):
+                line = stream.readline(max_line_bytes + 1)
+            yield None
+            continue
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+
+def _import_session_key(user_id, session_id):
+    return f"import_session:{user_id}:{session_id}"
+
+
+def _import_progress(session, status):
+    """Progress payload for an import session, in the shape the import SSE stream relays."""
+    return {
+        'session_id': session['session_id'],
+        'total': max(session.get('total') or 0, session['processed']),
+        'processed': session['processed'],
+        'added': session['added'],
+        'skipped': session['skipped'],
+        'updated': 0,
+        'errors': session['errors'],
+        'skip_reasons': session['skip_reasons'],
+        'status': status
+    }
+
+
+@bookmarks_bp.route('/import/stream', methods=['POST'])
+@jwt_required()
+def stream_import_bookmarks():
+    """
+    Streaming bulk import for large exports.
+
+    The body is NDJSON, one {"url", "title", "category"} object per line, and may use chunked
+    transfer encoding. Records are read incrementally and committed every IMPORT_BATCH_SIZE records,
+    so memory does not grow with the upload and each batch is queued for processing as soon as it
+    commits. Progress is published per batch on the import SSE channel.
+
+    Query params:
+        session_id: resumable import session (generated when omitted, returned in the response)
+        offset: index of the body's first record within the whole import (default 0)
+        total: total record count, if known, for progress reporting
+        final: 0 when more chunks will follow in later requests (default 1)
+
+    The session remembers how many records were committed (`processed`). Records below that index
+    are skipped, so an interrupted upload resumes by re-sending from `processed` (or from the start).
+    """
+    user_id = int(get_jwt_identity())
+
+    content_type = (request.mimetype or '').lower()
+    if content_type and content_type not in NDJSON_CONTENT_TYPES:
+        return jsonify({'message': 'Expected an NDJSON body (application/x-ndjson)'}), 415
+
+    session_id = request.args.get('session_id') or uuid.uuid4().hex
+    if not IMPORT_SESSION_ID_RE.match(session_id):
+        return jsonify({'message': 'Invalid session_id'}), 400
+    offset = request.args.get('offset', default=0, type=int)
+    if offset < 0:
+        return jsonify({'message': 'offset must be non-negative'}), 400
+    total = request.args.get('total', type=int)
+    final = request.args.get('final', default='1').lower() not in ('0', 'false', 'no')
+
+    from core.distributed_lock import DistributedLock
+    lock = DistributedLock(_import_session_key(user_id, session_id), ttl_ms=120000)
+    if not lock.acquire() and lock.client:
+        return jsonify({'message': 'Import session is already receiving data', 'session_id': session_id}), 409
+
+    try:
+        session_key = _import_session_key(user_id, session_id)
+        session = redis_cache.get_cache(session_key) or {
+            'session_id': session_id,
+            'processed': 0,
+            'added': 0,
+            'skipped': 0,
+            'errors': 0,
+            'skip_reasons': {},
+            'total': None,
+            'status': 'processing'
+        }
+        if total:
+            session['total'] = total
+
+        if session['status'] == 'completed':
+            return jsonify(_import_progress(session, 'completed')), 200
+        if offset > session['processed']:
+            return jsonify({
+                'message': 'offset is past the records this session has committed',
+                **_import_progress(session, 'processing')
+            }), 409
+
+        logger.info(f"[IMPORT] Streaming import for user {user_id}: session={session_id} offset={offset} resume_at={session['processed']}")
+
+        existing_urls, normalized_urls = _load_import_dedup_sets(user_id)
+        batch = []
+        batch_skip_reasons = {}
+        index = offset
+
+        def commit_batch():
+            nonlocal batch, batch_skip_reasons
+            added = _insert_import_batch(user_id, batch) if batch else 0
+            session['added'] += added
+            session['skipped'] += sum(batch_skip_reasons.values()) + len(batch) - added
+            for reason, count in batch_skip_reasons.items():
+                session['skip_reasons'][reason] = session['skip_reasons'].get(reason, 0) + count
+            session['processed'] = index
+            redis_cache.set_cache(session_key, session, ttl=IMPORT_SESSION_TTL)
+            publish_progress(user_id, 'import', _import_progress(session, 'processing'))
+            lock.extend()
+            batch = []
+            batch_skip_reasons = {}
+
+        interrupted = False
+        try:
+            for record in _iter_ndjson(request.stream):
+                if index < session['processed']:
+                    index += 1
+                    continue
+                index += 1
+
+                if record is None:
+                    new_bm, skip_reason = None, 'invalid_json'
+                else:
+                    new_bm, skip_reason = _prepare_import_entry(record, user_id, existing_urls, normalized_urls)
+                if new_bm is None:
+                    batch_skip_reasons[skip_reason] = batch_skip_reasons.get(skip_reason, 0) + 1
+                else:
+                    batch.append(new_bm)
+
+                if index - session['processed'] >= IMPORT_BATCH_SIZE:
+                    commit_batch()
+        except (ClientDisconnected, OSError) as e:
+            # Keep what was received; the client resumes from the reported `processed`
+            logger.warning(f"[IMPORT] Upload interrupted for user {user_id}, session {session_id}: {e}")
+            interrupted = True
+
+        if index > session['processed']:
+            commit_batch()
+
+        status = 'completed' if final and not interrupted else 'processing'
+        session['status'] = status
+        redis_cache.set_cache(session_key, session, ttl=IMPORT_SESSION_TTL)
+        publish_progress(user_id, 'import', _import_progress(session, status))
+    finally:
+        lock.release()
+
+    if session['added']:
+        from blueprints.recommendations import invalidate_user_recommendations
+        invalidate_user_recommendations(user_id)
+
+    logger.info(f"[IMPORT] Streaming import for user {user_id}, session {session_id}: processed={session['processed']} added={session['added']} skipped={session['skipped']} status={status}")
+    return jsonify(_import_progress(session, status)), 200
+
 @bookmarks_bp.route('', methods=['GET'])
 @jwt_required()
 def list_bookmarks():
@@ -699,7 +912,7 @@ def list_bookmarks():
             'description': b.notes,  # Map 'notes' to 'description' for API consistency
             'saved_at': b.saved_at.isoformat(),
             'category': b.category,
-            'has_content': bool(b.extracted_text)
+            'has_content': bool(b.has_content)
         } for b in pagination.items]
         
         total = pagination.total
@@ -864,71 +1077,56 @@ def stream_import_progress():
     import_key = f"import_progress:{user_id}"
     
     def generate():
-        last_status = None
         start_time = time.time()
         max_connection_time = 1800  # 30 minutes maximum (for long imports)
         idle_timeout = 30  # Close connection after 30 seconds of no activity
-        last_activity = time.time()
         heartbeat_interval = 15  # Send heartbeat every 15 seconds
-        last_heartbeat = time.time()
-        consecutive_errors = 0
-        max_errors = 5
-        
-        while True:
-            try:
-                # Check if connection has been open too long
-                elapsed = time.time() - start_time
-                if elapsed > max_connection_time:
-                    yield f"data: {json.dumps({'status': 'timeout', 'message': 'Connection timeout - please refresh'})}\n\n"
-                    break
-                
+
+        try:
+            # Subscribe before reading the snapshot so no update falls in between
+            with realtime_bus.subscribe(user_id) as subscription:
                 progress = redis_cache.get(import_key)
-                
-                if not progress:
-                    # No import in progress - send idle status once, then close after timeout
-                    if last_status != 'no_import':
-                        yield f"data: {json.dumps({'status': 'no_import', 'message': 'No import in progress'})}\n\n"
-                        last_status = 'no_import'
-                        last_activity = time.time()
+                if progress:
+                    yield f"data: {json.dumps(progress)}\n\n"
+                    if progress.get('status') == 'completed':
+                        return
+                else:
+                    yield f"data: {json.dumps({'status': 'no_import', 'message': 'No import in progress'})}\n\n"
+                last_activity = time.time()
+
+                while True:
+                    now = time.time()
+                    remaining = max_connection_time - (now - start_time)
+                    if remaining <= 0:
+                        yield f"data: {json.dumps({'status': 'timeout', 'message': 'Connection timeout - please refresh'})}\n\n"
+                        break
+
+                    if progress:
+                        wait = heartbeat_interval
                     else:
-                        # Already sent no_import - check if we should close
-                        idle_elapsed = time.time() - last_activity
-                        if idle_elapsed > idle_timeout:
+                        wait = idle_timeout - (now - last_activity)
+                        if wait <= 0:
                             # No activity for 30 seconds, close connection
                             yield f"data: {json.dumps({'status': 'idle', 'message': 'Closing connection - no activity'})}\n\n"
                             break
-                else:
-                    # Import in progress - update status
-                    current_status = progress.get('status', 'unknown')
-                    if progress != last_status:
-                        yield f"data: {json.dumps(progress)}\n\n"
-                        last_status = progress
-                        last_activity = time.time()  # Reset idle timer
-                        
-                        # If import is completed, send final update and close
-                        if current_status == 'completed':
-                            time.sleep(1)  # Give client time to process
-                            break
-                
-                # Send heartbeat periodically to keep connection alive during active imports
-                if progress and time.time() - last_heartbeat > heartbeat_interval:
-                    yield f": heartbeat\n\n"  # SSE comment (keeps connection alive)
-                    last_heartbeat = time.time()
-                    consecutive_errors = 0  # Reset error count on successful heartbeat
-                
-                time.sleep(1)  # Check every second
-            except Exception as e:
-                consecutive_errors += 1
-                logger.error(f"Error in import progress stream (attempt {consecutive_errors}/{max_errors}): {e}")
-                
-                # If too many consecutive errors, close connection
-                if consecutive_errors >= max_errors:
-                    yield f"data: {json.dumps({'status': 'error', 'message': 'Too many errors - connection closed'})}\n\n"
-                    break
-                
-                # Send error but continue
-                yield f"data: {json.dumps({'status': 'error', 'message': str(e)})}\n\n"
-                time.sleep(2)  # Wait longer before retrying after error
+
+                    # Blocks until the import publishes an update; no Redis polling
+                    message = subscription.get(timeout=min(wait, remaining))
+                    if message is None:
+                        if progress:
+                            yield f": heartbeat\n\n"  # SSE comment (keeps connection alive)
+                        continue
+                    if message.get('type') != 'progress.import' or not message.get('data'):
+                        continue
+
+                    progress = message['data']
+                    yield f"data: {json.dumps(progress)}\n\n"
+                    last_activity = time.time()  # Reset idle timer
+                    if progress.get('status') == 'completed':
+                        break
+        except Exception as e:
+            logger.error(f"Error in import progress stream: {e}")
+            yield f"data: {json.dumps({'status': 'error', 'message': 'Stream error - connection closed'})}\n\n"
     
     # SSE headers - optimized for Hugging Face Spaces and other reverse proxies
     import os
@@ -951,6 +1149,19 @@ def stream_import_progress():
         headers=headers
     )
 
+def _count_unanalyzed(user_id):
+    """Bookmarks with extracted text but no ContentAnalysis row yet."""
+    from sqlalchemy import select
+
+    analyzed_content_ids_subquery = select(ContentAnalysis.content_id).subquery()
+    analyzed_content_ids_select = select(analyzed_content_ids_subquery.c.content_id)
+    return db.session.query(SavedContent).filter(
+        SavedContent.user_id == user_id,
+        ~SavedContent.id.in_(analyzed_content_ids_select),
+        SavedContent.extracted_text.isnot(None),
+        SavedContent.extracted_text != ''
+    ).count()
+
 @bookmarks_bp.route('/analysis/progress', methods=['GET'])
 @jwt_required()
 def get_analysis_progress():
@@ -962,17 +1173,7 @@ def get_analysis_progress():
     if not progress:
         # Check if user has any unanalyzed content
         try:
-            from models import SavedContent, ContentAnalysis
-            from sqlalchemy import select
-
-            analyzed_content_ids_subquery = select(ContentAnalysis.content_id).subquery()
-            analyzed_content_ids_select = select(analyzed_content_ids_subquery.c.content_id)
-            unanalyzed_count = db.session.query(SavedContent).filter(
-                SavedContent.user_id == user_id,
-                ~SavedContent.id.in_(analyzed_content_ids_select),
-                SavedContent.extracted_text.isnot(None),
-                SavedContent.extracted_text != ''
-            ).count()
+            unanalyzed_count = _count_unanalyzed(user_id)
 
             return jsonify({
                 'status': 'idle',
@@ -1075,79 +1276,44 @@ def stream_combined_progress():
     analysis_key = f"analysis_progress:{user_id}"
     
     def generate():
-        last_import_status = None
-        last_analysis_status = None
         start_time = time.time()
         max_connection_time = 1800  # 30 minutes maximum (serverless limit)
-        # REMOVED idle_timeout - keep connection alive with heartbeats until client disconnects
+        # No idle timeout - keep connection alive with heartbeats until client disconnects
         heartbeat_interval = 15  # CRITICAL: Send heartbeat every 15 seconds
-        last_heartbeat = time.time()
-        consecutive_errors = 0
-        max_errors = 5
         
         # Send initial connection message
         yield f"data: {json.dumps({'type': 'connected', 'message': 'SSE connection established'})}\n\n"
         
-        while True:
-            try:
-                current_time = time.time()
-                
-                # Check if connection has been open too long
-                elapsed = current_time - start_time
-                if elapsed > max_connection_time:
-                    yield f"data: {json.dumps({'type': 'timeout', 'message': 'Connection timeout - please refresh'})}\n\n"
-                    break
-                
-                import_progress = redis_cache.get(import_key)
-                analysis_progress = redis_cache.get(analysis_key)
-                
-                # Check if we have any active progress
-                has_activity = import_progress is not None or analysis_progress is not None
-                
-                if has_activity:
-                    # We have activity - reset error count
-                    consecutive_errors = 0
-                    
-                    # Send import progress if changed
-                    if import_progress != last_import_status:
-                        yield f"data: {json.dumps({'type': 'import', 'data': import_progress})}\n\n"
-                        last_import_status = import_progress
-                        last_heartbeat = current_time  # Reset heartbeat timer after data send
-                        
-                        # If import completed, wait a bit then continue
-                        if import_progress and import_progress.get('status') == 'completed':
-                            time.sleep(1)
-                    
-                    # Send analysis progress if changed
-                    if analysis_progress != last_analysis_status:
-                        yield f"data: {json.dumps({'type': 'analysis', 'data': analysis_progress})}\n\n"
-                        last_analysis_status = analysis_progress
-                        last_heartbeat = current_time  # Reset heartbeat timer after data send
-                
-                # CRITICAL: Send heartbeat comment to prevent browser reconnection
-                # Even when there's no data, we need to keep connection alive
-                heartbeat_elapsed = current_time - last_heartbeat
-                if heartbeat_elapsed >= heartbeat_interval:
-                    # Send heartbeat as SSE comment (browsers ignore but keeps connection alive)
-                    yield f": heartbeat at {int(current_time)}\n\n"
-                    last_heartbeat = current_time
-                
-                time.sleep(1)  # Check every second
-                
-            except GeneratorExit:
-                # Client disconnected - exit gracefully
-                logger.info(f"SSE client disconnected for user {user_id}")
-                break
-            except Exception as e:
-                consecutive_errors += 1
-                logger.error(f"Error in combined progress stream (attempt {consecutive_errors}/{max_errors}): {e}")
-                
-                if consecutive_errors >= max_errors:
-                    yield f"data: {json.dumps({'type': 'error', 'message': 'Too many errors - connection closed'})}\n\n"
-                    break
-                
-                yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
-                time.sleep(2)
+        try:
+            # Subscribe before reading the snapshots so no update falls in between
+            with realtime_bus.subscribe(user_id) as subscription:
+                for progress_type, key in (('import', import_key), ('analysis', analysis_key)):
+                    snapshot = redis_cache.get(key)
+                    if snapshot is not None:
+                        yield f"data: {json.dumps({'type': progress_type, 'data': snapshot})}\n\n"
+
+                while True:
+                    remaining = max_connection_time - (time.time() - start_time)
+                    if remaining <= 0:
+                        yield f"data: {json.dumps({'type': 'timeout', 'message': 'Connection timeout - please refresh'})}\n\n"
+                        break
+
+                    # Blocks until import/analysis publishes an update; no Redis polling
+                    message = subscription.get(timeout=min(heartbeat_interval, remaining))
+                    if message is None:
+                        # CRITICAL: heartbeat comment prevents browser reconnection when idle
+                        yield f": heartbeat at {int(time.time())}\n\n"
+                        continue
+
+                    progress_type = COMBINED_PROGRESS_TYPES.get(message.get('type'))
+                    if progress_type:
+                        yield f"data: {json.dumps({'type': progress_type, 'data': message.get('data')})}\n\n"
+        except GeneratorExit:
+            # Client disconnected - exit gracefully
+            logger.info(f"SSE client disconnected for user {user_id}")
+        except Exception as e:
+            logger.error(f"Error in combined progress stream: {e}")
+            yield f"data: {json.dumps({'type': 'error', 'message': 'Stream error - connection closed'})}\n\n"
     
     # SSE headers - CRITICAL configuration
     import os
@@ -1197,91 +1363,62 @@ def stream_analysis_progress():
     analysis_key = f"analysis_progress:{user_id}"
     
     def generate():
-        last_status = None
         start_time = time.time()
         max_connection_time = 1800  # 30 minutes maximum (for long analyses)
         idle_timeout = 30  # Close connection after 30 seconds of no activity
-        last_activity = time.time()
         heartbeat_interval = 15  # Send heartbeat every 15 seconds
-        last_heartbeat = time.time()
-        consecutive_errors = 0
-        max_errors = 5
-        
-        while True:
-            try:
-                # Check if connection has been open too long
-                elapsed = time.time() - start_time
-                if elapsed > max_connection_time:
-                    yield f"data: {json.dumps({'status': 'timeout', 'message': 'Connection timeout - please refresh'})}\n\n"
-                    break
-                
+
+        try:
+            # Subscribe before reading the snapshot so no update falls in between
+            with realtime_bus.subscribe(user_id) as subscription:
                 progress = redis_cache.get(analysis_key)
-                
-                if not progress:
-                    # Check if user has any unanalyzed content
+                if progress:
+                    yield f"data: {json.dumps(progress)}\n\n"
+                else:
+                    # Pending count is read once on connect, not on every idle tick
                     try:
-                        from models import SavedContent, ContentAnalysis
-                        from sqlalchemy import select
-
-                        analyzed_content_ids_subquery = select(ContentAnalysis.content_id).subquery()
-                        analyzed_content_ids_select = select(analyzed_content_ids_subquery.c.content_id)
-                        unanalyzed_count = db.session.query(SavedContent).filter(
-                            SavedContent.user_id == user_id,
-                            ~SavedContent.id.in_(analyzed_content_ids_select),
-                            SavedContent.extracted_text.isnot(None),
-                            SavedContent.extracted_text != ''
-                        ).count()
-
                         idle_status = {
                             'status': 'idle',
                             'message': 'No analysis in progress',
-                            'pending_items': unanalyzed_count
+                            'pending_items': _count_unanalyzed(user_id)
                         }
-                        
-                        if idle_status != last_status:
-                            yield f"data: {json.dumps(idle_status)}\n\n"
-                            last_status = idle_status
-                            last_activity = time.time()
-                        else:
-                            # Already sent idle - check if we should close
-                            idle_elapsed = time.time() - last_activity
-                            if idle_elapsed > idle_timeout:
-                                # No activity for 30 seconds, close connection
-                                yield f"data: {json.dumps({'status': 'idle', 'message': 'Closing connection - no activity'})}\n\n"
-                                break
                     except Exception as e:
                         logger.error(f"Error checking analysis status: {e}")
-                        error_status = {'status': 'error', 'message': str(e)}
-                        if error_status != last_status:
-                            yield f"data: {json.dumps(error_status)}\n\n"
-                            last_status = error_status
-                else:
-                    # Analysis in progress - update status
-                    current_status = progress.get('status', 'unknown')
-                    if progress != last_status:
-                        yield f"data: {json.dumps(progress)}\n\n"
-                        last_status = progress
-                        last_activity = time.time()  # Reset idle timer
-                
-                # Send heartbeat periodically to keep connection alive during active analysis
-                if progress and time.time() - last_heartbeat > heartbeat_interval:
-                    yield f": heartbeat\n\n"  # SSE comment (keeps connection alive)
-                    last_heartbeat = time.time()
-                    consecutive_errors = 0  # Reset error count on successful heartbeat
-                
-                time.sleep(2)  # Check every 2 seconds (analysis is slower)
-            except Exception as e:
-                consecutive_errors += 1
-                logger.error(f"Error in analysis progress stream (attempt {consecutive_errors}/{max_errors}): {e}")
-                
-                # If too many consecutive errors, close connection
-                if consecutive_errors >= max_errors:
-                    yield f"data: {json.dumps({'status': 'error', 'message': 'Too many errors - connection closed'})}\n\n"
-                    break
-                
-                # Send error but continue
-                yield f"data: {json.dumps({'status': 'error', 'message': str(e)})}\n\n"
-                time.sleep(3)  # Wait longer before retrying after error
+                        idle_status = {'status': 'error', 'message': str(e)}
+                    yield f"data: {json.dumps(idle_status)}\n\n"
+                last_activity = time.time()
+
+                while True:
+                    now = time.time()
+                    remaining = max_connection_time - (now - start_time)
+                    if remaining <= 0:
+                        yield f"data: {json.dumps({'status': 'timeout', 'message': 'Connection timeout - please refresh'})}\n\n"
+                        break
+
+                    if progress:
+                        wait = heartbeat_interval
+                    else:
+                        wait = idle_timeout - (now - last_activity)
+                        if wait <= 0:
+                            # No activity for 30 seconds, close connection
+                            yield f"data: {json.dumps({'status': 'idle', 'message': 'Closing connection - no activity'})}\n\n"
+                            break
+
+                    # Blocks until the analysis worker publishes an update; no Redis polling
+                    message = subscription.get(timeout=min(wait, remaining))
+                    if message is None:
+                        if progress:
+                            yield f": heartbeat\n\n"  # SSE comment (keeps connection alive)
+                        continue
+                    if message.get('type') != 'progress.analysis' or not message.get('data'):
+                        continue
+
+                    progress = message['data']
+                    yield f"data: {json.dumps(progress)}\n\n"
+                    last_activity = time.time()  # Reset idle timer
+        except Exception as e:
+            logger.error(f"Error in analysis progress stream: {e}")
+            yield f"data: {json.dumps({'status': 'error', 'message': 'Stream error - connection closed'})}\n\n"
     
     # SSE headers - optimized for Hugging Face Spaces and other reverse proxies
     import os
@@ -1320,22 +1457,22 @@ def get_dashboard_stats():
         if cached_stats:
             return jsonify(cached_stats), 200
         
-        # Get current date and calculate comparison periods
-        now = datetime.utcnow()
-        week_ago = now - timedelta(days=7)
-        two_weeks_ago = now - timedelta(days=14)
-        month_ago = now - timedelta(days=30)
-        
         from uow.unit_of_work import UnitOfWork
-        from services.bookmark_service import BookmarkService
+        from services.user_stats_service import UserStatsService
         
+        # One counter row plus daily snapshots for the 7/14/30-day comparisons
         with UnitOfWork() as uow:
-            service = BookmarkService(uow)
-            stats_data = service.get_bookmark_stats(user_id, month_ago, week_ago, two_weeks_ago)
+            stats_service = UserStatsService(uow)
+            counters = stats_service.get_stats(user_id)
+            snapshots = stats_service.snapshots(user_id, counters, (7, 14, 30))
+            current = {name: getattr(counters, name) for name in ('bookmark_count', 'saved_total', 'quality_count', 'project_count')}
+            week_ago, two_weeks_ago, month_ago = (
+                {name: getattr(snapshots[n], name) for name in current} for n in (7, 14, 30)
+            )
             
         # Total Bookmarks - compare current vs 30 days ago
-        total_bookmarks = stats_data['total']
-        bookmarks_month_ago = stats_data['month']
+        total_bookmarks = current['bookmark_count']
+        bookmarks_month_ago = month_ago['bookmark_count']
         
         bookmarks_change = 0
         if bookmarks_month_ago > 0:
@@ -1343,12 +1480,9 @@ def get_dashboard_stats():
         elif total_bookmarks > 0:
             bookmarks_change = 100  # New user, 100% increase
             
-        # Active Projects - compare current vs 30 days ago (Keep Project queries in blueprint for now)
-        total_projects = Project.query.filter_by(user_id=user_id).count()
-        projects_month_ago = Project.query.filter(
-            Project.user_id == user_id,
-            Project.created_at <= month_ago
-        ).count()
+        # Active Projects - compare current vs 30 days ago
+        total_projects = current['project_count']
+        projects_month_ago = month_ago['project_count']
         
         projects_change = total_projects - projects_month_ago
         if projects_month_ago > 0:
@@ -1357,35 +1491,25 @@ def get_dashboard_stats():
         else:
             projects_change_display = f"+{projects_change}" if projects_change > 0 else str(projects_change)
             
-        # Weekly Saves
-        weekly_saves = stats_data['weekly']
-        weekly_change = stats_data['trend']
-        
-        # Success Rate - based on quality scores and analysis completion
-        # Success = bookmarks with quality_score >= 5 and have analysis
-        successful_bookmarks = db.session.query(SavedContent).join(
-            ContentAnalysis, SavedContent.id == ContentAnalysis.content_id
-        ).filter(
-            SavedContent.user_id == user_id,
-            SavedContent.quality_score >= 5
-        ).count()
+        # Weekly Saves - saved_total only grows, so snapshot differences count saves per window
+        weekly_saves = max(0, current['saved_total'] - week_ago['saved_total'])
+        last_week_saves = max(0, week_ago['saved_total'] - two_weeks_ago['saved_total'])
+        if last_week_saves > 0:
+            weekly_change = round(((weekly_saves - last_week_saves) / last_week_saves) * 100, 1)
+        else:
+            weekly_change = 100.0 if weekly_saves > 0 else 0.0
+            
+        # Success Rate - analyzed bookmarks with quality_score >= 5
+        successful_bookmarks = current['quality_count']
         
         success_rate = 0
         if total_bookmarks > 0:
             success_rate = (successful_bookmarks / total_bookmarks) * 100
         
-        # Get previous success rate (30 days ago)
-        successful_bookmarks_month_ago = db.session.query(SavedContent).join(
-            ContentAnalysis, SavedContent.id == ContentAnalysis.content_id
-        ).filter(
-            SavedContent.user_id == user_id,
-            SavedContent.quality_score >= 5,
-            SavedContent.saved_at <= month_ago
-        ).count()
-        
+        # Previous success rate (30 days ago)
         success_rate_month_ago = 0
         if bookmarks_month_ago > 0:
-            success_rate_month_ago = (successful_bookmarks_month_ago / bookmarks_month_ago) * 100
+            success_rate_month_ago = (month_ago['quality_count'] / bookmarks_month_ago) * 100
         
         success_rate_change = success_rate - success_rate_month_ago
         
@@ -1507,5 +1631,7 @@ def delete_all_bookmarks():
     with UnitOfWork() as uow:
         service = BookmarkService(uow)
         num_deleted = service.delete_all_for_user(user_id)
-        
+
+    from services.cache_invalidation_service import cache_invalidator
+    cache_invalidator.invalidate_tfidf_corpus(user_id)
     return jsonify({'message': f'Deleted {num_deleted} bookmarks'}), 200 
\ No newline at end of file
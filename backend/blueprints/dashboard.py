@@ -5,11 +5,13 @@ Combines multiple API queries into one aggregated endpoint to reduce latency and
 
 import time
 import json
-from datetime import datetime, timedelta
 from flask import Blueprint, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import func, case
+from sqlalchemy import func
 from models import db, User, SavedContent, Project, Task
+from repositories.projections import BOOKMARK_CARD_COLUMNS
+from services.user_stats_service import UserStatsService
+from uow.unit_of_work import UnitOfWork
 from utils.redis_utils import redis_cache
 from core.logging_config import get_logger
 
@@ -81,47 +83,23 @@ def get_dashboard_summary():
             logger.exception("dashboard_api_stats_failed", user_id=user_id)
             response_data['apiKeyStatus'] = dict(_DEFAULT_API_KEY_STATUS, api_key_status='error')
 
-        # 4. Bookmark Metrics (UTC Timezone + SQL aggregations)
-        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        week_ago = today - timedelta(days=7)
-        last_week_start = week_ago - timedelta(days=7)
-
-        stats_result = db.session.query(
-            func.count(SavedContent.id).label('total_bookmarks'),
-            func.sum(
-                case((SavedContent.saved_at >= week_ago, 1), else_=0)
-            ).label('bookmarks_this_week'),
-            func.sum(
-                case(
-                    ((SavedContent.saved_at >= last_week_start) & (SavedContent.saved_at < week_ago), 1),
-                    else_=0
-                )
-            ).label('bookmarks_last_week'),
-            func.sum(
-                case((SavedContent.extracted_text.isnot(None), 1), else_=0)
-            ).label('successful_bookmarks'),
-            func.sum(
-                case((SavedContent.scrape_status == 'RUNNING', 1), else_=0)
-            ).label('scraping_count'),
-            func.sum(
-                case((SavedContent.embedding_status == 'RUNNING', 1), else_=0)
-            ).label('embedding_count'),
-            func.sum(
-                case((SavedContent.analysis_status == 'RUNNING', 1), else_=0)
-            ).label('analyzing_count'),
-            func.sum(
-                case((SavedContent.analysis_status == 'SUCCESS', 1), else_=0)
-            ).label('analyzed_count')
-        ).filter(SavedContent.user_id == user_id).first()
-
-        active_projects = db.session.query(func.count(Project.id)).filter_by(
-            user_id=user_id
-        ).scalar() or 0
-
-        total_bookmarks = int(stats_result.total_bookmarks or 0)
-        bookmarks_this_week = int(stats_result.bookmarks_this_week or 0)
-        bookmarks_last_week = int(stats_result.bookmarks_last_week or 0)
-        successful_bookmarks = int(stats_result.successful_bookmarks or 0)
+        # 4. Bookmark Metrics (one counter row + daily snapshots, no per-request COUNTs)
+        with UnitOfWork() as uow:
+            stats_service = UserStatsService(uow)
+            counters = stats_service.get_stats(user_id)
+            snapshots = stats_service.snapshots(user_id, counters, (7, 14))
+            total_bookmarks = counters.bookmark_count
+            successful_bookmarks = counters.content_count
+            active_projects = counters.project_count
+            pipeline_counts = {
+                'scraping': counters.scraping_count,
+                'embedding': counters.embedding_count,
+                'analyzing': counters.analyzing_count,
+                'analyzed': counters.analyzed_count
+            }
+            # saved_total only grows, so snapshot differences count saves per window
+            bookmarks_this_week = max(0, counters.saved_total - snapshots[7].saved_total)
+            bookmarks_last_week = max(0, snapshots[7].saved_total - snapshots[14].saved_total)
 
         if bookmarks_last_week > 0:
             bookmark_change = ((bookmarks_this_week - bookmarks_last_week) / bookmarks_last_week) * 100
@@ -130,12 +108,7 @@ def get_dashboard_summary():
 
         success_rate = (successful_bookmarks / total_bookmarks * 100) if total_bookmarks > 0 else 0
 
-        response_data['pipeline_stats'] = {
-            'scraping': int(stats_result.scraping_count or 0),
-            'embedding': int(stats_result.embedding_count or 0),
-            'analyzing': int(stats_result.analyzing_count or 0),
-            'analyzed': int(stats_result.analyzed_count or 0)
-        }
+        response_data['pipeline_stats'] = pipeline_counts
 
         response_data['stats'] = {
             'total_bookmarks': {
@@ -161,16 +134,8 @@ def get_dashboard_summary():
         }
 
         # 5. Recent Bookmarks (DO NOT select extracted_text blob; compute has_content in SQL)
-        recent_bookmarks = db.session.query(
-            SavedContent.id,
-            SavedContent.url,
-            SavedContent.title,
-            SavedContent.notes,
-            SavedContent.saved_at,
-            SavedContent.category,
-            case((SavedContent.extracted_text.isnot(None), True), else_=False).label('has_content')
-        ).filter_by(
-            user_id=user_id
+        recent_bookmarks = db.session.query(*BOOKMARK_CARD_COLUMNS).filter(
+            SavedContent.user_id == user_id
         ).order_by(SavedContent.saved_at.desc()).limit(5).all()
 
         response_data['recentBookmarks'] = [
@@ -1,6 +1,7 @@
 """
 Events Blueprint: Multiplexed Server-Sent Events (SSE) Gateway for FUZE
-Provides /api/realtime/stream with Last-Event-ID replay from Redis Streams.
+Provides /api/realtime/stream with Last-Event-ID replay from Redis Streams;
+live events are fanned out by the process-wide subscriber in utils/realtime_bus.
 """
 
 import json
@@ -10,11 +11,22 @@ from flask import Blueprint, Response, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from core.logging_config import get_logger
 from utils.event_bus import read_events_for_replay
+from utils.realtime_bus import realtime_bus
 
 logger = get_logger(__name__)
 
 events_bp = Blueprint('events', __name__, url_prefix='/api')
 
+HEARTBEAT_INTERVAL = 15
+
+
+def _format_sse_event(evt: dict) -> str:
+    evt_type = evt.get('type', 'message')
+    evt_id = evt.get('event_id')
+    # Progress snapshots carry no event id; an empty id would reset the client's Last-Event-ID
+    id_line = f"id: {evt_id}\n" if evt_id else ""
+    return f"{id_line}event: {evt_type}\ndata: {json.dumps(evt)}\n\n"
+
 
 @events_bp.route('/realtime/stream', methods=['GET'])
 @events_bp.route('/bookmarks/progress/stream', methods=['GET'])
@@ -51,68 +63,35 @@ def stream_realtime_events():
         # 1. Initial Connection Handshake
         yield f"event: system.connected\ndata: {json.dumps({'status': 'connected', 'user_id': user_id_int, 'time': time.time()})}\n\n"
 
-        # 2. Replay missed events if Last-Event-ID is provided
-        if last_event_id:
-            try:
-                replayed_events = read_events_for_replay(user_id_int, last_event_id=last_event_id)
-                for evt in replayed_events:
-                    evt_type = evt.get('type', 'message')
-                    evt_id = evt.get('event_id', '')
-                    yield f"id: {evt_id}\nevent: {evt_type}\ndata: {json.dumps(evt)}\n\n"
-            except Exception as replay_err:
-                logger.warning(f"sse_replay_error: {replay_err}", extra={"user_id": user_id_int})
-
-        # 3. Live Event Loop using Redis Pub/Sub / Stream polling
-        from utils.redis_utils import redis_cache
-        client = getattr(redis_cache, 'redis_client', None) or getattr(redis_cache, 'client', None)
-        if not redis_cache or not client:
+        if not realtime_bus.available:
             yield f"event: system.warning\ndata: {json.dumps({'message': 'Redis unavailable for live stream'})}\n\n"
             return
 
-        pubsub = None
+        # Subscribe before replaying so nothing published in between is missed
         try:
-            pubsub = client.pubsub()
-            user_channel = f"fuze:events:channel:{user_id_int}"
-            pubsub.subscribe(user_channel)
-
-            last_ping = time.time()
-            consecutive_errors = 0
-
-            while True:
-                # Keep-alive heartbeat every 15 seconds
-                if time.time() - last_ping > 15:
-                    yield f": heartbeat {int(time.time())}\n\n"
-                    last_ping = time.time()
-
-                try:
-                    message = pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
-                    if message and message['type'] == 'message':
-                        raw_data = message['data']
-                        if isinstance(raw_data, bytes):
-                            raw_data = raw_data.decode('utf-8')
-                        
-                        evt_obj = json.loads(raw_data)
-                        evt_type = evt_obj.get('type', 'message')
-                        evt_id = evt_obj.get('event_id', '')
-                        
-                        yield f"id: {evt_id}\nevent: {evt_type}\ndata: {json.dumps(evt_obj)}\n\n"
-                        consecutive_errors = 0
-                except Exception as loop_err:
-                    consecutive_errors += 1
-                    if consecutive_errors > 10:
-                        logger.error(f"sse_loop_fatal_errors: {loop_err}", extra={"user_id": user_id_int})
-                        break
-                    time.sleep(1)
-
+            with realtime_bus.subscribe(user_id_int) as subscription:
+                # 2. Replay missed events if Last-Event-ID is provided
+                replayed_ids = set()
+                if last_event_id:
+                    try:
+                        for evt in read_events_for_replay(user_id_int, last_event_id=last_event_id):
+                            replayed_ids.add(evt.get('event_id'))
+                            yield _format_sse_event(evt)
+                    except Exception as replay_err:
+                        logger.warning(f"sse_replay_error: {replay_err}", extra={"user_id": user_id_int})
+
+                # 3. Live events from the process-wide pub/sub subscriber
+                while True:
+                    evt_obj = subscription.get(timeout=HEARTBEAT_INTERVAL)
+                    if evt_obj is None:
+                        # Keep-alive heartbeat when nothing arrived for HEARTBEAT_INTERVAL seconds
+                        yield f": heartbeat {int(time.time())}\n\n"
+                        continue
+                    if evt_obj.get('event_id') and evt_obj['event_id'] in replayed_ids:
+                        continue
+                    yield _format_sse_event(evt_obj)
         except Exception as stream_err:
             logger.error(f"sse_stream_exception: {stream_err}", extra={"user_id": user_id_int})
-        finally:
-            if pubsub:
-                try:
-                    pubsub.unsubscribe()
-                    pubsub.close()
-                except Exception:
-                    pass
 
     return Response(
         generate_sse_stream(),
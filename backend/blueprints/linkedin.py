@@ -6,12 +6,13 @@ Handles LinkedIn post content extraction, AI analysis, history, and bookmark int
 import json
 from datetime import datetime
 from urllib.parse import urlparse
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from sqlalchemy.exc import SQLAlchemyError
 
 from models import db, SavedContent, ContentAnalysis
-from scrapers.easy_linkedin_scraper import EasyLinkedInScraper
+from repositories.projections import WITH_TEXT
+from services.linkedin_batch_service import extract_post, iter_batch_extractions
 from utils.gemini_utils import GeminiAnalyzer
 from middleware.rate_limiting import limiter
 from core.logging_config import get_logger
@@ -72,9 +73,8 @@ def extract_linkedin_content():
 
         logger.info("linkedin_extract_started", user_id=user_id)
 
-        # Per-request thread-safe scraper instance
-        scraper = EasyLinkedInScraper()
-        extracted_data = scraper.scrape_post(linkedin_url)
+        # Shared keep-alive session and URL cache (services/linkedin_batch_service)
+        extracted_data = extract_post(linkedin_url)
 
         if not extracted_data or not extracted_data.get('success'):
             return jsonify({
@@ -258,7 +258,11 @@ def analyze_linkedin_content():
 @jwt_required()
 @limiter.limit("5 per minute")
 def batch_extract_linkedin():
-    """Extract content from multiple LinkedIn URLs."""
+    """
+    Extract content from multiple LinkedIn URLs.
+    With ?stream=1 (or Accept: application/x-ndjson) results are streamed as JSON lines
+    as each URL finishes, followed by a summary line.
+    """
     try:
         user_id = int(get_jwt_identity())
         data = request.get_json(silent=True) or {}
@@ -272,39 +276,33 @@ def batch_extract_linkedin():
 
         logger.info("linkedin_batch_extract_started", user_id=user_id, count=len(urls))
 
-        scraper = EasyLinkedInScraper()
-        results = []
-        successful = 0
-        failed = 0
-
-        for url in urls:
-            url_str = (url or '').strip()
-            if not validate_linkedin_url(url_str):
-                results.append({'url': url_str, 'success': False, 'error': 'Invalid LinkedIn URL'})
-                failed += 1
-                continue
-
-            try:
-                extracted = scraper.scrape_post(url_str)
-                if extracted and extracted.get('success'):
-                    results.append({
-                        'url': url_str,
-                        'success': True,
-                        'data': {
-                            'title': extracted.get('title'),
-                            'content': extracted.get('content'),
-                            'quality_score': extracted.get('quality_score', 0),
-                            'method_used': extracted.get('method_used', '')
-                        }
-                    })
-                    successful += 1
-                else:
-                    results.append({'url': url_str, 'success': False, 'error': 'Extraction failed'})
-                    failed += 1
-            except Exception:
-                logger.exception("linkedin_batch_url_failed", user_id=user_id)
-                results.append({'url': url_str, 'success': False, 'error': 'Extraction failed'})
-                failed += 1
+        # URLs run concurrently on a bounded pool; results arrive in completion order
+        results = iter_batch_extractions(urls, validate_linkedin_url)
+
+        if request.args.get('stream') or 'application/x-ndjson' in request.headers.get('Accept', ''):
+            def generate():
+                successful = 0
+                for result in results:
+                    successful += int(result['success'])
+                    yield json.dumps(dict(result, type='result')) + '\n'
+                yield json.dumps({
+                    'type': 'summary',
+                    'total_urls': len(urls),
+                    'successful': successful,
+                    'failed': len(urls) - successful
+                }) + '\n'
+
+            return Response(
+                stream_with_context(generate()),
+                mimetype='application/x-ndjson',
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+            )
+
+        results = sorted(results, key=lambda result: result['index'])
+        for result in results:
+            del result['index']
+        successful = sum(1 for result in results if result['success'])
+        failed = len(results) - successful
 
         return jsonify({
             'success': True,
@@ -331,7 +329,7 @@ def get_linkedin_history():
         limit = min(int(request.args.get('limit', 20)), 100)
         offset = int(request.args.get('offset', 0))
 
-        history_query = db.session.query(SavedContent).filter(
+        history_query = db.session.query(SavedContent).options(WITH_TEXT).filter(
             SavedContent.user_id == user_id,
             (SavedContent.category == 'linkedin') | (SavedContent.source == 'linkedin')
         ).order_by(SavedContent.saved_at.desc())
@@ -26,6 +26,7 @@ recommendations_bp = Blueprint('recommendations', __name__, url_prefix='/api/rec
 # Import models for new endpoints
 try:
     from models import db, SavedContent, Project, Task, User, UserFeedback
+    from repositories.projections import WITH_TEXT
     MODELS_AVAILABLE = True
 except ImportError:
     MODELS_AVAILABLE = False
@@ -366,7 +367,7 @@ def get_unified_recommendations():
             return jsonify(cached_result)
         
         # Get high-quality content from all users with proper ordering
-        all_content = SavedContent.query.filter(
+        all_content = SavedContent.query.options(WITH_TEXT).filter(
             SavedContent.quality_score >= 7,
             SavedContent.extracted_text.isnot(None),
             SavedContent.extracted_text != ''
@@ -454,7 +455,7 @@ def get_unified_project_recommendations(project_id):
             return jsonify(cached_result)
         
         # Get high-quality content from all users with proper ordering
-        all_content = SavedContent.query.filter(
+        all_content = SavedContent.query.options(WITH_TEXT).filter(
             SavedContent.quality_score >= 7,
             SavedContent.extracted_text.isnot(None),
             SavedContent.extracted_text != ''
@@ -535,7 +536,7 @@ def get_project_recommendations(project_id):
             return jsonify({'error': 'Project not found'}), 404
         
         # Get user's saved content
-        user_bookmarks = SavedContent.query.filter_by(user_id=user_id).all()
+        user_bookmarks = SavedContent.query.options(WITH_TEXT).filter_by(user_id=user_id).all()
         
         # Convert to format expected by UnifiedRecommendationEngine
         bookmarks_data = []
@@ -1577,7 +1578,7 @@ def discover_recommendations():
             engine = get_unified_engine()
             if engine:
                 from models import SavedContent
-                user_bookmarks = SavedContent.query.filter_by(user_id=user_id).all()
+                user_bookmarks = SavedContent.query.options(WITH_TEXT).filter_by(user_id=user_id).all()
                 bookmarks_data = [{
                     'id': b.id, 'title': b.title, 'url': b.url,
                     'extracted_text': b.extracted_text or '', 'tags': b.tags or '',
@@ -1634,7 +1635,7 @@ def get_similar_content(content_id):
             return jsonify({'error': 'Unified engine not available'}), 500
         
         # Get all user content
-        user_bookmarks = SavedContent.query.filter_by(user_id=user_id).all()
+        user_bookmarks = SavedContent.query.options(WITH_TEXT).filter_by(user_id=user_id).all()
         bookmarks_data = []
         for bookmark in user_bookmarks:
             if bookmark.id != content_id:  # Exclude the target content
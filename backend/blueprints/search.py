@@ -49,6 +49,43 @@ def semantic_search():
         return jsonify({'message': 'Search temporarily unavailable'}), 503
 
 
+@search_bp.route('/hybrid', methods=['POST'])
+@jwt_required()
+@limiter.limit("30 per minute")
+def hybrid_search():
+    """Single-request hybrid search: vector ANN + full-text fused with reciprocal rank fusion."""
+    user_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+    query = str(data.get('query', '')).strip()
+
+    try:
+        limit = int(data.get('limit', 10))
+    except (TypeError, ValueError):
+        limit = 10
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+
+    if not query:
+        return jsonify({'message': 'Query is required'}), 400
+
+    if len(query) > MAX_QUERY_LENGTH:
+        return jsonify({'message': f'Query exceeds maximum length of {MAX_QUERY_LENGTH} characters'}), 400
+
+    try:
+        with UnitOfWork() as uow:
+            service = SearchService(uow)
+            results = service.hybrid_search(user_id, query, limit)
+
+        return jsonify({
+            'query': query,
+            'results': results,
+            'total': len(results),
+            'engine': 'hybrid_rrf',
+        }), 200
+    except Exception:
+        logger.exception("hybrid_search_failed", extra={"user_id": user_id})
+        return jsonify({'message': 'Search temporarily unavailable'}), 503
+
+
 @search_bp.route('/text', methods=['GET'])
 @jwt_required()
 def text_search():
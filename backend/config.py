@@ -59,6 +59,7 @@ class TestingConfig(Config):
     DEBUG = True
     TESTING = True
     RATELIMIT_ENABLED = False
+    BCRYPT_LOG_ROUNDS = 4  # bcrypt's minimum cost keeps auth tests fast
     SQLALCHEMY_DATABASE_URI = os.getenv('TEST_DATABASE_URL', 'sqlite:///:memory:')
 
 # Select config based on environment
@@ -1,10 +1,17 @@
+import json
 import time
-from typing import Optional
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
 from utils.redis_utils import redis_cache
 from core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+CIRCUIT_EVENTS_CHANNEL = "fuze:circuit:events"
+MAX_REGISTERED_BREAKERS = 1024
+LISTENER_RETRY_SECONDS = 5.0
+
 
 class CircuitState:
     CLOSED = "CLOSED"
@@ -16,6 +23,10 @@ class RedisCircuitBreaker:
     """
     Distributed Redis-backed Circuit Breaker.
     Shares trip status across all Gunicorn worker processes and background RQ workers.
+
+    State is mirrored in-process for local_ttl_seconds so allow_request() on the hot
+    path normally costs no Redis round-trip; transitions are written in one pipeline
+    and broadcast on CIRCUIT_EVENTS_CHANNEL so other processes update their mirror early.
     """
 
     def __init__(
@@ -23,42 +34,91 @@ class RedisCircuitBreaker:
         name: str = "gemini",
         failure_threshold: int = 5,
         recovery_timeout: int = 120,
-        window_seconds: int = 60
+        window_seconds: int = 60,
+        local_ttl_seconds: float = 2.0
     ):
         self.name = name
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
         self.window_seconds = window_seconds
+        self.local_ttl_seconds = local_ttl_seconds
 
         self.state_key = f"fuze:circuit:{name}:state"
         self.failures_key = f"fuze:circuit:{name}:failures"
         self.opened_at_key = f"fuze:circuit:{name}:opened_at"
 
-    def get_state(self) -> str:
-        """Get current state of circuit breaker."""
-        if not redis_cache or not redis_cache.connected:
-            return CircuitState.CLOSED
-
+        self._lock = threading.Lock()
+        self._cached_state: Optional[str] = None
+        self._cached_opened_at: Optional[float] = None
+        self._cached_at = 0.0
+        self._failures_pending = False
+
+    def _set_local(self, state: str, opened_at: Optional[float] = None):
+        with self._lock:
+            self._cached_state = state
+            self._cached_opened_at = opened_at
+            self._cached_at = time.monotonic()
+
+    def _get_local(self) -> Tuple[Optional[str], Optional[float]]:
+        with self._lock:
+            if self._cached_state is None or time.monotonic() - self._cached_at >= self.local_ttl_seconds:
+                return None, None
+            return self._cached_state, self._cached_opened_at
+
+    def _refresh(self) -> Tuple[str, Optional[float]]:
+        """Reload state from Redis into the local mirror."""
+        _ensure_listener()
+        state, opened_at = CircuitState.CLOSED, None
         try:
             state_bytes = redis_cache.redis_client.get(self.state_key)
-            if not state_bytes:
-                return CircuitState.CLOSED
-
-            state = state_bytes.decode('utf-8') if isinstance(state_bytes, bytes) else str(state_bytes)
-
+            if state_bytes:
+                state = state_bytes.decode('utf-8') if isinstance(state_bytes, bytes) else str(state_bytes)
             if state == CircuitState.OPEN:
                 opened_at_bytes = redis_cache.redis_client.get(self.opened_at_key)
                 if opened_at_bytes:
                     opened_at = float(opened_at_bytes.decode('utf-8') if isinstance(opened_at_bytes, bytes) else opened_at_bytes)
-                    if time.time() - opened_at >= self.recovery_timeout:
-                        redis_cache.redis_client.set(self.state_key, CircuitState.HALF_OPEN)
-                        logger.info("circuit_breaker_transition_half_open", extra={"name": self.name})
-                        return CircuitState.HALF_OPEN
-            return state
         except Exception as e:
             logger.error("circuit_breaker_get_state_failed", extra={"name": self.name, "error": str(e)})
+            state, opened_at = CircuitState.CLOSED, None
+
+        self._set_local(state, opened_at)
+        return state, opened_at
+
+    def _transition(self, state: str, opened_at: Optional[float] = None):
+        """Write a state change and broadcast it in a single pipelined round-trip."""
+        pipe = redis_cache.redis_client.pipeline()
+        pipe.set(self.state_key, state)
+        if state == CircuitState.OPEN:
+            pipe.set(self.opened_at_key, str(opened_at))
+        elif state == CircuitState.CLOSED:
+            pipe.delete(self.failures_key)
+            pipe.delete(self.opened_at_key)
+        pipe.publish(CIRCUIT_EVENTS_CHANNEL, json.dumps({
+            "name": self.name,
+            "state": state,
+            "opened_at": opened_at
+        }))
+        pipe.execute()
+        self._set_local(state, opened_at)
+
+    def get_state(self) -> str:
+        """Get current state of circuit breaker."""
+        if not redis_cache or not redis_cache.connected:
             return CircuitState.CLOSED
 
+        state, opened_at = self._get_local()
+        if state is None:
+            state, opened_at = self._refresh()
+
+        if state == CircuitState.OPEN and opened_at and time.time() - opened_at >= self.recovery_timeout:
+            try:
+                self._transition(CircuitState.HALF_OPEN)
+                logger.info("circuit_breaker_transition_half_open", extra={"name": self.name})
+            except Exception as e:
+                logger.error("circuit_breaker_get_state_failed", extra={"name": self.name, "error": str(e)})
+            return CircuitState.HALF_OPEN
+        return state
+
     def record_success(self):
         """Record successful call, resetting state to CLOSED."""
         if not redis_cache or not redis_cache.connected:
@@ -67,14 +127,13 @@ class RedisCircuitBreaker:
         try:
             state = self.get_state()
             if state != CircuitState.CLOSED:
-                pipe = redis_cache.redis_client.pipeline()
-                pipe.set(self.state_key, CircuitState.CLOSED)
-                pipe.delete(self.failures_key)
-                pipe.delete(self.opened_at_key)
-                pipe.execute()
+                self._transition(CircuitState.CLOSED)
+                self._failures_pending = False
                 logger.info("circuit_breaker_reset_closed", extra={"name": self.name})
-            else:
+            elif self._failures_pending:
+                # Only clear the counter when this process has contributed to it
                 redis_cache.redis_client.delete(self.failures_key)
+                self._failures_pending = False
         except Exception as e:
             logger.error("circuit_breaker_record_success_failed", extra={"name": self.name, "error": str(e)})
 
@@ -84,17 +143,17 @@ class RedisCircuitBreaker:
             return
 
         try:
-            failures = redis_cache.redis_client.incr(self.failures_key)
-            if failures == 1:
-                redis_cache.redis_client.expire(self.failures_key, self.window_seconds)
+            # The window starts with the first failure: SET NX only creates the counter (with
+            # its TTL), so later failures never push the expiry out
+            pipe = redis_cache.redis_client.pipeline()
+            pipe.set(self.failures_key, 0, ex=self.window_seconds, nx=True)
+            pipe.incr(self.failures_key)
+            failures = int(pipe.execute()[1])
+            self._failures_pending = True
 
             state = self.get_state()
             if state == CircuitState.HALF_OPEN or failures >= self.failure_threshold:
-                now = time.time()
-                pipe = redis_cache.redis_client.pipeline()
-                pipe.set(self.state_key, CircuitState.OPEN)
-                pipe.set(self.opened_at_key, str(now))
-                pipe.execute()
+                self._transition(CircuitState.OPEN, opened_at=time.time())
                 logger.warning("circuit_breaker_tripped_open", extra={
                     "name": self.name,
                     "failures": failures,
@@ -112,4 +171,80 @@ class RedisCircuitBreaker:
         return False
 
 
-gemini_circuit_breaker = RedisCircuitBreaker(name="gemini")
+# Per-domain breakers live in a bounded LRU; module-level breakers are pinned outside it
+# so eviction never leaves a caller holding an instance that misses broadcasts
+_breakers: "OrderedDict[str, RedisCircuitBreaker]" = OrderedDict()
+_pinned_breakers: "dict[str, RedisCircuitBreaker]" = {}
+_registry_lock = threading.Lock()
+_listener_thread: Optional[threading.Thread] = None
+
+
+def get_circuit_breaker(name: str, pinned: bool = False, **kwargs) -> RedisCircuitBreaker:
+    """
+    Return the process-wide breaker for name, creating it on first use.
+    Reusing instances keeps the local state mirror warm across calls.
+    Pass pinned=True for breakers kept in long-lived references; they are never evicted.
+    """
+    with _registry_lock:
+        breaker = _pinned_breakers.get(name)
+        if breaker is not None:
+            return breaker
+        if pinned:
+            breaker = _breakers.pop(name, None) or RedisCircuitBreaker(name=name, **kwargs)
+            _pinned_breakers[name] = breaker
+            return breaker
+
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = RedisCircuitBreaker(name=name, **kwargs)
+            _breakers[name] = breaker
+            if len(_breakers) > MAX_REGISTERED_BREAKERS:
+                _breakers.popitem(last=False)
+        else:
+            _breakers.move_to_end(name)
+        return breaker
+
+
+def _apply_transition_message(data) -> None:
+    try:
+        payload = json.loads(data.decode('utf-8') if isinstance(data, bytes) else data)
+        with _registry_lock:
+            breaker = _pinned_breakers.get(payload["name"]) or _breakers.get(payload["name"])
+        if breaker is not None:
+            breaker._set_local(payload["state"], payload.get("opened_at"))
+    except Exception as e:
+        logger.warning("circuit_breaker_broadcast_invalid", extra={"error": str(e)})
+
+
+def _listen_for_transitions() -> None:
+    while True:
+        try:
+            pubsub = redis_cache.redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(CIRCUIT_EVENTS_CHANNEL)
+            for message in pubsub.listen():
+                if message and message.get('type') == 'message':
+                    _apply_transition_message(message.get('data'))
+        except Exception as e:
+            logger.warning("circuit_breaker_listener_disconnected", extra={"error": str(e)})
+        time.sleep(LISTENER_RETRY_SECONDS)
+
+
+def _ensure_listener() -> None:
+    """Start the per-process transition subscriber (again after a fork)."""
+    global _listener_thread
+    if _listener_thread is not None and _listener_thread.is_alive():
+        return
+    if not redis_cache or not redis_cache.connected:
+        return
+    with _registry_lock:
+        if _listener_thread is not None and _listener_thread.is_alive():
+            return
+        _listener_thread = threading.Thread(
+            target=_listen_for_transitions,
+            name="circuit-breaker-listener",
+            daemon=True
+        )
+        _listener_thread.start()
+
+
+gemini_circuit_breaker = get_circuit_breaker("gemini", pinned=True)
@@ -158,6 +158,24 @@ class ScrapingSkipped(Event):
     reason: str = "content_hash_unchanged"
 
 
+@dataclass(frozen=True, kw_only=True)
+class EmbeddingSkipped(Event):
+    bookmark_id: int
+    user_id: int
+    content_hash: Optional[str] = None
+    pipeline_run_id: Optional[str] = None
+    reason: str = "input_unchanged"
+
+
+@dataclass(frozen=True, kw_only=True)
+class AnalysisSkipped(Event):
+    bookmark_id: int
+    user_id: int
+    content_hash: Optional[str] = None
+    pipeline_run_id: Optional[str] = None
+    reason: str = "input_unchanged"
+
+
 @dataclass(frozen=True, kw_only=True)
 class ScrapingFailed(Event):
     bookmark_id: int
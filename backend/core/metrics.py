@@ -110,7 +110,7 @@ if PROMETHEUS_AVAILABLE and METRICS_ENABLED:
         labelnames=["cache_type"],
     )
 
-    # RQ queue depth — instrumented in task_queue.py on enqueue
+    # RQ queue depth — sampled by task_queue.sample_queue_depths when /metrics is scraped
     rq_queue_depth = Gauge(
         "fuze_rq_queue_depth",
         "Current RQ queue depth",
@@ -173,6 +173,12 @@ if PROMETHEUS_AVAILABLE and METRICS_ENABLED:
         labelnames=["stage", "status"],
     )
 
+    # Password hash operations running or waiting — set by core/password_pool.py
+    password_hash_pending = Gauge(
+        "fuze_password_hash_pending",
+        "Password hash operations running or waiting for a hashing thread",
+    )
+
     logger.info("prometheus_metrics_registered")
 
 else:
@@ -202,6 +208,7 @@ else:
     embedding_null_rate = _noop
     recommendation_requests_total = _noop
     pipeline_events_total = _noop
+    password_hash_pending = _noop
 
 
 def get_metrics_output() -> tuple:
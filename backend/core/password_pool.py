@@ -0,0 +1,108 @@
+"""
+core/password_pool.py
+=====================
+Runs bcrypt (and legacy werkzeug hash checks) off the gevent hub.
+
+A bcrypt call at work factor 12 is 100-300 ms of native CPU. Under gunicorn's
+gevent worker it runs on the hub, so every other request and SSE stream in the
+process stalls until it returns. PasswordHashPool hands the call to a small
+gevent ThreadPool of real OS threads (bcrypt releases the GIL) and parks only the
+calling greenlet.
+
+Calls in flight are capped. Past the cap, PasswordPoolSaturated (a 503 with
+Retry-After) is raised instead of queueing without bound during a login burst.
+Without gevent monkey-patching (RQ workers, scripts, tests) calls run inline.
+"""
+
+import os
+import threading
+from typing import Any, Callable
+from werkzeug.exceptions import ServiceUnavailable
+from core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+PASSWORD_POOL_SIZE = int(os.getenv('PASSWORD_POOL_SIZE', '4'))
+PASSWORD_POOL_MAX_PENDING = int(os.getenv('PASSWORD_POOL_MAX_PENDING', '32'))
+PASSWORD_POOL_RETRY_AFTER = int(os.getenv('PASSWORD_POOL_RETRY_AFTER', '2'))
+
+
+class PasswordPoolSaturated(ServiceUnavailable):
+    """Raised when too many password hash operations are already in flight (503, sends Retry-After)."""
+
+    description = "Too many sign-ins in progress. Please retry shortly."
+
+    def __init__(self, retry_after: int = PASSWORD_POOL_RETRY_AFTER):
+        super().__init__(retry_after=retry_after)
+
+
+def _gevent_patched() -> bool:
+    try:
+        from gevent import monkey
+        return monkey.is_module_patched('threading')
+    except ImportError:
+        return False
+
+
+class PasswordHashPool:
+    """Bounded real-thread pool for password hashing under gevent."""
+
+    def __init__(self, size: int = PASSWORD_POOL_SIZE, max_pending: int = PASSWORD_POOL_MAX_PENDING,
+                 retry_after: int = PASSWORD_POOL_RETRY_AFTER):
+        self.size = size
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pool_checked = False
+
+    @property
+    def pending(self) -> int:
+        """Calls running or waiting for a pool thread."""
+        return self._pending
+
+    def _get_pool(self):
+        if not self._pool_checked:
+            self._pool_checked = True
+            if _gevent_patched():
+                from gevent.threadpool import ThreadPool
+                self._pool = ThreadPool(self.size)
+                logger.info("password_pool_started", extra={"size": self.size, "max_pending": self.max_pending})
+        return self._pool
+
+    def _publish(self, pending: int) -> None:
+        try:
+            from core.metrics import password_hash_pending
+            password_hash_pending.set(pending)
+        except Exception:
+            pass
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) on a pool thread and wait for it; raises PasswordPoolSaturated at the cap."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                logger.warning("password_pool_saturated", extra={"pending": self._pending})
+                raise PasswordPoolSaturated(self.retry_after)
+            self._pending += 1
+            pending = self._pending
+        self._publish(pending)
+        try:
+            pool = self._get_pool()
+            if pool is None:
+                return fn(*args)
+            return pool.apply(fn, args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                pending = self._pending
+            self._publish(pending)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.kill()
+        self._pool = None
+        self._pool_checked = False
+
+
+password_pool = PasswordHashPool()
@@ -0,0 +1,236 @@
+import math
+import time
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+from utils.redis_utils import redis_cache
+from core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class QuotaWindow:
+    """A single rate window, e.g. 15 requests per 60 seconds."""
+    name: str
+    limit: int
+    seconds: int
+
+
+@dataclass
+class QuotaDecision:
+    """Outcome of a quota check: whether units were granted, usage per window and when to retry."""
+    allowed: bool
+    retry_after: int
+    used: Dict[str, int]
+    limits: Dict[str, int]
+    remaining: Dict[str, int] = field(init=False)
+
+    def __post_init__(self):
+        self.remaining = {
+            name: max(0, limit - self.used.get(name, 0))
+            for name, limit in self.limits.items()
+        }
+
+
+class RedisQuota:
+    """
+    Atomic multi-window quota engine.
+
+    Every window is a sliding-window counter (current bucket plus the linearly
+    decaying previous bucket). All windows are checked and reserved in a single
+    Lua call, so one round-trip both answers "may I?" and takes the units, and
+    concurrent workers cannot race past a limit between check and increment.
+    Falls back to an equivalent in-process store when Redis is unavailable.
+    """
+
+    # KEYS: (current bucket, previous bucket) per window
+    # ARGV: n, mode ("reserve" | "record" | "peek" | "release"), now, then (limit, seconds) per window
+    QUOTA_LUA_SCRIPT = """
+    local n = tonumber(ARGV[1])
+    local mode = ARGV[2]
+    local now = tonumber(ARGV[3])
+    local count = #KEYS / 2
+    local used = {}
+    local allowed = 1
+    local retry_after = 0
+
+    for i = 1, count do
+        local limit = tonumber(ARGV[2 + i * 2])
+        local size = tonumber(ARGV[3 + i * 2])
+        local cur = tonumber(redis.call("get", KEYS[i * 2 - 1]) or "0")
+        local prev = tonumber(redis.call("get", KEYS[i * 2]) or "0")
+        local remaining = size - (now % size)
+        local estimate = prev * remaining / size + cur
+        used[i] = estimate
+
+        if mode == "release" then
+            local give = math.min(n, cur)
+            if give > 0 then
+                redis.call("decrby", KEYS[i * 2 - 1], give)
+                used[i] = estimate - give
+            end
+        elseif estimate + n > limit then
+            allowed = 0
+            local wait
+            if n > limit then
+                wait = size
+            elseif cur + n > limit then
+                wait = remaining + size * (1 - (limit - n) / cur)
+            else
+                wait = remaining - (limit - cur - n) * size / prev
+            end
+            if wait > retry_after then
+                retry_after = wait
+            end
+        end
+    end
+
+    if (mode == "reserve" and allowed == 1) or mode == "record" then
+        for i = 1, count do
+            local size = tonumber(ARGV[3 + i * 2])
+            redis.call("incrby", KEYS[i * 2 - 1], n)
+            redis.call("expire", KEYS[i * 2 - 1], size * 2)
+            used[i] = used[i] + n
+        end
+    end
+
+    local result = {allowed, math.ceil(retry_after)}
+    for i = 1, count do
+        result[i + 2] = math.floor(used[i])
+    end
+    return result
+    """
+
+    def __init__(self, namespace: str, redis_client=None):
+        self.namespace = namespace
+        self.redis = redis_client or redis_cache
+        self._script = None
+        self._script_client = None
+        self._lock = threading.Lock()
+        self._memory: Dict[Tuple[str, str], Dict[int, int]] = {}
+
+    def reserve(self, subject: str, windows: Sequence[QuotaWindow], n: int = 1) -> QuotaDecision:
+        """Take n units from every window if all of them have room, otherwise take nothing."""
+        return self._apply(subject, windows, n, "reserve")
+
+    def record(self, subject: str, windows: Sequence[QuotaWindow], n: int = 1) -> QuotaDecision:
+        """Count n units that were already spent, even if that pushes a window over its limit."""
+        return self._apply(subject, windows, n, "record")
+
+    def peek(self, subject: str, windows: Sequence[QuotaWindow], n: int = 1) -> QuotaDecision:
+        """Report whether n units could be reserved right now without taking them."""
+        return self._apply(subject, windows, n, "peek")
+
+    def release(self, subject: str, windows: Sequence[QuotaWindow], n: int = 1) -> QuotaDecision:
+        """Give back n reserved units that were never spent (only from the current buckets)."""
+        return self._apply(subject, windows, n, "release")
+
+    def _apply(self, subject: str, windows: Sequence[QuotaWindow], n: int, mode: str) -> QuotaDecision:
+        if n < 0:
+            raise ValueError("n must be a non-negative integer")
+
+        now = time.time()
+        limits = {w.name: w.limit for w in windows}
+
+        if self.redis and getattr(self.redis, 'connected', False):
+            try:
+                allowed, retry_after, used = self._apply_redis(subject, windows, n, mode, now)
+                return QuotaDecision(allowed=allowed, retry_after=retry_after, used=used, limits=limits)
+            except Exception as e:
+                logger.warning("quota_redis_failed_using_memory", extra={
+                    "namespace": self.namespace,
+                    "subject": subject,
+                    "error": str(e)
+                })
+
+        allowed, retry_after, used = self._apply_memory(subject, windows, n, mode, now)
+        return QuotaDecision(allowed=allowed, retry_after=retry_after, used=used, limits=limits)
+
+    def _bucket_keys(self, subject: str, window: QuotaWindow, now: float) -> Tuple[str, str]:
+        bucket = int(now // window.seconds)
+        prefix = f"fuze:quota:{self.namespace}:{subject}:{window.name}"
+        return f"{prefix}:{bucket}", f"{prefix}:{bucket - 1}"
+
+    def _get_script(self, client):
+        if self._script is None or self._script_client is not client:
+            self._script = client.register_script(self.QUOTA_LUA_SCRIPT)
+            self._script_client = client
+        return self._script
+
+    def _apply_redis(self, subject: str, windows: Sequence[QuotaWindow], n: int, mode: str, now: float):
+        client = self.redis.redis_client
+        keys: List[str] = []
+        args: List = [n, mode, repr(now)]
+        for window in windows:
+            keys.extend(self._bucket_keys(subject, window, now))
+            args.extend([window.limit, window.seconds])
+
+        result = self._get_script(client)(keys=keys, args=args)
+        if not isinstance(result, (list, tuple)) or len(result) != 2 + len(windows):
+            raise ValueError(f"unexpected quota script result: {result!r}")
+
+        used = {w.name: int(result[i + 2]) for i, w in enumerate(windows)}
+        return bool(int(result[0])), int(result[1]), used
+
+    def _apply_memory(self, subject: str, windows: Sequence[QuotaWindow], n: int, mode: str, now: float):
+        with self._lock:
+            buckets = []
+            for window in windows:
+                counters = self._memory.setdefault((subject, window.name), {})
+                bucket = int(now // window.seconds)
+                for stale in [b for b in counters if b < bucket - 1]:
+                    del counters[stale]
+                buckets.append((counters, bucket))
+
+            allowed, retry_after, estimates = _evaluate_windows(
+                windows,
+                [(c.get(b, 0), c.get(b - 1, 0)) for c, b in buckets],
+                n,
+                now
+            )
+
+            if mode == "release":
+                allowed, retry_after = True, 0
+                for i, (counters, bucket) in enumerate(buckets):
+                    give = min(n, counters.get(bucket, 0))
+                    counters[bucket] = counters.get(bucket, 0) - give
+                    estimates[i] -= give
+            elif (mode == "reserve" and allowed) or mode == "record":
+                for i, (counters, bucket) in enumerate(buckets):
+                    counters[bucket] = counters.get(bucket, 0) + n
+                    estimates[i] += n
+
+            used = {w.name: int(estimates[i]) for i, w in enumerate(windows)}
+            return allowed, retry_after, used
+
+
+def _evaluate_windows(
+    windows: Sequence[QuotaWindow],
+    counts: Sequence[Tuple[int, int]],
+    n: int,
+    now: float
+) -> Tuple[bool, int, List[float]]:
+    """Python twin of the Lua evaluation, used by the in-memory fallback."""
+    allowed = True
+    retry_after = 0.0
+    estimates: List[float] = []
+
+    for window, (cur, prev) in zip(windows, counts):
+        size = window.seconds
+        remaining = size - (now % size)
+        estimate = prev * remaining / size + cur
+        estimates.append(estimate)
+
+        if estimate + n > window.limit:
+            allowed = False
+            if n > window.limit:
+                wait = size
+            elif cur + n > window.limit:
+                wait = remaining + size * (1 - (window.limit - n) / cur)
+            else:
+                wait = remaining - (window.limit - cur - n) * size / prev
+            retry_after = max(retry_after, wait)
+
+    return allowed, int(math.ceil(retry_after)), estimates
+
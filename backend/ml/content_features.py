@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Content Feature Store
+Materializes the normalized ranking features of a bookmark once, when its analysis
+completes, so recommendation requests load integer ids and enum codes instead of
+re-parsing ContentAnalysis rows on every call. Each row carries a digest of its inputs;
+rows whose inputs changed since (tag edits, rescrapes, rewritten analyses) are ignored.
+"""
+
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.exc import IntegrityError
+
+logger = logging.getLogger(__name__)
+
+# Bump when the normalization rules below change; older rows are ignored until rewritten
+FEATURE_VERSION = 1
+SNIPPET_CHARS = 500
+MAX_TERM_LENGTH = 100
+
+TECH = 'tech'
+CONCEPT = 'concept'
+
+# Stored as SmallInteger indexes into these tuples - append only, never reorder
+CONTENT_TYPES = (
+    'article', 'tutorial', 'documentation', 'course', 'example', 'best_practice',
+    'video', 'reference', 'guide', 'general', 'mixed', 'other'
+)
+DIFFICULTIES = ('beginner', 'intermediate', 'advanced')
+
+_CONTENT_TYPE_CODES = {name: code for code, name in enumerate(CONTENT_TYPES)}
+_DIFFICULTY_CODES = {name: code for code, name in enumerate(DIFFICULTIES)}
+
+
+def encode_content_type(content_type: Optional[str]) -> int:
+    key = (content_type or 'article').strip().lower()
+    return _CONTENT_TYPE_CODES.get(key, _CONTENT_TYPE_CODES['other'])
+
+
+def encode_difficulty(difficulty: Optional[str]) -> int:
+    key = (difficulty or 'intermediate').strip().lower()
+    return _DIFFICULTY_CODES.get(key, _DIFFICULTY_CODES['intermediate'])
+
+
+def _split_terms(value: Any) -> List[str]:
+    if isinstance(value, str):
+        return [term.strip() for term in value.split(',') if term.strip()]
+    if isinstance(value, list):
+        return [term.strip() for term in value if isinstance(term, str) and term.strip()]
+    return []
+
+
+def extract_feature_terms(content: Any, analysis: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    Canonical normalization of a bookmark's technologies, key concepts, content type
+    and difficulty from SavedContent + ContentAnalysis.
+    """
+    technologies = []
+    key_concepts = []
+    content_type = 'article'
+    difficulty = 'intermediate'
+
+    if analysis:
+        analysis_data = analysis.analysis_data or {}
+        technologies.extend(_split_terms(analysis.technology_tags))
+        technologies.extend(_split_terms(analysis_data.get('technologies', [])))
+
+        key_concepts = _split_terms(analysis.key_concepts)
+        if analysis_data:
+            key_concepts.extend(_split_terms(analysis_data.get('key_concepts', [])))
+            key_concepts = list(set(key_concepts))
+
+        if 'content_type' in analysis_data:
+            content_type = analysis_data.get('content_type', analysis.content_type or 'article')
+        else:
+            content_type = analysis.content_type or 'article'
+
+        if 'difficulty' in analysis_data:
+            difficulty = analysis_data.get('difficulty', analysis.difficulty_level or 'intermediate')
+        else:
+            difficulty = analysis.difficulty_level or 'intermediate'
+
+    technologies.extend(_split_terms(content.tags))
+    technologies = list(set(tech.lower() for tech in technologies))
+
+    return {
+        'technologies': technologies,
+        'key_concepts': key_concepts,
+        'content_type': content_type,
+        'difficulty': difficulty,
+    }
+
+
+def build_snippet(content: Any) -> str:
+    """Whitespace-collapsed head of the extracted text, sized for ranking prompts."""
+    text = ' '.join((content.extracted_text or '').split())
+    return text[:SNIPPET_CHARS]
+
+
+def feature_source_hash(content: Any, analysis: Optional[Any]) -> str:
+    """
+    Digest of the inputs a feature row is derived from. Only cheap, already-loaded columns:
+    content_hash stands in for the deferred extracted_text, which it changes with on rescrape.
+    """
+    updated_at = getattr(analysis, 'updated_at', None) if analysis else None
+    parts = (
+        content.tags or '',
+        str(content.quality_score),
+        content.content_hash or '',
+        str(analysis.id) if analysis else '',
+        updated_at.isoformat() if updated_at else '',
+    )
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+class TermVocabulary:
+    """
+    Process-wide two-way cache over the feature_terms table.
+    Every id decoded for loaded content is cached, so request terms can be mapped
+    to ids without a query: a term missing from the cache cannot match loaded content.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids: Dict[Tuple[str, str], int] = {}
+        self._terms: Dict[Tuple[str, int], str] = {}
+
+    def _remember(self, kind: str, term: str, term_id: int):
+        self._ids[(kind, term)] = term_id
+        self._terms[(kind, term_id)] = term
+
+    def clear(self):
+        with self._lock:
+            self._ids.clear()
+            self._terms.clear()
+
+    def cached_ids(self, kind: str, terms: Iterable[str]) -> frozenset:
+        """Ids of the given canonical terms that this process already knows about."""
+        with self._lock:
+            return frozenset(
+                self._ids[(kind, term)] for term in terms if (kind, term) in self._ids
+            )
+
+    def ids_for(self, session, kind: str, terms: Iterable[str], create: bool = False) -> Dict[str, int]:
+        """Resolve canonical terms to ids, inserting unseen terms when create is set."""
+        from models import FeatureTerm
+
+        wanted = {term[:MAX_TERM_LENGTH] for term in terms if term}
+        with self._lock:
+            found = {term: self._ids[(kind, term)] for term in wanted if (kind, term) in self._ids}
+        missing = wanted - found.keys()
+
+        if missing:
+            rows = session.query(FeatureTerm.term, FeatureTerm.id).filter(
+                FeatureTerm.kind == kind,
+                FeatureTerm.term.in_(missing)
+            ).all()
+            found.update({term: term_id for term, term_id in rows})
+            missing -= found.keys()
+
+        if missing and create:
+            for term in sorted(missing):
+                try:
+                    with session.begin_nested():
+                        row = FeatureTerm(kind=kind, term=term)
+                        session.add(row)
+                    found[term] = row.id
+                except IntegrityError:
+                    # Inserted concurrently by another worker
+                    found[term] = session.query(FeatureTerm.id).filter_by(kind=kind, term=term).scalar()
+
+        with self._lock:
+            for term, term_id in found.items():
+                if term_id is not None:
+                    self._remember(kind, term, term_id)
+        return {term: term_id for term, term_id in found.items() if term_id is not None}
+
+    def terms_for(self, session, kind: str, ids: Iterable[int]) -> Dict[int, str]:
+        """Decode ids back to canonical terms, querying only ids not yet cached."""
+        from models import FeatureTerm
+
+        wanted = set(ids)
+        with self._lock:
+            found = {term_id: self._terms[(kind, term_id)] for term_id in wanted if (kind, term_id) in self._terms}
+        missing = wanted - found.keys()
+
+        if missing:
+            rows = session.query(FeatureTerm.id, FeatureTerm.term).filter(
+                FeatureTerm.kind == kind,
+                FeatureTerm.id.in_(missing)
+            ).all()
+            with self._lock:
+                for term_id, term in rows:
+                    self._remember(kind, term, term_id)
+                    found[term_id] = term
+        return found
+
+
+feature_vocabulary = TermVocabulary()
+
+
+def upsert_content_features(session, content: Any, analysis: Any):
+    """
+    Write (or rewrite) the feature row for an analyzed bookmark.
+    Adds to the session only; the caller owns the commit.
+    """
+    from models import ContentFeatures
+
+    terms = extract_feature_terms(content, analysis)
+    tech_ids = feature_vocabulary.ids_for(session, TECH, terms['technologies'], create=True)
+    concept_ids = feature_vocabulary.ids_for(session, CONCEPT, terms['key_concepts'], create=True)
+    # Read before staging the row: extracted_text is deferred and loading it autoflushes
+    snippet = build_snippet(content)
+    source_hash = feature_source_hash(content, analysis)
+
+    row = session.get(ContentFeatures, content.id)
+    if row is None:
+        row = ContentFeatures(content_id=content.id)
+        session.add(row)
+
+    row.user_id = content.user_id
+    row.tech_ids = sorted(set(tech_ids.values()))
+    row.concept_ids = sorted(set(concept_ids.values()))
+    row.content_type = encode_content_type(terms['content_type'])
+    row.difficulty = encode_difficulty(terms['difficulty'])
+    row.quality_score = content.quality_score
+    row.relevance_score = analysis.relevance_score if analysis else 0
+    row.snippet = snippet
+    row.source_hash = source_hash
+    row.feature_version = FEATURE_VERSION
+    return row
+
+
+@dataclass
+class ContentFeatureColumns:
+    """Feature rows for a batch of bookmarks, held column-wise."""
+    content_ids: List[int] = field(default_factory=list)
+    tech_ids: List[frozenset] = field(default_factory=list)
+    concept_ids: List[Tuple[int, ...]] = field(default_factory=list)
+    content_type: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int16))
+    difficulty: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int16))
+    quality_score: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int32))
+    relevance_score: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int32))
+    snippets: List[str] = field(default_factory=list)
+    index: Dict[int, int] = field(default_factory=dict)
+
+    def __len__(self):
+        return len(self.content_ids)
+
+
+def load_feature_columns(session, content_ids: Iterable[int],
+                         source_hashes: Optional[Dict[int, str]] = None) -> ContentFeatureColumns:
+    """
+    Load current-version feature rows for content_ids in one column query.
+    With source_hashes ({content_id: feature_source_hash(...)} of the live rows), feature
+    rows derived from different inputs are dropped so callers normalize those rows afresh.
+    """
+    from models import ContentFeatures
+
+    content_ids = list(content_ids)
+    if not content_ids:
+        return ContentFeatureColumns()
+
+    rows = session.query(
+        ContentFeatures.content_id,
+        ContentFeatures.tech_ids,
+        ContentFeatures.concept_ids,
+        ContentFeatures.content_type,
+        ContentFeatures.difficulty,
+        ContentFeatures.quality_score,
+        ContentFeatures.relevance_score,
+        ContentFeatures.snippet,
+        ContentFeatures.source_hash,
+    ).filter(
+        ContentFeatures.content_id.in_(content_ids),
+        ContentFeatures.feature_version == FEATURE_VERSION
+    ).all()
+
+    if source_hashes is not None:
+        rows = [row for row in rows if row[-1] is not None and row[-1] == source_hashes.get(row[0])]
+    if not rows:
+        return ContentFeatureColumns()
+
+    ids, techs, concepts, types, levels, quality, relevance, snippets, _ = zip(*rows)
+    return ContentFeatureColumns(
+        content_ids=list(ids),
+        tech_ids=[frozenset(t or ()) for t in techs],
+        concept_ids=[tuple(c or ()) for c in concepts],
+        content_type=np.asarray(types, dtype=np.int16),
+        difficulty=np.asarray(levels, dtype=np.int16),
+        quality_score=np.asarray([q or 6 for q in quality], dtype=np.int32),
+        relevance_score=np.asarray([r or 0 for r in relevance], dtype=np.int32),
+        snippets=[s or '' for s in snippets],
+        index={content_id: i for i, content_id in enumerate(ids)},
+    )
+
+
+def decode_feature_terms(session, features: ContentFeatureColumns) -> Tuple[Dict[int, str], Dict[int, str]]:
+    """Decode every tech and concept id in a batch, with at most one query per kind."""
+    tech_ids = set().union(*features.tech_ids) if features.tech_ids else set()
+    concept_ids = {term_id for ids in features.concept_ids for term_id in ids}
+    return (
+        feature_vocabulary.terms_for(session, TECH, tech_ids),
+        feature_vocabulary.terms_for(session, CONCEPT, concept_ids),
+    )
+
+
+def feature_row_terms(features: ContentFeatureColumns, row: int, tech_terms: Dict[int, str],
+                      concept_terms: Dict[int, str]) -> Dict[str, Any]:
+    """The extract_feature_terms result for a stored row (terms from decode_feature_terms), plus its tech ids."""
+    tech_ids = features.tech_ids[row]
+    return {
+        'technologies': [tech_terms[i] for i in sorted(tech_ids) if i in tech_terms],
+        'tech_ids': tech_ids,
+        'key_concepts': [concept_terms[i] for i in features.concept_ids[row] if i in concept_terms],
+        'content_type': CONTENT_TYPES[features.content_type[row]],
+        'difficulty': DIFFICULTIES[features.difficulty[row]],
+    }
+
+
+def tech_id_overlap(content_tech_ids: frozenset, request_tech_ids: frozenset) -> int:
+    """Number of exact technology matches, by integer id."""
+    return len(content_tech_ids & request_tech_ids)
+
+
+def refresh_content_features(session, content: Any, analysis: Any) -> bool:
+    """
+    Upsert and commit the feature row after an analysis is stored. Failures are
+    logged and rolled back: requests fall back to per-row normalization.
+    """
+    try:
+        upsert_content_features(session, content, analysis)
+        session.commit()
+        return True
+    except Exception as e:
+        session.rollback()
+        logger.warning(f"Content feature refresh failed for content {getattr(content, 'id', None)}: {e}")
+        return False
@@ -29,6 +29,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from models import db, Project, User
 from utils.gemini_utils import GeminiAnalyzer
+from utils.tech_taxonomy import tech_taxonomy
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -106,23 +107,8 @@ class IntentAnalysisEngine:
             db.session.rollback()
     
     def _extract_technologies(self, text: str) -> List[str]:
-        """Extract technology mentions from text using regex patterns"""
-        # Common technology patterns
-        tech_patterns = [
-            r'\b(python|javascript|js|react|vue|angular|node\.js|express|django|flask|fastapi)\b',
-            r'\b(html|css|sql|mongodb|postgresql|mysql|redis|docker|kubernetes)\b',
-            r'\b(aws|azure|gcp|firebase|heroku|netlify|vercel)\b',
-            r'\b(machine learning|ml|ai|data science|analytics|visualization)\b',
-            r'\b(mobile|ios|android|flutter|react native|swift|kotlin)\b',
-            r'\b(api|rest|graphql|microservices|serverless|lambda)\b'
-        ]
-        
-        technologies = set()
-        for pattern in tech_patterns:
-            matches = re.findall(pattern, text.lower())
-            technologies.update(matches)
-        
-        return list(technologies)
+        """Extract technology mentions from text using the shared technology taxonomy"""
+        return tech_taxonomy.extract(text)
     
     def _analyze_with_llm(self, user_input: str, project_context: Optional[Dict] = None) -> Dict:
         """Use LLM to analyze user intent"""
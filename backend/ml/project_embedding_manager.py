@@ -103,10 +103,26 @@ class ProjectEmbeddingManager:
             logger.error(f" Failed to update all project embeddings: {e}")
             return {'total': 0, 'success': 0, 'failure': 1}
     
+    def get_candidate_rows(self, user_id: int) -> List:
+        """
+        Lightweight (id, title, url, tags, embedding) rows for a user's embedded
+        content; extracted_text is never loaded.
+        """
+        return self.db_session.query(
+            SavedContent.id,
+            SavedContent.title,
+            SavedContent.url,
+            SavedContent.tags,
+            SavedContent.embedding
+        ).filter(
+            SavedContent.user_id == user_id,
+            SavedContent.embedding.isnot(None)
+        ).all()
+
     def get_enhanced_recommendations(
         self, 
         project: Project, 
-        saved_content: List[SavedContent],
+        saved_content: Optional[List] = None,
         limit: int = 10,
         min_score: float = 0.3
     ) -> List[Dict]:
@@ -118,7 +134,8 @@ class ProjectEmbeddingManager:
         
         Args:
             project: Project to get recommendations for
-            saved_content: List of saved content to analyze
+            saved_content: Content to analyze (SavedContent objects or rows with id,
+                tags and embedding); defaults to get_candidate_rows(project.user_id)
             limit: Maximum number of recommendations to return
             min_score: Minimum score threshold
             
@@ -133,6 +150,18 @@ class ProjectEmbeddingManager:
                     logger.error(f"Failed to generate embeddings for project {project.title}")
                     return []
             
+            if saved_content is None:
+                saved_content = self.get_candidate_rows(project.user_id)
+
+            # One query for all analyses instead of two per content item
+            content_ids = [content.id for content in saved_content]
+            analyses = {
+                analysis.content_id: analysis
+                for analysis in self.db_session.query(ContentAnalysis).filter(
+                    ContentAnalysis.content_id.in_(content_ids)
+                )
+            } if content_ids else {}
+
             recommendations = []
             
             for content in saved_content:
@@ -144,7 +173,7 @@ class ProjectEmbeddingManager:
                 # Layer 1: Technology Overlap (Fast)
                 tech_score = self._calculate_tech_overlap(
                     project.technologies, 
-                    self._get_content_tech_tags(content)
+                    self._get_content_tech_tags(content, analyses.get(content.id))
                 )
                 
                 # Layer 2: Semantic Similarity (Medium)
@@ -154,7 +183,7 @@ class ProjectEmbeddingManager:
                 )
                 
                 # Layer 3: Content Analysis (Rich)
-                analysis_score = self._calculate_analysis_score(project, content)
+                analysis_score = self._calculate_analysis_score(project, analyses.get(content.id))
                 
                 # Combined Score (weighted average)
                 final_score = (
@@ -233,14 +262,9 @@ class ProjectEmbeddingManager:
             logger.warning(f"Failed to calculate semantic similarity: {e}")
             return 0.0
     
-    def _calculate_analysis_score(self, project: Project, content: SavedContent) -> float:
+    def _calculate_analysis_score(self, project: Project, analysis: Optional[ContentAnalysis]) -> float:
         """Calculate content analysis score based on difficulty, type, and concepts"""
         try:
-            # Get content analysis if available
-            analysis = self.db_session.query(ContentAnalysis).filter_by(
-                content_id=content.id
-            ).first()
-            
             if not analysis:
                 return 0.5  # Neutral score if no analysis available
             
@@ -286,14 +310,10 @@ class ProjectEmbeddingManager:
             logger.warning(f"Failed to calculate analysis score: {e}")
             return 0.5
     
-    def _get_content_tech_tags(self, content: SavedContent) -> str:
+    def _get_content_tech_tags(self, content, analysis: Optional[ContentAnalysis]) -> str:
         """Get technology tags for content from analysis or tags"""
         try:
             # Try to get from content analysis first
-            analysis = self.db_session.query(ContentAnalysis).filter_by(
-                content_id=content.id
-            ).first()
-            
             if analysis and analysis.technology_tags:
                 return analysis.technology_tags
             
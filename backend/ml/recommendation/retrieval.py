@@ -8,6 +8,11 @@ on saved_content.embedding to fetch the top-K most semantically similar candidat
 Populates RecommendationCandidate.embedding from the database row so Stage 2
 (RecommendationScorer) can compute vector similarity scores.
 
+Scan strategy:
+  utils.ann_strategy.prepare_ann_scan chooses per user between an exact scan of the
+  user's rows (small libraries) and a tuned iterative HNSW scan (large libraries),
+  since the global HNSW index loses recall under the user_id filter.
+
 Fallback behaviour:
   If the query_embedding is absent (None), or if the ANN query fails (e.g. pgvector
   not available), falls back to a plain ORM fetch ordered by recency. This means the
@@ -97,12 +102,17 @@ class CandidateRetriever:
         """
         from sqlalchemy import text
         from models import db
+        from utils.ann_strategy import prepare_ann_scan, ann_order_sql
 
         query_vector = query_embedding.vector.tolist()
         query_vector_str = f"[{','.join(str(v) for v in query_vector)}]"
 
-        # Fetch embedded candidates ordered by cosine distance (ANN via HNSW)
-        ann_sql = text("""
+        session = self.uow.session if hasattr(self.uow, 'session') else db.session
+        exact = prepare_ann_scan(session, user_id, k)
+        order_by = ann_order_sql("sc.embedding <=> CAST(:query_vector AS vector)", exact)
+
+        # Fetch embedded candidates ordered by cosine distance (exact or HNSW scan)
+        ann_sql = text(f"""
             SELECT
                 sc.id,
                 sc.title,
@@ -110,17 +120,15 @@ class CandidateRetriever:
                 sc.notes,
                 sc.extracted_text,
                 sc.embedding::text AS embedding_text,
-                ca.technologies
+                ca.technology_tags AS technologies
             FROM saved_content sc
-            LEFT JOIN content_analysis ca ON ca.saved_content_id = sc.id
+            LEFT JOIN content_analysis ca ON ca.content_id = sc.id
             WHERE sc.user_id = :user_id
               AND sc.embedding IS NOT NULL
-            ORDER BY sc.embedding <=> CAST(:query_vector AS vector)
+            ORDER BY {order_by}
             LIMIT :k
         """)
 
-        session = self.uow.session if hasattr(self.uow, 'session') else db.session
-
         rows = session.execute(ann_sql, {
             "user_id": user_id,
             "query_vector": query_vector_str,
@@ -159,6 +167,7 @@ class CandidateRetriever:
             extra={
                 "user_id": user_id,
                 "ann_results": len(ann_ids),
+                "exact_scan": exact,
                 "null_embedding_fallback": len(null_candidates),
                 "total": len(candidates),
             },
@@ -220,9 +229,9 @@ class CandidateRetriever:
             from sqlalchemy import text
             sql = text("""
                 SELECT sc.id, sc.title, sc.url, sc.notes, sc.extracted_text,
-                       ca.technologies
+                       ca.technology_tags AS technologies
                 FROM saved_content sc
-                LEFT JOIN content_analysis ca ON ca.saved_content_id = sc.id
+                LEFT JOIN content_analysis ca ON ca.content_id = sc.id
                 WHERE sc.user_id = :user_id
                   AND sc.embedding IS NULL
                 ORDER BY sc.id DESC
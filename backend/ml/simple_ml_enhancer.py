@@ -13,8 +13,12 @@ This is a DROP-IN enhancement that:
 Author: Fuze AI System
 """
 
+import io
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 
 logger = logging.getLogger(__name__)
@@ -22,6 +26,7 @@ logger = logging.getLogger(__name__)
 # Try to import ML features (optional)
 ML_AVAILABLE = False
 try:
+    from scipy import sparse
     from sklearn.feature_extraction.text import TfidfVectorizer
     from sklearn.metrics.pairwise import cosine_similarity
     ML_AVAILABLE = True
@@ -52,6 +57,231 @@ def calculate_tfidf_similarity(query_text: str, content_text: str) -> float:
         logger.debug(f"TF-IDF similarity calculation failed: {e}")
         return 0.0
 
+# Per-user corpus model settings
+TFIDF_CORPUS_MAX_FEATURES = 20000
+TFIDF_CORPUS_REFIT_RATIO = 0.2  # refit IDF once this share of rows was added incrementally
+TFIDF_CORPUS_TTL_SECONDS = 7 * 86400
+TFIDF_CORPUS_LOCAL_CAPACITY = 64
+
+
+def _doc_digest(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+class UserTfidfCorpus:
+    """
+    TF-IDF model fitted once over a user's whole library
+
+    Rows are L2-normalised, so scoring a query is one transform() and one
+    sparse dot product. Rows are keyed by content id plus a digest of the
+    text they were built from, which lets sync() add, replace and drop rows
+    without refitting until enough new rows have accumulated to move the IDF.
+    """
+
+    def __init__(self, vectorizer, matrix, ids: List[Any], digests: List[str],
+                 fitted_docs: int, added_since_fit: int = 0):
+        self.vectorizer = vectorizer
+        self.matrix = matrix
+        self.ids = ids
+        self.digests = digests
+        self.fitted_docs = fitted_docs
+        self.added_since_fit = added_since_fit
+
+    @classmethod
+    def fit(cls, docs: Dict[Any, str], digests: Dict[Any, str]) -> 'UserTfidfCorpus':
+        """Fit vocabulary and IDF over all documents"""
+        ids = list(docs.keys())
+        vectorizer = TfidfVectorizer(stop_words='english', max_features=TFIDF_CORPUS_MAX_FEATURES)
+        matrix = vectorizer.fit_transform([docs[i] for i in ids]).tocsr()
+        return cls(vectorizer, matrix, ids, [digests[i] for i in ids], fitted_docs=len(ids))
+
+    def sync(self, docs: Dict[Any, str], digests: Dict[Any, str]) -> Tuple['UserTfidfCorpus', bool]:
+        """
+        Bring the model in line with the current library
+
+        Returns:
+            (model, changed) - model may be a full refit when too many rows were added
+        """
+        keep = [row for row, (cid, digest) in enumerate(zip(self.ids, self.digests))
+                if digests.get(cid) == digest]
+        kept_ids = {self.ids[row] for row in keep}
+        added = [cid for cid in docs if cid not in kept_ids]
+
+        if not added and len(keep) == len(self.ids):
+            return self, False
+
+        if self.added_since_fit + len(added) > TFIDF_CORPUS_REFIT_RATIO * max(self.fitted_docs, 1):
+            return UserTfidfCorpus.fit(docs, digests), True
+
+        blocks = [self.matrix[keep]]
+        if added:
+            blocks.append(self.vectorizer.transform([docs[cid] for cid in added]))
+        matrix = sparse.vstack(blocks, format='csr')
+        return UserTfidfCorpus(
+            self.vectorizer,
+            matrix,
+            [self.ids[row] for row in keep] + added,
+            [self.digests[row] for row in keep] + [digests[cid] for cid in added],
+            fitted_docs=self.fitted_docs,
+            added_since_fit=self.added_since_fit + len(added)
+        ), True
+
+    def similarities(self, query_text: str) -> Dict[Any, float]:
+        """Cosine similarity of the query against every row"""
+        query_vec = self.vectorizer.transform([query_text])
+        scores = (self.matrix @ query_vec.T).toarray().ravel()
+        return {cid: float(score) for cid, score in zip(self.ids, scores)}
+
+    def to_bytes(self) -> bytes:
+        vocab_terms = np.array(list(self.vectorizer.vocabulary_.keys()))
+        vocab_index = np.array(list(self.vectorizer.vocabulary_.values()), dtype=np.int64)
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            data=self.matrix.data,
+            indices=self.matrix.indices,
+            indptr=self.matrix.indptr,
+            shape=np.array(self.matrix.shape, dtype=np.int64),
+            ids=np.array([str(cid) for cid in self.ids]),
+            digests=np.array(self.digests),
+            vocab_terms=vocab_terms,
+            vocab_index=vocab_index,
+            idf=self.vectorizer.idf_,
+            counters=np.array([self.fitted_docs, self.added_since_fit], dtype=np.int64)
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> 'UserTfidfCorpus':
+        with np.load(io.BytesIO(payload), allow_pickle=False) as arrays:
+            vocabulary = {str(term): int(idx) for term, idx in zip(arrays['vocab_terms'], arrays['vocab_index'])}
+            vectorizer = TfidfVectorizer(stop_words='english', vocabulary=vocabulary)
+            vectorizer.idf_ = arrays['idf']
+            matrix = sparse.csr_matrix(
+                (arrays['data'], arrays['indices'], arrays['indptr']),
+                shape=tuple(arrays['shape'])
+            )
+            fitted_docs, added_since_fit = (int(v) for v in arrays['counters'])
+            return cls(
+                vectorizer,
+                matrix,
+                [int(cid) if cid.isdigit() else cid for cid in (str(c) for c in arrays['ids'])],
+                [str(d) for d in arrays['digests']],
+                fitted_docs=fitted_docs,
+                added_since_fit=added_since_fit
+            )
+
+
+_corpus_cache: 'OrderedDict[int, Tuple[int, UserTfidfCorpus]]' = OrderedDict()
+_corpus_lock = threading.Lock()
+
+
+def _corpus_version_key(user_id: int) -> str:
+    return f"fuze:tfidf:version:{user_id}"
+
+
+def _corpus_key(user_id: int, version: int) -> str:
+    return f"fuze:tfidf:{user_id}:{version}"
+
+
+def _corpus_version(user_id: int) -> Optional[int]:
+    """Library version bumped by every bookmark write; None when Redis is unavailable"""
+    try:
+        from utils.redis_utils import redis_cache
+        if redis_cache.connected:
+            return int(redis_cache.redis_client.get(_corpus_version_key(user_id)) or 0)
+    except Exception as e:
+        logger.debug(f"TF-IDF corpus version lookup failed for user {user_id}: {e}")
+    return None
+
+
+def _load_corpus(user_id: int, version: Optional[int]) -> Tuple[Optional[UserTfidfCorpus], bool]:
+    """
+    Returns:
+        (corpus, stale) - a stale corpus predates the current version and only serves as
+        the base for an incremental sync, whose result is then persisted under the new key
+    """
+    with _corpus_lock:
+        cached = _corpus_cache.get(user_id)
+        if cached is not None and (version is None or cached[0] == version):
+            _corpus_cache.move_to_end(user_id)
+            return cached[1], False
+
+    if version is not None:
+        try:
+            from utils.redis_utils import redis_cache
+            payload = redis_cache.redis_client.get(_corpus_key(user_id, version))
+            if isinstance(payload, bytes) and payload:
+                return UserTfidfCorpus.from_bytes(payload), False
+        except Exception as e:
+            logger.debug(f"TF-IDF corpus load failed for user {user_id}: {e}")
+    return (cached[1], True) if cached is not None else (None, False)
+
+
+def _store_corpus(user_id: int, version: Optional[int], corpus: UserTfidfCorpus, persist: bool):
+    with _corpus_lock:
+        _corpus_cache[user_id] = (version or 0, corpus)
+        _corpus_cache.move_to_end(user_id)
+        while len(_corpus_cache) > TFIDF_CORPUS_LOCAL_CAPACITY:
+            _corpus_cache.popitem(last=False)
+
+    if not persist or version is None:
+        return
+    try:
+        from utils.redis_utils import redis_cache
+        redis_cache.redis_client.setex(_corpus_key(user_id, version), TFIDF_CORPUS_TTL_SECONDS, corpus.to_bytes())
+    except Exception as e:
+        logger.debug(f"TF-IDF corpus persist failed for user {user_id}: {e}")
+
+
+def invalidate_user_tfidf_corpus(user_id: int):
+    """
+    Called after the user's bookmarks are saved, updated or deleted. Bumping the shared
+    version retires every process's copy at once; the old blob expires on its own TTL.
+    """
+    try:
+        from utils.redis_utils import redis_cache
+        if redis_cache.connected:
+            pipe = redis_cache.redis_client.pipeline()
+            pipe.incr(_corpus_version_key(user_id))
+            pipe.expire(_corpus_version_key(user_id), TFIDF_CORPUS_TTL_SECONDS)
+            pipe.execute()
+            return
+    except Exception as e:
+        logger.debug(f"TF-IDF corpus invalidation failed for user {user_id}: {e}")
+    with _corpus_lock:
+        _corpus_cache.pop(user_id, None)
+
+
+def get_user_tfidf_similarities(user_id: int, docs: Dict[Any, str], query_text: str) -> Dict[Any, float]:
+    """
+    Score a query against the user's corpus model
+
+    Args:
+        user_id: Owner of the library
+        docs: Content id -> text for every candidate in the library
+        query_text: User query text
+
+    Returns:
+        Content id -> similarity (0.0-1.0); empty if ML is unavailable
+    """
+    if not ML_AVAILABLE or not docs:
+        return {}
+
+    try:
+        digests = {cid: _doc_digest(text) for cid, text in docs.items()}
+        version = _corpus_version(user_id)
+        corpus, stale = _load_corpus(user_id, version)
+        if corpus is None:
+            corpus, changed = UserTfidfCorpus.fit(docs, digests), True
+        else:
+            corpus, changed = corpus.sync(docs, digests)
+        _store_corpus(user_id, version, corpus, persist=changed or stale)
+        return corpus.similarities(query_text)
+    except Exception as e:
+        logger.debug(f"TF-IDF corpus scoring failed for user {user_id}: {e}")
+        return {}
+
 class SimpleMLEnhancer:
     """
     Simple ML enhancement that works with your existing system
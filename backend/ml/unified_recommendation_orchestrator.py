@@ -70,6 +70,13 @@ except ImportError:
     UNIVERSAL_MATCHER_AVAILABLE = False
     logger.warning("ΓÜá∩╕Å UniversalSemanticMatcher not available, using fallback matching")
 
+from utils.tech_taxonomy import tech_taxonomy
+from ml.content_features import (
+    TECH, SNIPPET_CHARS, ContentFeatureColumns,
+    decode_feature_terms, extract_feature_terms, feature_row_terms, feature_source_hash,
+    feature_vocabulary, load_feature_columns, tech_id_overlap
+)
+
 # Import new RecommendationPipeline and ShadowEvaluator
 try:
     from ml.recommendation.pipeline import RecommendationPipeline
@@ -285,58 +292,12 @@ class UnifiedDataLayer:
     def normalize_content_data(self, content: Any, analysis: Optional[Any] = None) -> Dict[str, Any]:
         """Normalize content data to unified format"""
         try:
-            # Extract technologies from multiple sources
-            technologies = []
+            terms = extract_feature_terms(content, analysis)
+            technologies = terms['technologies']
+            key_concepts = terms['key_concepts']
+            content_type = terms['content_type']
+            difficulty = terms['difficulty']
 
-            # From analysis (PRIMARY SOURCE - ContentAnalysis has the technologies)
-            if analysis:
-                # From ContentAnalysis.technology_tags (comma-separated)
-                if analysis.technology_tags:
-                    technologies.extend([tech.strip() for tech in analysis.technology_tags.split(',') if tech.strip()])
-
-                # From ContentAnalysis.analysis_data JSON (highest priority)
-                if analysis.analysis_data:
-                    analysis_techs = analysis.analysis_data.get('technologies', [])
-                    if isinstance(analysis_techs, list):
-                        technologies.extend(analysis_techs)
-                    elif isinstance(analysis_techs, str):
-                        technologies.extend([tech.strip() for tech in analysis_techs.split(',') if tech.strip()])
-
-            # From SavedContent.tags (fallback if no analysis)
-            if content.tags:
-                technologies.extend([tech.strip() for tech in content.tags.split(',') if tech.strip()])
-            
-            # Remove duplicates and normalize
-            technologies = list(set([tech.lower().strip() for tech in technologies if tech.strip()]))
-            
-            # Extract key concepts from multiple sources
-            key_concepts = []
-            if analysis:
-                if analysis.key_concepts:
-                    key_concepts = [concept.strip() for concept in analysis.key_concepts.split(',') if concept.strip()]
-                # Also get from analysis_data JSON
-                if analysis.analysis_data:
-                    json_concepts = analysis.analysis_data.get('key_concepts', [])
-                    if isinstance(json_concepts, list):
-                        key_concepts.extend(json_concepts)
-                    key_concepts = list(set(key_concepts))  # Remove duplicates
-            
-            # Determine content type (prefer analysis_data JSON)
-            content_type = 'article'  # default
-            if analysis:
-                if analysis.analysis_data and 'content_type' in analysis.analysis_data:
-                    content_type = analysis.analysis_data.get('content_type', analysis.content_type or 'article')
-                else:
-                    content_type = analysis.content_type or 'article'
-            
-            # Determine difficulty (prefer analysis_data JSON)
-            difficulty = 'intermediate'  # default
-            if analysis:
-                if analysis.analysis_data and 'difficulty' in analysis.analysis_data:
-                    difficulty = analysis.analysis_data.get('difficulty', analysis.difficulty_level or 'intermediate')
-                else:
-                    difficulty = analysis.difficulty_level or 'intermediate'
-            
             # Create unified format
             unified_data = {
                 'id': content.id,
@@ -378,6 +339,31 @@ class UnifiedDataLayer:
                 'relevance_score': 0
             }
 
+    def content_from_features(self, content: Any, analysis: Optional[Any], features: ContentFeatureColumns,
+                              row: int, tech_terms: Dict[int, str], concept_terms: Dict[int, str]) -> Dict[str, Any]:
+        """Build the unified content dict from a precomputed feature row (terms from decode_feature_terms)"""
+        terms = feature_row_terms(features, row, tech_terms, concept_terms)
+
+        return {
+            'id': content.id,
+            'title': content.title,
+            'url': content.url,
+            'extracted_text': content.extracted_text or '',
+            'snippet': features.snippets[row],
+            'notes': content.notes or '',
+            'technologies': terms['technologies'],
+            'tech_ids': terms['tech_ids'],
+            'key_concepts': terms['key_concepts'],
+            'content_type': terms['content_type'],
+            'difficulty': terms['difficulty'],
+            'quality_score': int(features.quality_score[row]),
+            'saved_at': content.saved_at,
+            'tags': content.tags or '',
+            'analysis_data': analysis.analysis_data if analysis else {},
+            'embedding': content.embedding,
+            'relevance_score': int(features.relevance_score[row])
+        }
+
     def get_candidate_content(self, user_id: int, request: UnifiedRecommendationRequest) -> List[Dict[str, Any]]:
         """Get candidate content in unified format"""
         try:
@@ -396,10 +382,12 @@ class UnifiedDataLayer:
         """Get content from database using provided session - OPTIMIZED FOR PERFORMANCE"""
         try:
             from models import SavedContent, ContentAnalysis
+            from repositories.projections import WITH_TEXT, WITH_EMBEDDING
             
             # OPTIMIZATION 1: Use more efficient query with proper indexing
-            # Build query with optimized joins and filtering
-            query = session.query(SavedContent, ContentAnalysis).outerjoin(
+            # Build query with optimized joins and filtering; the engines read the
+            # full text and embedding, so load the deferred columns in this query
+            query = session.query(SavedContent, ContentAnalysis).options(WITH_TEXT, WITH_EMBEDDING).outerjoin(
                 ContentAnalysis, SavedContent.id == ContentAnalysis.content_id
             )
             
@@ -450,9 +438,24 @@ class UnifiedDataLayer:
                 request_techs = []
             request_text = f"{request.title} {request.description}".lower()
             
+            # Precomputed feature rows (written at analysis time) skip per-row normalization;
+            # rows whose inputs changed since are normalized afresh
+            try:
+                source_hashes = {c.id: feature_source_hash(c, a) for c, a in user_content if a is not None}
+                features = load_feature_columns(session, source_hashes.keys(), source_hashes)
+                tech_terms, concept_terms = decode_feature_terms(session, features)
+            except Exception as e:
+                logger.warning(f"Content feature store unavailable, normalizing per row: {e}")
+                features = ContentFeatureColumns()
+            logger.info(f"Using precomputed features for {len(features)}/{len(user_content)} items")
+
             for content, analysis in user_content:
-                # Use the normalize_content_data method to ensure all required fields
-                normalized_content = self.normalize_content_data(content, analysis)
+                row = features.index.get(content.id)
+                if row is not None:
+                    normalized_content = self.content_from_features(content, analysis, features, row, tech_terms, concept_terms)
+                else:
+                    # Use the normalize_content_data method to ensure all required fields
+                    normalized_content = self.normalize_content_data(content, analysis)
 
                 # NOTE: Multi-topic splitting happens at orchestrator level, not data layer
                 # Just add the normalized content directly to the list
@@ -764,19 +767,30 @@ class FastSemanticEngine:
         start_time = time.time()
         
         try:
-            # If no content_list provided, fetch all relevant content from DB
+            # If no content_list provided, fetch the user's content from DB as a
+            # projection: this engine only scores title, a text prefix and tags
             if not content_list:
                 from models import SavedContent, ContentAnalysis
-                from sqlalchemy.orm import joinedload
-                from flask import current_app
-                # Use the current app context if available
+                from repositories.projections import text_prefix
                 try:
                     db_session = self.data_layer.get_db_session()
                     if not db_session:
                         logger.error("Could not get database session")
                         return []
-                    query = db_session.query(SavedContent).options(joinedload(SavedContent.analyses))
+                    query = db_session.query(
+                        SavedContent.id,
+                        SavedContent.title,
+                        SavedContent.url,
+                        SavedContent.notes,
+                        SavedContent.tags,
+                        SavedContent.quality_score,
+                        SavedContent.saved_at,
+                        SavedContent.content_hash,
+                        text_prefix(SNIPPET_CHARS),
+                        ContentAnalysis
+                    ).outerjoin(ContentAnalysis, SavedContent.id == ContentAnalysis.content_id)
                     query = query.filter(
+                        SavedContent.user_id == request.user_id,
                         SavedContent.quality_score >= 1,  # Lower threshold to include more content
                         SavedContent.extracted_text.isnot(None),
                         SavedContent.extracted_text != ''
@@ -784,25 +798,42 @@ class FastSemanticEngine:
                     # Optionally, filter out test/generic content
                     query = query.filter(~SavedContent.title.ilike('%test%'))
                     # NO LIMIT - Use ALL user content for best recommendations
-                    content_objs = query.order_by(SavedContent.quality_score.desc(), SavedContent.saved_at.desc()).all()
+                    rows = query.order_by(SavedContent.quality_score.desc(), SavedContent.saved_at.desc()).all()
+
+                    # Current feature rows supply normalized terms and tech ids; the rest are parsed here
+                    try:
+                        source_hashes = {
+                            row.id: feature_source_hash(row, row.ContentAnalysis)
+                            for row in rows if row.ContentAnalysis is not None
+                        }
+                        features = load_feature_columns(db_session, source_hashes.keys(), source_hashes)
+                        tech_terms, concept_terms = decode_feature_terms(db_session, features)
+                    except Exception as e:
+                        logger.warning(f"[FastSemanticEngine] Content feature store unavailable: {e}")
+                        features = ContentFeatureColumns()
+
                     content_list = []
-                    for content in content_objs:
-                        # Use normalize_content_data if available
-                        try:
-                            normalized = self.data_layer.normalize_content_data(content)
-                        except Exception:
-                            normalized = {
-                                'id': content.id,
-                                'title': content.title,
-                                'url': content.url,
-                                'extracted_text': content.extracted_text,
-                                'quality_score': content.quality_score,
-                                'technologies': getattr(content, 'technologies', []),
-                                'content_type': getattr(content, 'content_type', 'article'),
-                                'difficulty': getattr(content, 'difficulty', 'intermediate'),
-                                'key_concepts': [],
-                            }
-                        content_list.append(normalized)
+                    for row in rows:
+                        feature_row = features.index.get(row.id)
+                        if feature_row is not None:
+                            terms = feature_row_terms(features, feature_row, tech_terms, concept_terms)
+                        else:
+                            terms = extract_feature_terms(row, row.ContentAnalysis)
+                        content_list.append({
+                            'id': row.id,
+                            'title': row.title,
+                            'url': row.url,
+                            'extracted_text': row.extracted_text or '',
+                            'notes': row.notes or '',
+                            'technologies': terms['technologies'],
+                            'tech_ids': terms.get('tech_ids'),
+                            'key_concepts': terms['key_concepts'],
+                            'content_type': terms['content_type'],
+                            'difficulty': terms['difficulty'],
+                            'quality_score': row.quality_score or 6,
+                            'saved_at': row.saved_at,
+                            'tags': row.tags or '',
+                        })
                     logger.info(f"[FastSemanticEngine] Fetched {len(content_list)} candidates from DB.")
                 except Exception as e:
                     logger.error(f"[FastSemanticEngine] Error fetching content from DB: {e}")
@@ -881,7 +912,7 @@ class FastSemanticEngine:
                 
                 # OPTIMIZATION: Use shorter text for faster processing
                 title = content.get('title', '')[:100]  # Limit title length
-                extracted_text = content.get('extracted_text', '')[:200]  # Limit text length
+                extracted_text = (content.get('snippet') or content.get('extracted_text', ''))[:200]  # Limit text length
                 content_text = f"{title} {extracted_text} {' '.join(technologies[:5])}"  # Limit technologies
                 content_texts.append(content_text)
             
@@ -896,6 +927,7 @@ class FastSemanticEngine:
                 request_techs = [tech.strip().lower() for tech in request.technologies if tech.strip()]
             else:
                 request_techs = []
+            request_tech_ids = feature_vocabulary.cached_ids(TECH, request_techs)
             
             for i, content in enumerate(content_list):
                 similarity = similarities[i]
@@ -915,10 +947,14 @@ class FastSemanticEngine:
                         )
                     except Exception as e:
                         logger.debug(f"Universal matcher tech overlap failed, using fallback: {e}")
-                        tech_overlap = self._calculate_technology_overlap(content_techs, request_techs)
+                        tech_overlap = self._calculate_technology_overlap(
+                            content_techs, request_techs, content.get('tech_ids'), request_tech_ids
+                        )
                 else:
                     # Fallback to standard technology overlap calculation
-                    tech_overlap = self._calculate_technology_overlap(content_techs, request_techs)
+                    tech_overlap = self._calculate_technology_overlap(
+                        content_techs, request_techs, content.get('tech_ids'), request_tech_ids
+                    )
                 
                 # OPTIMIZATION: Simplified scoring with fewer calculations
                 # Technology overlap (50%) + Semantic similarity (40%) + Quality (10%)
@@ -1052,21 +1088,28 @@ class FastSemanticEngine:
             self._update_performance(start_time, False)
             return []
     
-    def _calculate_technology_overlap(self, content_techs: List[str], request_techs: List[str]) -> float:
+    def _calculate_technology_overlap(self, content_techs: List[str], request_techs: List[str],
+                                      content_tech_ids: Optional[frozenset] = None,
+                                      request_tech_ids: Optional[frozenset] = None) -> float:
         """Calculate technology overlap score with improved accuracy"""
         if not content_techs or not request_techs:
             return 0.0
         
-        # Normalize to lowercase and clean
-        content_set = set([tech.lower().strip() for tech in content_techs if tech.strip()])
-        request_set = set([tech.lower().strip() for tech in request_techs if tech.strip()])
+        if content_tech_ids is not None and request_tech_ids is not None:
+            # Feature-store terms and the caller's request terms are already normalized;
+            # exact matches compare integer ids
+            content_set = set(content_techs)
+            request_set = set(request_techs)
+            exact_matches = tech_id_overlap(content_tech_ids, request_tech_ids)
+        else:
+            # Normalize to lowercase and clean
+            content_set = set([tech.lower().strip() for tech in content_techs if tech.strip()])
+            request_set = set([tech.lower().strip() for tech in request_techs if tech.strip()])
+            exact_matches = len(content_set.intersection(request_set))
         
         if not content_set or not request_set:
             return 0.0
         
-        # Calculate exact matches
-        exact_matches = len(content_set.intersection(request_set))
-        
         # Calculate partial matches (one technology contains another)
         partial_matches = 0
         for req_tech in request_set:
@@ -1377,7 +1420,7 @@ class ContextAwareEngine:
             # Calculate ML (TF-IDF) scores for all content
             ml_scores = {}
             try:
-                from simple_ml_enhancer import calculate_tfidf_similarity
+                from ml.simple_ml_enhancer import get_user_tfidf_similarities
                 # ML scoring with full context - captures semantic relationships
                 # Use same semantic expansion as embedding query for consistency
                 base_query = f"{context['title']} {context['description']} {' '.join(context.get('technologies', []))} {context.get('user_interests', '')}"
@@ -1393,11 +1436,13 @@ class ContextAwareEngine:
                     semantic_expansions.extend(['database design', 'data storage', 'data management', 'SQL queries'])
                 
                 query_text = f"{base_query} {' '.join(semantic_expansions)}"
-                for content in content_list:
-                    # Include full content context for better semantic matching
-                    content_text = f"{content['title']} {content.get('extracted_text', '')[:500]} {' '.join(content.get('technologies', []))}"
-                    ml_score = calculate_tfidf_similarity(query_text, content_text)
-                    ml_scores[content['id']] = ml_score
+                # Include full content context for better semantic matching
+                content_texts = {
+                    content['id']: f"{content['title']} {content.get('extracted_text', '')[:500]} {' '.join(content.get('technologies', []))}"
+                    for content in content_list
+                }
+                # One corpus model per user: only the query is transformed per request
+                ml_scores = get_user_tfidf_similarities(request.user_id, content_texts, query_text)
                 logger.info(f"ML (TF-IDF) scores calculated for {len(ml_scores)} items")
             except Exception as e:
                 logger.debug(f"ML scoring skipped: {e}")
@@ -1864,9 +1909,9 @@ class ContextAwareEngine:
         if not context_techs:
             return 0.5
         
-        # Normalize to lowercase for case-insensitive matching
-        content_techs_lower = [tech.lower().strip() for tech in content_techs if tech.strip()]
-        context_techs_lower = [tech.lower().strip() for tech in context_techs if tech.strip()]
+        # Normalize to canonical taxonomy names ('JS' == 'javascript'), lowercase otherwise
+        content_techs_lower = [tech_taxonomy.canonicalize(tech) or tech.lower().strip() for tech in content_techs if tech.strip()]
+        context_techs_lower = [tech_taxonomy.canonicalize(tech) or tech.lower().strip() for tech in context_techs if tech.strip()]
         
         # Use batch semantic similarity for technology matching if embedding model is available
         # This is more efficient than calling similarity for each pair individually
@@ -3048,36 +3093,11 @@ class UnifiedRecommendationOrchestrator:
 
     def _group_technologies_by_category(self, technologies: List[str]) -> Dict[str, List[str]]:
         """Group technologies by learning categories"""
-        # Define technology categories
-        categories = {
-            'frontend': ['react', 'vue', 'angular', 'javascript', 'js', 'typescript', 'ts', 'html', 'css', 'sass', 'scss', 'tailwind', 'bootstrap'],
-            'backend': ['node.js', 'node', 'express', 'python', 'django', 'flask', 'fastapi', 'java', 'spring', 'php', 'laravel', 'ruby', 'rails'],
-            'database': ['postgresql', 'postgres', 'mysql', 'mongodb', 'mongo', 'redis', 'sqlite', 'sql', 'oracle'],
-            'cloud': ['aws', 'azure', 'gcp', 'google cloud', 'docker', 'kubernetes', 'k8s', 'terraform'],
-            'mobile': ['react native', 'flutter', 'ios', 'android', 'swift', 'kotlin'],
-            'ml_ai': ['tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy', 'machine learning', 'ai', 'deep learning'],
-            'devops': ['docker', 'kubernetes', 'jenkins', 'github actions', 'ci/cd', 'linux', 'bash']
-        }
-
         grouped = {}
 
         for tech in technologies:
-            tech_lower = tech.lower().strip()
-            found_category = None
-
-            # Find which category this technology belongs to
-            for category, category_techs in categories.items():
-                if tech_lower in category_techs:
-                    found_category = category
-                    break
-
-            # If no category found, put in 'other'
-            if not found_category:
-                found_category = 'other'
-
-            if found_category not in grouped:
-                grouped[found_category] = []
-            grouped[found_category].append(tech)
+            category = tech_taxonomy.category_of(tech) or 'other'
+            grouped.setdefault(category, []).append(tech)
 
         return grouped
 
@@ -9,6 +9,7 @@ import difflib
 from typing import List, Dict, Tuple, Optional
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
+from utils.tech_taxonomy import tech_taxonomy
 
 class UniversalSemanticMatcher:
     """Universal semantic matcher that handles all variations"""
@@ -245,23 +246,7 @@ class UniversalSemanticMatcher:
     def extract_technologies(self, text: str) -> List[str]:
         """Extract technologies from text"""
         try:
-            # Simple technology extraction
-            tech_keywords = [
-                'python', 'javascript', 'react', 'node', 'java', 'c++', 'c#',
-                'php', 'ruby', 'go', 'rust', 'swift', 'kotlin', 'dart',
-                'sql', 'mongodb', 'redis', 'docker', 'kubernetes', 'aws',
-                'azure', 'gcp', 'git', 'github', 'gitlab'
-            ]
-            
-            found_techs = []
-            text_lower = text.lower()
-            
-            for tech in tech_keywords:
-                if tech in text_lower:
-                    found_techs.append(tech)
-            
-            return found_techs
-            
+            return tech_taxonomy.extract(text)
         except Exception:
             return []
     
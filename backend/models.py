@@ -1,8 +1,8 @@
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Text, ForeignKey, func, UniqueConstraint, JSON, Boolean
-from sqlalchemy.dialects.postgresql import TEXT, JSONB
+from sqlalchemy import Column, Integer, BigInteger, SmallInteger, String, Date, DateTime, Text, ForeignKey, func, UniqueConstraint, JSON, Boolean
+from sqlalchemy.dialects.postgresql import TEXT, JSONB, ARRAY
 from pgvector.sqlalchemy import Vector
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 
 # Initialize SQLAlchemy with enhanced configuration
 db = SQLAlchemy()
@@ -362,8 +362,10 @@ class SavedContent(Base):
     title = Column(String(200), nullable=False)
     source = Column(String(50))
     saved_at = Column(DateTime, default=func.now(), index=True)  # Indexed for sorting
-    extracted_text = Column(TEXT)
-    embedding = Column(Vector(384))
+    # Heavy columns are deferred: list/ranking paths select projections
+    # (repositories/projections.py) and readers opt in with undefer()
+    extracted_text = deferred(Column(TEXT))
+    embedding = deferred(Column(Vector(384)))
     tags = Column(TEXT)
     category = Column(String(100))
     notes = Column(TEXT)
@@ -389,6 +391,9 @@ class SavedContent(Base):
     scrapling_version = Column(String(20), nullable=True)
     extractor_version = Column(String(20), nullable=True)
 
+    # search_vector (generated tsvector + GIN index) exists on PostgreSQL only and is
+    # intentionally unmapped; see migration 0012 and BookmarkRepository.full_text_search
+
     # Relationship to rich JSON metadata
     rich_metadata = relationship('BookmarkMetadata', backref='bookmark', uselist=False, cascade='all, delete-orphan')
 
@@ -435,6 +440,59 @@ class ContentAnalysis(Base):
         UniqueConstraint('content_id', name='_content_analysis_unique'),
     )
 
+class FeatureTerm(Base):
+    """Global vocabulary mapping canonical technology / concept strings to stable integer ids."""
+    __tablename__ = 'feature_terms'
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(20), nullable=False)  # 'tech' or 'concept'
+    term = Column(String(100), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('kind', 'term', name='_feature_term_unique'),
+    )
+
+class ContentFeatures(Base):
+    """Materialized per-bookmark ranking features, written when analysis completes."""
+    __tablename__ = 'content_features'
+    content_id = Column(Integer, ForeignKey('saved_content.id', ondelete='CASCADE'), primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    tech_ids = Column(JSON().with_variant(ARRAY(Integer), 'postgresql'), nullable=False)
+    concept_ids = Column(JSON().with_variant(ARRAY(Integer), 'postgresql'), nullable=False)
+    content_type = Column(SmallInteger, nullable=False)  # ml.content_features.CONTENT_TYPES index
+    difficulty = Column(SmallInteger, nullable=False)  # ml.content_features.DIFFICULTIES index
+    quality_score = Column(Integer)
+    relevance_score = Column(Integer)
+    snippet = Column(TEXT)
+    source_hash = Column(String(40))  # ml.content_features.feature_source_hash of the inputs
+    feature_version = Column(SmallInteger, nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
+
+class UserStats(Base):
+    """Per-user dashboard counters, kept current in the writing transaction (services/user_stats_service)."""
+    __tablename__ = 'user_stats'
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    bookmark_count = Column(Integer, nullable=False, default=0, server_default='0')
+    saved_total = Column(Integer, nullable=False, default=0, server_default='0')  # Never decremented: drives "saves this week"
+    content_count = Column(Integer, nullable=False, default=0, server_default='0')  # extracted_text IS NOT NULL
+    analyzed_count = Column(Integer, nullable=False, default=0, server_default='0')  # analysis_status = SUCCESS
+    quality_count = Column(Integer, nullable=False, default=0, server_default='0')  # ...and quality_score >= 5
+    scraping_count = Column(Integer, nullable=False, default=0, server_default='0')
+    embedding_count = Column(Integer, nullable=False, default=0, server_default='0')
+    analyzing_count = Column(Integer, nullable=False, default=0, server_default='0')
+    project_count = Column(Integer, nullable=False, default=0, server_default='0')
+    reconciled_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
+
+class UserStatsDaily(Base):
+    """Daily copy of the UserStats counters used for week- and month-over-month comparisons."""
+    __tablename__ = 'user_stats_daily'
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    day = Column(Date, primary_key=True)
+    bookmark_count = Column(Integer, nullable=False)
+    saved_total = Column(Integer, nullable=False)
+    quality_count = Column(Integer, nullable=False)
+    project_count = Column(Integer, nullable=False)
+
 class Feedback(Base):
     __tablename__ = 'feedback'
     id = Column(Integer, primary_key=True)
@@ -512,7 +570,7 @@ class TokenFamily(Base):
 class BookmarkEvent(Base):
     """Stores immutable audit and stage timeline events for pipeline execution."""
     __tablename__ = 'bookmark_events'
-    id = Column(BigInteger, primary_key=True)
+    id = Column(BigInteger().with_variant(Integer, 'sqlite'), primary_key=True)  # SQLite only autoincrements INTEGER keys
     event_id = Column(String(64), unique=True, nullable=False, index=True)
     bookmark_id = Column(BigInteger, ForeignKey('saved_content.id', ondelete='CASCADE'), nullable=False, index=True)
     user_id = Column(BigInteger, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
@@ -1,8 +1,12 @@
 from typing import Optional, List
-from sqlalchemy import func
+from sqlalchemy import func, literal_column
+from sqlalchemy.engine import Row
 from models import SavedContent, db
+from repositories.projections import BOOKMARK_REF_COLUMNS, BOOKMARK_CARD_COLUMNS, WITH_TEXT, WITH_EMBEDDING
 from utils.query_sanitizer import sanitize_like_query
 
+FULLTEXT_CONFIG = 'english'
+
 
 class BookmarkRepository:
     """Core repository for Bookmark/SavedContent aggregate."""
@@ -69,9 +73,28 @@ class BookmarkRepository:
             )
         ).order_by(SavedContent.saved_at.desc()).limit(limit).all()
 
+    def full_text_search(self, user_id: int, query: str, limit: int = 10) -> Optional[List[Row]]:
+        """
+        Ranked full-text search over the generated saved_content.search_vector column
+        (title A, notes B, body C; GIN-indexed, PostgreSQL only - see migration 0012).
+        Returns BOOKMARK_CARD_COLUMNS rows, or None when the database cannot serve it
+        so callers fall back to ILIKE.
+        """
+        if self._session.get_bind().dialect.name != 'postgresql':
+            return None
+        tsquery = func.websearch_to_tsquery(FULLTEXT_CONFIG, query)
+        search_vector = literal_column('saved_content.search_vector')
+        return self._session.query(*BOOKMARK_CARD_COLUMNS).filter(
+            SavedContent.user_id == user_id,
+            search_vector.op('@@')(tsquery)
+        ).order_by(
+            func.ts_rank_cd(search_vector, tsquery).desc(),
+            SavedContent.saved_at.desc()
+        ).limit(limit).all()
+
     def list_bookmarks(self, user_id: int, search: str = None, category: str = None, page: int = 1, per_page: int = 10):
-        """List bookmarks with pagination and filtering without unnecessary joins."""
-        query = self._session.query(SavedContent).filter_by(user_id=user_id)
+        """List bookmarks with pagination and filtering; items are BOOKMARK_CARD_COLUMNS rows."""
+        query = self._session.query(*BOOKMARK_CARD_COLUMNS).filter(SavedContent.user_id == user_id)
 
         if search:
             safe_search = sanitize_like_query(search)
@@ -102,9 +125,17 @@ class BookmarkRepository:
         """Fetch all bookmarks for a user ordered by saved_at desc"""
         return self._session.query(SavedContent).filter_by(user_id=user_id).order_by(SavedContent.saved_at.desc()).all()
 
+    def get_bookmark_refs(self, user_id: int) -> List[Row]:
+        """(id, url, title) rows for all of a user's bookmarks, e.g. for import dedup."""
+        return self._session.query(*BOOKMARK_REF_COLUMNS).filter(
+            SavedContent.user_id == user_id
+        ).order_by(SavedContent.saved_at.desc()).all()
+
     def get_user_bookmarks(self, user_id: int, limit: int = 10) -> List[SavedContent]:
-        """Fetch user bookmarks ordered by saved_at desc with limit."""
-        return self._session.query(SavedContent).filter_by(user_id=user_id).order_by(SavedContent.saved_at.desc()).limit(limit).all()
+        """Fetch user bookmarks ordered by saved_at desc with limit, text and embedding loaded for ranking."""
+        return self._session.query(SavedContent).options(WITH_TEXT, WITH_EMBEDDING).filter_by(
+            user_id=user_id
+        ).order_by(SavedContent.saved_at.desc()).limit(limit).all()
 
     # --- Bookmark Stats ---
 
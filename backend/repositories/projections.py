@@ -0,0 +1,45 @@
+"""
+Column-subset projections of SavedContent for list and ranking paths.
+
+extracted_text (often tens of KB) and the 384-dim embedding are deferred on the
+SavedContent mapper, so entity queries no longer pull them. Paths that only render
+or rank on metadata select one of the column tuples below and get lightweight Row
+tuples back; paths that do read the heavy columns opt in with WITH_TEXT /
+WITH_EMBEDDING instead of lazy-loading them row by row.
+"""
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import undefer
+from models import SavedContent
+
+# Computed in SQL so the text blob never leaves the server
+HAS_CONTENT = case(
+    (SavedContent.extracted_text.isnot(None) & (SavedContent.extracted_text != ''), True),
+    else_=False
+).label('has_content')
+
+# id/url/title: URL dedup and cache priming
+BOOKMARK_REF_COLUMNS = (
+    SavedContent.id,
+    SavedContent.url,
+    SavedContent.title,
+)
+
+# Everything a bookmark list / search result card renders
+BOOKMARK_CARD_COLUMNS = (
+    SavedContent.id,
+    SavedContent.url,
+    SavedContent.title,
+    SavedContent.notes,
+    SavedContent.saved_at,
+    SavedContent.category,
+    HAS_CONTENT,
+)
+
+WITH_TEXT = undefer(SavedContent.extracted_text)
+WITH_EMBEDDING = undefer(SavedContent.embedding)
+
+
+def text_prefix(length: int):
+    """First `length` characters of extracted_text, labelled extracted_text."""
+    return func.substr(SavedContent.extracted_text, 1, length).label('extracted_text')
@@ -1,7 +1,9 @@
 from typing import List, Optional, Dict, Any
 from sqlalchemy import func
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from models import SavedContent, ContentAnalysis, UserFeedback
+from repositories.projections import WITH_TEXT, WITH_EMBEDDING
 
 
 class RecommendationRepository:
@@ -35,10 +37,11 @@ class RecommendationRepository:
         return feedback
 
     def get_user_bookmarks(self, user_id: int, limit: int = 50, offset: int = 0) -> List[SavedContent]:
-        """Fetch paginated user bookmarks with limit and offset."""
+        """Fetch paginated user bookmarks with limit and offset, text and embedding loaded."""
         limit = max(1, min(limit, 100))
         return (
             self.session.query(SavedContent)
+            .options(WITH_TEXT, WITH_EMBEDDING)
             .filter_by(user_id=user_id)
             .order_by(SavedContent.saved_at.desc())
             .offset(offset)
@@ -47,10 +50,11 @@ class RecommendationRepository:
         )
 
     def get_unanalyzed_bookmarks(self, user_id: int, limit: int = 10) -> List[SavedContent]:
-        """Find bookmarks that don't have a content analysis yet."""
+        """Find bookmarks that don't have a content analysis yet, with the text to analyze loaded."""
         limit = max(1, min(limit, 100))
         return (
             self.session.query(SavedContent)
+            .options(WITH_TEXT)
             .outerjoin(ContentAnalysis, SavedContent.id == ContentAnalysis.content_id)
             .filter(SavedContent.user_id == user_id, ContentAnalysis.id.is_(None))
             .limit(limit)
@@ -110,11 +114,11 @@ class RecommendationRepository:
             'top_technologies': sorted_tags
         }
 
-    def get_recent_bookmarks_for_learning(self, user_id: int, limit: int = 20) -> List[SavedContent]:
-        """Retrieve recent bookmarks for user learning insights."""
+    def get_recent_bookmarks_for_learning(self, user_id: int, limit: int = 20) -> List[Row]:
+        """(id, tags, saved_at) rows of recent bookmarks for user learning insights."""
         limit = max(1, min(limit, 100))
         return (
-            self.session.query(SavedContent)
+            self.session.query(SavedContent.id, SavedContent.tags, SavedContent.saved_at)
             .filter_by(user_id=user_id)
             .order_by(SavedContent.saved_at.desc())
             .limit(limit)
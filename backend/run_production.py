@@ -61,6 +61,7 @@ from models import db
 from sqlalchemy import text
 from flask_cors import CORS
 from utils.redis_utils import redis_cache
+from core.password_pool import PasswordPoolSaturated
 
 # Import Flask-Compress for response compression
 try:
@@ -270,6 +271,10 @@ def create_app(config_name: str = None) -> Flask:
     # Database initialization
     db.init_app(app)
 
+    # Dashboard counters follow every ORM flush (services/user_stats_service)
+    from services.user_stats_service import register_stats_listeners
+    register_stats_listeners()
+
     # Auto-run Alembic database migrations on startup
     with app.app_context():
         try:
@@ -487,6 +492,10 @@ def create_app(config_name: str = None) -> Flask:
             if not hmac.compare_digest(provided, metrics_token):
                 return jsonify({'message': 'Unauthorized'}), 401
 
+        # Queue depth is sampled on scrape rather than on every enqueue
+        from services.task_queue import sample_queue_depths
+        sample_queue_depths()
+
         output, content_type = get_metrics_output()
         if output is None:
             return jsonify({'status': 'prometheus_client_unavailable'}), 503
@@ -636,6 +645,12 @@ def create_app(config_name: str = None) -> Flask:
     def method_not_allowed(error):
         return jsonify({'message': 'Method not allowed', 'error': 'method_not_allowed'}), 405
 
+    @app.errorhandler(PasswordPoolSaturated)
+    def password_pool_saturated(error):
+        response = jsonify({'message': error.description, 'error': 'password_pool_saturated'})
+        response.headers['Retry-After'] = str(error.retry_after)
+        return response, 503
+
     @app.errorhandler(Exception)
     def handle_exception(e):
         from werkzeug.exceptions import HTTPException
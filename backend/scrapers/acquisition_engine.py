@@ -4,11 +4,12 @@ Single-responsibility engine that reliably acquires, parses, quality-evaluates,
 into an immutable ContentDocument DTO.
 """
 
+import time
 from urllib.parse import urlparse
 from typing import Dict, Optional, Tuple
 from scrapers.cache_manager import CacheManager
 from scrapers.robots_manager import RobotsManager
-from scrapers.rate_limiter import DomainRateLimiter
+from scrapers.rate_limiter import DomainRateLimiter, DomainRateLimited
 from scrapers.fetch_policy import FetchPolicy
 from scrapers.fetchers.http_fetcher import HTTPFetcher
 from scrapers.fetchers.stealth_fetcher import StealthFetcher
@@ -16,10 +17,10 @@ from scrapers.fetchers.dynamic_fetcher import DynamicFetcher
 from scrapers.extractor_pipeline import ExtractorPipeline
 from scrapers.normalizer import MetadataNormalizer
 from scrapers.quality_evaluator import QualityEvaluator
-from scrapers.decision_engine import DecisionEngine
+from scrapers.decision_engine import DecisionEngine, BEST_EFFORT_REASONS
 from scrapers.event_publisher import ScrapingEventPublisher
 from scrapers.models import ContentDocument, RawFetchResult, ParsedDocument, NormalizedDocument, Decision, compute_content_hash
-from core.circuit_breaker import RedisCircuitBreaker
+from core.circuit_breaker import get_circuit_breaker
 from core.events import (
     FetchStarted, FetchCompleted, ParsingStarted, ParsingCompleted, NormalizationCompleted
 )
@@ -60,12 +61,21 @@ class ContentAcquisitionEngine:
         if not self.robots_manager.can_fetch(url):
             logger.warning("acquisition_blocked_by_robots", extra={"url": url})
 
-        allowed, wait_time = self.rate_limiter.acquire(url)
+        domain = urlparse(url).netloc.lower()
+        allowed, wait_time = self.rate_limiter.acquire(url, min_interval=self.robots_manager.crawl_delay(url))
         if not allowed:
+            # Callers defer the work instead of fetching past the domain's limits
             logger.warning("acquisition_rate_limited", extra={"url": url, "wait_time": wait_time})
+            raise DomainRateLimited(domain, wait_time)
 
-        domain = urlparse(url).netloc.lower()
-        circuit_breaker = RedisCircuitBreaker(name=f"domain_{domain}", failure_threshold=5, recovery_timeout=300)
+        try:
+            return self._fetch_and_normalize(url, domain, bookmark_id)
+        finally:
+            self.rate_limiter.release(url)
+
+    def _fetch_and_normalize(self, url: str, domain: str, bookmark_id: Optional[int]) -> ContentDocument:
+        """Stages 2-5, run while holding the domain's rate-limit lease."""
+        circuit_breaker = get_circuit_breaker(f"domain_{domain}", failure_threshold=5, recovery_timeout=300)
 
         strategy_plan = self.fetch_policy.get_strategy_plan(url)
         
@@ -85,19 +95,19 @@ class ContentAcquisitionEngine:
             if bookmark_id:
                 self.event_publisher.publish(FetchStarted(bookmark_id=bookmark_id, strategy=strategy, url=url))
 
+            fetch_start = time.time()
             try:
                 raw_result = fetcher.fetch(url)
                 if raw_result and raw_result.http_status < 400:
                     circuit_breaker.record_success()
-                    self.fetch_policy.record_success(url, strategy)
                 else:
                     circuit_breaker.record_failure()
-                    self.fetch_policy.record_failure(url, strategy)
             except Exception as fetch_err:
                 circuit_breaker.record_failure()
-                self.fetch_policy.record_failure(url, strategy)
+                self.fetch_policy.record_outcome(url, strategy, passed=False, latency_ms=(time.time() - fetch_start) * 1000)
                 logger.error("fetcher_exception", extra={"url": url, "strategy": strategy, "error": str(fetch_err)})
                 continue
+            fetch_latency_ms = (time.time() - fetch_start) * 1000
 
             if bookmark_id and raw_result:
                 self.event_publisher.publish(
@@ -110,6 +120,7 @@ class ContentAcquisitionEngine:
                 )
 
             if not raw_result or not raw_result.raw_content:
+                self.fetch_policy.record_outcome(url, strategy, passed=False, latency_ms=fetch_latency_ms)
                 continue
 
             # Stage 3: Extraction
@@ -137,6 +148,14 @@ class ContentAcquisitionEngine:
             )
 
             decision = self.decision_engine.evaluate(quality_metrics, strategy)
+            # The policy learns which strategy yields acceptable content, not just a 2xx;
+            # best-effort accepts count as failures so they don't inflate the last tier's pass rate
+            self.fetch_policy.record_outcome(
+                url, strategy,
+                passed=(raw_result.http_status < 400 and decision.action == "ACCEPT"
+                        and decision.reason not in BEST_EFFORT_REASONS),
+                latency_ms=fetch_latency_ms
+            )
 
             content_hash = compute_content_hash(norm_doc.markdown_content)
             if bookmark_id:
@@ -11,6 +11,8 @@ from core.logging_config import get_logger
 logger = get_logger(__name__)
 
 QUALITY_ACCEPT_THRESHOLD = 70
+# Accepted only because no tier is left to escalate to; not evidence the strategy works
+BEST_EFFORT_REASONS = frozenset({"dynamic_best_effort_accepted", "default_accepted"})
 
 
 class DecisionEngine:
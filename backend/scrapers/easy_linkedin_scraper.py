@@ -8,7 +8,7 @@ from bs4 import BeautifulSoup
 import re
 import json
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Optional
 import logging
 
 # Set up logging
@@ -18,9 +18,11 @@ logger = logging.getLogger(__name__)
 class EasyLinkedInScraper:
     """Easy-to-use LinkedIn post scraper with multiple strategies"""
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.setup_session()
+    def __init__(self, session: Optional[requests.Session] = None):
+        # A caller-provided session is shared (keep-alive pool) and set up once by its owner
+        self.session = session or requests.Session()
+        if session is None:
+            self.setup_session()
         self.results = []
     
     def setup_session(self):
@@ -60,6 +62,12 @@ class EasyLinkedInScraper:
         # Strategy 4: Fallback - return what we have
         return result
     
+    def _only_headers(self, headers: Dict) -> Dict:
+        """Per-request headers that replace, not extend, the session defaults."""
+        merged = {name: None for name in self.session.headers}
+        merged.update(headers)
+        return merged
+    
     def try_direct_scraping(self, url: str) -> Dict:
         """Try direct scraping with standard headers"""
         try:
@@ -86,7 +94,7 @@ class EasyLinkedInScraper:
                 "Upgrade-Insecure-Requests": "1"
             }
             
-            response = requests.get(url, headers=headers, timeout=15)
+            response = self.session.get(url, headers=self._only_headers(headers), timeout=15)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.text, "html.parser")
@@ -107,7 +115,7 @@ class EasyLinkedInScraper:
                 "Connection": "keep-alive"
             }
             
-            response = requests.get(url, headers=headers, timeout=15)
+            response = self.session.get(url, headers=self._only_headers(headers), timeout=15)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.text, "html.parser")
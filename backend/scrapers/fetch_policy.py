@@ -1,11 +1,26 @@
 """
 Fetch Policy Module
-Provides configurable static per-domain policies as well as runtime dynamic policy adaptation
-based on strategy success/failure metrics stored in Redis.
+Prunes the per-domain fetch escalation chain with a cost-aware Thompson-sampling bandit.
+
+Each attempt's outcome (did the page pass the DecisionEngine on its own merit?) and
+latency are kept in one Redis hash per domain, fuze:policy:v2:{domain}, read with a
+single HGETALL. Counters decay: each new observation of a strategy discounts its older
+ones (an effective window of ~OBSERVATION_WINDOW attempts) and every count halves per
+POLICY_HALF_LIFE_SECONDS, so a domain that changes behaviour is re-learned.
+
+Plans always keep the HTTP -> STEALTH -> DYNAMIC escalation order that the DecisionEngine
+assumes; the bandit only decides which tiers are worth attempting. A strategy's pass
+probability is sampled from Beta(prior + passes, prior + fails), and a tier is attempted
+only when its cost is below the expected cost it saves the rest of the chain
+(cost < p * remaining chain cost). Cost is observed mean latency weighted by the
+strategy's relative CPU cost. The static domain table seeds the priors and is the plan
+for domains without observations.
 """
 
+import random
+import time
 from urllib.parse import urlparse
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from utils.redis_utils import get_redis_client
 from core.logging_config import get_logger
 
@@ -31,78 +46,183 @@ DEFAULT_DOMAIN_POLICIES: Dict[str, List[str]] = {
 }
 
 
+# Relative CPU cost per second of fetching, and latency assumed before any observation
+STRATEGY_CPU_WEIGHT: Dict[str, float] = {"HTTP": 1.0, "STEALTH": 5.0, "DYNAMIC": 8.0}
+DEFAULT_LATENCY_MS: Dict[str, float] = {"HTTP": 1000.0, "STEALTH": 4000.0, "DYNAMIC": 6000.0}
+# Cost charged for ending the chain without acceptable content; the last tier is always worth trying
+FAILURE_COST = float("inf")
+
+# Beta priors: strategies in the domain's static plan start optimistic, others pessimistic
+LISTED_PRIOR: Tuple[float, float] = (2.0, 1.0)
+UNLISTED_PRIOR: Tuple[float, float] = (1.0, 12.0)
+# Each observation discounts a strategy's previous ones by (1 - 1/OBSERVATION_WINDOW),
+# and all counts halve every POLICY_HALF_LIFE_SECONDS without new observations
+OBSERVATION_WINDOW = 50
+POLICY_HALF_LIFE_SECONDS = 3 * 86400
+# Strategies whose posterior mean pass rate is below this are left out of the plan,
+# except for an occasional exploratory attempt so they can earn their way back
+MIN_PASS_RATE = 0.1
+EXPLORE_RATE = 0.05
+# Idle domains' hashes are dropped; their decayed counts would be near zero by then anyway
+STATS_TTL_SECONDS = 7 * 86400
+
+# Decay a strategy's counters to now, add one observation, and stamp the update time
+RECORD_OUTCOME_LUA = """
+local now = tonumber(ARGV[4])
+local values = redis.call('HMGET', KEYS[1], ARGV[1] .. ':pass', ARGV[1] .. ':fail', ARGV[1] .. ':ms', ARGV[1] .. ':ts')
+local last = tonumber(values[4]) or now
+local factor = tonumber(ARGV[6]) * math.pow(0.5, math.max(0, now - last) / tonumber(ARGV[5]))
+local passed = tonumber(ARGV[2])
+redis.call('HSET', KEYS[1],
+    ARGV[1] .. ':pass', tostring((tonumber(values[1]) or 0) * factor + passed),
+    ARGV[1] .. ':fail', tostring((tonumber(values[2]) or 0) * factor + 1 - passed),
+    ARGV[1] .. ':ms', tostring((tonumber(values[3]) or 0) * factor + tonumber(ARGV[3])),
+    ARGV[1] .. ':ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[7]))
+return 1
+"""
+
+
+class StrategyStats:
+    """Decayed outcomes of one strategy on one domain."""
+
+    def __init__(self, passes: float = 0.0, fails: float = 0.0, latency_ms_total: float = 0.0,
+                 updated_at: Optional[float] = None):
+        self.passes = passes
+        self.fails = fails
+        self.latency_ms_total = latency_ms_total
+        self.updated_at = updated_at
+
+    @property
+    def observations(self) -> float:
+        return self.passes + self.fails
+
+    def mean_latency_ms(self, default: float) -> float:
+        # Latency is decayed with the same weights as the counts, so this is a recent mean
+        return self.latency_ms_total / self.observations if self.observations else default
+
+    def decayed_to(self, now: float) -> "StrategyStats":
+        """Counts as of now, halved per POLICY_HALF_LIFE_SECONDS since the last observation."""
+        if self.updated_at is None:
+            return self
+        factor = 0.5 ** (max(0.0, now - self.updated_at) / POLICY_HALF_LIFE_SECONDS)
+        return StrategyStats(self.passes * factor, self.fails * factor, self.latency_ms_total * factor, now)
+
+    def posterior(self, prior: Tuple[float, float]) -> Tuple[float, float]:
+        return prior[0] + self.passes, prior[1] + self.fails
+
+
 class FetchPolicy:
     """
     Evaluates target domain policies and constructs an ordered list of candidate fetch strategies.
-    Supports static domain overrides + dynamic runtime adaptation based on success rates.
+    Static domain overrides seed a per-domain bandit that learns from recorded outcomes.
     """
-    def __init__(self, domain_policies: Optional[Dict[str, List[str]]] = None):
+    def __init__(self, domain_policies: Optional[Dict[str, List[str]]] = None, rng: Optional[random.Random] = None):
         self.domain_policies = domain_policies if domain_policies is not None else DEFAULT_DOMAIN_POLICIES
         self._redis = get_redis_client()
+        self._rng = rng or random.Random()
+        self._record_script = None
 
     def _get_domain(self, url: str) -> str:
         domain = urlparse(url).netloc.lower()
         return domain[4:] if domain.startswith("www.") else domain
 
-    def record_success(self, url: str, strategy: str):
-        """Record successful fetch for domain/strategy in Redis for dynamic policy learning."""
+    def _stats_key(self, domain: str) -> str:
+        return f"fuze:policy:v2:{domain}"
+
+    def _static_plan(self, domain: str) -> Optional[List[str]]:
+        for policy_domain, plan in self.domain_policies.items():
+            clean_policy_domain = policy_domain[4:] if policy_domain.startswith("www.") else policy_domain
+            if domain == clean_policy_domain or domain.endswith(f".{clean_policy_domain}"):
+                return list(plan)
+        return None
+
+    def record_outcome(self, url: str, strategy: str, passed: bool, latency_ms: float):
+        """Record whether an attempt passed the DecisionEngine on its own merit, and how long it took."""
         if not self._redis:
             return
         domain = self._get_domain(url)
         try:
-            pipe = self._redis.pipeline()
-            pipe.incr(f"fuze:policy:{domain}:{strategy}:success")
-            pipe.expire(f"fuze:policy:{domain}:{strategy}:success", 86400)
-            pipe.execute()
+            if self._record_script is None:
+                self._record_script = self._redis.register_script(RECORD_OUTCOME_LUA)
+            self._record_script(
+                keys=[self._stats_key(domain)],
+                args=[strategy, 1 if passed else 0, max(0.0, float(latency_ms)), time.time(),
+                      POLICY_HALF_LIFE_SECONDS, 1.0 - 1.0 / OBSERVATION_WINDOW, STATS_TTL_SECONDS]
+            )
         except Exception as e:
-            logger.debug("record_policy_success_failed", extra={"domain": domain, "error": str(e)})
+            logger.debug("record_policy_outcome_failed", extra={"domain": domain, "error": str(e)})
 
-    def record_failure(self, url: str, strategy: str):
-        """Record failed fetch for domain/strategy in Redis for dynamic promotion/demotion."""
+    def _load_stats(self, domain: str) -> Dict[str, StrategyStats]:
         if not self._redis:
-            return
-        domain = self._get_domain(url)
+            return {}
         try:
-            pipe = self._redis.pipeline()
-            pipe.incr(f"fuze:policy:{domain}:{strategy}:failure")
-            pipe.expire(f"fuze:policy:{domain}:{strategy}:failure", 86400)
-            pipe.execute()
+            raw = self._redis.hgetall(self._stats_key(domain))
         except Exception as e:
-            logger.debug("record_policy_failure_failed", extra={"domain": domain, "error": str(e)})
+            logger.debug("load_policy_stats_failed", extra={"domain": domain, "error": str(e)})
+            return {}
+        if not isinstance(raw, dict):
+            return {}
+
+        stats: Dict[str, StrategyStats] = {}
+        for field, value in raw.items():
+            field = field.decode("utf-8") if isinstance(field, bytes) else str(field)
+            strategy, _, metric = field.partition(":")
+            if strategy not in STRATEGY_CPU_WEIGHT:
+                continue
+            try:
+                number = float(value.decode("utf-8") if isinstance(value, bytes) else value)
+            except (TypeError, ValueError):
+                continue
+            entry = stats.setdefault(strategy, StrategyStats())
+            if metric == "pass":
+                entry.passes = number
+            elif metric == "fail":
+                entry.fails = number
+            elif metric == "ms":
+                entry.latency_ms_total = number
+            elif metric == "ts":
+                entry.updated_at = number
+        now = time.time()
+        return {strategy: entry.decayed_to(now) for strategy, entry in stats.items()}
 
     def get_strategy_plan(self, url: str) -> List[str]:
         """
-        Return the candidate fetch strategy plan for a given URL.
-        Evaluates static overrides first, then dynamic runtime metrics, then default plan.
+        Return the candidate fetch strategy plan for a given URL, in escalation order.
+        Domains without observations use the static plan; otherwise tiers that are
+        unlikely to pass, or cost more than they are expected to save, are skipped.
         """
         domain = self._get_domain(url)
+        static_plan = self._static_plan(domain)
+        stats = self._load_stats(domain)
 
-        # 1. Static Domain Policy Check
-        for policy_domain, plan in self.domain_policies.items():
-            clean_policy_domain = policy_domain[4:] if policy_domain.startswith("www.") else policy_domain
-            if domain == clean_policy_domain or domain.endswith(f".{clean_policy_domain}"):
-                # Check runtime adaptation: If HTTP has succeeded 5+ times consecutively on a STEALTH domain, downgrade to HTTP fast-path
-                if self._redis and plan[0] != "HTTP":
-                    try:
-                        http_successes = int(self._redis.get(f"fuze:policy:{domain}:HTTP:success") or 0)
-                        http_failures = int(self._redis.get(f"fuze:policy:{domain}:HTTP:failure") or 0)
-                        if http_successes >= 5 and http_failures == 0:
-                            logger.info("dynamic_policy_downgrade_to_http", extra={"domain": domain})
-                            return ["HTTP"] + list(plan)
-                    except Exception:
-                        pass
-                logger.info("fetch_policy_matched_static", extra={"url": url, "domain": domain, "plan": plan})
-                return list(plan)
+        if not any(entry.observations for entry in stats.values()):
+            plan = static_plan or list(DEFAULT_STRATEGY_PLAN)
+            logger.debug("fetch_policy_static", extra={"url": url, "plan": plan})
+            return plan
 
-        # 2. Dynamic Policy Check for standard domains (promote to STEALTH if HTTP repeatedly fails)
-        if self._redis:
-            try:
-                http_failures = int(self._redis.get(f"fuze:policy:{domain}:HTTP:failure") or 0)
-                if http_failures >= 3:
-                    logger.info("dynamic_policy_promote_to_stealth", extra={"domain": domain, "http_failures": http_failures})
-                    return ["STEALTH", "DYNAMIC", "HTTP"]
-            except Exception:
-                pass
-
-        logger.debug("fetch_policy_default", extra={"url": url, "plan": DEFAULT_STRATEGY_PLAN})
-        return list(DEFAULT_STRATEGY_PLAN)
+        listed = set(static_plan or DEFAULT_STRATEGY_PLAN)
+        # Walk from the last tier back: remaining_cost is the expected cost of the chain after this tier
+        plan: List[str] = []
+        remaining_cost = FAILURE_COST
+        for strategy in reversed(DEFAULT_STRATEGY_PLAN):
+            entry = stats.get(strategy, StrategyStats())
+            alpha, beta = entry.posterior(LISTED_PRIOR if strategy in listed else UNLISTED_PRIOR)
+            if alpha / (alpha + beta) < MIN_PASS_RATE and self._rng.random() >= EXPLORE_RATE:
+                continue
+            pass_sample = max(self._rng.betavariate(alpha, beta), 1e-3)
+            cost = STRATEGY_CPU_WEIGHT[strategy] * entry.mean_latency_ms(DEFAULT_LATENCY_MS[strategy]) / 1000.0
+            if cost >= pass_sample * remaining_cost:
+                continue
+            plan.insert(0, strategy)
+            if remaining_cost == FAILURE_COST:
+                # Last resort: value it at its expected cost per success
+                remaining_cost = cost / pass_sample
+            else:
+                remaining_cost = cost + (1.0 - pass_sample) * remaining_cost
+
+        if not plan:
+            # Everything looks hopeless: fall back to the full chain rather than fetching nothing
+            plan = static_plan or list(DEFAULT_STRATEGY_PLAN)
+        logger.info("fetch_policy_bandit_plan", extra={"url": url, "domain": domain, "plan": plan})
+        return plan
@@ -0,0 +1,335 @@
+"""
+Browser Pool
+Long-lived headless Chromium shared by the STEALTH and DYNAMIC fetchers of one process.
+
+Launching a browser per fetch costs seconds and hundreds of MB on every JS-heavy
+domain in DEFAULT_DOMAIN_POLICIES. The pool launches Chromium once and keeps
+BROWSER_POOL_SIZE warm contexts. Each context reuses one page, replaced after
+BROWSER_PAGE_MAX_USES navigations; the whole context is replaced once its JS heap
+passes BROWSER_CONTEXT_MAX_HEAP_MB. Images, fonts and media are aborted at the
+route level since extraction only needs the DOM.
+
+Playwright objects belong to the event loop that created them, so the pool runs
+on one asyncio loop in one daemon thread and callers block on a concurrent future.
+A fetch that overruns its deadline is cancelled on that loop and its page closed;
+no thread is left behind per timed-out fetch.
+"""
+
+import os
+import time
+import asyncio
+import threading
+import concurrent.futures
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from scrapers.models import RawFetchResult, FetchMetadata
+from core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+POOL_SIZE = int(os.environ.get("BROWSER_POOL_SIZE", 2))
+PAGE_MAX_USES = int(os.environ.get("BROWSER_PAGE_MAX_USES", 25))
+CONTEXT_MAX_HEAP_MB = int(os.environ.get("BROWSER_CONTEXT_MAX_HEAP_MB", 256))
+# After a failed launch (no playwright, no browser binary) fetchers skip the pool for this long
+LAUNCH_RETRY_SECONDS = 300
+# Extra wait on the caller side beyond the fetch deadline before giving up on the loop
+CALLER_GRACE_SECONDS = 5
+SHUTDOWN_TIMEOUT_SECONDS = 10
+
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+CONTEXT_OPTIONS = {
+    "user_agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
+    ),
+    "locale": "en-US",
+    "viewport": {"width": 1366, "height": 900},
+    "java_script_enabled": True,
+}
+STEALTH_INIT_SCRIPT = "Object.defineProperty(navigator, 'webdriver', {get: () => undefined});"
+HEAP_PROBE = "() => (performance.memory && performance.memory.usedJSHeapSize) || 0"
+
+Launcher = Callable[[], Awaitable[Tuple[Any, Any]]]
+
+
+class BrowserPoolUnavailable(RuntimeError):
+    """Raised when the pool is disabled or Chromium cannot be launched."""
+
+
+@dataclass(frozen=True)
+class PageSnapshot:
+    """Rendered page captured by the pool."""
+    url: str
+    final_url: str
+    status: int
+    headers: Dict[str, str]
+    html: str
+
+    def to_raw_result(self, strategy: str, latency_ms: int) -> RawFetchResult:
+        meta = FetchMetadata(
+            strategy=strategy,
+            attempts=1,
+            http_status=self.status,
+            redirected=self.final_url != self.url,
+            redirect_chain=[self.url] if self.final_url != self.url else [],
+            fetch_latency_ms=latency_ms
+        )
+        return RawFetchResult(
+            url=self.url,
+            final_url=self.final_url,
+            http_status=self.status,
+            headers=self.headers,
+            raw_content=self.html.encode('utf-8'),
+            fetch_metadata=meta
+        )
+
+
+class _Slot:
+    """One warm browser context and the page it reuses."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.context = None
+        self.page = None
+        self.uses = 0
+
+
+async def _launch_chromium() -> Tuple[Any, Any]:
+    from playwright.async_api import async_playwright
+    driver = await async_playwright().start()
+    try:
+        browser = await driver.chromium.launch(
+            headless=True,
+            args=["--disable-dev-shm-usage", "--disable-blink-features=AutomationControlled"]
+        )
+    except Exception:
+        await driver.stop()
+        raise
+    return driver, browser
+
+
+async def _block_heavy_resources(route):
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class BrowserPool:
+    """
+    Process-wide pool of warm Chromium contexts.
+    fetch() is thread-safe and blocking; the browser starts on first use.
+    """
+
+    def __init__(
+        self,
+        size: int = POOL_SIZE,
+        page_max_uses: int = PAGE_MAX_USES,
+        max_heap_mb: int = CONTEXT_MAX_HEAP_MB,
+        launcher: Launcher = _launch_chromium,
+    ):
+        self.size = size
+        self.page_max_uses = page_max_uses
+        self.max_heap_bytes = max_heap_mb * 1024 * 1024
+        self._launcher = launcher
+        self._lock = threading.Lock()
+        self._reset_state()
+
+    def _reset_state(self):
+        self._pid = os.getpid()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._driver = None
+        self._browser = None
+        self._launch_lock: Optional[asyncio.Lock] = None
+        self._idle: Optional[asyncio.Queue] = None
+        self._slots: List[_Slot] = [_Slot(i) for i in range(self.size)]
+        self._unavailable_until = 0.0
+        self._stats = {"launches": 0, "fetches": 0, "timeouts": 0, "page_recycles": 0, "context_recycles": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    @property
+    def available(self) -> bool:
+        """False while disabled or cooling down after a failed launch."""
+        return self.enabled and time.monotonic() >= self._unavailable_until
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats, size=self.size)
+
+    def fetch(
+        self,
+        url: str,
+        timeout: float = 20.0,
+        wait_until: str = "domcontentloaded",
+        settle_ms: int = 0,
+    ) -> PageSnapshot:
+        """
+        Render url in a pooled page. Raises TimeoutError when the deadline passes
+        (the page is closed) and BrowserPoolUnavailable when there is no browser.
+        """
+        if not self.available:
+            raise BrowserPoolUnavailable("browser pool disabled or unavailable")
+
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self._fetch(url, timeout, wait_until, settle_ms), loop)
+        try:
+            return future.result(timeout=timeout + CALLER_GRACE_SECONDS)
+        except concurrent.futures.TimeoutError:
+            # Still queued behind busy slots: cancel it so it never starts
+            future.cancel()
+            raise TimeoutError(f"browser pool fetch timed out after {timeout}s")
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"browser pool fetch timed out after {timeout}s")
+
+    def shutdown(self):
+        """Close the browser and stop the loop thread. The pool restarts on the next fetch."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or self._pid != os.getpid():
+                self._reset_state()
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(self._stop_browser(), loop).result(timeout=SHUTDOWN_TIMEOUT_SECONDS)
+            except Exception as e:
+                logger.warning("browser_pool_shutdown_failed", extra={"error": str(e)})
+            loop.call_soon_threadsafe(loop.stop)
+            if thread is not None:
+                thread.join(timeout=SHUTDOWN_TIMEOUT_SECONDS)
+            loop.close()
+            logger.info("browser_pool_stopped", extra=self.stats())
+            self._reset_state()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked child (e.g. an RQ work horse): the parent's loop thread and browser are not ours
+                self._reset_state()
+            if self._thread is not None and self._thread.is_alive():
+                return self._loop
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="browser-pool", daemon=True)
+            thread.start()
+            self._loop, self._thread = loop, thread
+            return loop
+
+    async def _fetch(self, url: str, timeout: float, wait_until: str, settle_ms: int) -> PageSnapshot:
+        await self._ensure_browser()
+        slot = await self._idle.get()
+        try:
+            snapshot = await asyncio.wait_for(self._navigate(slot, url, timeout, wait_until, settle_ms), timeout)
+            self._stats["fetches"] += 1
+            return snapshot
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            self._stats["timeouts"] += 1
+            logger.warning("browser_pool_page_killed", extra={"url": url, "slot": slot.index, "timeout": timeout})
+            await self._close_page(slot)
+            raise
+        except Exception:
+            # A page that errored mid-navigation may have crashed its renderer: start the slot clean
+            await self._close_context(slot)
+            raise
+        finally:
+            self._idle.put_nowait(slot)
+
+    async def _ensure_browser(self):
+        if self._launch_lock is None:
+            self._launch_lock = asyncio.Lock()
+            self._idle = asyncio.Queue()
+            for slot in self._slots:
+                self._idle.put_nowait(slot)
+
+        async with self._launch_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return
+            await self._stop_browser()
+            try:
+                self._driver, self._browser = await self._launcher()
+            except Exception as e:
+                self._unavailable_until = time.monotonic() + LAUNCH_RETRY_SECONDS
+                logger.warning("browser_pool_launch_failed", extra={"error": str(e)})
+                raise BrowserPoolUnavailable(str(e)) from e
+            self._stats["launches"] += 1
+            logger.info("browser_pool_launched", extra={"size": self.size, "pid": self._pid})
+
+    async def _page_for(self, slot: _Slot):
+        if slot.context is None:
+            slot.context = await self._browser.new_context(**CONTEXT_OPTIONS)
+            await slot.context.add_init_script(STEALTH_INIT_SCRIPT)
+            await slot.context.route("**/*", _block_heavy_resources)
+        if slot.page is None or slot.page.is_closed():
+            slot.page = await slot.context.new_page()
+            slot.uses = 0
+        return slot.page
+
+    async def _navigate(self, slot: _Slot, url: str, timeout: float, wait_until: str, settle_ms: int) -> PageSnapshot:
+        page = await self._page_for(slot)
+        response = await page.goto(url, timeout=timeout * 1000, wait_until=wait_until)
+        if settle_ms:
+            await page.wait_for_timeout(settle_ms)
+        snapshot = PageSnapshot(
+            url=url,
+            final_url=page.url,
+            status=response.status if response is not None else 200,
+            headers=dict(await response.all_headers()) if response is not None else {},
+            html=await page.content()
+        )
+        slot.uses += 1
+        await self._recycle(slot)
+        return snapshot
+
+    async def _recycle(self, slot: _Slot):
+        """Replace the context past the heap watermark, the page past its use budget."""
+        try:
+            heap = await slot.page.evaluate(HEAP_PROBE)
+        except Exception:
+            heap = 0
+        if heap and heap > self.max_heap_bytes:
+            self._stats["context_recycles"] += 1
+            logger.info("browser_pool_context_recycled", extra={"slot": slot.index, "heap_bytes": heap})
+            await self._close_context(slot)
+        elif slot.uses >= self.page_max_uses:
+            self._stats["page_recycles"] += 1
+            await self._close_page(slot)
+        else:
+            # Park the page so the last site's scripts and timers stop running between fetches
+            try:
+                await slot.page.goto("about:blank")
+            except Exception:
+                await self._close_page(slot)
+
+    async def _close_page(self, slot: _Slot):
+        page, slot.page, slot.uses = slot.page, None, 0
+        if page is not None:
+            try:
+                await page.close()
+            except Exception:
+                pass
+
+    async def _close_context(self, slot: _Slot):
+        context, slot.context = slot.context, None
+        slot.page, slot.uses = None, 0
+        if context is not None:
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+    async def _stop_browser(self):
+        for slot in self._slots:
+            await self._close_context(slot)
+        browser, driver = self._browser, self._driver
+        self._browser = self._driver = None
+        for closer in (browser.close if browser else None, driver.stop if driver else None):
+            if closer is None:
+                continue
+            try:
+                await closer()
+            except Exception:
+                pass
+
+
+browser_pool = BrowserPool()
@@ -1,15 +1,20 @@
 """
 Tier 3: Dynamic Browser Fetcher Implementation
-Uses Scrapling's DynamicFetcher (Chromium client-side JS rendering) or Playwright fallback.
+Renders in the shared browser pool (warm Chromium contexts), falling back to a one-shot
+Scrapling DynamicFetcher and finally to StealthFetcher.
 """
 
 import time
 from scrapers.fetchers.base import BaseFetcher
+from scrapers.fetchers.browser_pool import browser_pool, BrowserPoolUnavailable
 from scrapers.models import RawFetchResult, FetchMetadata
 from core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Let client-side rendering finish after the load event before capturing the DOM
+RENDER_SETTLE_MS = 1500
+
 SCRAPLING_DYNAMIC_AVAILABLE = False
 DynamicFetcherClass = None
 
@@ -31,6 +36,15 @@ class DynamicFetcher(BaseFetcher):
     def fetch(self, url: str) -> RawFetchResult:
         start_time = time.time()
 
+        if browser_pool.available:
+            try:
+                snapshot = browser_pool.fetch(url, timeout=self.timeout, wait_until="load", settle_ms=RENDER_SETTLE_MS)
+                return snapshot.to_raw_result(self.strategy_name, int((time.time() - start_time) * 1000))
+            except BrowserPoolUnavailable:
+                pass
+            except Exception as e:
+                logger.warning("pooled_dynamic_fetch_failed", extra={"url": url, "error": str(e)})
+
         if SCRAPLING_DYNAMIC_AVAILABLE and DynamicFetcherClass is not None:
             try:
                 fetcher = DynamicFetcherClass()
@@ -59,35 +73,6 @@ class DynamicFetcher(BaseFetcher):
             except Exception as e:
                 logger.warning("scrapling_dynamic_fetch_failed", extra={"url": url, "error": str(e)})
 
-        # Fallback to Playwright if available
-        try:
-            from playwright.sync_api import sync_playwright
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
-                page.goto(url, timeout=self.timeout * 1000, wait_until="domcontentloaded")
-                content = page.content()
-                browser.close()
-
-                latency_ms = int((time.time() - start_time) * 1000)
-                meta = FetchMetadata(
-                    strategy=self.strategy_name,
-                    attempts=1,
-                    http_status=200,
-                    redirected=False,
-                    fetch_latency_ms=latency_ms
-                )
-                return RawFetchResult(
-                    url=url,
-                    final_url=url,
-                    http_status=200,
-                    headers={},
-                    raw_content=content.encode('utf-8'),
-                    fetch_metadata=meta
-                )
-        except Exception as e:
-            logger.warning("playwright_dynamic_fetch_failed", extra={"url": url, "error": str(e)})
-
         # Final fallback to StealthFetcher
         from scrapers.fetchers.stealth_fetcher import StealthFetcher
         fallback = StealthFetcher(timeout=self.timeout)
@@ -1,10 +1,14 @@
 """
 Tier 2: Stealthy Browser Fetcher Implementation
-Uses Scrapling's StealthyFetcher (Camoufox TLS fingerprinting) or stealth fallback.
+Renders in the shared browser pool first; pages that come back blocked or as an anti-bot
+challenge escalate to Scrapling's StealthyFetcher (Camoufox TLS fingerprinting, challenge
+solving), then to the stealth-header HTTP fallback.
 """
 
 import time
 from scrapers.fetchers.base import BaseFetcher
+from scrapers.fetchers.browser_pool import browser_pool, BrowserPoolUnavailable, PageSnapshot
+from scrapers.quality_evaluator import scan_markers
 from scrapers.models import RawFetchResult, FetchMetadata
 from core.logging_config import get_logger
 
@@ -21,6 +25,13 @@ except Exception:
     SCRAPLING_STEALTH_AVAILABLE = False
 
 
+def _is_blocked(snapshot: PageSnapshot) -> bool:
+    if snapshot.status in (401, 403, 429, 503):
+        return True
+    challenge, _ = scan_markers(snapshot.html)
+    return challenge is not None
+
+
 class StealthFetcher(BaseFetcher):
     def __init__(self, timeout: int = 15):
         self.timeout = timeout
@@ -31,7 +42,18 @@ class StealthFetcher(BaseFetcher):
 
     def fetch(self, url: str) -> RawFetchResult:
         start_time = time.time()
-        
+
+        if browser_pool.available:
+            try:
+                snapshot = browser_pool.fetch(url, timeout=self.timeout)
+                if not _is_blocked(snapshot):
+                    return snapshot.to_raw_result(self.strategy_name, int((time.time() - start_time) * 1000))
+                logger.info("pooled_stealth_fetch_blocked", extra={"url": url, "status": snapshot.status})
+            except BrowserPoolUnavailable:
+                pass
+            except Exception as e:
+                logger.warning("pooled_stealth_fetch_failed", extra={"url": url, "error": str(e)})
+
         if SCRAPLING_STEALTH_AVAILABLE and StealthyFetcher is not None:
             try:
                 fetcher = StealthyFetcher()
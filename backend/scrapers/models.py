@@ -132,3 +132,18 @@ def compute_content_hash(text: Optional[str]) -> str:
         return hashlib.sha256(b"").hexdigest()
     normalized_text = text.strip()
     return hashlib.sha256(normalized_text.encode('utf-8')).hexdigest()
+
+
+def derivation_record(input_hash: str, model_version: str, content_hash: Optional[str] = None) -> Dict[str, Optional[str]]:
+    """
+    Provenance stored alongside an artifact derived from scraped content (embedding, analysis):
+    the hash of the exact input the model saw, the model version, and the bookmark content_hash at the time.
+    """
+    return {"input_hash": input_hash, "model_version": model_version, "content_hash": content_hash}
+
+
+def is_derivation_current(record: Any, input_hash: str, model_version: str) -> bool:
+    """True when a stored derivation_record was produced from the same input by the same model version."""
+    if not isinstance(record, dict):
+        return False
+    return record.get("input_hash") == input_hash and record.get("model_version") == model_version
@@ -5,8 +5,7 @@ and client-side JS hydration signals to produce multi-dimensional QualityMetrics
 """
 
 import re
-from typing import List, Optional
-from bs4 import BeautifulSoup
+from typing import Dict, List, Optional, Tuple
 from scrapers.models import QualityMetrics
 from core.logging_config import get_logger
 
@@ -28,7 +27,7 @@ HYDRATION_PATTERNS = [
     r"__next_data__",
     r"__nuxt__",
     r"window\.__initial_state__",
-    r"<div id=[\"'](root|app)[\"']>\s*</div>",
+    r"<div id=[\"'](?:root|app)[\"']>\s*</div>",
     r"enable javascript to run this app",
 ]
 
@@ -37,6 +36,69 @@ DEFAULT_BLOCKED_TITLES = {
     "attention required!", "untitled", "site error", "security check"
 }
 
+# Markers are looked for in the first HEAD_WINDOW and last TAIL_WINDOW characters of the
+# HTML (hydration payloads such as __NEXT_DATA__ sit at the end of <body>)
+HEAD_WINDOW = 100000
+TAIL_WINDOW = 30000
+TEXT_WINDOW = 10000
+
+
+def _combined(groups: List[Tuple[str, str]]) -> "re.Pattern":
+    """
+    One case-insensitive alternation with a named group per marker. A lookahead on the
+    markers' first characters (all markers start with a literal) lets the scan skip most
+    positions without trying every branch.
+    """
+    first_chars = "".join(sorted({re.escape(pattern[0]) for _, pattern in groups}))
+    body = "|".join(f"(?P<{name}>{pattern})" for name, pattern in groups)
+    return re.compile(f"(?=[{first_chars}])(?:{body})", re.IGNORECASE)
+
+
+_CHALLENGE_GROUPS = [(f"c{i}", pattern) for i, pattern in enumerate(CHALLENGE_PATTERNS)]
+_HYDRATION_GROUPS = [(f"h{i}", pattern) for i, pattern in enumerate(HYDRATION_PATTERNS)]
+_MARKER_RE = _combined(_CHALLENGE_GROUPS + _HYDRATION_GROUPS)
+_CHALLENGE_RE = _combined(_CHALLENGE_GROUPS)
+# Opening tags that signal article structure, counted without building a tree
+_STRUCTURE_TAG_RE = re.compile(r"<(article|main|h1|p)(?=[\s>/])", re.IGNORECASE)
+
+
+def _windows(html: str) -> List[str]:
+    if len(html) <= HEAD_WINDOW + TAIL_WINDOW:
+        return [html]
+    return [html[:HEAD_WINDOW], html[-TAIL_WINDOW:]]
+
+
+def scan_markers(html: str, text: str = "") -> Tuple[Optional[str], Optional[str]]:
+    """
+    Single pass over the bounded HTML windows (plus the head of the text for challenges).
+    Returns (challenge pattern, hydration pattern); None where nothing matched.
+    """
+    challenge: Optional[str] = None
+    hydration: Optional[str] = None
+    for window in _windows(html or ""):
+        for match in _MARKER_RE.finditer(window):
+            kind, index = match.lastgroup[0], int(match.lastgroup[1:])
+            if kind == "c" and challenge is None:
+                challenge = CHALLENGE_PATTERNS[index]
+            elif kind == "h" and hydration is None:
+                hydration = HYDRATION_PATTERNS[index]
+            if challenge and hydration:
+                return challenge, hydration
+
+    if challenge is None and text:
+        match = _CHALLENGE_RE.search(text[:TEXT_WINDOW])
+        if match:
+            challenge = CHALLENGE_PATTERNS[int(match.lastgroup[1:])]
+    return challenge, hydration
+
+
+def count_structure_tags(html: str) -> Dict[str, int]:
+    """Opening-tag counts for article/main/h1/p within the head window."""
+    counts = {"article": 0, "main": 0, "h1": 0, "p": 0}
+    for match in _STRUCTURE_TAG_RE.finditer(html[:HEAD_WINDOW] if html else ""):
+        counts[match.group(1).lower()] += 1
+    return counts
+
 
 class QualityEvaluator:
     """
@@ -45,24 +107,14 @@ class QualityEvaluator:
     def evaluate(self, html: str, clean_text: str, title: Optional[str] = None) -> QualityMetrics:
         notes: List[str] = []
 
-        html_lower = html.lower() if html else ""
-        text_lower = clean_text.lower() if clean_text else ""
-
-        # 1. Challenge & Anti-Bot Detection
-        challenge_detected = False
-        for pattern in CHALLENGE_PATTERNS:
-            if re.search(pattern, html_lower) or re.search(pattern, text_lower):
-                challenge_detected = True
-                notes.append(f"Anti-bot challenge pattern matched: {pattern}")
-                break
-
-        # 2. JS Hydration Detection
-        hydration_detected = False
-        for pattern in HYDRATION_PATTERNS:
-            if re.search(pattern, html_lower):
-                hydration_detected = True
-                notes.append(f"JS hydration marker detected: {pattern}")
-                break
+        # 1. Challenge & Anti-Bot Detection, 2. JS Hydration Detection (one scan)
+        challenge_pattern, hydration_pattern = scan_markers(html, clean_text)
+        challenge_detected = challenge_pattern is not None
+        if challenge_detected:
+            notes.append(f"Anti-bot challenge pattern matched: {challenge_pattern}")
+        hydration_detected = hydration_pattern is not None
+        if hydration_detected:
+            notes.append(f"JS hydration marker detected: {hydration_pattern}")
 
         # 3. Title Evaluation & Metadata Completeness
         clean_title = title.strip() if title else ""
@@ -89,10 +141,10 @@ class QualityEvaluator:
         has_article_body = False
         structure_quality = 50
         if html:
-            soup = BeautifulSoup(html[:100000], 'html.parser')
-            has_article = bool(soup.find(['article', 'main']))
-            has_h1 = bool(soup.find('h1'))
-            has_paragraphs = len(soup.find_all('p')) > 2
+            tags = count_structure_tags(html)
+            has_article = bool(tags["article"] or tags["main"])
+            has_h1 = bool(tags["h1"])
+            has_paragraphs = tags["p"] > 2
 
             if has_article or (has_h1 and has_paragraphs):
                 has_article_body = True
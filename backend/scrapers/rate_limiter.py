@@ -1,11 +1,14 @@
 """
 Domain Rate Limiter Module
-Per-domain token-bucket and sliding window rate limiting via Redis.
+Per-domain admission control shared by every worker via Redis: a sliding-window
+request rate plus a cap on concurrent fetches, checked and claimed in one Lua call.
 """
 
+import os
 import time
+import uuid
 from urllib.parse import urlparse
-from typing import Tuple
+from typing import Dict, Optional, Tuple
 from utils.redis_utils import get_redis_client
 from core.logging_config import get_logger
 
@@ -13,57 +16,126 @@ logger = get_logger(__name__)
 
 DEFAULT_RATE_LIMIT = 5  # Requests per domain
 DEFAULT_WINDOW_SECONDS = 10  # Window size in seconds
+DEFAULT_MAX_CONCURRENT = int(os.environ.get("DOMAIN_MAX_CONCURRENT", 2))
+# A lease not released by its holder (crashed worker) frees itself after this long
+LEASE_TTL_SECONDS = 600
+# Suggested wait when the window has room but every concurrency slot is taken
+CONCURRENCY_RETRY_SECONDS = 5.0
+
+
+class DomainRateLimited(Exception):
+    """Raised by the acquisition engine when a domain has no capacity; carries the suggested wait."""
+
+    def __init__(self, domain: str, wait_time: float):
+        super().__init__(f"Domain {domain} rate limited, retry in {wait_time}s")
+        self.domain = domain
+        self.wait_time = wait_time
 
 
 class DomainRateLimiter:
     """
-    Enforces per-domain sliding window rate limiting using Redis.
+    Enforces per-domain sliding window rate limiting and a concurrent-fetch cap using Redis.
+    A successful acquire() holds a lease on one concurrency slot until release().
     """
-    def __init__(self, max_requests: int = DEFAULT_RATE_LIMIT, window_seconds: int = DEFAULT_WINDOW_SECONDS):
+
+    # KEYS[1] window zset (member per request), KEYS[2] lease zset (member per in-flight fetch, score = expiry)
+    # ARGV: now_ms, window_ms, max_requests, max_concurrent, lease_ttl_ms, lease token, concurrency retry ms,
+    #       min interval ms between requests (robots.txt crawl-delay, 0 for none)
+    # Returns {1, 0} when admitted, otherwise {0, wait_ms}
+    ACQUIRE_LUA_SCRIPT = """
+    local now = tonumber(ARGV[1])
+    local window = tonumber(ARGV[2])
+    local interval = tonumber(ARGV[8])
+    local horizon = math.max(window, interval)
+    redis.call("zremrangebyscore", KEYS[1], 0, now - horizon)
+    redis.call("zremrangebyscore", KEYS[2], 0, now)
+
+    if interval > 0 then
+        local newest = redis.call("zrange", KEYS[1], -1, -1, "WITHSCORES")
+        if newest[2] and tonumber(newest[2]) + interval > now then
+            return {0, math.max(100, tonumber(newest[2]) + interval - now)}
+        end
+    end
+    if redis.call("zcount", KEYS[1], now - window, "+inf") >= tonumber(ARGV[3]) then
+        local oldest = redis.call("zrangebyscore", KEYS[1], now - window, "+inf", "WITHSCORES", "LIMIT", 0, 1)
+        local wait = 1000
+        if oldest[2] then
+            wait = math.max(100, tonumber(oldest[2]) + window - now)
+        end
+        return {0, wait}
+    end
+    if redis.call("zcard", KEYS[2]) >= tonumber(ARGV[4]) then
+        return {0, tonumber(ARGV[7])}
+    end
+
+    redis.call("zadd", KEYS[1], now, ARGV[6])
+    redis.call("pexpire", KEYS[1], horizon * 2)
+    redis.call("zadd", KEYS[2], now + tonumber(ARGV[5]), ARGV[6])
+    redis.call("pexpire", KEYS[2], tonumber(ARGV[5]))
+    return {1, 0}
+    """
+
+    def __init__(
+        self,
+        max_requests: int = DEFAULT_RATE_LIMIT,
+        window_seconds: int = DEFAULT_WINDOW_SECONDS,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+    ):
         self.max_requests = max_requests
         self.window_seconds = window_seconds
+        self.max_concurrent = max_concurrent
         self._redis = get_redis_client()
+        self._acquire_script = None
+        self._leases: Dict[str, str] = {}
 
     def _get_domain(self, url: str) -> str:
         return urlparse(url).netloc.lower()
 
-    def acquire(self, url: str) -> Tuple[bool, float]:
+    def _keys(self, domain: str) -> Tuple[str, str]:
+        return f"fuze:rate_limit:{domain}", f"fuze:rate_limit:{domain}:inflight"
+
+    def acquire(self, url: str, min_interval: Optional[float] = None) -> Tuple[bool, float]:
         """
-        Check if request to domain can proceed under rate limits.
-        Returns Tuple[allowed: bool, wait_time_seconds: float].
+        Atomically check and claim capacity for a request to the URL's domain.
+        min_interval (seconds, e.g. robots.txt crawl-delay) spaces consecutive requests.
+        Returns Tuple[allowed: bool, wait_time_seconds: float]. Fails open without Redis.
         """
         domain = self._get_domain(url)
         if not domain or not self._redis:
             return True, 0.0
 
-        key = f"fuze:rate_limit:{domain}"
-        now = time.time()
-        cutoff = now - self.window_seconds
-
+        token = uuid.uuid4().hex
         try:
-            pipe = self._redis.pipeline()
-            pipe.zremrangebyscore(key, 0, cutoff)
-            pipe.zcard(key)
-            pipe.zrange(key, 0, 0, withscores=True)
-            pipe.expire(key, self.window_seconds * 2)
-            results = pipe.execute()
-
-            current_count = results[1]
-            oldest_entry = results[2]
-
-            if current_count < self.max_requests:
-                self._redis.zadd(key, {f"{now}": now})
-                return True, 0.0
-
-            # Calculate wait time based on oldest request in window
-            if oldest_entry:
-                oldest_timestamp = oldest_entry[0][1]
-                wait_time = max(0.1, (oldest_timestamp + self.window_seconds) - now)
-            else:
-                wait_time = 1.0
-
-            logger.warning("domain_rate_limit_exceeded", extra={"domain": domain, "current_count": current_count, "wait_time": wait_time})
-            return False, round(wait_time, 2)
+            if self._acquire_script is None:
+                self._acquire_script = self._redis.register_script(self.ACQUIRE_LUA_SCRIPT)
+            admitted, wait_ms = self._acquire_script(
+                keys=list(self._keys(domain)),
+                args=[
+                    int(time.time() * 1000), self.window_seconds * 1000, self.max_requests,
+                    self.max_concurrent, LEASE_TTL_SECONDS * 1000, token, int(CONCURRENCY_RETRY_SECONDS * 1000),
+                    int((min_interval or 0) * 1000)
+                ]
+            )
+            admitted, wait_ms = int(admitted), int(wait_ms)
         except Exception as e:
             logger.warning("rate_limit_check_failed", extra={"domain": domain, "error": str(e)})
             return True, 0.0
+
+        if admitted:
+            self._leases[domain] = token
+            return True, 0.0
+
+        wait_time = round(wait_ms / 1000.0, 2)
+        logger.warning("domain_rate_limit_exceeded", extra={"domain": domain, "wait_time": wait_time})
+        return False, wait_time
+
+    def release(self, url: str):
+        """Give back the concurrency slot claimed by acquire(). The window entry stays."""
+        domain = self._get_domain(url)
+        token = self._leases.pop(domain, None)
+        if token is None or not self._redis:
+            return
+        try:
+            self._redis.zrem(self._keys(domain)[1], token)
+        except Exception as e:
+            logger.debug("rate_limit_release_failed", extra={"domain": domain, "error": str(e)})
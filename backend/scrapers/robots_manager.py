@@ -1,20 +1,58 @@
 """
 Robots Manager Module
 Fetches, caches, and evaluates target domain robots.txt rules to ensure compliance.
+
+Parsed rules live in a per-process LRU keyed by domain, so checking a URL costs a
+dict lookup plus RobotFileParser matching. Redis holds the raw file as the shared
+L2 (an empty value marks a missing or unreachable robots.txt); a local copy never
+outlives the remaining TTL of the Redis key it was read from. A missing entry is
+fetched by one worker at a time per domain; the others wait briefly for it.
 """
 
+import time
+import threading
+from collections import OrderedDict
 from urllib.parse import urlparse
 from urllib.robotparser import RobotFileParser
 import requests
-from typing import Optional
+from typing import Optional, Tuple
 from utils.redis_utils import get_redis_client
 from core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 ROBOTS_CACHE_TTL = 86400  # 24 Hours
+# A robots.txt that could not be fetched (timeout, 5xx, 429) is retried sooner than a 404
+ROBOTS_UNREACHABLE_TTL = 600
 DEFAULT_USER_AGENT = "FUZEBot/2.0 (+https://fuze.app/bot)"
 
+# In-process parsed rules: entry count and how long before re-reading Redis
+LOCAL_CACHE_SIZE = 1024
+LOCAL_CACHE_TTL = 3600
+# Single-flight fetch: how long the fetch lock is held at most, and how long others wait for its result
+FETCH_LOCK_TTL_MS = 10000
+FETCH_WAIT_SECONDS = 6.0
+FETCH_POLL_SECONDS = 0.2
+# A waiter that gave up allows the domain locally for this long, then looks again
+SINGLE_FLIGHT_GIVE_UP_TTL = 60
+
+_local_rules: "OrderedDict[str, Tuple[Optional[RobotFileParser], float]]" = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def _compile(robots_txt: str) -> Optional[RobotFileParser]:
+    """Parse robots.txt once; None means everything is allowed."""
+    if not robots_txt or not robots_txt.strip():
+        return None
+    parser = RobotFileParser()
+    parser.parse(robots_txt.splitlines())
+    return parser
+
+
+def clear_local_cache():
+    with _local_lock:
+        _local_rules.clear()
+
 
 class RobotsManager:
     """
@@ -34,22 +72,12 @@ class RobotsManager:
         Defaults to True if robots.txt cannot be fetched or parsed.
         """
         agent = user_agent or self.user_agent
-        robots_url = self._get_robots_url(target_url)
-        domain = urlparse(target_url).netloc.lower()
-
-        robots_txt_content = self._get_cached_robots_txt(domain)
-        if robots_txt_content is None:
-            robots_txt_content = self._fetch_robots_txt(robots_url)
-            if robots_txt_content is not None:
-                self._cache_robots_txt(domain, robots_txt_content)
-
-        if not robots_txt_content:
+        parser = self._get_rules(target_url)
+        if parser is None:
             # If robots.txt doesn't exist or failed to load, allow fetch by default
             return True
 
         try:
-            parser = RobotFileParser()
-            parser.parse(robots_txt_content.splitlines())
             allowed = parser.can_fetch(agent, target_url)
             if not allowed:
                 logger.warning("robots_txt_disallowed", extra={"url": target_url, "user_agent": agent})
@@ -58,27 +86,105 @@ class RobotsManager:
             logger.warning("robots_txt_parse_error", extra={"url": target_url, "error": str(e)})
             return True
 
-    def _fetch_robots_txt(self, robots_url: str) -> Optional[str]:
+    def crawl_delay(self, target_url: str, user_agent: Optional[str] = None) -> Optional[float]:
+        """Crawl-delay in seconds that robots.txt asks of this agent, if any."""
+        parser = self._get_rules(target_url)
+        if parser is None:
+            return None
+        try:
+            delay = parser.crawl_delay(user_agent or self.user_agent)
+            return float(delay) if delay else None
+        except Exception:
+            return None
+
+    def _get_rules(self, target_url: str) -> Optional[RobotFileParser]:
+        domain = urlparse(target_url).netloc.lower()
+        if not domain:
+            return None
+
+        now = time.monotonic()
+        with _local_lock:
+            entry = _local_rules.get(domain)
+            if entry is not None and entry[1] > now:
+                _local_rules.move_to_end(domain)
+                return entry[0]
+
+        cached = self._get_cached_robots_txt(domain)
+        if cached is None:
+            cached = self._fetch_single_flight(domain, self._get_robots_url(target_url))
+        robots_txt, local_ttl = cached[0], min(LOCAL_CACHE_TTL, cached[1])
+
+        try:
+            parser = _compile(robots_txt)
+        except Exception as e:
+            logger.warning("robots_txt_parse_error", extra={"domain": domain, "error": str(e)})
+            parser = None
+
+        with _local_lock:
+            _local_rules[domain] = (parser, now + local_ttl)
+            _local_rules.move_to_end(domain)
+            while len(_local_rules) > LOCAL_CACHE_SIZE:
+                _local_rules.popitem(last=False)
+        return parser
+
+    def _fetch_single_flight(self, domain: str, robots_url: str) -> Tuple[str, float]:
+        """Fetch robots.txt with one worker per domain; others wait for the shared copy."""
+        if not self._redis:
+            return self._fetch_robots_txt(robots_url)
+
+        from core.distributed_lock import DistributedLock
+        lock = DistributedLock(f"robots_fetch:{domain}", ttl_ms=FETCH_LOCK_TTL_MS)
+        if lock.acquire(blocking=False):
+            try:
+                content, ttl = self._fetch_robots_txt(robots_url)
+                self._cache_robots_txt(domain, content, ttl)
+                return content, ttl
+            finally:
+                lock.release()
+
+        deadline = time.monotonic() + FETCH_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(FETCH_POLL_SECONDS)
+            cached = self._get_cached_robots_txt(domain)
+            if cached is not None:
+                return cached
+        logger.debug("robots_txt_single_flight_wait_expired", extra={"domain": domain})
+        return "", SINGLE_FLIGHT_GIVE_UP_TTL
+
+    def _fetch_robots_txt(self, robots_url: str) -> Tuple[str, int]:
+        """Return (robots.txt body, cache TTL). A 4xx means no rules; errors and 429 are retried sooner."""
         try:
             resp = requests.get(robots_url, timeout=5, headers={"User-Agent": self.user_agent})
             if resp.status_code == 200:
-                return resp.text
+                return resp.text, ROBOTS_CACHE_TTL
+            if 400 <= resp.status_code < 500 and resp.status_code != 429:
+                return "", ROBOTS_CACHE_TTL
         except Exception as e:
             logger.debug("robots_txt_fetch_failed", extra={"robots_url": robots_url, "error": str(e)})
-        return None
+        return "", ROBOTS_UNREACHABLE_TTL
 
-    def _get_cached_robots_txt(self, domain: str) -> Optional[str]:
+    def _get_cached_robots_txt(self, domain: str) -> Optional[Tuple[str, float]]:
+        """Return (robots.txt body, seconds until the Redis copy expires), or None on a miss."""
         if not self._redis:
             return None
         try:
-            return self._redis.get(f"fuze:robots_txt:{domain}")
+            pipe = self._redis.pipeline()
+            pipe.get(f"fuze:robots_txt:{domain}")
+            pipe.pttl(f"fuze:robots_txt:{domain}")
+            cached, pttl = pipe.execute()
         except Exception:
             return None
+        if isinstance(cached, bytes):
+            cached = cached.decode("utf-8", errors="replace")
+        if not isinstance(cached, str):
+            return None
+        ttl = pttl / 1000.0 if isinstance(pttl, int) and pttl >= 0 else ROBOTS_CACHE_TTL
+        return cached, ttl
 
-    def _cache_robots_txt(self, domain: str, content: str):
+    def _cache_robots_txt(self, domain: str, content: str, ttl: int = ROBOTS_CACHE_TTL):
         if not self._redis:
             return
         try:
-            self._redis.setex(f"fuze:robots_txt:{domain}", ROBOTS_CACHE_TTL, content)
+            self._redis.setex(f"fuze:robots_txt:{domain}", ttl, content)
         except Exception as e:
             logger.warning("robots_txt_cache_error", extra={"domain": domain, "error": str(e)})
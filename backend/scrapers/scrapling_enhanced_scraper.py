@@ -54,6 +54,7 @@ except Exception as e:
 
 # Import existing scraper as fallback
 from scrapers.enhanced_web_scraper import EnhancedWebScraper
+from scrapers.text_cleaner import clean_extracted_text, count_special_chars
 from bs4 import BeautifulSoup
 
 class ScraplingEnhancedScraper:
@@ -254,7 +255,7 @@ class ScraplingEnhancedScraper:
             score += 5.0  # Very long might be noise
         
         # Penalize CSS/JS patterns
-        special_chars = sum(1 for c in content if c in '{}(),;:[]=+-*/%<>!&|')
+        special_chars = count_special_chars(content)
         special_ratio = special_chars / length if length > 0 else 0
         if special_ratio > 0.3:  # More than 30% special chars = likely CSS/JS
             score -= 20.0  # Heavy penalty
@@ -1095,131 +1096,7 @@ class ScraplingEnhancedScraper:
     
     def _clean_and_optimize_content(self, content: str) -> str:
         """Clean and optimize content for better quality"""
-        if not content:
-            return ""
-        
-        import re
-        
-        # Remove CSS styles (e.g., .class-name { property: value; })
-        # Match CSS selectors and rules
-        content = re.sub(r'\.[a-zA-Z0-9_-]+\s*\{[^}]*\}', '', content)
-        content = re.sub(r'#[a-zA-Z0-9_-]+\s*\{[^}]*\}', '', content)
-        content = re.sub(r'[a-zA-Z0-9_-]+\s*\{[^}]*\}', '', content)
-        content = re.sub(r'@media[^{]*\{[^}]*\}', '', content, flags=re.DOTALL)
-        
-        # Remove inline styles (style="...")
-        content = re.sub(r'style\s*=\s*["\'][^"\']*["\']', '', content, flags=re.IGNORECASE)
-        
-        # Remove JSON-like configuration objects (common in modern web apps)
-        # Match { "key": "value", ... } patterns that look like config
-        content = re.sub(r'\{\s*"[^"]+":\s*"[^"]*",?\s*\}', '', content)
-        content = re.sub(r'\{\s*"[^"]+":\s*\[[^\]]*\],?\s*\}', '', content)
-        
-        # Remove CSS property patterns (property: value;)
-        content = re.sub(r'[a-zA-Z-]+\s*:\s*[^;]+;', '', content)
-        
-        # Remove HTML entity codes and encoded content
-        content = re.sub(r'&[a-zA-Z0-9#]+;', ' ', content)
-        
-        # Remove class names and IDs that look like CSS (e.g., ._23tra1HsiiP6cT-Cka-ycB)
-        content = re.sub(r'\.[a-zA-Z0-9_-]{20,}', '', content)  # Long class names
-        content = re.sub(r'#[a-zA-Z0-9_-]{20,}', '', content)  # Long IDs
-        
-        # Remove CSS selectors (e.g., div[dir="rtl"])
-        content = re.sub(r'[a-zA-Z]+\[[^\]]+\]', '', content)
-        
-        # Remove color codes and hex colors
-        content = re.sub(r'#[0-9a-fA-F]{3,6}\b', '', content)
-        content = re.sub(r'rgba?\([^)]+\)', '', content)
-        
-        # Remove CSS units and measurements
-        content = re.sub(r'\d+px\b', '', content)
-        content = re.sub(r'\d+%', '', content)
-        content = re.sub(r'\d+em\b', '', content)
-        content = re.sub(r'\d+rem\b', '', content)
-        
-        # Remove CSS media queries
-        content = re.sub(r'@media[^\{]*', '', content, flags=re.IGNORECASE)
-        
-        # Remove common CSS keywords
-        css_keywords = [
-            'position', 'display', 'top', 'left', 'right', 'bottom', 'width', 'height',
-            'margin', 'padding', 'border', 'background', 'color', 'font', 'z-index',
-            'transition', 'transform', 'opacity', 'box-shadow', 'cursor', 'outline',
-            'float', 'clear', 'overflow', 'text-align', 'vertical-align', 'line-height',
-            'font-size', 'font-weight', 'font-family', 'text-decoration', 'box-sizing',
-            'flex', 'grid', 'align', 'justify', 'gap', 'min-width', 'max-width',
-            'min-height', 'max-height', 'calc', '!important'
-        ]
-        for keyword in css_keywords:
-            content = re.sub(rf'\b{re.escape(keyword)}\s*:', '', content, flags=re.IGNORECASE)
-        
-        # Remove JavaScript-like patterns
-        content = re.sub(r'function\s*\([^)]*\)\s*\{[^}]*\}', '', content)
-        content = re.sub(r'const\s+\w+\s*=\s*\{[^}]*\}', '', content)
-        content = re.sub(r'let\s+\w+\s*=\s*\{[^}]*\}', '', content)
-        content = re.sub(r'var\s+\w+\s*=\s*\{[^}]*\}', '', content)
-        
-        # Remove JSON-like feature flags arrays
-        content = re.sub(r'"featureFlags":\s*\[[^\]]*\]', '', content, flags=re.IGNORECASE)
-        
-        # Remove URLs in content (but keep text)
-        content = re.sub(r'https?://[^\s]+', '', content)
-        
-        # Remove email-like patterns that are actually CSS/JS
-        content = re.sub(r'[a-zA-Z0-9._-]+@[a-zA-Z0-9._-]+\.[a-zA-Z]{2,}', '', content)
-        
-        # Remove extra whitespace but preserve structure
-        content = re.sub(r' +', ' ', content)
-        content = re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
-        content = content.strip()
-        
-        # Remove lines that are mostly CSS/JS patterns (more than 50% special chars)
-        lines = content.split('\n')
-        cleaned_lines = []
-        for line in lines:
-            line_stripped = line.strip()
-            if not line_stripped:
-                continue
-            
-            # Skip lines that are mostly CSS/JS
-            special_chars = sum(1 for c in line_stripped if c in '{}(),;:[]=+-*/%<>!&|')
-            if len(line_stripped) > 0 and special_chars / len(line_stripped) > 0.5:
-                continue
-            
-            # Skip lines that look like CSS selectors
-            if re.match(r'^[.#]?[a-zA-Z0-9_-]+\s*\{', line_stripped):
-                continue
-            
-            # Skip lines that are just CSS properties
-            if re.match(r'^\s*[a-zA-Z-]+\s*:\s*[^;]+;\s*$', line_stripped):
-                continue
-            
-            cleaned_lines.append(line)
-        
-        content = '\n'.join(cleaned_lines)
-        
-        # Remove common boilerplate that doesn't add value
-        boilerplate_patterns = [
-            r'cookie\s+policy.*?\.',
-            r'privacy\s+policy.*?\.',
-            r'terms\s+of\s+service.*?\.',
-            r'sign\s+in\s+to\s+continue.*?\.',
-            r'please\s+enable\s+javascript.*?\.',
-            r'javascript\s+required.*?\.',
-            r'skip\s+to\s+content',
-            r'navigation\s+menu',
-        ]
-        
-        for pattern in boilerplate_patterns:
-            content = re.sub(pattern, '', content, flags=re.IGNORECASE)
-        
-        # Final cleanup
-        content = re.sub(r' +', ' ', content)
-        content = re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
-        content = content.strip()
-        
-        return content
+        return clean_extracted_text(content)
     
     def _compute_quality_score(self, content: str, title: str, meta_description: str) -> int:
         """Compute quality score for scraped content - enhanced version"""
@@ -1277,7 +1154,7 @@ class ScraplingEnhancedScraper:
         
         # Penalize if content is mostly CSS/JS (high special char ratio)
         if content_length > 0:
-            special_chars = sum(1 for c in content if c in '{}(),;:[]=+-*/%<>!&|')
+            special_chars = count_special_chars(content)
             special_char_ratio = special_chars / content_length
             if special_char_ratio > 0.3:  # More than 30% special chars = likely CSS/JS
                 score -= 5  # Heavy penalty for CSS/JS content
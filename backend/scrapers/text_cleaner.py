@@ -0,0 +1,162 @@
+"""
+Text Cleaner Module
+Strips CSS/JS residue and boilerplate from text extracted off rendered pages.
+
+Every rule is compiled once at import. The output is byte-identical to the
+original per-call chain of re.sub calls in ScraplingEnhancedScraper; the speedups
+only ever skip work that provably cannot match:
+
+- Rules that start with a character run ([a-zA-Z0-9_-]+, \\d+, ...) and end
+  outside it are anchored at the start of the run. A match starting mid-run
+  implies one at the run start, which the scan reaches first, so the retries
+  inside long words were wasted. Runs are taken possessively where giving
+  characters back can never let the rest of the rule match.
+- Substitutions whose matches cannot overlap or create each other are merged
+  into one alternation (pixel and percent units, em and rem units, long class/ID names).
+- The CSS keyword rules still run one by one, since removing one keyword can
+  expose another, but only over the spans of text where any of them matches.
+"""
+
+import re
+from typing import Iterable, Iterator
+
+# Characters counted towards the "mostly CSS/JS" line ratio
+SPECIAL_CHARS = '{}(),;:[]=+-*/%<>!&|'
+_DROP_SPECIAL = str.maketrans('', '', SPECIAL_CHARS)
+
+_CSS_RULES = [
+    re.compile(r'\.[a-zA-Z0-9_-]++\s*\{[^}]*\}'),
+    re.compile(r'#[a-zA-Z0-9_-]++\s*\{[^}]*\}'),
+    re.compile(r'(?<![a-zA-Z0-9_-])[a-zA-Z0-9_-]++\s*\{[^}]*\}'),
+    re.compile(r'@media[^{]*\{[^}]*\}', re.DOTALL),
+    re.compile(r'style\s*=\s*["\'][^"\']*["\']', re.IGNORECASE),
+    # JSON-like configuration objects ({ "key": "value" } / { "key": [...] })
+    re.compile(r'\{\s*"[^"]+":\s*"[^"]*",?\s*\}'),
+    re.compile(r'\{\s*"[^"]+":\s*\[[^\]]*\],?\s*\}'),
+    # property: value;
+    re.compile(r'(?<![a-zA-Z-])[a-zA-Z-]++\s*:\s*[^;]+;'),
+]
+_HTML_ENTITY = re.compile(r'&[a-zA-Z0-9#]+;')
+_CSS_FRAGMENTS = [
+    # Long generated class names and IDs (._23tra1HsiiP6cT-Cka-ycB)
+    re.compile(r'[.#][a-zA-Z0-9_-]{20,}'),
+    # Attribute selectors (div[dir="rtl"])
+    re.compile(r'(?<![a-zA-Z])[a-zA-Z]++\[[^\]]+\]'),
+    re.compile(r'#[0-9a-fA-F]{3,6}\b'),
+    re.compile(r'rgba?\([^)]+\)'),
+    # Removing "12%" can put a word boundary after a preceding "12em", so the units take two passes
+    re.compile(r'(?<!\d)\d++(?:px\b|%)'),
+    re.compile(r'(?<!\d)\d++(?:em|rem)\b'),
+    re.compile(r'@media[^\{]*', re.IGNORECASE),
+]
+
+CSS_KEYWORDS = [
+    'position', 'display', 'top', 'left', 'right', 'bottom', 'width', 'height',
+    'margin', 'padding', 'border', 'background', 'color', 'font', 'z-index',
+    'transition', 'transform', 'opacity', 'box-shadow', 'cursor', 'outline',
+    'float', 'clear', 'overflow', 'text-align', 'vertical-align', 'line-height',
+    'font-size', 'font-weight', 'font-family', 'text-decoration', 'box-sizing',
+    'flex', 'grid', 'align', 'justify', 'gap', 'min-width', 'max-width',
+    'min-height', 'max-height', 'calc', '!important'
+]
+_CSS_KEYWORD_RULES = [re.compile(rf'\b{re.escape(keyword)}\s*:', re.IGNORECASE) for keyword in CSS_KEYWORDS]
+# Lookahead on the possible first characters spares trying every alternative at every position
+_ANY_CSS_KEYWORD = re.compile(
+    r'(?=[' + re.escape(''.join(sorted({keyword[0] for keyword in CSS_KEYWORDS}))) + r'])'
+    r'\b(?:' + '|'.join(re.escape(keyword) for keyword in CSS_KEYWORDS) + r')\s*:', re.IGNORECASE
+)
+# Keyword matches, and any text a removal can join together, lie within runs of these characters
+# (case-insensitive matches of the ASCII keywords are word characters too)
+_KEYWORD_SPAN_BREAK = re.compile(r'([^\w\s:!-]+)')
+# Joins the spans that need the keyword rules; it is outside the span alphabet, so never matched or removed
+_SPAN_SEPARATOR = '\x00'
+
+_SCRIPT_RESIDUE = [
+    re.compile(r'function\s*\([^)]*\)\s*\{[^}]*\}'),
+    re.compile(r'const\s+\w+\s*=\s*\{[^}]*\}'),
+    re.compile(r'let\s+\w+\s*=\s*\{[^}]*\}'),
+    re.compile(r'var\s+\w+\s*=\s*\{[^}]*\}'),
+    re.compile(r'"featureFlags":\s*\[[^\]]*\]', re.IGNORECASE),
+    re.compile(r'https?://[^\s]+'),
+    # Email-like tokens, usually CSS/JS rather than addresses
+    re.compile(r'[a-zA-Z0-9._-]++@[a-zA-Z0-9._-]+\.[a-zA-Z]{2,}'),
+]
+
+_SPACES = re.compile(r' +')
+_BLANK_LINES = re.compile(r'\n\s*\n\s*\n+')
+_CSS_SELECTOR_LINE = re.compile(r'^[.#]?[a-zA-Z0-9_-]++\s*\{')
+_CSS_PROPERTY_LINE = re.compile(r'^\s*[a-zA-Z-]++\s*:\s*[^;]+;\s*$')
+
+BOILERPLATE_RULES = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'cookie\s+policy.*?\.',
+        r'privacy\s+policy.*?\.',
+        r'terms\s+of\s+service.*?\.',
+        r'sign\s+in\s+to\s+continue.*?\.',
+        r'please\s+enable\s+javascript.*?\.',
+        r'javascript\s+required.*?\.',
+        r'skip\s+to\s+content',
+        r'navigation\s+menu',
+    )
+]
+
+
+def count_special_chars(text: str) -> int:
+    """Number of SPECIAL_CHARS in text."""
+    return len(text) - len(text.translate(_DROP_SPECIAL))
+
+
+def _strip_css_keywords(content: str) -> str:
+    if ':' not in content:
+        return content
+    # pieces alternates span, break, span, ...; only spans holding a keyword can change
+    pieces = _KEYWORD_SPAN_BREAK.split(content)
+    hits = [i for i in range(0, len(pieces), 2) if ':' in pieces[i] and _ANY_CSS_KEYWORD.search(pieces[i])]
+    if not hits:
+        return content
+    spans = _SPAN_SEPARATOR.join(pieces[i] for i in hits)
+    for rule in _CSS_KEYWORD_RULES:
+        spans = rule.sub('', spans)
+    for i, span in zip(hits, spans.split(_SPAN_SEPARATOR)):
+        pieces[i] = span
+    return ''.join(pieces)
+
+
+def _collapse_whitespace(content: str) -> str:
+    content = _SPACES.sub(' ', content)
+    return _BLANK_LINES.sub('\n\n', content).strip()
+
+
+def _content_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Drop blank lines and lines that are mostly CSS/JS."""
+    for line in lines:
+        line_stripped = line.strip()
+        if not line_stripped:
+            continue
+        if count_special_chars(line_stripped) / len(line_stripped) > 0.5:
+            continue
+        if _CSS_SELECTOR_LINE.match(line_stripped) or _CSS_PROPERTY_LINE.match(line_stripped):
+            continue
+        yield line
+
+
+def clean_extracted_text(content: str) -> str:
+    """Remove CSS, inline styles, script residue, URLs and boilerplate from extracted page text."""
+    if not content:
+        return ""
+
+    for rule in _CSS_RULES:
+        content = rule.sub('', content)
+    content = _HTML_ENTITY.sub(' ', content)
+    for rule in _CSS_FRAGMENTS:
+        content = rule.sub('', content)
+    content = _strip_css_keywords(content)
+    for rule in _SCRIPT_RESIDUE:
+        content = rule.sub('', content)
+    content = _collapse_whitespace(content)
+
+    content = '\n'.join(_content_lines(content.split('\n')))
+
+    for rule in BOILERPLATE_RULES:
+        content = rule.sub('', content)
+    return _collapse_whitespace(content)
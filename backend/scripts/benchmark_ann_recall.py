@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+scripts/benchmark_ann_recall.py
+===============================
+Recall@k and latency of per-user vector search against exact brute-force KNN.
+
+Query vectors are sampled from the user's own embeddings. Each is run three ways:
+  exact     - ORDER BY distance + 0 (HNSW index bypassed), the ground truth
+  hnsw      - plain HNSW scan with default settings and the user_id post-filter
+  strategy  - whatever utils.ann_strategy.prepare_ann_scan picks for this user
+
+Requires PostgreSQL with pgvector and migration 0013 applied.
+
+Usage:
+    cd backend
+    python scripts/benchmark_ann_recall.py --user-id 1
+    python scripts/benchmark_ann_recall.py --user-id 1 --k 20 --queries 50
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+# Ensure backend/ is on sys.path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from sqlalchemy import text
+
+from utils.ann_strategy import prepare_ann_scan, ann_order_sql
+
+DISTANCE_SQL = "embedding <=> CAST(:query AS vector(384))"
+KNN_SQL = """
+    SELECT id FROM saved_content
+    WHERE user_id = :user_id AND embedding IS NOT NULL
+    ORDER BY {order_by}
+    LIMIT :k
+"""
+EXACT_SQL = text(KNN_SQL.format(order_by=ann_order_sql(DISTANCE_SQL, True)))
+HNSW_SQL = text(KNN_SQL.format(order_by=ann_order_sql(DISTANCE_SQL, False)))
+
+
+def run_knn(session, sql, params, prepare=None):
+    """Run one KNN query in its own transaction; returns (ids, ms)."""
+    start = time.perf_counter()
+    if prepare:
+        sql = EXACT_SQL if prepare() else HNSW_SQL
+    ids = [row.id for row in session.execute(sql, params)]
+    elapsed = (time.perf_counter() - start) * 1000
+    session.rollback()  # drop transaction-local scan settings
+    return ids, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-user ANN recall and latency")
+    parser.add_argument("--user-id", type=int, required=True, help="User whose library is searched")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per query")
+    parser.add_argument("--queries", type=int, default=30, help="Number of sampled query vectors")
+    args = parser.parse_args()
+
+    from run_production import create_app
+    from models import db
+
+    app = create_app()
+    with app.app_context():
+        session = db.session
+        if session.get_bind().dialect.name != 'postgresql':
+            print("This benchmark needs PostgreSQL with pgvector (DATABASE_URL).")
+            return 1
+
+        queries = [row.embedding_text for row in session.execute(text("""
+            SELECT embedding::text AS embedding_text FROM saved_content
+            WHERE user_id = :user_id AND embedding IS NOT NULL
+            ORDER BY random() LIMIT :n
+        """), {"user_id": args.user_id, "n": args.queries})]
+        session.rollback()
+        if not queries:
+            print(f"User {args.user_id} has no embedded bookmarks.")
+            return 1
+
+        recall = {"hnsw": [], "strategy": []}
+        latency = {"exact": [], "hnsw": [], "strategy": []}
+        exact_chosen = False
+
+        for query in queries:
+            params = {"user_id": args.user_id, "query": query, "k": args.k}
+            truth, ms = run_knn(session, EXACT_SQL, params)
+            latency["exact"].append(ms)
+            if not truth:
+                continue
+
+            def prepare():
+                nonlocal exact_chosen
+                exact_chosen = prepare_ann_scan(session, args.user_id, args.k)
+                return exact_chosen
+
+            for name, prep in (("hnsw", None), ("strategy", prepare)):
+                ids, ms = run_knn(session, HNSW_SQL, params, prep)
+                latency[name].append(ms)
+                recall[name].append(len(set(ids) & set(truth)) / len(truth))
+
+        print(f"User {args.user_id}: {len(queries)} queries, k={args.k}, "
+              f"strategy chose {'exact scan' if exact_chosen else 'iterative HNSW'}")
+        for name in ("exact", "hnsw", "strategy"):
+            line = f"  {name:<9} p50 {statistics.median(latency[name]):7.2f} ms"
+            line += f"  p95 {sorted(latency[name])[int(0.95 * (len(latency[name]) - 1))]:7.2f} ms"
+            if name in recall and recall[name]:
+                line += f"  recall@{args.k} {statistics.mean(recall[name]):.3f}"
+            print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+scripts/benchmark_text_cleaner.py
+=================================
+Regression check and micro-benchmark for scrapers.text_cleaner against the
+per-call re.sub chain it replaced in ScraplingEnhancedScraper._clean_and_optimize_content.
+Every document must clean to byte-identical output; the script exits non-zero otherwise.
+
+The corpus is either synthetic page text or real extracted_text exported with
+    python scripts/find_bad_extractions.py --export-corpus bad_extractions_corpus.json
+
+Usage:
+    cd backend
+    python scripts/benchmark_text_cleaner.py
+    python scripts/benchmark_text_cleaner.py --corpus bad_extractions_corpus.json --rounds 5
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+# Ensure backend/ is on sys.path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from scrapers.text_cleaner import clean_extracted_text
+
+SYNTHETIC_FRAGMENTS = [
+    "Getting started with React hooks and state management in large applications.",
+    "The quick brown fox jumps over the lazy dog while the compiler optimizes loops.",
+    "Binary search halves the interval on every step, so it runs in O(log n) time.",
+    ".css-1x2y3z { color: #fff; margin: 0 10px; }",
+    "#header-nav{display:flex}",
+    "@media (max-width: 600px) { .a { width: 100%; } }",
+    'style="color: red"',
+    '{"theme": "dark", }',
+    '{"featureFlags": ["a","b"]}',
+    '"featureFlags": ["search", "dark-mode"]',
+    "font-size: 14px; line-height: 1.5em;",
+    "Read more at https://example.com/path?x=1 or mail dev@example.com",
+    "&nbsp;&amp; entities &#39;",
+    "._23tra1HsiiP6cT-Cka-ycBxxxx #a1B2c3D4e5F6g7H8i9J0kk",
+    'div[dir="rtl"] rgba(0,0,0,0.5) 2rem 3em 50% #a0f',
+    "function(a,b){return a+b}",
+    "const cfg = {a: 1} let x = {b: 2} var y = {c: 3}",
+    "Accept our cookie policy to continue. Skip to content",
+    "Privacy Policy applies here. Terms of Service apply.",
+    "Sign in to continue. Please enable JavaScript to view. JavaScript required.",
+    "z-index: 10", "Position: absolute top: 0", "Text-Align :center !important:",
+    "min-width: 300px max-width:", "line-height : 2", "Navigation menu",
+    "{} () ;; ::", "a {", "color:red;", "  margin: 0 auto;  ",
+]
+
+
+# Previous implementation, kept verbatim for comparison
+def legacy_clean(content: str) -> str:
+    if not content:
+        return ""
+
+    # Remove CSS styles (e.g., .class-name { property: value; })
+    # Match CSS selectors and rules
+    content = re.sub(r'\.[a-zA-Z0-9_-]+\s*\{[^}]*\}', '', content)
+    content = re.sub(r'#[a-zA-Z0-9_-]+\s*\{[^}]*\}', '', content)
+    content = re.sub(r'[a-zA-Z0-9_-]+\s*\{[^}]*\}', '', content)
+    content = re.sub(r'@media[^{]*\{[^}]*\}', '', content, flags=re.DOTALL)
+
+    # Remove inline styles (style="...")
+    content = re.sub(r'style\s*=\s*["\'][^"\']*["\']', '', content, flags=re.IGNORECASE)
+
+    # Remove JSON-like configuration objects (common in modern web apps)
+    # Match { "key": "value", ... } patterns that look like config
+    content = re.sub(r'\{\s*"[^"]+":\s*"[^"]*",?\s*\}', '', content)
+    content = re.sub(r'\{\s*"[^"]+":\s*\[[^\]]*\],?\s*\}', '', content)
+
+    # Remove CSS property patterns (property: value;)
+    content = re.sub(r'[a-zA-Z-]+\s*:\s*[^;]+;', '', content)
+
+    # Remove HTML entity codes and encoded content
+    content = re.sub(r'&[a-zA-Z0-9#]+;', ' ', content)
+
+    # Remove class names and IDs that look like CSS (e.g., ._23tra1HsiiP6cT-Cka-ycB)
+    content = re.sub(r'\.[a-zA-Z0-9_-]{20,}', '', content)  # Long class names
+    content = re.sub(r'#[a-zA-Z0-9_-]{20,}', '', content)  # Long IDs
+
+    # Remove CSS selectors (e.g., div[dir="rtl"])
+    content = re.sub(r'[a-zA-Z]+\[[^\]]+\]', '', content)
+
+    # Remove color codes and hex colors
+    content = re.sub(r'#[0-9a-fA-F]{3,6}\b', '', content)
+    content = re.sub(r'rgba?\([^)]+\)', '', content)
+
+    # Remove CSS units and measurements
+    content = re.sub(r'\d+px\b', '', content)
+    content = re.sub(r'\d+%', '', content)
+    content = re.sub(r'\d+em\b', '', content)
+    content = re.sub(r'\d+rem\b', '', content)
+
+    # Remove CSS media queries
+    content = re.sub(r'@media[^\{]*', '', content, flags=re.IGNORECASE)
+
+    # Remove common CSS keywords
+    css_keywords = [
+        'position', 'display', 'top', 'left', 'right', 'bottom', 'width', 'height',
+        'margin', 'padding', 'border', 'background', 'color', 'font', 'z-index',
+        'transition', 'transform', 'opacity', 'box-shadow', 'cursor', 'outline',
+        'float', 'clear', 'overflow', 'text-align', 'vertical-align', 'line-height',
+        'font-size', 'font-weight', 'font-family', 'text-decoration', 'box-sizing',
+        'flex', 'grid', 'align', 'justify', 'gap', 'min-width', 'max-width',
+        'min-height', 'max-height', 'calc', '!important'
+    ]
+    for keyword in css_keywords:
+        content = re.sub(rf'\b{re.escape(keyword)}\s*:', '', content, flags=re.IGNORECASE)
+
+    # Remove JavaScript-like patterns
+    content = re.sub(r'function\s*\([^)]*\)\s*\{[^}]*\}', '', content)
+    content = re.sub(r'const\s+\w+\s*=\s*\{[^}]*\}', '', content)
+    content = re.sub(r'let\s+\w+\s*=\s*\{[^}]*\}', '', content)
+    content = re.sub(r'var\s+\w+\s*=\s*\{[^}]*\}', '', content)
+
+    # Remove JSON-like feature flags arrays
+    content = re.sub(r'"featureFlags":\s*\[[^\]]*\]', '', content, flags=re.IGNORECASE)
+
+    # Remove URLs in content (but keep text)
+    content = re.sub(r'https?://[^\s]+', '', content)
+
+    # Remove email-like patterns that are actually CSS/JS
+    content = re.sub(r'[a-zA-Z0-9._-]+@[a-zA-Z0-9._-]+\.[a-zA-Z]{2,}', '', content)
+
+    # Remove extra whitespace but preserve structure
+    content = re.sub(r' +', ' ', content)
+    content = re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
+    content = content.strip()
+
+    # Remove lines that are mostly CSS/JS patterns (more than 50% special chars)
+    lines = content.split('\n')
+    cleaned_lines = []
+    for line in lines:
+        line_stripped = line.strip()
+        if not line_stripped:
+            continue
+
+        # Skip lines that are mostly CSS/JS
+        special_chars = sum(1 for c in line_stripped if c in '{}(),;:[]=+-*/%<>!&|')
+        if len(line_stripped) > 0 and special_chars / len(line_stripped) > 0.5:
+            continue
+
+        # Skip lines that look like CSS selectors
+        if re.match(r'^[.#]?[a-zA-Z0-9_-]+\s*\{', line_stripped):
+            continue
+
+        # Skip lines that are just CSS properties
+        if re.match(r'^\s*[a-zA-Z-]+\s*:\s*[^;]+;\s*$', line_stripped):
+            continue
+
+        cleaned_lines.append(line)
+
+    content = '\n'.join(cleaned_lines)
+
+    # Remove common boilerplate that doesn't add value
+    boilerplate_patterns = [
+        r'cookie\s+policy.*?\.',
+        r'privacy\s+policy.*?\.',
+        r'terms\s+of\s+service.*?\.',
+        r'sign\s+in\s+to\s+continue.*?\.',
+        r'please\s+enable\s+javascript.*?\.',
+        r'javascript\s+required.*?\.',
+        r'skip\s+to\s+content',
+        r'navigation\s+menu',
+    ]
+
+    for pattern in boilerplate_patterns:
+        content = re.sub(pattern, '', content, flags=re.IGNORECASE)
+
+    # Final cleanup
+    content = re.sub(r' +', ' ', content)
+    content = re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
+    content = content.strip()
+
+    return content
+
+
+def build_corpus(documents: int, size: int, seed: int = 11):
+    rng = random.Random(seed)
+    separators = [" ", " ", "\n", "\n\n", "\n\n\n  ", "   ", "\t"]
+    corpus = []
+    for n in range(documents):
+        parts = []
+        length = 0
+        while length < size:
+            part = rng.choice(SYNTHETIC_FRAGMENTS) + rng.choice(separators)
+            parts.append(part)
+            length += len(part)
+        corpus.append({"id": f"synthetic-{n}", "text": "".join(parts)})
+    return corpus
+
+
+def load_corpus(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return [doc for doc in json.load(f) if doc.get("text")]
+
+
+def timed(fn, corpus, rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for doc in corpus:
+            fn(doc["text"])
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark the extracted-text cleaner")
+    parser.add_argument("--corpus", type=str, help="JSON corpus written by find_bad_extractions.py --export-corpus")
+    parser.add_argument("--documents", type=int, default=20, help="Synthetic documents when no corpus is given")
+    parser.add_argument("--size", type=int, default=100000, help="Characters per synthetic document")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed repetitions per implementation")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else build_corpus(args.documents, args.size)
+    if not corpus:
+        print("Corpus is empty")
+        sys.exit(1)
+
+    mismatches = [doc.get("id") for doc in corpus if clean_extracted_text(doc["text"]) != legacy_clean(doc["text"])]
+
+    legacy_ms = timed(legacy_clean, corpus, args.rounds)
+    cleaner_ms = timed(clean_extracted_text, corpus, args.rounds)
+
+    total_chars = sum(len(doc["text"]) for doc in corpus)
+    print(f"Corpus: {len(corpus)} documents, {total_chars} chars, {args.rounds} rounds (median)")
+    print(f"Legacy re.sub chain:  {legacy_ms:.2f} ms")
+    print(f"Compiled cleaner:     {cleaner_ms:.2f} ms")
+    print(f"Speedup: {legacy_ms / cleaner_ms:.1f}x")
+    if mismatches:
+        print(f"OUTPUT MISMATCH in {len(mismatches)} documents: {mismatches[:20]}")
+        sys.exit(1)
+    print("Output byte-identical for every document")
+
+
+if __name__ == "__main__":
+    main()
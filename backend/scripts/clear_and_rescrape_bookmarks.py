@@ -15,6 +15,7 @@ if backend_dir not in sys.path:
 from flask import Flask
 from config import DevelopmentConfig
 from models import db, SavedContent, ContentAnalysis
+from repositories.projections import WITH_TEXT
 from scrapers.scrapling_enhanced_scraper import scrape_url_enhanced
 from utils.embedding_utils import get_embedding
 import logging
@@ -95,7 +96,7 @@ def analyze_extraction_quality():
             # Weird text patterns (CSS/JS-like content)
             weird_text_count = 0
             weird_text_examples = []
-            all_content = db.session.query(SavedContent).filter(
+            all_content = db.session.query(SavedContent).options(WITH_TEXT).filter(
                 SavedContent.extracted_text.isnot(None),
                 SavedContent.extracted_text != ''
             ).limit(1000).all()
@@ -158,13 +159,13 @@ def analyze_extraction_quality():
                 '10000+': 0
             }
             
-            all_with_text = db.session.query(SavedContent).filter(
+            # Lengths are computed in SQL so the text never leaves the server
+            text_lengths = db.session.query(db.func.length(SavedContent.extracted_text)).filter(
                 SavedContent.extracted_text.isnot(None),
                 SavedContent.extracted_text != ''
             ).all()
             
-            for content in all_with_text:
-                length = len(content.extracted_text)
+            for (length,) in text_lengths:
                 if length == 0:
                     length_ranges['0'] += 1
                 elif length <= 100:
@@ -197,7 +198,7 @@ def analyze_extraction_quality():
             logger.info("CONTENT LENGTH DISTRIBUTION:")
             for range_name, count in length_ranges.items():
                 if count > 0:
-                    logger.info(f"  {range_name} chars: {count} ({count/len(all_with_text)*100:.1f}%)" if len(all_with_text) > 0 else f"  {range_name} chars: {count}")
+                    logger.info(f"  {range_name} chars: {count} ({count/len(text_lengths)*100:.1f}%)" if len(text_lengths) > 0 else f"  {range_name} chars: {count}")
             logger.info("")
             logger.info("QUALITY SCORE DISTRIBUTION:")
             if quality_dist:
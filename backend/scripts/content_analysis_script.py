@@ -21,9 +21,11 @@ if backend_dir not in sys.path:
     sys.path.insert(0, backend_dir)
 
 from models import db, SavedContent, ContentAnalysis, User
+from repositories.projections import WITH_TEXT
 from utils.gemini_utils import GeminiAnalyzer
 from utils.redis_utils import redis_cache
 from services.multi_user_api_manager import get_user_api_key
+from ml.content_features import refresh_content_features
 import flask
 
 # Configure logging
@@ -89,7 +91,7 @@ class ContentAnalysisEngine:
         total_bookmarks = SavedContent.query.filter_by(user_id=self.user_id).count()
         logger.info(f"Total bookmarks for user {self.user_id}: {total_bookmarks}")
 
-        query = SavedContent.query.filter_by(user_id=self.user_id)
+        query = SavedContent.query.options(WITH_TEXT).filter_by(user_id=self.user_id)
 
         # Filter out already analyzed content unless force refresh
         if not force_refresh:
@@ -122,11 +124,11 @@ class ContentAnalysisEngine:
 
         for content in saved_content:
             try:
-                # Check rate limit before processing
+                # Reserve quota before processing
                 if self.use_user_api_key:
                     try:
-                        from services.multi_user_api_manager import check_user_rate_limit
-                        rate_limit_status = check_user_rate_limit(self.user_id)
+                        from services.multi_user_api_manager import reserve_user_request
+                        rate_limit_status = reserve_user_request(self.user_id)
                         if not rate_limit_status['can_make_request']:
                             wait_time = rate_limit_status['wait_time_seconds']
                             logger.warning(f"Rate limit exceeded. Waiting {wait_time} seconds...")
@@ -151,14 +153,6 @@ class ContentAnalysisEngine:
                     self.content_analyses.append(analysis_result)
                     analyzed_count += 1
 
-                    # Record API usage for rate limiting
-                    if self.use_user_api_key:
-                        try:
-                            from services.multi_user_api_manager import record_user_request
-                            record_user_request(self.user_id)
-                        except Exception as record_error:
-                            logger.warning(f"Could not record API usage: {record_error}")
-
                     # Log progress
                     if analyzed_count % 5 == 0:  # Log more frequently
                         logger.info(f"Analyzed {analyzed_count}/{len(saved_content)} bookmarks")
@@ -259,6 +253,7 @@ class ContentAnalysisEngine:
                 existing_analysis.relevance_score = analysis_result.get('relevance_score', 50)
                 existing_analysis.updated_at = datetime.now()
                 db.session.commit()
+                refresh_content_features(db.session, existing_analysis.content, existing_analysis)
                 return
 
             # Extract key information from analysis
@@ -282,6 +277,7 @@ class ContentAnalysisEngine:
             # Save to database immediately
             db.session.add(analysis_record)
             db.session.commit()
+            refresh_content_features(db.session, analysis_record.content, analysis_record)
 
             logger.debug(f"Successfully saved analysis for content {content_id}")
 
@@ -15,10 +15,12 @@ if backend_dir not in sys.path:
 from flask import Flask
 from config import DevelopmentConfig
 from models import db, SavedContent
+from repositories.projections import WITH_TEXT
 from sqlalchemy import func
 import logging
 from urllib.parse import urlparse
 import re
+import json
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -72,7 +74,7 @@ def find_bad_extractions():
                     logger.info(f"   - {bm.url[:80]} (ID: {bm.id}, Title: {bm.title[:50]})")
             
             # 4. Very short content (< 100 chars) - likely bad extraction
-            short_content = db.session.query(SavedContent).filter(
+            short_content = db.session.query(SavedContent).options(WITH_TEXT).filter(
                 db.func.length(SavedContent.extracted_text) < 100,
                 SavedContent.extracted_text.isnot(None),
                 SavedContent.extracted_text != '',
@@ -89,7 +91,7 @@ def find_bad_extractions():
                     logger.info(f"     Preview: {preview}...")
             
             # 5. CSS/JS-like content (high special character ratio)
-            all_content = db.session.query(SavedContent).filter(
+            all_content = db.session.query(SavedContent).options(WITH_TEXT).filter(
                 SavedContent.extracted_text.isnot(None),
                 SavedContent.extracted_text != '',
                 ~SavedContent.extracted_text.like('%Unable to extract%'),
@@ -225,6 +227,25 @@ def find_bad_extractions():
             traceback.print_exc()
             return None
 
+def export_corpus(output_file: str, limit: int = 500):
+    """Export extracted_text of problematic bookmarks as a regression corpus for scripts/benchmark_text_cleaner.py"""
+    results = find_bad_extractions()
+    if not results:
+        return 0
+    with app.app_context():
+        ids = results['problematic_ids'][:limit]
+        rows = db.session.query(SavedContent.id, SavedContent.url, SavedContent.extracted_text).filter(
+            SavedContent.id.in_(ids),
+            SavedContent.extracted_text.isnot(None),
+            SavedContent.extracted_text != ''
+        ).all()
+    corpus = [{'id': row.id, 'url': row.url, 'text': row.extracted_text} for row in rows]
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(corpus, f)
+    logger.info(f"\n Exported {len(corpus)} documents to {output_file}")
+    logger.info(f"   Run: python backend/scripts/benchmark_text_cleaner.py --corpus {output_file}")
+    return len(corpus)
+
 def main():
     """Main function"""
     import argparse
@@ -233,10 +254,18 @@ def main():
     parser.add_argument('--export-ids', action='store_true', help='Export problematic IDs to file')
     parser.add_argument('--output-file', type=str, default='bad_extractions_ids.txt',
                        help='Output file for problematic IDs (default: bad_extractions_ids.txt)')
+    parser.add_argument('--export-corpus', type=str, metavar='FILE',
+                       help='Export extracted_text of problematic bookmarks as a JSON text-cleaner regression corpus')
+    parser.add_argument('--corpus-limit', type=int, default=500,
+                       help='Maximum documents in the exported corpus (default: 500)')
     
     args = parser.parse_args()
     
     try:
+        if args.export_corpus:
+            export_corpus(args.export_corpus, args.corpus_limit)
+            return
+        
         results = find_bad_extractions()
         
         # Always export IDs to file for convenience
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+scripts/reconcile_user_stats.py
+===============================
+Recount every user's dashboard counters (user_stats) from saved_content and
+projects, log any drift corrected, and record today's user_stats_daily snapshot.
+
+Counters are also recounted lazily when a user's row is older than
+USER_STATS_RECONCILE_HOURS; run this daily (cron / scheduled job) so inactive
+users keep a snapshot history for month-over-month comparisons.
+
+Usage:
+    cd backend
+    python scripts/reconcile_user_stats.py
+    python scripts/reconcile_user_stats.py --batch-size 500
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# Ensure backend/ is on sys.path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recount per-user dashboard counters")
+    parser.add_argument("--batch-size", type=int, default=200, help="Users recounted per commit")
+    args = parser.parse_args()
+
+    from run_production import create_app
+    from uow.unit_of_work import UnitOfWork
+    from services.user_stats_service import UserStatsService
+
+    app = create_app()
+    with app.app_context():
+        start = time.perf_counter()
+        with UnitOfWork() as uow:
+            processed = UserStatsService(uow).reconcile_all(batch_size=args.batch_size)
+        print(f"Reconciled {processed} users in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
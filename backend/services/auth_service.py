@@ -8,6 +8,7 @@ from typing import Tuple, Optional, List, Dict, Any
 from models import User, TokenFamily
 from core.events import UserRegistered
 from core.logging_config import get_logger
+from core.password_pool import password_pool, PasswordPoolSaturated
 
 logger = get_logger(__name__)
 
@@ -35,6 +36,7 @@ class AuthService:
     """
 
     BCRYPT_WORK_FACTOR = 12
+    BCRYPT_TEST_WORK_FACTOR = 4  # bcrypt's minimum; used by testing apps unless configured
 
     def __init__(self, uow):
         self.uow = uow
@@ -44,25 +46,28 @@ class AuthService:
         import os
         try:
             from flask import current_app
-            if current_app and 'BCRYPT_LOG_ROUNDS' in current_app.config:
-                return int(current_app.config['BCRYPT_LOG_ROUNDS'])
+            if current_app:
+                if 'BCRYPT_LOG_ROUNDS' in current_app.config:
+                    return int(current_app.config['BCRYPT_LOG_ROUNDS'])
+                if current_app.testing:
+                    return self.BCRYPT_TEST_WORK_FACTOR
         except Exception:
             pass
         return int(os.environ.get('BCRYPT_LOG_ROUNDS', self.BCRYPT_WORK_FACTOR))
 
     def hash_password(self, password: str) -> str:
-        """Generate memory-hard bcrypt hash"""
+        """Generate memory-hard bcrypt hash on the password pool"""
         if not password:
             raise ValueError("Password is required")
         if isinstance(password, str):
             password = password.encode('utf-8')
 
         salt = bcrypt.gensalt(rounds=self.work_factor)
-        hashed = bcrypt.hashpw(password, salt)
+        hashed = password_pool.run(bcrypt.hashpw, password, salt)
         return hashed.decode('utf-8')
 
     def verify_password(self, password_hash: str, password: str) -> bool:
-        """Verify password against hash, supporting both legacy werkzeug and bcrypt"""
+        """Verify password against hash, supporting both legacy werkzeug and bcrypt; runs on the password pool"""
         if not password or not password_hash:
             return False
 
@@ -71,7 +76,9 @@ class AuthService:
         if password_hash.startswith(('$2b$', '$2a$', '$2y$')):
             hash_bytes = password_hash.encode('utf-8') if isinstance(password_hash, str) else password_hash
             try:
-                return bcrypt.checkpw(pass_bytes, hash_bytes)
+                return password_pool.run(bcrypt.checkpw, pass_bytes, hash_bytes)
+            except PasswordPoolSaturated:
+                raise
             except Exception as e:
                 logger.error("bcrypt_verification_error", extra={"error": str(e)})
                 return False
@@ -79,7 +86,9 @@ class AuthService:
         try:
             from werkzeug.security import check_password_hash
             pass_str = password.decode('utf-8') if isinstance(password, bytes) else password
-            return check_password_hash(password_hash, pass_str)
+            return password_pool.run(check_password_hash, password_hash, pass_str)
+        except PasswordPoolSaturated:
+            raise
         except Exception as e:
             logger.error("legacy_password_verification_error", extra={"error": str(e)})
             return False
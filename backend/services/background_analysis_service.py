@@ -10,7 +10,8 @@ import os
 import sys
 import threading
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from collections import Counter
+from typing import Dict, List, Optional, Any, Set
 from sqlalchemy import exists
 from core.logging_config import get_logger
 
@@ -24,10 +25,43 @@ if backend_dir not in sys.path:
 from models import db, SavedContent, ContentAnalysis
 from utils.gemini_utils import GeminiAnalyzer
 from utils.redis_utils import RedisCache
+from utils.realtime_bus import publish_progress
 from core.distributed_lock import DistributedLock
+from ml.content_features import refresh_content_features
+from repositories.projections import WITH_TEXT
+from scrapers.models import compute_content_hash, derivation_record, is_derivation_current
 
 _app_instance = None
 
+# Bump when the analysis prompt or result schema changes so stored analyses are recomputed
+ANALYSIS_SCHEMA_VERSION = 1
+
+
+def analysis_model_version() -> str:
+    """Configured Gemini model plus analysis schema version, recorded with each stored analysis."""
+    from utils.unified_config import get_config
+    return f"{get_config().ai.gemini_model}:v{ANALYSIS_SCHEMA_VERSION}"
+
+
+def analysis_input_hash(content: SavedContent) -> str:
+    """Hash of exactly the fields sent to Gemini for this content."""
+    text_to_analyze = content.extracted_text or content.title or content.url or "Untitled content"
+    return compute_content_hash("\n".join([content.title or "Untitled", content.notes or "", text_to_analyze, content.url or ""]))
+
+
+def analysis_is_current(analysis: Optional[ContentAnalysis], derivation: Dict[str, Optional[str]]) -> bool:
+    """
+    True when the stored analysis needs no new Gemini call. Analyses written before provenance was
+    recorded are kept as they are, matching the previous never-overwrite behaviour.
+    """
+    if analysis is None:
+        return False
+    data = analysis.analysis_data if isinstance(analysis.analysis_data, dict) else {}
+    record = data.get('_derived_from')
+    if record is None:
+        return True
+    return is_derivation_current(record, derivation['input_hash'], derivation['model_version'])
+
 
 def get_app():
     """Get Flask app instance, creating if necessary."""
@@ -150,31 +184,64 @@ class BackgroundAnalysisService:
                 return
 
             logger.info("bg_analysis_items_found", extra={"count": len(unanalyzed_content)})
+            reserved_users = self._reserve_batch_quota(unanalyzed_content)
+            # Reserved units not yet spent on a Gemini call; whatever is left goes back to the quota
+            unspent = Counter(c.user_id for c in unanalyzed_content if c.user_id in reserved_users)
 
             processed = 0
-            for content in unanalyzed_content:
-                try:
-                    if hasattr(content, 'user_id'):
-                        progress_key = f"analysis_progress:{content.user_id}"
-                        self.redis_cache.set_cache(progress_key, {
-                            'status': 'analyzing',
-                            'current_item': content.title[:50] if hasattr(content, 'title') else 'Unknown',
-                            'last_updated': datetime.now().isoformat()
-                        }, ttl=3600)
-
-                    self._analyze_single_content(content)
-                    processed += 1
-                    time.sleep(3.0)
-
-                except Exception as e:
-                    logger.error("bg_analysis_single_item_failed", extra={"content_id": content.id, "error": str(e)})
-                    db.session.rollback()
-                    self._mark_failed(content.id)
+            try:
+                for content in unanalyzed_content:
+                    content_id, uid = content.id, content.user_id
+                    try:
+                        if hasattr(content, 'user_id'):
+                            publish_progress(uid, 'analysis', {
+                                'status': 'analyzing',
+                                'current_item': content.title[:50] if hasattr(content, 'title') else 'Unknown',
+                                'last_updated': datetime.now().isoformat()
+                            })
+
+                        if self._analyze_single_content(content, quota_reserved=uid in reserved_users) and unspent[uid] > 0:
+                            unspent[uid] -= 1
+                        processed += 1
+                        time.sleep(3.0)
+
+                    except Exception as e:
+                        logger.error("bg_analysis_single_item_failed", extra={"content_id": content_id, "error": str(e)})
+                        db.session.rollback()
+                        self._mark_failed(content_id)
+            finally:
+                self._release_batch_quota(unspent)
 
         except Exception as e:
             logger.error("bg_analysis_process_failed", extra={"error": str(e)})
             db.session.rollback()
 
+    def _reserve_batch_quota(self, contents: List[SavedContent]) -> Set[int]:
+        """
+        Reserve each user's share of the batch with one quota call per user. Users whose
+        share does not fit are left out and fall back to reserving item by item.
+        """
+        reserved = set()
+        try:
+            from services.multi_user_api_manager import reserve_user_request
+            for uid, n in Counter(c.user_id for c in contents if c.user_id).items():
+                if reserve_user_request(uid, n).get('reserved') == n:
+                    reserved.add(uid)
+        except Exception as e:
+            logger.warning("bg_analysis_batch_reserve_failed", extra={"error": str(e)})
+        return reserved
+
+    def _release_batch_quota(self, unspent: Counter):
+        """Give back batch reservations that no Gemini call used (skipped, failed or never reached)."""
+        try:
+            from services.multi_user_api_manager import release_user_request
+            for uid, n in unspent.items():
+                if n > 0:
+                    release_user_request(uid, n)
+                    logger.info("bg_analysis_batch_quota_released", extra={"user_id": uid, "units": n})
+        except Exception as e:
+            logger.warning("bg_analysis_batch_release_failed", extra={"error": str(e)})
+
     def _get_unanalyzed_content(self) -> List[SavedContent]:
         """
         Query unanalyzed content using an efficient SQL NOT EXISTS clause.
@@ -182,7 +249,7 @@ class BackgroundAnalysisService:
         """
         try:
             subq = exists().where(ContentAnalysis.content_id == SavedContent.id)
-            query = db.session.query(SavedContent).filter(
+            query = db.session.query(SavedContent).options(WITH_TEXT).filter(
                 SavedContent.extracted_text.isnot(None),
                 SavedContent.extracted_text != '',
                 ~subq
@@ -215,14 +282,35 @@ class BackgroundAnalysisService:
             db.session.rollback()
             return []
 
-    def _analyze_single_content(self, content: SavedContent, user_id: Optional[int] = None, pipeline_run_id: Optional[str] = None):
-        """Analyze a single content item without mutating ORM fields or making duplicate LLM calls."""
+    def _analyze_single_content(self, content: SavedContent, user_id: Optional[int] = None,
+                                pipeline_run_id: Optional[str] = None, quota_reserved: bool = False):
+        """
+        Analyze a single content item without duplicate LLM calls. Skips Gemini when the stored
+        analysis was derived from the same input and model version; replaces it when either changed.
+        quota_reserved means the caller already took this item's unit from the user's quota.
+        Returns True when Gemini produced an analysis, i.e. the item's quota unit was spent.
+        """
         from datetime import datetime
         from utils.event_bus import publish_pipeline_event, generate_pipeline_run_id
         run_id = pipeline_run_id or generate_pipeline_run_id()
         target_user_id = user_id or content.user_id
+        gemini_used = False
 
         try:
+            derivation = derivation_record(analysis_input_hash(content), analysis_model_version(), content.content_hash)
+            existing_analysis = db.session.query(ContentAnalysis).filter_by(content_id=content.id).first()
+            if analysis_is_current(existing_analysis, derivation):
+                logger.info("bg_analysis_skipped_input_unchanged", extra={"content_id": content.id, "run_id": run_id})
+                from core.events import AnalysisSkipped
+                from services.pipeline_orchestrator import PipelineOrchestrator
+                PipelineOrchestrator().handle_event(AnalysisSkipped(
+                    bookmark_id=content.id,
+                    user_id=target_user_id,
+                    content_hash=content.content_hash,
+                    pipeline_run_id=run_id
+                ))
+                return False
+
             logger.info("bg_analysis_analyzing_content", extra={"content_id": content.id, "user_id": target_user_id, "run_id": run_id})
 
             # Emit Stage 3 Started
@@ -240,10 +328,13 @@ class BackgroundAnalysisService:
 
             if target_user_id:
                 try:
-                    from services.multi_user_api_manager import get_user_api_key, check_user_rate_limit
-                    rate_status = check_user_rate_limit(target_user_id)
+                    from services.multi_user_api_manager import get_user_api_key, reserve_user_request
+                    rate_status = {} if quota_reserved else reserve_user_request(target_user_id)
                     if not rate_status.get('can_make_request', True):
-                        logger.warning("bg_analysis_rate_limited", extra={"user_id": target_user_id})
+                        logger.warning("bg_analysis_rate_limited", extra={
+                            "user_id": target_user_id,
+                            "retry_after": rate_status.get('wait_time_seconds')
+                        })
                         publish_pipeline_event(
                             event_type="bookmark.pipeline.analysis.failed",
                             bookmark_id=content.id,
@@ -252,7 +343,7 @@ class BackgroundAnalysisService:
                             sequence=6,
                             error={"error_code": "RATE_LIMIT_EXCEEDED", "retryable": True}
                         )
-                        return
+                        return False
 
                     api_key = get_user_api_key(target_user_id)
                 except Exception as e:
@@ -268,13 +359,7 @@ class BackgroundAnalysisService:
                 url=content.url
             )
             analysis_duration_ms = round((time.time() - start_time) * 1000)
-
-            if target_user_id and api_key:
-                try:
-                    from services.multi_user_api_manager import record_user_request
-                    record_user_request(target_user_id)
-                except Exception:
-                    pass
+            gemini_used = bool(analysis_result)
 
             if not analysis_result:
                 logger.warning("bg_analysis_empty_result", extra={"content_id": content.id})
@@ -289,7 +374,7 @@ class BackgroundAnalysisService:
                     sequence=6,
                     error={"error_code": "ANALYSIS_FAILED", "retryable": True}
                 )
-                return
+                return False
 
             # Single-pass summary (avoids second LLM call cost doubling)
             basic_summary = analysis_result.get('summary') or analysis_result.get('brief_summary')
@@ -298,12 +383,13 @@ class BackgroundAnalysisService:
                 basic_summary = f"Content focused on {techs} from {content.title or 'source'}."
 
             analysis_result['basic_summary'] = basic_summary
+            analysis_result['_derived_from'] = derivation
 
-            # Check existing analysis to avoid race conditions
+            # Re-check existing analysis to avoid race conditions with a concurrent worker
             existing_analysis = db.session.query(ContentAnalysis).filter_by(content_id=content.id).first()
-            if existing_analysis:
+            if existing_analysis and analysis_is_current(existing_analysis, derivation):
                 logger.debug("bg_analysis_duplicate_skipped", extra={"content_id": content.id})
-                return
+                return True
 
             key_concepts = analysis_result.get('key_concepts', [])
             content_type = analysis_result.get('content_type', 'article')
@@ -311,15 +397,13 @@ class BackgroundAnalysisService:
             technology_tags = analysis_result.get('technologies', [])
             relevance_score = analysis_result.get('relevance_score', 50)
 
-            analysis = ContentAnalysis(
-                content_id=content.id,
-                analysis_data=analysis_result,
-                key_concepts=', '.join(key_concepts) if isinstance(key_concepts, list) else str(key_concepts),
-                content_type=content_type,
-                difficulty_level=difficulty_level,
-                technology_tags=', '.join(technology_tags) if isinstance(technology_tags, list) else str(technology_tags),
-                relevance_score=relevance_score
-            )
+            analysis = existing_analysis or ContentAnalysis(content_id=content.id)
+            analysis.analysis_data = analysis_result
+            analysis.key_concepts = ', '.join(key_concepts) if isinstance(key_concepts, list) else str(key_concepts)
+            analysis.content_type = content_type
+            analysis.difficulty_level = difficulty_level
+            analysis.technology_tags = ', '.join(technology_tags) if isinstance(technology_tags, list) else str(technology_tags)
+            analysis.relevance_score = relevance_score
 
             content.analysis_status = 'SUCCESS'
             content.analyzed_at = datetime.utcnow()
@@ -330,9 +414,11 @@ class BackgroundAnalysisService:
                 db.session.rollback()
                 if 'unique' in str(db_err).lower() or 'duplicate' in str(db_err).lower():
                     logger.debug("bg_analysis_unique_constraint_race_handled", extra={"content_id": content.id})
-                    return
+                    return True
                 raise
 
+            refresh_content_features(db.session, content, analysis)
+
             # Cache in Redis
             cache_key = f"content_analysis:{content.id}"
             self.redis_cache.set_cache(cache_key, analysis_result, ttl=86400)
@@ -345,11 +431,13 @@ class BackgroundAnalysisService:
                 logger.warning("bg_analysis_cache_invalidation_error", extra={"error": str(inv_err)})
 
             logger.info("bg_analysis_completed_successfully", extra={"content_id": content.id})
+            return True
 
         except Exception as e:
             logger.error("bg_analysis_single_content_exception", extra={"content_id": content.id, "error": str(e)})
             db.session.rollback()
             self._mark_failed(content.id)
+            return gemini_used
 
     def get_cached_analysis(self, content_id: int) -> Optional[Dict]:
         """Get cached analysis for a content item."""
@@ -370,18 +458,19 @@ class BackgroundAnalysisService:
             logger.error("bg_analysis_get_cached_failed", extra={"content_id": content_id, "error": str(e)})
             return None
 
-    def analyze_content_immediately(self, content_id: int, user_id: Optional[int] = None) -> Optional[Dict]:
-        """Analyze content immediately (user-triggered)."""
+    def analyze_content_immediately(self, content_id: int, user_id: Optional[int] = None,
+                                    pipeline_run_id: Optional[str] = None) -> Optional[Dict]:
+        """Analyze content immediately (user-triggered or chained after embedding)."""
         try:
             flask_app = get_app()
             with flask_app.app_context():
-                content = db.session.query(SavedContent).filter_by(id=content_id).first()
+                content = db.session.query(SavedContent).options(WITH_TEXT).filter_by(id=content_id).first()
                 if not content:
                     logger.error("bg_analysis_content_not_found", extra={"content_id": content_id})
                     return None
 
                 target_user_id = user_id or content.user_id
-                self._analyze_single_content(content, user_id=target_user_id)
+                self._analyze_single_content(content, user_id=target_user_id, pipeline_run_id=pipeline_run_id)
                 return self.get_cached_analysis(content_id)
         except Exception as e:
             logger.error("bg_analysis_immediate_failed", extra={"content_id": content_id, "error": str(e)})
@@ -400,5 +489,5 @@ def stop_background_service():
     background_service.stop_background_analysis()
 
 
-def analyze_content(content_id: int, user_id: Optional[int] = None) -> Optional[Dict]:
-    return background_service.analyze_content_immediately(content_id, user_id)
\ No newline at end of file
+def analyze_content(content_id: int, user_id: Optional[int] = None, pipeline_run_id: Optional[str] = None) -> Optional[Dict]:
+    return background_service.analyze_content_immediately(content_id, user_id, pipeline_run_id=pipeline_run_id)
\ No newline at end of file
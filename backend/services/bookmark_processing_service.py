@@ -5,22 +5,26 @@ using the decoupled 5-stage ContentAcquisitionEngine and PipelineOrchestrator.
 """
 
 import time
+import random
 from datetime import datetime
 from typing import Optional, Union, Dict, Any
 from uow.unit_of_work import UnitOfWork
 from services.bookmark_service import BookmarkService
 from scrapers.acquisition_engine import ContentAcquisitionEngine
-from scrapers.models import ContentDocument, compute_content_hash
-from core.events import ScrapingStarted, ScrapingCompleted, ScrapingSkipped, ScrapingFailed
+from scrapers.models import ContentDocument, compute_content_hash, derivation_record, is_derivation_current
+from scrapers.rate_limiter import DomainRateLimited, DEFAULT_WINDOW_SECONDS
+from core.events import ScrapingStarted, ScrapingCompleted, ScrapingSkipped, ScrapingFailed, EmbeddingSkipped
 from services.pipeline_orchestrator import PipelineOrchestrator
 from utils.redis_utils import redis_cache
-from utils.embedding_utils import get_embedding
+from utils.embedding_utils import get_embedding, get_embedding_model_version
 from core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 EXPECTED_EMBEDDING_DIM = 384
 DEFAULT_QUALITY_SCORE = 10
+# A bookmark deferred this many times by its domain's rate limit falls back to RQ's failure retries
+MAX_RATE_LIMIT_DEFERRALS = 50
 
 
 def truncate_title(title: str, max_len: int = 200) -> str:
@@ -52,16 +56,15 @@ def validate_embedding(embedding, expected_dim: int = EXPECTED_EMBEDDING_DIM) ->
     return False
 
 
-def generate_comprehensive_embedding(
+def build_embedding_text(
     title: str,
     description: str,
     meta_description: str,
     headings: list,
-    extracted_text: str,
-    url: Optional[str] = None
-) -> Optional[list]:
+    extracted_text: str
+) -> str:
     """
-    Generate comprehensive embedding.
+    Assemble the text a bookmark embedding is computed from.
     Priority: title > meta_description > headings > notes > extracted_text
     """
     embedding_parts = []
@@ -84,15 +87,83 @@ def generate_comprehensive_embedding(
             text_sample += " " + extracted_text[-1000:]
         embedding_parts.append(text_sample.strip())
 
-    full_text = " | ".join(embedding_parts) if embedding_parts else (title or "Untitled")
-    return get_embedding(full_text)
+    return " | ".join(embedding_parts) if embedding_parts else (title or "Untitled")
+
+
+def generate_comprehensive_embedding(
+    title: str,
+    description: str,
+    meta_description: str,
+    headings: list,
+    extracted_text: str,
+    url: Optional[str] = None
+) -> Optional[list]:
+    """Generate comprehensive embedding from the text assembled by build_embedding_text."""
+    return get_embedding(build_embedding_text(title, description, meta_description, headings, extracted_text))
+
+
+def embedding_derivation(
+    title: str,
+    description: str,
+    meta_description: str,
+    headings: list,
+    extracted_text: str,
+    content_hash: Optional[str] = None
+) -> Dict[str, Optional[str]]:
+    """Provenance of an embedding of these fields with the active model (stored in embedding_metadata)."""
+    text = build_embedding_text(title, description, meta_description, headings, extracted_text)
+    return derivation_record(compute_content_hash(text), get_embedding_model_version(), content_hash)
+
+
+def embedding_is_current(bookmark, derivation: Dict[str, Optional[str]]) -> bool:
+    """True when the stored embedding was computed from the same input by the same model."""
+    if getattr(bookmark, 'embedding_status', None) != 'SUCCESS':
+        return False
+    metadata = getattr(bookmark, 'embedding_metadata', None)
+    if not isinstance(metadata, dict):
+        return False
+    return is_derivation_current(metadata.get('derived_from'), derivation['input_hash'], derivation['model_version'])
+
+
+def store_embedding(bookmark, embedding, derivation: Dict[str, Optional[str]]) -> None:
+    """Persist an embedding together with its provenance."""
+    bookmark.embedding = embedding
+    bookmark.embedding_status = 'SUCCESS'
+    bookmark.embedded_at = datetime.utcnow()
+    metadata = getattr(bookmark, 'embedding_metadata', None)
+    metadata = dict(metadata) if isinstance(metadata, dict) else {}
+    metadata['derived_from'] = derivation
+    # Reassign rather than mutate: plain JSON columns do not track in-place changes
+    bookmark.embedding_metadata = metadata
 
 
-def process_bookmark_content_task(bookmark_id: int, url: str, user_id: int):
+def defer_rate_limited_bookmark(bookmark_id: int, url: str, user_id: int, limited: DomainRateLimited, deferrals: int) -> bool:
+    """
+    Schedule the bookmark to be processed again once its domain has capacity.
+    The delay is the limiter's wait plus jitter that widens with each deferral, so a
+    bulk import of one domain spreads out instead of retrying in lockstep.
+    """
+    if deferrals >= MAX_RATE_LIMIT_DEFERRALS:
+        logger.warning("bg_acquisition_rate_limit_deferrals_exhausted", extra={"bookmark_id": bookmark_id, "domain": limited.domain})
+        return False
+
+    from services.task_queue import schedule_bookmark_processing
+    delay = limited.wait_time + random.uniform(0, DEFAULT_WINDOW_SECONDS * min(deferrals + 1, 6))
+    job = schedule_bookmark_processing(bookmark_id, url, user_id, delay_seconds=delay, rate_limit_deferrals=deferrals + 1)
+    if job is None:
+        return False
+    logger.info("bg_acquisition_deferred", extra={
+        "bookmark_id": bookmark_id, "domain": limited.domain, "delay_seconds": round(delay, 2), "deferrals": deferrals + 1
+    })
+    return True
+
+
+def process_bookmark_content_task(bookmark_id: int, url: str, user_id: int, rate_limit_deferrals: int = 0):
     """
     RQ Task function executing the 5-Stage Content Acquisition Engine.
     Acquires, quality-evaluates, normalizes, fingerprint-checks, and persists content,
     then notifies PipelineOrchestrator for downstream processing.
+    A rate-limited domain reschedules the task instead of fetching or holding the worker.
     """
     from utils.event_bus import publish_pipeline_event, generate_pipeline_run_id
     pipeline_run_id = generate_pipeline_run_id()
@@ -120,7 +191,12 @@ def process_bookmark_content_task(bookmark_id: int, url: str, user_id: int):
 
     try:
         # Step 2: Execute extraction via extract_article_content
-        scraped = extract_article_content(url)
+        try:
+            scraped = extract_article_content(url)
+        except DomainRateLimited as limited:
+            if defer_rate_limited_bookmark(bookmark_id, url, user_id, limited, rate_limit_deferrals):
+                return
+            raise
 
         if isinstance(scraped, ContentDocument):
             extracted_text_raw = scraped.markdown_content
@@ -215,18 +291,27 @@ def process_bookmark_content_task(bookmark_id: int, url: str, user_id: int):
             # Async embeddings / direct embedding generation fallback for legacy tests
             from core.feature_flags import is_enabled
             if not is_enabled("async_embeddings", user_id=user_id):
-                embedding = generate_comprehensive_embedding(
+                derivation = embedding_derivation(
                     title=final_title,
                     description=bookmark_notes,
                     meta_description="",
                     headings=[],
                     extracted_text=extracted_text_raw,
-                    url=url
+                    content_hash=content_hash
                 )
-                if validate_embedding(embedding):
-                    bookmark.embedding = embedding
-                    bookmark.embedding_status = 'SUCCESS'
-                    bookmark.embedded_at = datetime.utcnow()
+                if embedding_is_current(bookmark, derivation):
+                    logger.info("bg_embedding_skipped_input_unchanged", extra={"bookmark_id": bookmark_id})
+                else:
+                    embedding = generate_comprehensive_embedding(
+                        title=final_title,
+                        description=bookmark_notes,
+                        meta_description="",
+                        headings=[],
+                        extracted_text=extracted_text_raw,
+                        url=url
+                    )
+                    if validate_embedding(embedding):
+                        store_embedding(bookmark, embedding, derivation)
 
         # Step 4: Publish Scraping Events & Trigger Pipeline Orchestrator
         orchestrator = PipelineOrchestrator()
@@ -272,7 +357,8 @@ def process_bookmark_content_task(bookmark_id: int, url: str, user_id: int):
 def generate_embedding_task(bookmark_id: int, user_id: int):
     """
     Decoupled RQ Task function for vector embedding generation.
-    Enqueued by PipelineOrchestrator on scraping completion.
+    Enqueued by PipelineOrchestrator on scraping completion. Skips the model call when the stored
+    embedding was derived from the same input by the same model.
     """
     from utils.event_bus import publish_pipeline_event, generate_pipeline_run_id
     pipeline_run_id = generate_pipeline_run_id()
@@ -289,40 +375,55 @@ def generate_embedding_task(bookmark_id: int, user_id: int):
         notes = bookmark.notes or ''
         text = bookmark.extracted_text or ''
         url = bookmark.url
+        content_hash = bookmark.content_hash
+        derivation = embedding_derivation(
+            title=title,
+            description=notes,
+            meta_description="",
+            headings=[],
+            extracted_text=text,
+            content_hash=content_hash
+        )
+        is_current = embedding_is_current(bookmark, derivation)
 
-    start_embed = time.time()
-    embedding = generate_comprehensive_embedding(
-        title=title,
-        description=notes,
-        meta_description="",
-        headings=[],
-        extracted_text=text,
-        url=url
-    )
-    embed_duration_ms = round((time.time() - start_embed) * 1000)
-
-    is_embedded = False
-    with UnitOfWork() as uow:
-        service = BookmarkService(uow)
-        bookmark = service.get_bookmark(bookmark_id)
-        if bookmark:
-            if validate_embedding(embedding):
-                bookmark.embedding = embedding
-                bookmark.embedding_status = 'SUCCESS'
-                bookmark.embedded_at = datetime.utcnow()
-                is_embedded = True
-            else:
-                bookmark.embedding_status = 'FAILED'
-
-    # Selective cache invalidation
-    try:
-        from services.cache_invalidation_service import cache_invalidator
-        cache_invalidator.after_content_update(bookmark_id, user_id)
-        redis_cache.invalidate_query_cache(f"bookmarks:{user_id}:*")
-    except Exception as cache_err:
-        logger.warning("bg_embedding_cache_invalidation_warning", extra={"bookmark_id": bookmark_id, "error": str(cache_err)})
+    if is_current:
+        logger.info("bg_embedding_skipped_input_unchanged", extra={"bookmark_id": bookmark_id, "content_hash": content_hash})
+        PipelineOrchestrator().handle_event(EmbeddingSkipped(
+            bookmark_id=bookmark_id,
+            user_id=user_id,
+            content_hash=content_hash,
+            pipeline_run_id=pipeline_run_id
+        ))
+    else:
+        start_embed = time.time()
+        embedding = generate_comprehensive_embedding(
+            title=title,
+            description=notes,
+            meta_description="",
+            headings=[],
+            extracted_text=text,
+            url=url
+        )
+        embed_duration_ms = round((time.time() - start_embed) * 1000)
 
-    # Trigger AI analysis downstream
+        with UnitOfWork() as uow:
+            service = BookmarkService(uow)
+            bookmark = service.get_bookmark(bookmark_id)
+            if bookmark:
+                if validate_embedding(embedding):
+                    store_embedding(bookmark, embedding, derivation)
+                else:
+                    bookmark.embedding_status = 'FAILED'
+
+        # Selective cache invalidation
+        try:
+            from services.cache_invalidation_service import cache_invalidator
+            cache_invalidator.after_content_update(bookmark_id, user_id)
+            redis_cache.invalidate_query_cache(f"bookmarks:{user_id}:*")
+        except Exception as cache_err:
+            logger.warning("bg_embedding_cache_invalidation_warning", extra={"bookmark_id": bookmark_id, "error": str(cache_err)})
+
+    # Trigger AI analysis downstream; it skips itself when the stored analysis is current
     try:
         from services.background_analysis_service import analyze_content
         analyze_content(bookmark_id, user_id, pipeline_run_id=pipeline_run_id)
@@ -158,4 +158,8 @@ class BookmarkService:
         """Delete all bookmarks for a user."""
         if not user_id:
             return 0
-        return self.uow.bookmarks.delete_all_for_user(user_id)
+        deleted = self.uow.bookmarks.delete_all_for_user(user_id)
+        # Bulk delete bypasses the ORM flush the stats counters follow
+        from services.user_stats_service import UserStatsService
+        UserStatsService(self.uow).invalidate(user_id)
+        return deleted
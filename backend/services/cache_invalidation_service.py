@@ -35,6 +35,9 @@ class _CacheInvalidationMeta(type):
     def invalidate_all_cache(cls, confirm: bool = False) -> bool:
         return cache_invalidator.invalidate_all_cache(confirm=confirm)
 
+    def invalidate_tfidf_corpus(cls, user_id: int) -> bool:
+        return cache_invalidator.invalidate_tfidf_corpus(user_id)
+
     def after_content_save(cls, content_id: int, user_id: int) -> bool:
         return cache_invalidator.after_content_save(content_id, user_id)
 
@@ -190,12 +193,23 @@ class CacheInvalidationService(metaclass=_CacheInvalidationMeta):
             logger.error("cache_invalidate_all_failed", extra={"error": str(e)})
             return False
 
+    def invalidate_tfidf_corpus(self, user_id: int) -> bool:
+        """Retire the user's cached TF-IDF corpus model after their library changes."""
+        try:
+            from ml.simple_ml_enhancer import invalidate_user_tfidf_corpus
+            invalidate_user_tfidf_corpus(user_id)
+            return True
+        except Exception as e:
+            logger.error("cache_invalidate_tfidf_corpus_failed", extra={"user_id": user_id, "error": str(e)})
+            return False
+
     def after_content_save(self, content_id: int, user_id: int) -> bool:
         """Hook called after content is saved."""
         try:
             logger.info("cache_invalidation_hook_content_saved", extra={"content_id": content_id, "user_id": user_id})
             self.invalidate_content_cache(content_id)
             self.invalidate_user_cache(user_id)
+            self.invalidate_tfidf_corpus(user_id)
             return True
         except Exception as e:
             logger.error("cache_invalidation_hook_content_saved_failed", extra={"content_id": content_id, "user_id": user_id, "error": str(e)})
@@ -207,6 +221,7 @@ class CacheInvalidationService(metaclass=_CacheInvalidationMeta):
             logger.info("cache_invalidation_hook_content_updated", extra={"content_id": content_id, "user_id": user_id})
             self.invalidate_content_cache(content_id)
             self.invalidate_user_cache(user_id)
+            self.invalidate_tfidf_corpus(user_id)
             return True
         except Exception as e:
             logger.error("cache_invalidation_hook_content_updated_failed", extra={"content_id": content_id, "user_id": user_id, "error": str(e)})
@@ -218,6 +233,7 @@ class CacheInvalidationService(metaclass=_CacheInvalidationMeta):
             logger.info("cache_invalidation_hook_content_deleted", extra={"content_id": content_id, "user_id": user_id})
             self.invalidate_content_cache(content_id)
             self.invalidate_user_cache(user_id)
+            self.invalidate_tfidf_corpus(user_id)
             return True
         except Exception as e:
             logger.error("cache_invalidation_hook_content_deleted_failed", extra={"content_id": content_id, "user_id": user_id, "error": str(e)})
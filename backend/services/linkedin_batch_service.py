@@ -0,0 +1,127 @@
+"""
+LinkedIn Batch Extraction Service
+Runs LinkedIn post extractions on a process-wide bounded worker pool, with a
+per-host concurrency cap, one shared keep-alive HTTP session and a Redis cache
+of successful extractions keyed by URL.
+"""
+
+import os
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from scrapers.easy_linkedin_scraper import EasyLinkedInScraper
+from utils.redis_utils import redis_cache
+from core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Total extractions in flight per process, across all requests
+BATCH_MAX_WORKERS = int(os.environ.get("LINKEDIN_BATCH_MAX_WORKERS", 6))
+# Concurrent requests to one host (www./m. variants count as one host)
+PER_HOST_LIMIT = int(os.environ.get("LINKEDIN_PER_HOST_LIMIT", 3))
+EXTRACTION_CACHE_TTL = int(os.environ.get("LINKEDIN_EXTRACTION_CACHE_TTL", 6 * 3600))
+
+_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+_session: Optional[requests.Session] = None
+_host_slots: Dict[str, threading.BoundedSemaphore] = {}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS, thread_name_prefix="linkedin-extract")
+        return _executor
+
+
+def _get_session() -> requests.Session:
+    """One keep-alive session for every extraction, its pool sized to the worker pool."""
+    global _session
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=BATCH_MAX_WORKERS)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            EasyLinkedInScraper(session).setup_session()
+            _session = session
+        return _session
+
+
+def _host_slot(url: str) -> threading.BoundedSemaphore:
+    host = urlparse(url).netloc.lower()
+    for prefix in ("www.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    with _lock:
+        if host not in _host_slots:
+            _host_slots[host] = threading.BoundedSemaphore(PER_HOST_LIMIT)
+        return _host_slots[host]
+
+
+def _cache_key(url: str) -> str:
+    return f"linkedin:extract:{hashlib.sha256(url.encode('utf-8')).hexdigest()}"
+
+
+def extract_post(url: str) -> Dict[str, Any]:
+    """Scrape one LinkedIn post, serving and storing successful results in the URL cache."""
+    key = _cache_key(url)
+    cached = redis_cache.get(key)
+    if cached:
+        return dict(cached, cached=True)
+
+    with _host_slot(url):
+        result = EasyLinkedInScraper(_get_session()).scrape_post(url)
+
+    if result and result.get('success'):
+        redis_cache.set_cache(key, result, ttl=EXTRACTION_CACHE_TTL)
+    return result
+
+
+def iter_batch_extractions(
+    urls: List[str],
+    validate: Callable[[str], bool],
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield one result dict per input URL as soon as it is ready (completion order).
+    Each carries the input index; invalid URLs are reported without being fetched.
+    """
+    pending = {}
+    executor = _get_executor()
+    for index, url in enumerate(urls):
+        url_str = (url or '').strip() if isinstance(url, str) else ''
+        if not validate(url_str):
+            yield {'index': index, 'url': url_str, 'success': False, 'error': 'Invalid LinkedIn URL'}
+            continue
+        pending[executor.submit(extract_post, url_str)] = (index, url_str)
+
+    for future in as_completed(pending):
+        index, url_str = pending[future]
+        try:
+            extracted = future.result()
+        except Exception as e:
+            logger.warning("linkedin_batch_url_failed", extra={"url_index": index, "error": str(e)})
+            extracted = None
+
+        if extracted and extracted.get('success'):
+            yield {
+                'index': index,
+                'url': url_str,
+                'success': True,
+                'data': {
+                    'title': extracted.get('title'),
+                    'content': extracted.get('content'),
+                    'quality_score': extracted.get('quality_score', 0),
+                    'method_used': extracted.get('method_used', ''),
+                    'cached': bool(extracted.get('cached'))
+                }
+            }
+        else:
+            yield {'index': index, 'url': url_str, 'success': False, 'error': 'Extraction failed'}
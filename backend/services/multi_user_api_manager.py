@@ -11,7 +11,7 @@ import logging
 import hashlib
 import base64
 import threading
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 from typing import Dict, Optional
 from dataclasses import dataclass, field
 from enum import Enum
@@ -19,6 +19,7 @@ from cryptography.fernet import Fernet
 from dotenv import load_dotenv
 
 from core.logging_config import get_logger
+from core.quota import RedisQuota, QuotaWindow, QuotaDecision
 from utils.redis_utils import RedisCache, redis_cache
 
 logger = get_logger("MultiUserAPIManager")
@@ -61,9 +62,9 @@ class MultiUserAPIManager:
 
     def __init__(self, redis_client=None):
         self.user_api_keys: Dict[int, UserAPIKey] = {}
-        self.rate_limit_cache: Dict[int, Dict] = {}
         self.lock = threading.RLock()
         self.redis = redis_client or redis_cache
+        self.quota = RedisQuota("user", redis_client=self.redis)
 
         self.REQUESTS_PER_MINUTE = 15
         self.REQUESTS_PER_DAY = 1500
@@ -194,120 +195,78 @@ class MultiUserAPIManager:
             logger.error("get_user_api_key_failed", extra={"user_id": user_id, "error": str(e)})
             return os.environ.get('GEMINI_API_KEY')
 
+    def _quota_windows(self):
+        return (
+            QuotaWindow("minute", self.REQUESTS_PER_MINUTE, 60),
+            QuotaWindow("day", self.REQUESTS_PER_DAY, 86400),
+            QuotaWindow("month", self.REQUESTS_PER_MONTH, 2592000),
+        )
+
+    def _rate_status(self, decision: QuotaDecision) -> Dict:
+        return {
+            'can_make_request': decision.allowed,
+            'requests_last_minute': decision.used.get('minute', 0),
+            'requests_today': decision.used.get('day', 0),
+            'requests_this_month': decision.used.get('month', 0),
+            'minute_limit': self.REQUESTS_PER_MINUTE,
+            'daily_limit': self.REQUESTS_PER_DAY,
+            'monthly_limit': self.REQUESTS_PER_MONTH,
+            'remaining': decision.remaining,
+            'wait_time_seconds': decision.retry_after
+        }
+
     def check_user_rate_limit(self, user_id: int) -> Dict:
-        """Check rate limits using Redis atomic counters if available, with thread-safe memory fallback."""
+        """Check rate limits in one atomic Redis round-trip without consuming quota."""
         try:
-            if self.redis and getattr(self.redis, 'connected', False):
-                min_key = f"fuze:rate:{user_id}:minute"
-                day_key = f"fuze:rate:{user_id}:day"
-                month_key = f"fuze:rate:{user_id}:month"
-
-                c_min = int(self.redis.get_cache(min_key) or 0)
-                c_day = int(self.redis.get_cache(day_key) or 0)
-                c_mon = int(self.redis.get_cache(month_key) or 0)
-
-                can_make = (
-                    c_min < self.REQUESTS_PER_MINUTE and
-                    c_day < self.REQUESTS_PER_DAY and
-                    c_mon < self.REQUESTS_PER_MONTH
-                )
-
-                return {
-                    'can_make_request': can_make,
-                    'requests_last_minute': c_min,
-                    'requests_today': c_day,
-                    'requests_this_month': c_mon,
-                    'minute_limit': self.REQUESTS_PER_MINUTE,
-                    'daily_limit': self.REQUESTS_PER_DAY,
-                    'monthly_limit': self.REQUESTS_PER_MONTH,
-                    'wait_time_seconds': 60 if not can_make else 0
-                }
-
-            # Thread-safe in-memory fallback
-            now = datetime.now(timezone.utc)
-            with self.lock:
-                if user_id not in self.rate_limit_cache:
-                    self.rate_limit_cache[user_id] = {
-                        'requests_last_minute': 0,
-                        'requests_today': 0,
-                        'requests_this_month': 0,
-                        'minute_start': now,
-                        'day_start': now,
-                        'month_start': now
-                    }
-
-                rd = self.rate_limit_cache[user_id]
-                if now - rd['minute_start'] > timedelta(minutes=1):
-                    rd['requests_last_minute'] = 0
-                    rd['minute_start'] = now
-
-                if now.date() > rd['day_start'].date():
-                    rd['requests_today'] = 0
-                    rd['day_start'] = now
-
-                if now.month != rd['month_start'].month or now.year != rd['month_start'].year:
-                    rd['requests_this_month'] = 0
-                    rd['month_start'] = now
-
-                can_make = (
-                    rd['requests_last_minute'] < self.REQUESTS_PER_MINUTE and
-                    rd['requests_today'] < self.REQUESTS_PER_DAY and
-                    rd['requests_this_month'] < self.REQUESTS_PER_MONTH
-                )
-
-                return {
-                    'can_make_request': can_make,
-                    'requests_last_minute': rd['requests_last_minute'],
-                    'requests_today': rd['requests_today'],
-                    'requests_this_month': rd['requests_this_month'],
-                    'minute_limit': self.REQUESTS_PER_MINUTE,
-                    'daily_limit': self.REQUESTS_PER_DAY,
-                    'monthly_limit': self.REQUESTS_PER_MONTH,
-                    'wait_time_seconds': 60 if not can_make else 0
-                }
-
+            decision = self.quota.peek(str(user_id), self._quota_windows())
+            return self._rate_status(decision)
         except Exception as e:
             logger.error("check_user_rate_limit_failed", extra={"user_id": user_id, "error": str(e)})
             return {'can_make_request': False, 'wait_time_seconds': 60}
 
-    def record_user_request(self, user_id: int):
-        """Record API request using Redis INCR with TTL expiration."""
+    def reserve_user_request(self, user_id: int, n: int = 1) -> Dict:
+        """
+        Atomically check and reserve n requests across the minute, day and month windows.
+        Nothing is reserved when any window lacks room; 'wait_time_seconds' then says when to retry.
+        """
         try:
-            if self.redis and getattr(self.redis, 'connected', False):
-                min_key = f"fuze:rate:{user_id}:minute"
-                day_key = f"fuze:rate:{user_id}:day"
-                month_key = f"fuze:rate:{user_id}:month"
-
-                # Increment counters
-                val_min = int(self.redis.get_cache(min_key) or 0) + 1
-                self.redis.set_cache(min_key, val_min, ttl=60)
-
-                val_day = int(self.redis.get_cache(day_key) or 0) + 1
-                self.redis.set_cache(day_key, val_day, ttl=86400)
+            decision = self.quota.reserve(str(user_id), self._quota_windows(), n=n)
+            status = self._rate_status(decision)
+            status['reserved'] = n if decision.allowed else 0
+            if decision.allowed:
+                self._touch_user_key(user_id, n)
+            return status
+        except Exception as e:
+            logger.error("reserve_user_request_failed", extra={"user_id": user_id, "error": str(e)})
+            return {'can_make_request': False, 'reserved': 0, 'wait_time_seconds': 60}
 
-                val_mon = int(self.redis.get_cache(month_key) or 0) + 1
-                self.redis.set_cache(month_key, val_mon, ttl=2592000)
-                return
+    def record_user_request(self, user_id: int, n: int = 1):
+        """Count requests that were made without a prior reservation."""
+        try:
+            self.quota.record(str(user_id), self._quota_windows(), n=n)
+            self._touch_user_key(user_id, n)
+        except Exception as e:
+            logger.error("record_user_request_failed", extra={"user_id": user_id, "error": str(e)})
 
-            # Thread-safe in-memory fallback
-            now = datetime.now(timezone.utc)
+    def release_user_request(self, user_id: int, n: int = 1):
+        """Give back reserved requests that were never made."""
+        try:
+            self.quota.release(str(user_id), self._quota_windows(), n=n)
             with self.lock:
-                if user_id not in self.rate_limit_cache:
-                    self.check_user_rate_limit(user_id)
-
-                rd = self.rate_limit_cache[user_id]
-                rd['requests_last_minute'] += 1
-                rd['requests_today'] += 1
-                rd['requests_this_month'] += 1
-
                 if user_id in self.user_api_keys:
                     k = self.user_api_keys[user_id]
-                    k.daily_requests += 1
-                    k.monthly_requests += 1
-                    k.last_used = now
-
+                    k.daily_requests = max(0, k.daily_requests - n)
+                    k.monthly_requests = max(0, k.monthly_requests - n)
         except Exception as e:
-            logger.error("record_user_request_failed", extra={"user_id": user_id, "error": str(e)})
+            logger.error("release_user_request_failed", extra={"user_id": user_id, "error": str(e)})
+
+    def _touch_user_key(self, user_id: int, n: int):
+        with self.lock:
+            if user_id in self.user_api_keys:
+                k = self.user_api_keys[user_id]
+                k.daily_requests += n
+                k.monthly_requests += n
+                k.last_used = datetime.now(timezone.utc)
 
     def save_user_api_key_to_db(self, user_api_key: UserAPIKey, encrypted_key: str):
         """Save encrypted API key metadata to user model in database."""
@@ -392,8 +351,16 @@ def check_user_rate_limit(user_id: int) -> Dict:
     return api_manager.check_user_rate_limit(user_id)
 
 
-def record_user_request(user_id: int):
-    api_manager.record_user_request(user_id)
+def reserve_user_request(user_id: int, n: int = 1) -> Dict:
+    return api_manager.reserve_user_request(user_id, n)
+
+
+def record_user_request(user_id: int, n: int = 1):
+    api_manager.record_user_request(user_id, n)
+
+
+def release_user_request(user_id: int, n: int = 1):
+    api_manager.release_user_request(user_id, n)
 
 
 def get_user_api_stats(user_id: int) -> Dict:
@@ -1,14 +1,14 @@
 """
 Pipeline Orchestrator Service
-Listens to scraping lifecycle events (scraping.completed, scraping.skipped)
-and orchestrates downstream execution for Embedding, AI Analysis, and Recommendation engines
+Listens to pipeline stage events (scraping.completed, scraping.skipped, embedding.skipped,
+analysis.skipped) and orchestrates downstream execution for Embedding, AI Analysis, and Recommendation engines
 with automatic backpressure control.
 """
 
-from typing import Dict, Any, Optional
-from core.events import ScrapingCompleted, ScrapingSkipped, Event
+from typing import Dict, Any, Optional, Union
+from core.events import ScrapingCompleted, ScrapingSkipped, EmbeddingSkipped, AnalysisSkipped, Event
 from core.logging_config import get_logger
-from services.task_queue import get_queue
+from services.task_queue import get_queue, enqueue_unique, job_id_for
 from utils.event_bus import publish_pipeline_event
 
 logger = get_logger(__name__)
@@ -35,6 +35,8 @@ class PipelineOrchestrator:
             return self._on_scraping_completed(event)
         elif isinstance(event, ScrapingSkipped):
             return self._on_scraping_skipped(event)
+        elif isinstance(event, (EmbeddingSkipped, AnalysisSkipped)):
+            return self._on_stage_skipped(event)
         return False
 
     def _on_scraping_completed(self, event: ScrapingCompleted) -> bool:
@@ -71,13 +73,19 @@ class PipelineOrchestrator:
                 logger.debug("queue_length_check_failed", extra={"error": str(len_err)})
 
             try:
-                queue.enqueue(
+                # One embedding job per scraped content version; repeat events join the active job
+                job_id = job_id_for("generate_embedding", event.bookmark_id, event.content_hash[:12])
+                _, created = enqueue_unique(queue, job_id, lambda job_id: queue.enqueue(
                     "services.bookmark_processing_service.generate_embedding_task",
                     bookmark_id=event.bookmark_id,
                     user_id=event.user_id,
-                    job_timeout=120
+                    job_timeout=120,
+                    job_id=job_id
+                ))
+                logger.info(
+                    "orchestrator_enqueued_embedding_task" if created else "orchestrator_embedding_task_already_active",
+                    extra={"bookmark_id": event.bookmark_id, "job_id": job_id}
                 )
-                logger.info("orchestrator_enqueued_embedding_task", extra={"bookmark_id": event.bookmark_id})
             except Exception as e:
                 logger.error("orchestrator_enqueue_embedding_failed", extra={"bookmark_id": event.bookmark_id, "error": str(e)})
 
@@ -89,3 +97,20 @@ class PipelineOrchestrator:
             extra={"bookmark_id": event.bookmark_id, "user_id": event.user_id, "reason": event.reason}
         )
         return True
+
+    def _on_stage_skipped(self, event: Union[EmbeddingSkipped, AnalysisSkipped]) -> bool:
+        """A derived artifact is already current for this content; nothing downstream needs re-running."""
+        stage = "embedding" if isinstance(event, EmbeddingSkipped) else "analysis"
+        logger.info(
+            "orchestrator_handling_stage_skipped",
+            extra={"stage": stage, "bookmark_id": event.bookmark_id, "user_id": event.user_id, "reason": event.reason}
+        )
+        publish_pipeline_event(
+            event_type=f"bookmark.pipeline.{stage}.skipped",
+            bookmark_id=event.bookmark_id,
+            user_id=event.user_id,
+            pipeline_run_id=event.pipeline_run_id or f"run_{stage}_skipped",
+            sequence=4 if stage == "embedding" else 6,
+            data={"reason": event.reason, "content_hash": event.content_hash}
+        )
+        return True
@@ -2,7 +2,7 @@
 """
 Rate Limiting Handler for Gemini API
 Manages global rate limiting for Gemini API calls across threads and multi-worker processes
-using shared Redis counters or thread-safe atomic memory tracking.
+using an atomic Redis quota script or thread-safe in-memory tracking.
 """
 
 import time
@@ -10,8 +10,8 @@ import random
 import threading
 from typing import Optional, Callable, Any, Dict
 from functools import wraps
-from datetime import datetime, timezone, timedelta
 from core.logging_config import get_logger
+from core.quota import RedisQuota, QuotaWindow, QuotaDecision
 from utils.redis_utils import RedisCache, redis_cache
 
 logger = get_logger(__name__)
@@ -30,6 +30,8 @@ class RateLimitHandler:
     Handles global rate limiting for Gemini API calls with Redis persistence and thread locking.
     """
 
+    QUOTA_SUBJECT = "global"
+
     def __init__(self, redis_client=None):
         self.requests_per_minute = 15
         self.requests_per_day = 1500
@@ -39,83 +41,48 @@ class RateLimitHandler:
 
         self.lock = threading.RLock()
         self.redis = redis_client or redis_cache
-        self.request_times = []
-        self.daily_requests = 0
-        self.last_daily_reset = datetime.now(timezone.utc).date()
-
-    def can_make_request(self) -> bool:
-        """Check if request can be made without exceeding limits."""
-        try:
-            if self.redis and getattr(self.redis, 'connected', False):
-                min_key = "fuze:gemini:rpm"
-                day_key = "fuze:gemini:rpd"
-
-                c_min = int(self.redis.get_cache(min_key) or 0)
-                c_day = int(self.redis.get_cache(day_key) or 0)
-
-                if c_min >= self.requests_per_minute or c_day >= self.requests_per_day:
-                    logger.warning("gemini_rate_limit_reached_redis", extra={"min_count": c_min, "day_count": c_day})
-                    return False
-                return True
-
-            # Thread-safe in-memory fallback
-            now = datetime.now(timezone.utc)
-            with self.lock:
-                if now.date() > self.last_daily_reset:
-                    self.daily_requests = 0
-                    self.last_daily_reset = now.date()
-
-                if self.daily_requests >= self.requests_per_day:
-                    logger.warning("gemini_daily_limit_reached_memory")
-                    return False
+        self.quota = RedisQuota("gemini", redis_client=self.redis)
 
-                minute_ago = now - timedelta(minutes=1)
-                self.request_times = [t for t in self.request_times if t > minute_ago]
+    def _quota_windows(self):
+        return (
+            QuotaWindow("minute", self.requests_per_minute, 60),
+            QuotaWindow("day", self.requests_per_day, 86400),
+        )
 
-                if len(self.request_times) >= self.requests_per_minute:
-                    logger.warning("gemini_minute_limit_reached_memory")
-                    return False
+    def reserve(self, n: int = 1) -> QuotaDecision:
+        """Atomically check and take n request slots from the shared Gemini quota."""
+        return self.quota.reserve(self.QUOTA_SUBJECT, self._quota_windows(), n=n)
 
-                return True
+    def status(self) -> QuotaDecision:
+        """Current usage and headroom for one more request, without consuming quota."""
+        return self.quota.peek(self.QUOTA_SUBJECT, self._quota_windows())
 
+    def can_make_request(self) -> bool:
+        """Check if request can be made without exceeding limits."""
+        try:
+            decision = self.status()
+            if not decision.allowed:
+                logger.warning("gemini_rate_limit_reached", extra={
+                    "min_count": decision.used.get("minute", 0),
+                    "day_count": decision.used.get("day", 0)
+                })
+            return decision.allowed
         except Exception as e:
             logger.error("can_make_request_failed", extra={"error": str(e)})
             return True
 
-    def record_request(self):
-        """Record an API request attempt."""
+    def record_request(self, n: int = 1):
+        """Record API request attempts made without a prior reservation."""
         try:
-            if self.redis and getattr(self.redis, 'connected', False):
-                min_key = "fuze:gemini:rpm"
-                day_key = "fuze:gemini:rpd"
-
-                c_min = int(self.redis.get_cache(min_key) or 0) + 1
-                self.redis.set_cache(min_key, c_min, ttl=60)
-
-                c_day = int(self.redis.get_cache(day_key) or 0) + 1
-                self.redis.set_cache(day_key, c_day, ttl=86400)
-                return
-
-            now = datetime.now(timezone.utc)
-            with self.lock:
-                self.request_times.append(now)
-                self.daily_requests += 1
-                minute_ago = now - timedelta(minutes=1)
-                self.request_times = [t for t in self.request_times if t > minute_ago]
-
+            self.quota.record(self.QUOTA_SUBJECT, self._quota_windows(), n=n)
         except Exception as e:
             logger.error("record_request_failed", extra={"error": str(e)})
 
     def get_wait_time(self) -> int:
         """Calculate wait time before next request."""
-        now = datetime.now(timezone.utc)
-        with self.lock:
-            minute_ago = now - timedelta(minutes=1)
-            recent_requests = [t for t in self.request_times if t > minute_ago]
-            if recent_requests:
-                oldest_recent = min(recent_requests)
-                wait_until = oldest_recent + timedelta(minutes=1)
-                return max(0, int((wait_until - now).total_seconds()))
+        try:
+            return self.status().retry_after
+        except Exception:
             return 0
 
     def exponential_backoff(self, attempt: int) -> int:
@@ -150,14 +117,15 @@ def rate_limited(func: Callable = None, *, raise_on_limit: bool = False) -> Call
         def wrapper(*args, **kwargs):
             for attempt in range(global_rate_handler.max_retries + 1):
                 try:
-                    if not global_rate_handler.can_make_request():
-                        wait_time = global_rate_handler.get_wait_time() or 60
+                    decision = global_rate_handler.reserve()
+                    if not decision.allowed:
+                        wait_time = decision.retry_after or 60
                         if raise_on_limit:
                             raise RateLimitExceededException("Rate limit reached", wait_seconds=wait_time)
                         logger.info("rate_limit_reached_waiting", extra={"wait_seconds": wait_time})
                         time.sleep(min(wait_time, 60))
+                        global_rate_handler.record_request()
 
-                    global_rate_handler.record_request()
                     return fn(*args, **kwargs)
 
                 except Exception as e:
@@ -193,17 +161,12 @@ class GeminiRateLimiter:
 
     def get_status(self) -> Dict[str, Any]:
         """Get current rate limiting status using shared rate handler."""
-        now = datetime.now(timezone.utc)
-        with self.rate_handler.lock:
-            minute_ago = now - timedelta(minutes=1)
-            recent_count = len([t for t in self.rate_handler.request_times if t > minute_ago])
-            daily_count = self.rate_handler.daily_requests
-
+        decision = self.rate_handler.status()
         return {
-            'requests_last_minute': recent_count,
-            'requests_today': daily_count,
-            'can_make_request': self.rate_handler.can_make_request(),
-            'wait_time_seconds': self.rate_handler.get_wait_time(),
+            'requests_last_minute': decision.used.get('minute', 0),
+            'requests_today': decision.used.get('day', 0),
+            'can_make_request': decision.allowed,
+            'wait_time_seconds': decision.retry_after,
             'daily_limit': self.rate_handler.requests_per_day,
             'minute_limit': self.rate_handler.requests_per_minute
         }
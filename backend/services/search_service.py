@@ -3,12 +3,15 @@ import json
 import heapq
 import numpy as np
 from typing import List, Dict, Any, Optional
-from sqlalchemy import or_
+from sqlalchemy import Float, or_, text
 from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.engine import Row
 from models import SavedContent
+from repositories.projections import BOOKMARK_CARD_COLUMNS
 from uow.unit_of_work import UnitOfWork
 from utils.embedding_utils import get_embedding
 from utils.query_sanitizer import sanitize_like_query
+from utils.ann_strategy import prepare_ann_scan, ann_order_sql
 from core.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -16,6 +19,64 @@ logger = get_logger(__name__)
 MAX_SEARCH_LIMIT = 100
 MAX_QUERY_LENGTH = 1000
 
+# Reciprocal rank fusion: score = sum(1 / (RRF_K + rank)) over the rankings an item appears in
+RRF_K = 60
+HYBRID_MIN_CANDIDATES = 40
+
+# ANN top-k and lexical top-k as CTEs, fused in-database. Only result-card columns
+# leave the server; extracted_text is reduced to a has_content flag.
+# {ann_order} is the exact or HNSW ordering chosen by utils.ann_strategy.
+_HYBRID_SEARCH_TEMPLATE = """
+    WITH ann AS (
+        SELECT id, ROW_NUMBER() OVER (ORDER BY distance) AS rank
+        FROM (
+            SELECT id, embedding <=> CAST(:embedding AS vector(384)) AS distance
+            FROM saved_content
+            WHERE user_id = :user_id AND embedding IS NOT NULL
+            ORDER BY {ann_order}
+            LIMIT :candidates
+        ) nearest
+    ),
+    lexical AS (
+        SELECT id, ROW_NUMBER() OVER (ORDER BY text_rank DESC) AS rank
+        FROM (
+            SELECT id, ts_rank_cd(search_vector, tsq) AS text_rank
+            FROM saved_content, websearch_to_tsquery('english', :query) AS tsq
+            WHERE user_id = :user_id AND search_vector @@ tsq
+            ORDER BY text_rank DESC
+            LIMIT :candidates
+        ) matched
+    ),
+    fused AS (
+        SELECT COALESCE(ann.id, lexical.id) AS id,
+               COALESCE(1.0 / (:rrf_k + ann.rank), 0) + COALESCE(1.0 / (:rrf_k + lexical.rank), 0) AS score,
+               ann.rank AS vector_rank,
+               lexical.rank AS text_rank
+        FROM ann FULL OUTER JOIN lexical ON ann.id = lexical.id
+    )
+    SELECT sc.id, sc.title, sc.url, sc.notes, sc.saved_at,
+           COALESCE(octet_length(sc.extracted_text), 0) > 0 AS has_content,
+           fused.score, fused.vector_rank, fused.text_rank
+    FROM fused JOIN saved_content sc ON sc.id = fused.id
+    ORDER BY fused.score DESC, sc.saved_at DESC
+    LIMIT :limit
+"""
+_ANN_DISTANCE_SQL = "embedding <=> CAST(:embedding AS vector(384))"
+HYBRID_SEARCH_SQL = text(_HYBRID_SEARCH_TEMPLATE.format(ann_order=ann_order_sql(_ANN_DISTANCE_SQL, False)))
+HYBRID_SEARCH_EXACT_SQL = text(_HYBRID_SEARCH_TEMPLATE.format(ann_order=ann_order_sql(_ANN_DISTANCE_SQL, True)))
+
+
+def reciprocal_rank_fusion(rankings: List[List[Any]], k: int = RRF_K) -> List[tuple]:
+    """Fuse ranked id lists; returns (id, score, [rank per list or None]) best first."""
+    scores: Dict[Any, float] = {}
+    ranks: Dict[Any, List[Optional[int]]] = {}
+    for list_index, ranking in enumerate(rankings):
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + 1.0 / (k + rank)
+            ranks.setdefault(item_id, [None] * len(rankings))[list_index] = rank
+    ordered = sorted(scores, key=lambda item_id: scores[item_id], reverse=True)
+    return [(item_id, scores[item_id], ranks[item_id]) for item_id in ordered]
+
 SUPABASE_URL = os.environ.get("SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
 SUPABASE_TABLE = os.environ.get("SUPABASE_TABLE", "saved_content")
@@ -51,18 +112,42 @@ class SearchService:
         return clean_query
 
     def text_search(self, user_id: int, query: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Perform text-based search across bookmark titles, notes, and extracted text."""
+        """Perform ranked full-text search across bookmark titles, notes, and extracted text."""
         limit = max(1, min(limit, MAX_SEARCH_LIMIT))
         clean_query = self._validate_query(query)
         if not clean_query:
             return []
 
-        sanitized = sanitize_like_query(clean_query)
+        session = self.uow.session
+        results = None
+        try:
+            results = self.uow.bookmarks.full_text_search(user_id, clean_query, limit)
+        except (OperationalError, ProgrammingError) as db_err:
+            session.rollback()
+            logger.info("fulltext_search_fallback_trigger", extra={"user_id": user_id, "error": str(db_err)})
+
+        if results is None:
+            results = self._fallback_text_search(user_id, clean_query, limit)
+
+        return [
+            {
+                'id': content.id,
+                'title': content.title,
+                'url': content.url,
+                'description': content.notes,
+                'saved_at': content.saved_at.isoformat() if content.saved_at else None,
+                'has_content': bool(content.has_content)
+            }
+            for content in results
+        ]
+
+    def _fallback_text_search(self, user_id: int, query: str, limit: int) -> List[Row]:
+        """ILIKE scan used when the full-text index is unavailable (e.g. SQLite)."""
+        sanitized = sanitize_like_query(query)
         if not sanitized:
             return []
 
-        session = self.uow.session
-        results = session.query(SavedContent).filter_by(user_id=user_id).filter(
+        return self.uow.session.query(*BOOKMARK_CARD_COLUMNS).filter(SavedContent.user_id == user_id).filter(
             or_(
                 SavedContent.title.ilike(f'%{sanitized}%', escape='\\'),
                 SavedContent.notes.ilike(f'%{sanitized}%', escape='\\'),
@@ -70,16 +155,72 @@ class SearchService:
             )
         ).order_by(SavedContent.saved_at.desc()).limit(limit).all()
 
+    def hybrid_search(self, user_id: int, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Hybrid search: pgvector ANN top-k and full-text top-k fused with reciprocal rank
+        fusion in a single SQL statement. Falls back to fusing the Python-side rankings.
+        """
+        limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+        clean_query = self._validate_query(query)
+        if not clean_query:
+            return []
+
+        query_embedding = get_embedding(clean_query)  # Redis-cached per query text
+        if query_embedding is None:
+            raise RuntimeError("Failed to generate query embedding")
+
+        candidates = max(limit * 4, HYBRID_MIN_CANDIDATES)
+        session = self.uow.session
+
+        if session.get_bind().dialect.name == 'postgresql':
+            try:
+                vector_str = f"[{','.join(str(float(v)) for v in query_embedding)}]"
+                exact = prepare_ann_scan(session, user_id, candidates)
+                rows = session.execute(HYBRID_SEARCH_EXACT_SQL if exact else HYBRID_SEARCH_SQL, {
+                    "user_id": user_id,
+                    "embedding": vector_str,
+                    "query": clean_query,
+                    "candidates": candidates,
+                    "rrf_k": RRF_K,
+                    "limit": limit,
+                }).fetchall()
+
+                return [
+                    {
+                        'id': row.id,
+                        'title': row.title,
+                        'url': row.url,
+                        'description': row.notes,
+                        'saved_at': row.saved_at.isoformat() if row.saved_at else None,
+                        'has_content': bool(row.has_content),
+                        'score': round(float(row.score), 6),
+                        'vector_rank': row.vector_rank,
+                        'text_rank': row.text_rank
+                    }
+                    for row in rows
+                ]
+            except (OperationalError, ProgrammingError) as db_err:
+                session.rollback()
+                logger.info("hybrid_search_fallback_trigger", extra={"user_id": user_id, "error": str(db_err)})
+
+        semantic = self._fallback_semantic_ranking(user_id, clean_query, candidates)
+        lexical = self._fallback_text_search(user_id, clean_query, candidates)
+        contents = {content.id: content for content in semantic + lexical}
+        fused = reciprocal_rank_fusion([[c.id for c in semantic], [c.id for c in lexical]])
+
         return [
             {
-                'id': content.id,
-                'title': content.title,
-                'url': content.url,
-                'description': content.notes,
-                'saved_at': content.saved_at.isoformat() if content.saved_at else None,
-                'has_content': bool(content.extracted_text)
+                'id': content_id,
+                'title': contents[content_id].title,
+                'url': contents[content_id].url,
+                'description': contents[content_id].notes,
+                'saved_at': contents[content_id].saved_at.isoformat() if contents[content_id].saved_at else None,
+                'has_content': bool(contents[content_id].has_content),
+                'score': round(score, 6),
+                'vector_rank': ranks[0],
+                'text_rank': ranks[1]
             }
-            for content in results
+            for content_id, score, ranks in fused[:limit]
         ]
 
     def semantic_search(self, user_id: int, query: str, limit: int = 10) -> List[Dict[str, Any]]:
@@ -97,11 +238,13 @@ class SearchService:
         results = []
 
         try:
-            results = session.query(SavedContent).filter_by(user_id=user_id).filter(
+            distance = SavedContent.embedding.op('<=>', return_type=Float)(query_embedding)
+            if prepare_ann_scan(session, user_id, limit):
+                distance = distance + 0  # exact scan: keep the HNSW index out of the plan
+            results = session.query(*BOOKMARK_CARD_COLUMNS).filter(
+                SavedContent.user_id == user_id,
                 SavedContent.embedding.isnot(None)
-            ).order_by(
-                SavedContent.embedding.op('<=>')(query_embedding)
-            ).limit(limit).all()
+            ).order_by(distance).limit(limit).all()
         except (OperationalError, ProgrammingError) as db_err:
             session.rollback()
             logger.info("pgvector_search_fallback_trigger", extra={"user_id": user_id, "error": str(db_err)})
@@ -118,15 +261,15 @@ class SearchService:
                 'url': content.url,
                 'description': content.notes,
                 'saved_at': content.saved_at.isoformat() if content.saved_at else None,
-                'has_content': bool(content.extracted_text)
+                'has_content': bool(content.has_content)
             }
             for content in results
         ]
 
-    def _fallback_semantic_ranking(self, user_id: int, query: str, limit: int) -> List[SavedContent]:
+    def _fallback_semantic_ranking(self, user_id: int, query: str, limit: int) -> List[Row]:
         """Rank candidates using word overlap and phrase matching when vector search is unavailable."""
         session = self.uow.session
-        bookmarks = session.query(SavedContent).filter_by(user_id=user_id).order_by(
+        bookmarks = session.query(*BOOKMARK_CARD_COLUMNS).filter(SavedContent.user_id == user_id).order_by(
             SavedContent.saved_at.desc()
         ).limit(max(limit * 5, 50)).all()
 
@@ -2,15 +2,24 @@
 Task Queue Service using RQ (Redis Queue)
 Handles asynchronous background job processing for bookmark content extraction
 with lazy Redis initialization, thread safety, job deduplication, and error sanitization.
+
+Job ids are deterministic per (job type, entity id, content version). Enqueueing an id
+whose job is still queued, scheduled or running returns that job instead of adding a
+second one, so retries, double clicks and rescrape scripts do not repeat work. A short
+Redis claim on the id closes the window between the status check and the enqueue.
 """
 
 import os
 import ssl
-import uuid
+import time
+import hashlib
 import threading
-from typing import Optional, Dict, Any
+from datetime import timedelta
+from typing import Optional, Dict, Any, Callable, Iterable, List, Tuple
 from rq import Queue, Retry
 from rq.job import Job
+from rq.queue import EnqueueData
+from rq.exceptions import NoSuchJobError
 from redis import Redis, RedisError
 from core.logging_config import get_logger
 
@@ -19,6 +28,16 @@ logger = get_logger(__name__)
 _redis_conn: Optional[Redis] = None
 _connection_lock = threading.Lock()
 
+# Queues sampled for the rq_queue_depth gauge (mirrors worker.ALLOWED_QUEUES)
+QUEUE_NAMES = ('default', 'high', 'low', 'background_analysis', 'recommendations')
+QUEUE_DEPTH_SAMPLE_INTERVAL = 15  # seconds
+_last_depth_sample = 0.0
+
+# A tuple, not a set: RQ returns JobStatus members, which equal but do not hash like their values
+ACTIVE_JOB_STATUSES = ('queued', 'started', 'scheduled', 'deferred')
+ENQUEUE_CLAIM_PREFIX = "fuze:rq:claim:"
+ENQUEUE_CLAIM_TTL = 30  # seconds
+
 
 def _create_redis_connection() -> Optional[Redis]:
     """Create and return a configured Redis connection instance for RQ."""
@@ -127,10 +146,105 @@ def get_queue(name: str = 'default') -> Optional[Queue]:
         return None
 
 
+def content_version(*parts: Any) -> str:
+    """Short stable digest of the inputs a job depends on, for use in job ids."""
+    raw = '\x1f'.join('' if part is None else str(part) for part in parts)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]
+
+
+def job_id_for(job_type: str, entity_id: Any, version: Optional[str] = None) -> str:
+    """Deterministic RQ job id for a (job type, entity id, content version)."""
+    if version is None:
+        return f"{job_type}_{entity_id}"
+    return f"{job_type}_{entity_id}_{version}"
+
+
+def _is_active(job: Optional[Job]) -> bool:
+    return job is not None and job.get_status(refresh=False) in ACTIVE_JOB_STATUSES
+
+
+def find_active_job(job_id: str, connection: Optional[Redis] = None) -> Optional[Job]:
+    """Return the job with this id if it is queued, scheduled or running."""
+    conn = connection or get_redis_connection()
+    if not conn:
+        return None
+    try:
+        job = Job.fetch(job_id, connection=conn)
+    except NoSuchJobError:
+        return None
+    return job if _is_active(job) else None
+
+
+def enqueue_unique(queue: Queue, job_id: str, submit: Callable[[str], Job]) -> Tuple[Job, bool]:
+    """
+    Run submit(job_id) unless a job with that id is already active.
+    Returns (job, created); job is the existing one when created is False.
+    """
+    conn = queue.connection
+    existing = find_active_job(job_id, conn)
+    if existing is not None:
+        return existing, False
+
+    claim_key = f"{ENQUEUE_CLAIM_PREFIX}{job_id}"
+    if not conn.set(claim_key, 1, nx=True, ex=ENQUEUE_CLAIM_TTL):
+        # A concurrent caller is enqueueing this id right now
+        return Job(id=job_id, connection=conn), False
+    try:
+        return submit(job_id), True
+    finally:
+        conn.delete(claim_key)
+
+
+def enqueue_many(queue_name: str, jobs: Iterable[EnqueueData]) -> List[Job]:
+    """
+    Enqueue many jobs (built with Queue.prepare_data and an explicit job_id) in one pipeline.
+    Ids that are already active, or repeated within the batch, are not enqueued again;
+    their existing jobs are returned in place of new ones.
+    """
+    queue = get_queue(queue_name)
+    if not queue:
+        logger.warning("rq_queue_unavailable_for_batch", extra={"queue": queue_name})
+        return []
+
+    jobs = list(jobs)
+    if not jobs:
+        return []
+
+    try:
+        conn = queue.connection
+        job_ids = [data.job_id for data in jobs]
+        active = {job.id: job for job in Job.fetch_many(job_ids, connection=conn) if _is_active(job)}
+
+        pending = []
+        seen = set(active)
+        for data in jobs:
+            if data.job_id not in seen:
+                seen.add(data.job_id)
+                pending.append(data)
+
+        created: List[Job] = []
+        if pending:
+            with conn.pipeline() as pipe:
+                created = queue.enqueue_many(pending, pipeline=pipe)
+                pipe.execute()
+
+        logger.info("rq_jobs_batch_enqueued", extra={
+            "queue": queue_name, "requested": len(jobs), "enqueued": len(created), "already_active": len(active)
+        })
+        return list(active.values()) + created
+    except Exception as e:
+        logger.error("rq_jobs_batch_enqueue_failed", extra={"queue": queue_name, "count": len(jobs), "error": str(e)})
+        return []
+
+
+def _bookmark_job_id(bookmark_id: int, url: str) -> str:
+    return job_id_for("bookmark_process", bookmark_id, content_version(url))
+
+
 def enqueue_bookmark_processing(bookmark_id: int, url: str, user_id: int, queue_name: str = 'default') -> Optional[Job]:
     """
     Enqueue a bookmark processing task asynchronously using RQ.
-    Prevents duplicate enqueueing and avoids job ID collisions.
+    Returns the already-active job instead when this bookmark and URL are queued or running.
     """
     queue = get_queue(queue_name)
     if not queue:
@@ -139,31 +253,89 @@ def enqueue_bookmark_processing(bookmark_id: int, url: str, user_id: int, queue_
 
     try:
         from services.bookmark_processing_service import process_bookmark_content_task
-        from core.metrics import rq_queue_depth
-        try:
-            rq_queue_depth.labels(queue=queue_name).set(len(queue))
-        except Exception:
-            pass
-
-        unique_job_id = f"bookmark_process_{bookmark_id}_{uuid.uuid4().hex[:8]}"
 
-        job = queue.enqueue(
+        job, created = enqueue_unique(queue, _bookmark_job_id(bookmark_id, url), lambda job_id: queue.enqueue(
             process_bookmark_content_task,
             bookmark_id,
             url,
             user_id,
             job_timeout='10m',
             retry=Retry(max=2, interval=[60, 300]),
-            job_id=unique_job_id
-        )
+            job_id=job_id
+        ))
 
-        logger.info("rq_job_enqueued", extra={"job_id": job.id, "bookmark_id": bookmark_id, "user_id": user_id})
+        if created:
+            logger.info("rq_job_enqueued", extra={"job_id": job.id, "bookmark_id": bookmark_id, "user_id": user_id})
+        else:
+            logger.info("rq_job_already_active", extra={"job_id": job.id, "bookmark_id": bookmark_id})
         return job
     except Exception as e:
         logger.error("rq_job_enqueue_failed", extra={"bookmark_id": bookmark_id, "error": str(e)})
         return None
 
 
+def enqueue_bookmark_processing_many(
+    bookmarks: Iterable[Tuple[int, str, int]],
+    queue_name: str = 'default'
+) -> List[Job]:
+    """Enqueue processing for many (bookmark_id, url, user_id) tuples in one Redis round-trip."""
+    from services.bookmark_processing_service import process_bookmark_content_task
+
+    return enqueue_many(queue_name, [
+        Queue.prepare_data(
+            process_bookmark_content_task,
+            args=(bookmark_id, url, user_id),
+            timeout='10m',
+            retry=Retry(max=2, interval=[60, 300]),
+            job_id=_bookmark_job_id(bookmark_id, url)
+        )
+        for bookmark_id, url, user_id in bookmarks
+    ])
+
+
+def schedule_bookmark_processing(
+    bookmark_id: int,
+    url: str,
+    user_id: int,
+    delay_seconds: float,
+    rate_limit_deferrals: int = 0,
+    queue_name: str = 'default'
+) -> Optional[Job]:
+    """
+    Re-enqueue a bookmark processing task to run after delay_seconds.
+    The job waits in the queue's scheduled registry, not on a worker; workers run with the RQ scheduler.
+    Called from the running job, so the id carries the deferral count rather than reusing the running job's id.
+    """
+    queue = get_queue(queue_name)
+    if not queue:
+        logger.warning("rq_queue_unavailable", extra={"bookmark_id": bookmark_id})
+        return None
+
+    try:
+        from services.bookmark_processing_service import process_bookmark_content_task
+
+        job_id = f"{_bookmark_job_id(bookmark_id, url)}_deferred{rate_limit_deferrals}"
+        job, _ = enqueue_unique(queue, job_id, lambda job_id: queue.enqueue_in(
+            timedelta(seconds=delay_seconds),
+            process_bookmark_content_task,
+            bookmark_id,
+            url,
+            user_id,
+            rate_limit_deferrals=rate_limit_deferrals,
+            job_timeout='10m',
+            retry=Retry(max=2, interval=[60, 300]),
+            job_id=job_id
+        ))
+
+        logger.info("rq_job_scheduled", extra={
+            "job_id": job.id, "bookmark_id": bookmark_id, "delay_seconds": delay_seconds, "deferrals": rate_limit_deferrals
+        })
+        return job
+    except Exception as e:
+        logger.error("rq_job_schedule_failed", extra={"bookmark_id": bookmark_id, "error": str(e)})
+        return None
+
+
 def get_job_status(job_id: str) -> Optional[Dict[str, Any]]:
     """
     Get status of a job safely without exposing sensitive stack trace info or massive payloads.
@@ -200,7 +372,8 @@ def get_job_status(job_id: str) -> Optional[Dict[str, Any]]:
 def enqueue_embedding_job(bookmark_id: int, queue_name: str = 'default') -> Optional[Job]:
     """
     Enqueue an async embedding generation job for a single bookmark.
-    Idempotent at the job level — embed_bookmark_job checks IS NULL before generating.
+    Idempotent at the job level — embed_bookmark_job checks IS NULL before generating —
+    so one active job per bookmark is enough and the id carries no content version.
     Uses Retry(max=3) with exponential backoff: 60s, 300s, 900s.
     """
     queue = get_queue(queue_name)
@@ -210,24 +383,17 @@ def enqueue_embedding_job(bookmark_id: int, queue_name: str = 'default') -> Opti
 
     try:
         from background.embed_worker import embed_bookmark_job
-        from core.metrics import rq_queue_depth
-        try:
-            rq_queue_depth.labels(queue=queue_name).set(len(queue))
-        except Exception:
-            pass
-
-        unique_job_id = f"embed_bookmark_{bookmark_id}_{uuid.uuid4().hex[:8]}"
 
-        job = queue.enqueue(
+        job, created = enqueue_unique(queue, job_id_for("embed_bookmark", bookmark_id), lambda job_id: queue.enqueue(
             embed_bookmark_job,
             bookmark_id,
             job_timeout='5m',
             retry=Retry(max=3, interval=[60, 300, 900]),
-            job_id=unique_job_id,
-        )
+            job_id=job_id,
+        ))
 
         logger.info(
-            "rq_embedding_job_enqueued",
+            "rq_embedding_job_enqueued" if created else "rq_embedding_job_already_active",
             extra={"job_id": job.id, "bookmark_id": bookmark_id},
         )
         return job
@@ -248,7 +414,8 @@ def enqueue_project_ml_job(
 ) -> Optional[Job]:
     """
     Enqueue an async ML generation job for a project.
-    Generates embeddings and extracts intents.
+    Generates embeddings and extracts intents. Keyed by the project text, so an
+    edit enqueues a new job while a repeat of the same text joins the active one.
     """
     queue = get_queue(queue_name)
     if not queue:
@@ -257,15 +424,9 @@ def enqueue_project_ml_job(
 
     try:
         from jobs.project_ml_job import process_project_ml
-        from core.metrics import rq_queue_depth
-        try:
-            rq_queue_depth.labels(queue=queue_name).set(len(queue))
-        except Exception:
-            pass
 
-        unique_job_id = f"project_ml_{project_id}_{uuid.uuid4().hex[:8]}"
-
-        job = queue.enqueue(
+        version = content_version(title, description, technologies)
+        job, created = enqueue_unique(queue, job_id_for("project_ml", project_id, version), lambda job_id: queue.enqueue(
             process_project_ml,
             project_id,
             user_id,
@@ -274,11 +435,11 @@ def enqueue_project_ml_job(
             technologies,
             job_timeout='10m',
             retry=Retry(max=3, interval=[60, 300, 900]),
-            job_id=unique_job_id,
-        )
+            job_id=job_id,
+        ))
 
         logger.info(
-            "rq_project_ml_job_enqueued",
+            "rq_project_ml_job_enqueued" if created else "rq_project_ml_job_already_active",
             extra={"job_id": job.id, "project_id": project_id},
         )
         return job
@@ -293,6 +454,7 @@ def enqueue_cache_warm_job(user_id: int, queue_name: str = 'high') -> Optional[J
     """
     Enqueue a cache warming job for a user after login.
     Uses the high-priority queue so it executes before regular bookmark jobs.
+    Repeated logins while a warm job is pending share that job.
     """
     queue = get_queue(queue_name)
     if not queue:
@@ -302,18 +464,16 @@ def enqueue_cache_warm_job(user_id: int, queue_name: str = 'high') -> Optional[J
     try:
         from background.cache_warmer import warm_user_cache
 
-        unique_job_id = f"cache_warm_{user_id}_{uuid.uuid4().hex[:8]}"
-
-        job = queue.enqueue(
+        job, created = enqueue_unique(queue, job_id_for("cache_warm", user_id), lambda job_id: queue.enqueue(
             warm_user_cache,
             user_id,
             job_timeout='30s',
             retry=Retry(max=1, interval=[10]),
-            job_id=unique_job_id,
-        )
+            job_id=job_id,
+        ))
 
         logger.info(
-            "rq_cache_warm_job_enqueued",
+            "rq_cache_warm_job_enqueued" if created else "rq_cache_warm_job_already_active",
             extra={"job_id": job.id, "user_id": user_id},
         )
         return job
@@ -343,6 +503,34 @@ def is_rq_available() -> bool:
         return False
 
 
+def sample_queue_depths(force: bool = False) -> Optional[Dict[str, int]]:
+    """
+    Set the rq_queue_depth gauge for every queue with one pipelined LLEN round-trip.
+    Called when /metrics is scraped and throttled to QUEUE_DEPTH_SAMPLE_INTERVAL.
+    """
+    global _last_depth_sample
+    now = time.monotonic()
+    if not force and now - _last_depth_sample < QUEUE_DEPTH_SAMPLE_INTERVAL:
+        return None
+    _last_depth_sample = now
+
+    conn = get_redis_connection()
+    if not conn:
+        return None
+    try:
+        from core.metrics import rq_queue_depth
+        with conn.pipeline(transaction=False) as pipe:
+            for name in QUEUE_NAMES:
+                pipe.llen(f"{Queue.redis_queue_namespace_prefix}{name}")
+            depths = dict(zip(QUEUE_NAMES, pipe.execute()))
+        for name, depth in depths.items():
+            rq_queue_depth.labels(queue=name).set(depth)
+        return depths
+    except Exception as e:
+        logger.warning("rq_queue_depth_sample_failed", extra={"error": str(e)})
+        return None
+
+
 def get_queue_stats(queue_name: str = 'default') -> Dict[str, Any]:
     """Get metrics for a specific RQ queue including depth and active workers."""
     conn = get_redis_connection()
@@ -0,0 +1,307 @@
+"""
+User Stats Service
+Per-user dashboard counters (UserStats) and their daily snapshots (UserStatsDaily),
+so the dashboard reads one counter row plus a few snapshot rows instead of
+re-counting the user's library on every page load.
+
+Counters move in the same transaction as the write that changes them: a
+before_flush listener turns SavedContent / Project inserts, deletes and status
+changes into +/- deltas and applies them with relative UPDATEs. The UPDATE holds
+the user's stats row lock until commit, so concurrent writers for one user
+serialize on it briefly.
+
+Writes that bypass the ORM unit of work (Query.delete(), Core statements) are not
+seen. Such paths call invalidate(); rows that are missing, invalidated or older
+than RECONCILE_INTERVAL are recounted from the source tables on the next read,
+and scripts/reconcile_user_stats.py recounts every user.
+"""
+
+import os
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import case, event, func, inspect, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from core.logging_config import get_logger
+from models import Project, SavedContent, User, UserStats, UserStatsDaily
+
+logger = get_logger(__name__)
+
+RECONCILE_INTERVAL = timedelta(hours=int(os.environ.get("USER_STATS_RECONCILE_HOURS", 24)))
+# A comparison snapshot may be this many days older than the requested day
+SNAPSHOT_MAX_AGE_DAYS = 3
+SUCCESS_QUALITY_SCORE = 5
+
+# Counters derived from a single SavedContent row
+_BOOKMARK_FLAGS = (
+    'content_count', 'analyzed_count', 'quality_count',
+    'scraping_count', 'embedding_count', 'analyzing_count',
+)
+_TRACKED_ATTRS = ('extracted_text', 'quality_score', 'analysis_status', 'scrape_status', 'embedding_status')
+
+
+def _start_of_day(day: date) -> datetime:
+    return datetime.combine(day, time.min)
+
+
+def _bookmark_flags(has_text: bool, quality_score, analysis_status, scrape_status, embedding_status) -> Dict[str, int]:
+    analyzed = analysis_status == 'SUCCESS'
+    return {
+        'content_count': int(bool(has_text)),
+        'analyzed_count': int(analyzed),
+        'quality_count': int(analyzed and (quality_score or 0) >= SUCCESS_QUALITY_SCORE),
+        'scraping_count': int(scrape_status == 'RUNNING'),
+        'embedding_count': int(embedding_status == 'RUNNING'),
+        'analyzing_count': int(analysis_status == 'RUNNING'),
+    }
+
+
+# --- Transactional counter maintenance ---
+
+def _column_default(name: str):
+    default = SavedContent.__table__.c[name].default
+    return default.arg if default is not None and default.is_scalar else None
+
+
+def _stored_values(session, content_id: int) -> Dict[str, object]:
+    # Core query on the flush connection: no autoflush, and a flag instead of the text blob
+    row = session.connection().execute(select(
+        SavedContent.extracted_text.isnot(None).label('extracted_text'),
+        SavedContent.quality_score, SavedContent.analysis_status,
+        SavedContent.scrape_status, SavedContent.embedding_status,
+    ).where(SavedContent.id == content_id)).first()
+    return dict(row._mapping) if row else {}
+
+
+def _bookmark_state(session, bookmark: SavedContent, committed: bool, cache: dict, with_text: bool = True) -> Dict[str, int]:
+    """Flags of the row as flushed now (committed=False) or as last stored (committed=True)."""
+    state = inspect(bookmark)
+    persistent = state.key is not None
+    values = {}
+    for name in _TRACKED_ATTRS:
+        if name == 'extracted_text' and not with_text:
+            values[name] = None
+            continue
+        history = state.attrs[name].history
+        if committed and history.deleted:
+            value = history.deleted[0]
+        elif name in state.dict and not (committed and history.added):
+            value = state.dict[name]
+        elif persistent:
+            # Deferred or expired attribute: read the stored value once per object
+            if bookmark.id not in cache:
+                cache[bookmark.id] = _stored_values(session, bookmark.id)
+            value = cache[bookmark.id].get(name)
+        else:
+            value = None
+        if value is None and not persistent and name != 'extracted_text':
+            value = _column_default(name)
+        values[name] = value
+    return _bookmark_flags(
+        values['extracted_text'] not in (None, False),
+        values['quality_score'], values['analysis_status'],
+        values['scrape_status'], values['embedding_status']
+    )
+
+
+def _collect_deltas(session) -> Dict[int, Dict[str, int]]:
+    deltas: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    cache: Dict[int, Dict[str, object]] = {}
+
+    for obj in session.new:
+        if isinstance(obj, SavedContent) and obj.user_id:
+            user = deltas[obj.user_id]
+            user['bookmark_count'] += 1
+            user['saved_total'] += 1
+            for name, flag in _bookmark_state(session, obj, False, cache).items():
+                user[name] += flag
+        elif isinstance(obj, Project) and obj.user_id:
+            deltas[obj.user_id]['project_count'] += 1
+
+    for obj in session.deleted:
+        if isinstance(obj, SavedContent) and obj.user_id:
+            user = deltas[obj.user_id]
+            user['bookmark_count'] -= 1
+            for name, flag in _bookmark_state(session, obj, True, cache).items():
+                user[name] -= flag
+        elif isinstance(obj, Project) and obj.user_id:
+            deltas[obj.user_id]['project_count'] -= 1
+
+    for obj in session.dirty:
+        if not isinstance(obj, SavedContent) or not obj.user_id:
+            continue
+        state = inspect(obj)
+        changed = {name for name in _TRACKED_ATTRS if state.attrs[name].history.has_changes()}
+        if not changed:
+            continue
+        # content_count depends on the text alone: skip loading it when it did not change
+        with_text = 'extracted_text' in changed
+        before = _bookmark_state(session, obj, True, cache, with_text)
+        after = _bookmark_state(session, obj, False, cache, with_text)
+        for name in _BOOKMARK_FLAGS:
+            if after[name] != before[name]:
+                deltas[obj.user_id][name] += after[name] - before[name]
+
+    return deltas
+
+
+def _apply_counter_deltas(session, flush_context, instances):
+    deltas = _collect_deltas(session)
+    table = UserStats.__table__
+    for user_id, changes in deltas.items():
+        values = {name: table.c[name] + amount for name, amount in changes.items() if amount}
+        if values:
+            values['updated_at'] = func.now()
+            # Missing rows are left alone: the first read seeds them with a full recount
+            session.connection().execute(table.update().where(table.c.user_id == user_id).values(values))
+
+
+def register_stats_listeners():
+    """Attach the counter-maintenance listener to every ORM session (idempotent)."""
+    if not event.contains(Session, 'before_flush', _apply_counter_deltas):
+        event.listen(Session, 'before_flush', _apply_counter_deltas)
+
+
+# --- Reads, snapshots and reconciliation ---
+
+class UserStatsService:
+    """Reads and repairs the per-user dashboard counters."""
+
+    def __init__(self, uow):
+        self.uow = uow
+
+    @property
+    def session(self):
+        return self.uow.session
+
+    def get_stats(self, user_id: int) -> UserStats:
+        """Current counters; seeds or recounts the row when missing, invalidated or stale."""
+        stats = self.session.get(UserStats, user_id, populate_existing=True)
+        now = datetime.now(timezone.utc)
+        if stats is None or stats.reconciled_at is None or self._as_utc(stats.reconciled_at) < now - RECONCILE_INTERVAL:
+            stats = self.reconcile(user_id)
+        return stats
+
+    def invalidate(self, user_id: int):
+        """Force a recount on the next read, after a bulk write the listener cannot see."""
+        table = UserStats.__table__
+        self.session.execute(table.update().where(table.c.user_id == user_id).values(reconciled_at=None))
+
+    def reconcile(self, user_id: int) -> UserStats:
+        """Recount one user's counters from saved_content and projects."""
+        counts = self._count_current(user_id)
+        stats = self.session.get(UserStats, user_id, populate_existing=True)
+        if stats is None:
+            try:
+                with self.session.begin_nested():
+                    stats = UserStats(user_id=user_id, saved_total=counts['bookmark_count'], **counts)
+                    self.session.add(stats)
+            except IntegrityError:
+                # Seeded concurrently by another request
+                stats = self.session.get(UserStats, user_id, populate_existing=True)
+
+        drift = {name: value - getattr(stats, name) for name, value in counts.items() if getattr(stats, name) != value}
+        if drift:
+            logger.info("user_stats_drift_corrected", extra={"user_id": user_id, "drift": drift})
+        for name, value in counts.items():
+            setattr(stats, name, value)
+        stats.saved_total = max(stats.saved_total or 0, counts['bookmark_count'])
+        stats.reconciled_at = datetime.now(timezone.utc)
+        self.session.flush()
+        return stats
+
+    def snapshots(self, user_id: int, stats: UserStats, days_ago: Iterable[int], today: Optional[date] = None) -> Dict[int, UserStatsDaily]:
+        """
+        Snapshot as of the start of (today - n) for each n, in one query. Records
+        today's snapshot when absent and backfills a missing comparison day by
+        counting rows created before it (a one-off cost per user and day).
+        """
+        today = today or datetime.utcnow().date()
+        days_ago = sorted(set(days_ago))
+        oldest = today - timedelta(days=max(days_ago, default=0) + SNAPSHOT_MAX_AGE_DAYS)
+        rows = self.session.query(UserStatsDaily).filter(
+            UserStatsDaily.user_id == user_id,
+            UserStatsDaily.day >= oldest,
+            UserStatsDaily.day <= today
+        ).order_by(UserStatsDaily.day.desc()).all()
+
+        if not rows or rows[0].day != today:
+            today_row = self._insert_snapshot(UserStatsDaily(
+                user_id=user_id, day=today,
+                bookmark_count=stats.bookmark_count, saved_total=stats.saved_total,
+                quality_count=stats.quality_count, project_count=stats.project_count
+            ))
+            rows.insert(0, today_row)
+
+        result = {}
+        for n in days_ago:
+            target = today - timedelta(days=n)
+            found = next((row for row in rows if target - timedelta(days=SNAPSHOT_MAX_AGE_DAYS) <= row.day <= target), None)
+            result[n] = found or self._insert_snapshot(self._count_as_of(user_id, target))
+        return result
+
+    def reconcile_all(self, batch_size: int = 200) -> int:
+        """Recount and snapshot every user, committing per batch. Returns users processed."""
+        processed = 0
+        last_id = 0
+        while True:
+            user_ids = [row.id for row in self.session.query(User.id).filter(User.id > last_id).order_by(User.id).limit(batch_size)]
+            if not user_ids:
+                break
+            for user_id in user_ids:
+                stats = self.reconcile(user_id)
+                self.snapshots(user_id, stats, ())
+            self.session.commit()
+            processed += len(user_ids)
+            last_id = user_ids[-1]
+        return processed
+
+    # --- internals ---
+
+    @staticmethod
+    def _as_utc(value: datetime) -> datetime:
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+    def _count_current(self, user_id: int) -> Dict[str, int]:
+        analyzed = SavedContent.analysis_status == 'SUCCESS'
+        row = self.session.query(
+            func.count(SavedContent.id).label('bookmark_count'),
+            func.sum(case((SavedContent.extracted_text.isnot(None), 1), else_=0)).label('content_count'),
+            func.sum(case((analyzed, 1), else_=0)).label('analyzed_count'),
+            func.sum(case((analyzed & (SavedContent.quality_score >= SUCCESS_QUALITY_SCORE), 1), else_=0)).label('quality_count'),
+            func.sum(case((SavedContent.scrape_status == 'RUNNING', 1), else_=0)).label('scraping_count'),
+            func.sum(case((SavedContent.embedding_status == 'RUNNING', 1), else_=0)).label('embedding_count'),
+            func.sum(case((SavedContent.analysis_status == 'RUNNING', 1), else_=0)).label('analyzing_count'),
+        ).filter(SavedContent.user_id == user_id).one()
+        counts = {name: int(value or 0) for name, value in row._mapping.items()}
+        counts['project_count'] = self.session.query(func.count(Project.id)).filter(Project.user_id == user_id).scalar() or 0
+        return counts
+
+    def _count_as_of(self, user_id: int, day: date) -> UserStatsDaily:
+        cutoff = _start_of_day(day)
+        row = self.session.query(
+            func.count(SavedContent.id).label('bookmark_count'),
+            func.sum(case((
+                (SavedContent.analysis_status == 'SUCCESS') & (SavedContent.quality_score >= SUCCESS_QUALITY_SCORE), 1
+            ), else_=0)).label('quality_count'),
+        ).filter(SavedContent.user_id == user_id, SavedContent.saved_at < cutoff).one()
+        project_count = self.session.query(func.count(Project.id)).filter(
+            Project.user_id == user_id, Project.created_at < cutoff
+        ).scalar() or 0
+        return UserStatsDaily(
+            user_id=user_id, day=day,
+            bookmark_count=int(row.bookmark_count or 0), saved_total=int(row.bookmark_count or 0),
+            quality_count=int(row.quality_count or 0), project_count=int(project_count)
+        )
+
+    def _insert_snapshot(self, snapshot: UserStatsDaily) -> UserStatsDaily:
+        try:
+            with self.session.begin_nested():
+                self.session.add(snapshot)
+            return snapshot
+        except IntegrityError:
+            # Written concurrently for the same day
+            return self.session.get(UserStatsDaily, (snapshot.user_id, snapshot.day))
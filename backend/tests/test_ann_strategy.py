@@ -0,0 +1,61 @@
+import pytest
+from unittest.mock import MagicMock
+from sqlalchemy.exc import ProgrammingError
+from utils.ann_strategy import prepare_ann_scan, ann_order_sql, clear_row_count_cache, EXACT_SCAN_MAX_ROWS
+
+
+@pytest.fixture(autouse=True)
+def _fresh_row_counts():
+    clear_row_count_cache()
+    yield
+    clear_row_count_cache()
+
+
+def _session(dialect, scalar=None, error=None):
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = dialect
+    if error is not None:
+        session.execute.side_effect = error
+    else:
+        session.execute.return_value.scalar.return_value = scalar
+    return session
+
+
+def test_prepare_ann_scan_is_postgres_only():
+    session = _session('sqlite')
+    assert prepare_ann_scan(session, 1, 10) is False
+    session.execute.assert_not_called()
+
+
+def test_prepare_ann_scan_reports_database_choice():
+    session = _session('postgresql', scalar=12)
+    assert prepare_ann_scan(session, 4, 25) is True
+    params = session.execute.call_args[0][1]
+    assert params == {"user_id": 4, "k": 25, "exact_max_rows": EXACT_SCAN_MAX_ROWS, "known_rows": None}
+    assert "ann_prepare_scan_v2" in str(session.execute.call_args[0][0])
+
+    assert prepare_ann_scan(_session('postgresql', scalar=EXACT_SCAN_MAX_ROWS + 1), 5, 25) is False
+
+
+def test_prepare_ann_scan_reuses_the_users_row_count():
+    small = _session('postgresql', scalar=12)
+    assert prepare_ann_scan(small, 4, 25) is True
+    assert prepare_ann_scan(small, 4, 25) is True
+    assert small.execute.call_count == 1  # exact scans need nothing from the database
+
+    large = _session('postgresql', scalar=EXACT_SCAN_MAX_ROWS + 1)
+    assert prepare_ann_scan(large, 5, 25) is False
+    assert prepare_ann_scan(large, 5, 40) is False
+    # The second call only sets up HNSW, handing the cached count back instead of recounting
+    assert large.execute.call_args[0][1]["known_rows"] == EXACT_SCAN_MAX_ROWS + 1
+
+
+def test_prepare_ann_scan_without_migration_falls_back_to_hnsw():
+    session = _session('postgresql', error=ProgrammingError("SELECT", {}, Exception("no function")))
+    assert prepare_ann_scan(session, 4, 25) is False
+
+
+def test_ann_order_sql_hides_exact_scans_from_the_index():
+    distance = "sc.embedding <=> CAST(:q AS vector)"
+    assert ann_order_sql(distance, False) == distance
+    assert ann_order_sql(distance, True) == "(sc.embedding <=> CAST(:q AS vector)) + 0"
@@ -50,3 +50,26 @@ def test_authentication_failed_raises(mock_uow):
 
     with pytest.raises(AuthenticationFailed):
         service.authenticate("nonexistent", "any_password")
+
+def test_password_pool_saturation_propagates(mock_uow, monkeypatch):
+    """A saturated hashing pool surfaces as a 503 instead of a failed login"""
+    from core.password_pool import PasswordHashPool, PasswordPoolSaturated
+    import services.auth_service as auth_module
+
+    service = AuthService(mock_uow)
+    password_hash = service.hash_password("password123")
+
+    monkeypatch.setattr(auth_module, "password_pool", PasswordHashPool(max_pending=0, retry_after=5))
+    with pytest.raises(PasswordPoolSaturated) as exc_info:
+        service.verify_password(password_hash, "password123")
+
+    assert exc_info.value.code == 503
+    assert ('Retry-After', '5') in exc_info.value.get_headers()
+    mock_uow.users.add.assert_not_called()
+
+def test_password_pool_runs_inline_without_gevent():
+    from core.password_pool import PasswordHashPool
+
+    pool = PasswordHashPool(max_pending=1)
+    assert pool.run(lambda a, b: a + b, 2, 3) == 5
+    assert pool.pending == 0
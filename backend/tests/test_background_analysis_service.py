@@ -71,3 +71,131 @@ def test_bg_analysis_single_pass_summary_no_second_llm_call():
         mock_analyzer.analyze_bookmark_content.assert_called_once()
         # Verify _make_gemini_request (second LLM call) was NEVER called!
         assert not hasattr(mock_analyzer, '_make_gemini_request') or mock_analyzer._make_gemini_request.call_count == 0
+
+
+def _analysis_content():
+    content = MagicMock()
+    content.id = 51
+    content.user_id = None
+    content.title = "Test Post"
+    content.notes = ""
+    content.extracted_text = "Content"
+    content.url = "https://example.com"
+    content.content_hash = "hash-1"
+    return content
+
+
+def test_bg_analysis_skips_gemini_when_input_and_model_unchanged():
+    from services.background_analysis_service import analysis_input_hash, analysis_model_version
+    from scrapers.models import derivation_record
+    service = BackgroundAnalysisService()
+    service.redis_cache = MagicMock()
+    content = _analysis_content()
+
+    existing = MagicMock()
+    existing.analysis_data = {
+        'summary': 'old',
+        '_derived_from': derivation_record(analysis_input_hash(content), analysis_model_version(), 'hash-1')
+    }
+
+    with patch('services.background_analysis_service.GeminiAnalyzer') as mock_analyzer_cls, \
+         patch('services.background_analysis_service.db') as mock_db, \
+         patch('services.pipeline_orchestrator.PipelineOrchestrator.handle_event') as mock_handle:
+        mock_db.session.query.return_value.filter_by.return_value.first.return_value = existing
+
+        service._analyze_single_content(content, pipeline_run_id='run_1')
+
+        mock_analyzer_cls.assert_not_called()
+        event = mock_handle.call_args[0][0]
+        assert type(event).__name__ == 'AnalysisSkipped'
+        assert event.pipeline_run_id == 'run_1'
+
+
+def test_bg_analysis_replaces_stale_analysis_in_place():
+    service = BackgroundAnalysisService()
+    service.redis_cache = MagicMock()
+    content = _analysis_content()
+
+    existing = MagicMock()
+    existing.analysis_data = {
+        'summary': 'old',
+        '_derived_from': {'input_hash': 'previous', 'model_version': 'gemini-old:v1', 'content_hash': 'hash-0'}
+    }
+
+    with patch('services.background_analysis_service.GeminiAnalyzer') as mock_analyzer_cls, \
+         patch('services.background_analysis_service.db') as mock_db, \
+         patch('services.background_analysis_service.refresh_content_features'):
+        mock_analyzer_cls.return_value.analyze_bookmark_content.return_value = {
+            'technologies': ['python'],
+            'summary': 'new'
+        }
+        mock_db.session.query.return_value.filter_by.return_value.first.return_value = existing
+
+        service._analyze_single_content(content)
+
+        mock_analyzer_cls.return_value.analyze_bookmark_content.assert_called_once()
+        assert existing.analysis_data['summary'] == 'new'
+        assert existing.analysis_data['_derived_from']['content_hash'] == 'hash-1'
+        assert existing.technology_tags == 'python'
+
+
+def test_bg_analysis_reserves_quota_once_per_user_batch():
+    service = BackgroundAnalysisService()
+    service.redis_cache = MagicMock()
+    contents = []
+    for content_id, user_id in [(1, 7), (2, 8), (3, 7), (4, 7)]:
+        content = MagicMock()
+        content.id = content_id
+        content.user_id = user_id
+        content.title = "Post"
+        contents.append(content)
+
+    # User 7's three items fit; user 8 is at the limit and falls back to per-item reservation
+    reserve = MagicMock(side_effect=lambda uid, n: {'can_make_request': uid == 7, 'reserved': n if uid == 7 else 0})
+
+    release = MagicMock()
+
+    with patch('services.background_analysis_service.db'), \
+         patch('services.background_analysis_service.publish_progress'), \
+         patch('services.background_analysis_service.time.sleep'), \
+         patch('services.multi_user_api_manager.reserve_user_request', reserve), \
+         patch('services.multi_user_api_manager.release_user_request', release), \
+         patch.object(service, '_get_unanalyzed_content', return_value=contents), \
+         patch.object(service, '_analyze_single_content', return_value=True) as mock_analyze:
+        service._process_unanalyzed_content()
+
+    assert sorted(c.args for c in reserve.call_args_list) == [(7, 3), (8, 1)]
+    assert [c.kwargs['quota_reserved'] for c in mock_analyze.call_args_list] == [True, False, True, True]
+    release.assert_not_called()
+
+
+def test_bg_analysis_refunds_batch_units_no_gemini_call_used():
+    service = BackgroundAnalysisService()
+    service.redis_cache = MagicMock()
+    contents = []
+    for content_id in (1, 2, 3, 4):
+        content = MagicMock()
+        content.id = content_id
+        content.user_id = 7
+        content.title = "Post"
+        contents.append(content)
+
+    reserve = MagicMock(side_effect=lambda uid, n: {'can_make_request': True, 'reserved': n})
+    release = MagicMock()
+    # Item 1 spends its unit, item 2 fails before Gemini answers, item 3 blows up the loop itself
+    outcomes = iter([True, False])
+    analyze = MagicMock(side_effect=lambda *a, **kw: next(outcomes))
+    progress = MagicMock(side_effect=[None, None, KeyboardInterrupt()])
+
+    with patch('services.background_analysis_service.db'), \
+         patch('services.background_analysis_service.publish_progress', progress), \
+         patch('services.background_analysis_service.time.sleep'), \
+         patch('services.multi_user_api_manager.reserve_user_request', reserve), \
+         patch('services.multi_user_api_manager.release_user_request', release), \
+         patch.object(service, '_get_unanalyzed_content', return_value=contents), \
+         patch.object(service, '_analyze_single_content', analyze):
+        with pytest.raises(KeyboardInterrupt):
+            service._process_unanalyzed_content()
+
+    reserve.assert_called_once_with(7, 4)
+    release.assert_called_once_with(7, 3)
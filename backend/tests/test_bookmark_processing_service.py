@@ -2,6 +2,8 @@ import pytest
 from unittest.mock import MagicMock, patch
 from services.bookmark_processing_service import (
     process_bookmark_content_task,
+    generate_embedding_task,
+    embedding_derivation,
     validate_embedding,
     truncate_title
 )
@@ -27,6 +29,7 @@ def test_process_bookmark_content_task_flow(app):
     with patch('services.bookmark_processing_service.UnitOfWork') as mock_uow_cls, \
          patch('services.bookmark_processing_service.extract_article_content') as mock_extract, \
          patch('services.bookmark_processing_service.generate_comprehensive_embedding') as mock_emb, \
+         patch('services.bookmark_processing_service.get_embedding_model_version', return_value='all-MiniLM-L6-v2'), \
          patch('services.bookmark_processing_service.redis_cache') as mock_redis:
 
         mock_uow = MagicMock()
@@ -53,3 +56,76 @@ def test_process_bookmark_content_task_flow(app):
             assert '\x00' not in mock_bookmark.extracted_text
             assert mock_bookmark.quality_score == 8
             assert mock_bookmark.embedding == [0.1] * 384
+
+
+def test_rate_limited_bookmark_is_rescheduled_not_failed(app):
+    from scrapers.rate_limiter import DomainRateLimited
+    with patch('services.bookmark_processing_service.UnitOfWork') as mock_uow_cls, \
+         patch('services.bookmark_processing_service.extract_article_content',
+               side_effect=DomainRateLimited('github.com', 4.0)), \
+         patch('services.task_queue.schedule_bookmark_processing') as mock_schedule:
+
+        mock_uow = MagicMock()
+        mock_uow_cls.return_value.__enter__.return_value = mock_uow
+        mock_bookmark = MagicMock()
+        mock_bookmark.scrape_status = 'PENDING'
+        mock_uow.bookmarks.get_by_id.return_value = mock_bookmark
+
+        process_bookmark_content_task(bookmark_id=3, url='https://github.com/a/b', user_id=10, rate_limit_deferrals=2)
+
+        args, kwargs = mock_schedule.call_args
+        assert args == (3, 'https://github.com/a/b', 10)
+        assert kwargs['rate_limit_deferrals'] == 3
+        assert 4.0 <= kwargs['delay_seconds'] <= 4.0 + 30
+        assert mock_bookmark.scrape_status == 'PENDING'
+
+
+def _embedded_bookmark(model_version):
+    bookmark = MagicMock()
+    bookmark.title = 'Post'
+    bookmark.notes = 'Notes'
+    bookmark.extracted_text = 'Body text'
+    bookmark.url = 'https://example.com/post'
+    bookmark.content_hash = 'abc123'
+    bookmark.embedding_status = 'SUCCESS'
+    with patch('services.bookmark_processing_service.get_embedding_model_version', return_value=model_version):
+        derivation = embedding_derivation('Post', 'Notes', '', [], 'Body text', content_hash='abc123')
+    bookmark.embedding_metadata = {'derived_from': derivation}
+    return bookmark
+
+
+def test_generate_embedding_task_skips_unchanged_input(app):
+    from core.events import EmbeddingSkipped
+    bookmark = _embedded_bookmark('all-MiniLM-L6-v2')
+    with patch('services.bookmark_processing_service.UnitOfWork') as mock_uow_cls, \
+         patch('services.bookmark_processing_service.get_embedding_model_version', return_value='all-MiniLM-L6-v2'), \
+         patch('services.bookmark_processing_service.generate_comprehensive_embedding') as mock_emb, \
+         patch('services.bookmark_processing_service.PipelineOrchestrator') as mock_orchestrator_cls, \
+         patch('services.background_analysis_service.analyze_content') as mock_analyze:
+        mock_uow_cls.return_value.__enter__.return_value.bookmarks.get_by_id.return_value = bookmark
+
+        generate_embedding_task(bookmark_id=5, user_id=10)
+
+        mock_emb.assert_not_called()
+        event = mock_orchestrator_cls.return_value.handle_event.call_args[0][0]
+        assert isinstance(event, EmbeddingSkipped)
+        assert event.content_hash == 'abc123'
+        # Analysis is still chained; it applies its own provenance check
+        assert mock_analyze.call_args.kwargs['pipeline_run_id'] == event.pipeline_run_id
+
+
+def test_generate_embedding_task_reembeds_when_model_changes(app):
+    bookmark = _embedded_bookmark('paraphrase-MiniLM-L3-v2')
+    with patch('services.bookmark_processing_service.UnitOfWork') as mock_uow_cls, \
+         patch('services.bookmark_processing_service.get_embedding_model_version', return_value='all-MiniLM-L6-v2'), \
+         patch('services.bookmark_processing_service.generate_comprehensive_embedding', return_value=[0.2] * 384) as mock_emb, \
+         patch('services.bookmark_processing_service.redis_cache'), \
+         patch('services.background_analysis_service.analyze_content'):
+        mock_uow_cls.return_value.__enter__.return_value.bookmarks.get_by_id.return_value = bookmark
+
+        generate_embedding_task(bookmark_id=5, user_id=10)
+
+        mock_emb.assert_called_once()
+        assert bookmark.embedding == [0.2] * 384
+        assert bookmark.embedding_metadata['derived_from']['model_version'] == 'all-MiniLM-L6-v2'
+        assert bookmark.embedding_metadata['derived_from']['content_hash'] == 'abc123'
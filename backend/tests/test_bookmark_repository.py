@@ -45,3 +45,40 @@ def test_bookmark_repository_crud(test_user, app):
         top_cats = repo.get_top_categories(test_user['id'])
         assert len(top_cats) >= 1
         assert top_cats[0][0] == 'ai'
+
+
+@pytest.mark.unit
+@pytest.mark.requires_db
+def test_bookmark_repository_full_text_search_needs_postgres(app):
+    with app.app_context():
+        # SQLite has no tsvector column; callers fall back to ILIKE
+        assert BookmarkRepository(db.session).full_text_search(1, 'python') is None
+
+
+@pytest.mark.unit
+@pytest.mark.requires_db
+def test_bookmark_repository_projections_skip_heavy_columns(test_user, app):
+    with app.app_context():
+        repo = BookmarkRepository(db.session)
+        repo.add(SavedContent(user_id=test_user['id'], url='https://example.com/full', title='Full',
+                              extracted_text='Long body text'))
+        repo.add(SavedContent(user_id=test_user['id'], url='https://example.com/empty', title='Empty',
+                              extracted_text=''))
+        db.session.commit()
+        db.session.expunge_all()
+
+        page = repo.list_bookmarks(test_user['id'], search='example.com', per_page=10)
+        cards = {row.url: row for row in page.items}
+        assert bool(cards['https://example.com/full'].has_content) is True
+        assert bool(cards['https://example.com/empty'].has_content) is False
+        assert 'extracted_text' not in cards['https://example.com/full']._fields
+
+        refs = repo.get_bookmark_refs(test_user['id'])
+        assert {'https://example.com/full', 'https://example.com/empty'} <= {ref.url for ref in refs}
+        assert refs[0]._fields == ('id', 'url', 'title')
+
+        # Entity queries leave the heavy columns unloaded until asked for
+        entity = repo.get_by_url(test_user['id'], 'https://example.com/full')
+        assert 'extracted_text' not in entity.__dict__ and 'embedding' not in entity.__dict__
+        ranked = repo.get_user_bookmarks(test_user['id'], limit=50)
+        assert all('extracted_text' in bm.__dict__ for bm in ranked)
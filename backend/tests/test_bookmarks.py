@@ -256,6 +256,61 @@ class TestBookmarks:
             assert data['total'] == 3
             assert data['added'] == 3
 
+    def test_stream_import_commits_in_batches(self, client, auth_headers):
+        """NDJSON import commits every IMPORT_BATCH_SIZE records and reports progress per batch"""
+        lines = [
+            '{"url": "https://example.com/s1", "title": "One"}',
+            '{"url": "https://example.com/s2"}',
+            'not json',
+            '{"url": "https://example.com/s1"}',
+            '{"url": "javascript:void(0)"}',
+        ]
+        with patch('blueprints.bookmarks.IMPORT_BATCH_SIZE', 2), \
+             patch('blueprints.bookmarks.publish_progress') as mock_progress, \
+             patch('services.task_queue.enqueue_bookmark_processing_many', side_effect=lambda items: list(items)):
+            response = client.post('/api/bookmarks/import/stream?total=5',
+                                   data='\n'.join(lines) + '\n',
+                                   content_type='application/x-ndjson',
+                                   headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json
+        assert data['session_id']
+        assert data['processed'] == 5
+        assert data['added'] == 2
+        assert data['skipped'] == 3
+        assert data['skip_reasons'] == {'invalid_json': 1, 'duplicate': 1, 'invalid_scheme': 1}
+        assert data['status'] == 'completed'
+        statuses = [call.args[2]['status'] for call in mock_progress.call_args_list]
+        assert statuses == ['processing', 'processing', 'processing', 'completed']
+
+    def test_stream_import_resumes_after_committed_records(self, client, auth_headers):
+        """Re-sending an interrupted upload skips the records the session already committed"""
+        session = {
+            'session_id': 'resume-session-1', 'processed': 1, 'added': 1, 'skipped': 0, 'errors': 0,
+            'skip_reasons': {}, 'total': 2, 'status': 'processing'
+        }
+        body = '{"url": "https://example.com/r1"}\n{"url": "https://example.com/r2"}\n'
+        stored = lambda key: session if key.startswith('import_session:') else None
+        with patch('blueprints.bookmarks.redis_cache.get_cache', side_effect=stored), \
+             patch('blueprints.bookmarks.publish_progress'), \
+             patch('services.task_queue.enqueue_bookmark_processing_many', side_effect=lambda items: list(items)) as mock_enqueue:
+            response = client.post('/api/bookmarks/import/stream?session_id=resume-session-1',
+                                   data=body, content_type='application/x-ndjson', headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json['processed'] == 2
+        assert response.json['added'] == 2
+        assert mock_enqueue.call_count == 1
+
+    def test_stream_import_rejects_gap_in_offsets(self, client, auth_headers):
+        """A chunk starting past the committed records would silently drop bookmarks"""
+        with patch('blueprints.bookmarks.publish_progress'):
+            response = client.post('/api/bookmarks/import/stream?session_id=gap-session-1&offset=10',
+                                   data='{"url": "https://example.com/g"}\n',
+                                   content_type='application/x-ndjson', headers=auth_headers)
+        assert response.status_code == 409
+
     def test_check_duplicate_endpoint(self, client, auth_headers, test_user, app):
         """Test check-duplicate endpoint signature fix and functionality"""
         from models import db, SavedContent
@@ -0,0 +1,170 @@
+import asyncio
+import threading
+import pytest
+from scrapers.fetchers.browser_pool import BrowserPool, BrowserPoolUnavailable, _block_heavy_resources
+
+
+class FakeResponse:
+    status = 200
+
+    async def all_headers(self):
+        return {"content-type": "text/html"}
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.url = "about:blank"
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def goto(self, url, timeout=None, wait_until=None):
+        if "slow" in url:
+            await asyncio.sleep(30)
+        self.url = url
+        return FakeResponse()
+
+    async def wait_for_timeout(self, ms):
+        pass
+
+    async def content(self):
+        return f"<html><body>{self.url}</body></html>"
+
+    async def evaluate(self, script):
+        return self.context.browser.heap
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.pages = []
+        self.routes = []
+        self.closed = False
+
+    async def add_init_script(self, script):
+        pass
+
+    async def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+    async def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.heap = 0
+
+    def is_connected(self):
+        return True
+
+    async def new_context(self, **options):
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        pass
+
+
+class FakeDriver:
+    async def stop(self):
+        pass
+
+
+@pytest.fixture
+def browser():
+    return FakeBrowser()
+
+
+@pytest.fixture
+def make_pool(browser):
+    pools = []
+
+    def make(**kwargs):
+        async def launcher():
+            return FakeDriver(), browser
+        pool = BrowserPool(launcher=launcher, **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.shutdown()
+
+
+@pytest.mark.unit
+def test_pages_are_reused_then_recycled_and_heavy_resources_blocked(browser, make_pool):
+    pool = make_pool(size=1, page_max_uses=2, max_heap_mb=1)
+
+    for n in range(3):
+        snapshot = pool.fetch(f"https://devdocs.io/page-{n}")
+        assert snapshot.status == 200 and f"page-{n}" in snapshot.html
+
+    context = browser.contexts[0]
+    assert len(browser.contexts) == 1 and len(context.pages) == 2
+    assert context.pages[0].closed and not context.pages[1].closed
+
+    browser.heap = 2 * 1024 * 1024
+    pool.fetch("https://neetcode.io/")
+    assert context.closed and pool.stats()["context_recycles"] == 1
+    assert pool.stats()["launches"] == 1
+
+    calls = []
+
+    class Route:
+        def __init__(self, resource_type):
+            self.request = type("Request", (), {"resource_type": resource_type})()
+
+        async def abort(self):
+            calls.append(("abort", self.request.resource_type))
+
+        async def continue_(self):
+            calls.append(("continue", self.request.resource_type))
+
+    pattern, handler = context.routes[0]
+    for resource_type in ("image", "font", "media", "script", "document"):
+        asyncio.run(handler(Route(resource_type)))
+    assert pattern == "**/*" and handler is _block_heavy_resources
+    assert calls == [("abort", "image"), ("abort", "font"), ("abort", "media"),
+                     ("continue", "script"), ("continue", "document")]
+
+
+@pytest.mark.unit
+def test_timeout_kills_the_page_without_leaking_threads(browser, make_pool):
+    pool = make_pool(size=1)
+    pool.fetch("https://medium.com/warm")
+    threads = threading.active_count()
+
+    with pytest.raises(TimeoutError):
+        pool.fetch("https://medium.com/slow", timeout=0.2)
+
+    assert browser.contexts[0].pages[0].closed
+    assert pool.stats()["timeouts"] == 1
+    assert threading.active_count() == threads
+    assert "after" in pool.fetch("https://medium.com/after").html
+
+
+@pytest.mark.unit
+def test_failed_launch_marks_pool_unavailable():
+    async def launcher():
+        raise RuntimeError("Executable doesn't exist")
+
+    pool = BrowserPool(size=1, launcher=launcher)
+    try:
+        with pytest.raises(BrowserPoolUnavailable):
+            pool.fetch("https://github.com/")
+        assert not pool.available
+    finally:
+        pool.shutdown()
@@ -16,13 +16,17 @@ def test_circuit_breaker_closed_by_default():
 def test_circuit_breaker_trips_to_open_on_failures():
     with patch('core.circuit_breaker.redis_cache') as mock_redis:
         mock_redis.connected = True
-        mock_redis.redis_client.incr.return_value = 5
+        pipe = mock_redis.redis_client.pipeline.return_value
+        pipe.execute.return_value = [True, 5]  # SET NX / INCR results
         mock_redis.redis_client.get.return_value = b"CLOSED"
 
         cb = RedisCircuitBreaker(name="test_trip", failure_threshold=5)
         cb.record_failure()
 
-        mock_redis.redis_client.pipeline().execute.assert_called()
+        pipe.incr.assert_called_once_with("fuze:circuit:test_trip:failures")
+        pipe.set.assert_any_call("fuze:circuit:test_trip:state", CircuitState.OPEN)
+        pipe.publish.assert_called_once()
+        assert cb.allow_request() is False
 
 
 def test_circuit_breaker_blocks_when_open():
@@ -52,3 +56,78 @@ def test_circuit_breaker_transitions_to_half_open_after_timeout():
         cb = RedisCircuitBreaker(name="test_half_open", recovery_timeout=120)
         assert cb.get_state() == CircuitState.HALF_OPEN
         assert cb.allow_request() is True
+
+
+def test_circuit_breaker_serves_state_from_local_mirror():
+    with patch('core.circuit_breaker.redis_cache') as mock_redis:
+        mock_redis.connected = True
+        mock_redis.redis_client.get.return_value = None
+
+        cb = RedisCircuitBreaker(name="test_mirror", local_ttl_seconds=60)
+        for _ in range(100):
+            assert cb.allow_request() is True
+
+        assert mock_redis.redis_client.get.call_count == 1
+
+
+def test_circuit_breaker_success_skips_redis_when_no_local_failures():
+    with patch('core.circuit_breaker.redis_cache') as mock_redis:
+        mock_redis.connected = True
+        mock_redis.redis_client.get.return_value = None
+
+        cb = RedisCircuitBreaker(name="test_success", local_ttl_seconds=60)
+        for _ in range(10):
+            cb.record_success()
+
+        mock_redis.redis_client.delete.assert_not_called()
+
+
+def test_circuit_breaker_registry_and_broadcast():
+    from core.circuit_breaker import get_circuit_breaker, _apply_transition_message
+
+    with patch('core.circuit_breaker.redis_cache') as mock_redis:
+        mock_redis.connected = True
+        mock_redis.redis_client.get.return_value = None
+
+        cb = get_circuit_breaker("test_registry", local_ttl_seconds=60)
+        assert get_circuit_breaker("test_registry") is cb
+        assert cb.allow_request() is True
+
+        _apply_transition_message(
+            b'{"name": "test_registry", "state": "OPEN", "opened_at": %f}' % time.time()
+        )
+        assert cb.allow_request() is False
+
+
+def test_pinned_circuit_breaker_survives_registry_eviction():
+    from core.circuit_breaker import get_circuit_breaker, _apply_transition_message
+
+    with patch('core.circuit_breaker.redis_cache') as mock_redis, \
+            patch('core.circuit_breaker.MAX_REGISTERED_BREAKERS', 2):
+        mock_redis.connected = True
+        mock_redis.redis_client.get.return_value = None
+
+        pinned = get_circuit_breaker("test_pinned", pinned=True, local_ttl_seconds=60)
+        for i in range(5):
+            get_circuit_breaker(f"domain_evict{i}.example")
+
+        assert get_circuit_breaker("test_pinned") is pinned
+        _apply_transition_message(
+            b'{"name": "test_pinned", "state": "OPEN", "opened_at": %f}' % time.time()
+        )
+        assert pinned.allow_request() is False
+
+
+def test_circuit_breaker_failure_window_is_fixed_from_first_failure():
+    with patch('core.circuit_breaker.redis_cache') as mock_redis:
+        mock_redis.connected = True
+        mock_redis.redis_client.get.return_value = None
+        pipe = mock_redis.redis_client.pipeline.return_value
+        pipe.execute.return_value = [None, 2]
+
+        cb = RedisCircuitBreaker(name="test_window", failure_threshold=5, window_seconds=60, local_ttl_seconds=60)
+        cb.record_failure()
+
+        pipe.set.assert_called_once_with(cb.failures_key, 0, ex=60, nx=True)
+        pipe.incr.assert_called_once_with(cb.failures_key)
+        pipe.expire.assert_not_called()
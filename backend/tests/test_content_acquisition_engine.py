@@ -178,6 +178,7 @@ def test_acquisition_engine_integration(mocker):
 
     mocker.patch("scrapers.rate_limiter.DomainRateLimiter.acquire", return_value=(True, 0.0))
     mocker.patch("scrapers.robots_manager.RobotsManager.can_fetch", return_value=True)
+    mocker.patch("scrapers.robots_manager.RobotsManager.crawl_delay", return_value=None)
     mocker.patch("core.circuit_breaker.RedisCircuitBreaker.allow_request", return_value=True)
 
     engine = ContentAcquisitionEngine()
@@ -191,3 +192,205 @@ def test_acquisition_engine_integration(mocker):
     assert doc.fetch_metadata.strategy in ("HTTP", "STEALTH", "DYNAMIC")
     assert "opengraph" in doc.plugin_versions
     assert "title" in doc.metadata.field_provenance
+
+
+class _MeanRng:
+    """Deterministic stand-in for random.Random: posterior means, never explores."""
+    def betavariate(self, alpha, beta):
+        return alpha / (alpha + beta)
+
+    def random(self):
+        return 0.99
+
+
+def _policy_with_stats(stats):
+    policy = FetchPolicy(rng=_MeanRng())
+    policy._redis = MagicMock()
+    policy._redis.hgetall.return_value = stats
+    return policy
+
+
+def test_fetch_policy_bandit_prunes_tiers_by_cost_per_success():
+    # HTTP keeps failing the quality gate on this domain while STEALTH passes: skip the doomed attempt
+    policy = _policy_with_stats({
+        b"HTTP:fail": b"30", b"HTTP:ms": b"24000",
+        b"STEALTH:pass": b"20", b"STEALTH:ms": b"70000",
+        b"DYNAMIC:pass": b"5", b"DYNAMIC:fail": b"1", b"DYNAMIC:ms": b"40000",
+    })
+    assert policy.get_strategy_plan("https://example.com/post") == ["STEALTH", "DYNAMIC"]
+    policy._redis.hgetall.assert_called_once_with("fuze:policy:v2:example.com")
+
+    # A cheap HTTP fetch that passes beats the browsers even on a STEALTH-listed domain
+    policy = _policy_with_stats({b"HTTP:pass": b"6", b"HTTP:ms": b"3000", b"STEALTH:pass": b"3", b"STEALTH:ms": b"9000"})
+    assert policy.get_strategy_plan("https://medium.com/@user/story") == ["HTTP", "STEALTH", "DYNAMIC"]
+
+    # No observations yet: the static table decides
+    assert _policy_with_stats({}).get_strategy_plan("https://devdocs.io/css") == ["DYNAMIC"]
+
+
+def test_fetch_policy_keeps_escalation_order():
+    # DYNAMIC passing everywhere must not jump ahead of the cheaper tiers: the DecisionEngine
+    # fails a DYNAMIC challenge outright, which would end the chain before HTTP was tried
+    policy = _policy_with_stats({
+        b"HTTP:pass": b"4", b"HTTP:fail": b"4", b"HTTP:ms": b"2000",
+        b"DYNAMIC:pass": b"40", b"DYNAMIC:ms": b"40000",
+    })
+    plan = policy.get_strategy_plan("https://example.com/post")
+    assert plan == sorted(plan, key=["HTTP", "STEALTH", "DYNAMIC"].index)
+    assert plan[0] == "HTTP" and plan[-1] == "DYNAMIC"
+
+
+def test_fetch_policy_counts_decay_with_age():
+    from scrapers.fetch_policy import StrategyStats, POLICY_HALF_LIFE_SECONDS
+    stats = StrategyStats(passes=40.0, fails=10.0, latency_ms_total=50000.0, updated_at=1000.0)
+
+    aged = stats.decayed_to(1000.0 + 2 * POLICY_HALF_LIFE_SECONDS)
+
+    assert aged.passes == pytest.approx(10.0) and aged.fails == pytest.approx(2.5)
+    # Mean latency is a recency-weighted mean, unchanged by uniform decay
+    assert aged.mean_latency_ms(0) == pytest.approx(1000.0)
+
+
+def test_fetch_policy_records_outcomes_atomically():
+    policy = _policy_with_stats({})
+    script = policy._redis.register_script.return_value
+
+    policy.record_outcome("https://www.github.com/user/repo", "STEALTH", passed=True, latency_ms=1200)
+    policy.record_outcome("https://www.github.com/user/repo", "STEALTH", passed=False, latency_ms=800)
+
+    policy._redis.register_script.assert_called_once()
+    kwargs = script.call_args_list[0].kwargs
+    assert kwargs["keys"] == ["fuze:policy:v2:github.com"]
+    assert kwargs["args"][:3] == ["STEALTH", 1, 1200.0]
+    assert script.call_args_list[1].kwargs["args"][1] == 0
+
+
+def test_acquisition_engine_defers_rate_limited_domain(mocker):
+    from scrapers.rate_limiter import DomainRateLimited
+    mocker.patch("scrapers.robots_manager.RobotsManager.can_fetch", return_value=True)
+    mocker.patch("scrapers.robots_manager.RobotsManager.crawl_delay", return_value=None)
+    mocker.patch("scrapers.rate_limiter.DomainRateLimiter.acquire", return_value=(False, 3.5))
+    engine = ContentAcquisitionEngine()
+    fetch = mocker.patch.object(engine.fetchers["HTTP"], "fetch")
+
+    with pytest.raises(DomainRateLimited) as exc_info:
+        engine.acquire_and_normalize("https://github.com/user/repo")
+
+    assert exc_info.value.wait_time == 3.5 and exc_info.value.domain == "github.com"
+    fetch.assert_not_called()
+
+
+def test_domain_rate_limiter_leases_concurrency_slot():
+    from scrapers.rate_limiter import DomainRateLimiter
+    limiter = DomainRateLimiter()
+    limiter._redis = MagicMock()
+    script = limiter._redis.register_script.return_value
+
+    script.return_value = [1, 0]
+    assert limiter.acquire("https://github.com/a") == (True, 0.0)
+    keys = script.call_args.kwargs["keys"]
+    assert keys == ["fuze:rate_limit:github.com", "fuze:rate_limit:github.com:inflight"]
+    token = script.call_args.kwargs["args"][5]
+
+    limiter.release("https://github.com/a")
+    limiter._redis.zrem.assert_called_once_with("fuze:rate_limit:github.com:inflight", token)
+
+    script.return_value = [0, 2500]
+    assert limiter.acquire("https://github.com/b") == (False, 2.5)
+    limiter.release("https://github.com/b")
+    assert limiter._redis.zrem.call_count == 1
+
+
+def test_robots_rules_compiled_once_and_crawl_delay_exposed(mocker):
+    import scrapers.robots_manager as robots_module
+    from scrapers.robots_manager import RobotsManager, clear_local_cache
+    clear_local_cache()
+    manager = RobotsManager()
+    manager._redis = MagicMock()
+    manager._redis.pipeline.return_value.execute.return_value = [
+        b"User-agent: *\nDisallow: /private\nCrawl-delay: 2\n", 86_000_000
+    ]
+    compile_spy = mocker.spy(robots_module, "_compile")
+
+    assert manager.can_fetch("https://docs.example.org/guide") is True
+    assert manager.can_fetch("https://docs.example.org/private/x") is False
+    assert manager.crawl_delay("https://docs.example.org/guide") == 2.0
+
+    assert manager._redis.pipeline.return_value.execute.call_count == 1
+    assert compile_spy.call_count == 1
+    clear_local_cache()
+
+
+def test_robots_missing_file_is_cached_negative(mocker):
+    from scrapers.robots_manager import RobotsManager, ROBOTS_CACHE_TTL, clear_local_cache
+    clear_local_cache()
+    manager = RobotsManager()
+    manager._redis = MagicMock()
+    manager._redis.pipeline.return_value.execute.return_value = [None, -2]
+    mocker.patch("core.distributed_lock.DistributedLock.acquire", return_value=True)
+    mocker.patch("core.distributed_lock.DistributedLock.release", return_value=True)
+    get = mocker.patch("scrapers.robots_manager.requests.get", return_value=MagicMock(status_code=404))
+
+    assert manager.can_fetch("https://no-robots.example.net/a") is True
+    assert manager.can_fetch("https://no-robots.example.net/b") is True
+    assert manager.crawl_delay("https://no-robots.example.net/c") is None
+
+    get.assert_called_once()
+    manager._redis.setex.assert_called_once_with("fuze:robots_txt:no-robots.example.net", ROBOTS_CACHE_TTL, "")
+    clear_local_cache()
+
+
+def test_robots_local_copy_never_outlives_redis_entry(mocker):
+    import scrapers.robots_manager as robots_module
+    from scrapers.robots_manager import RobotsManager, clear_local_cache
+    clear_local_cache()
+    manager = RobotsManager()
+    manager._redis = MagicMock()
+    # An unreachable allow-all entry with 120s left of its ROBOTS_UNREACHABLE_TTL
+    manager._redis.pipeline.return_value.execute.return_value = [b"", 120_000]
+    mocker.patch("scrapers.robots_manager.time.monotonic", return_value=1000.0)
+
+    assert manager.can_fetch("https://flaky.example.net/a") is True
+    assert robots_module._local_rules["flaky.example.net"][1] == 1120.0
+    clear_local_cache()
+
+
+def test_robots_rate_limited_fetch_is_retried_sooner(mocker):
+    from scrapers.robots_manager import RobotsManager, ROBOTS_UNREACHABLE_TTL, clear_local_cache
+    clear_local_cache()
+    manager = RobotsManager()
+    manager._redis = MagicMock()
+    manager._redis.pipeline.return_value.execute.return_value = [None, -2]
+    mocker.patch("core.distributed_lock.DistributedLock.acquire", return_value=True)
+    mocker.patch("core.distributed_lock.DistributedLock.release", return_value=True)
+    mocker.patch("scrapers.robots_manager.requests.get", return_value=MagicMock(status_code=429))
+
+    assert manager.can_fetch("https://busy.example.net/a") is True
+    manager._redis.setex.assert_called_once_with("fuze:robots_txt:busy.example.net", ROBOTS_UNREACHABLE_TTL, "")
+    clear_local_cache()
+
+
+def test_quality_evaluator_scans_head_and_tail_windows():
+    from scrapers.quality_evaluator import scan_markers, count_structure_tags, HEAD_WINDOW
+    filler = "<div>" + ("x" * (HEAD_WINDOW + 50000)) + "</div>"
+    html = "<html><body><div id='app'>Rendered</div>" + filler + '<script id="__NEXT_DATA__">{}</script></body></html>'
+
+    assert scan_markers(html) == (None, "__next_data__")
+    assert scan_markers("<p>ok</p>", "Pardon Our Interruption while we verify") == ("pardon our interruption", None)
+    assert count_structure_tags('<main><H1>T</H1><p class="a">1</p><p>2</p><pre>x</pre><param></main>') == {
+        "article": 0, "main": 1, "h1": 1, "p": 2
+    }
+
+
+def test_text_cleaner_strips_css_and_boilerplate():
+    from scrapers.text_cleaner import clean_extracted_text, count_special_chars
+    text = (
+        "Intro text here.\n.nav-bar { color: red; }\nfont-size: 14px;\n\n\n\n"
+        "Read https://x.io/a now. Cookie policy applies here. Done 12% and 12em."
+    )
+
+    assert clean_extracted_text(text) == "Intro text here.\nRead now. Done and ."
+    assert clean_extracted_text("Position: absolute top: 0 text stays") == "absolute 0 text stays"
+    assert clean_extracted_text('style="color:red" {"theme": "dark"} rgba(0,0,0,1) #fff word') == "word"
+    assert clean_extracted_text("") == ""
+    assert count_special_chars("a{b}: c;") == 4
@@ -0,0 +1,138 @@
+import pytest
+from types import SimpleNamespace
+from models import SavedContent, ContentAnalysis, ContentFeatures, db
+from ml.content_features import (
+    TECH,
+    CONTENT_TYPES,
+    DIFFICULTIES,
+    decode_feature_terms,
+    extract_feature_terms,
+    feature_source_hash,
+    feature_vocabulary,
+    load_feature_columns,
+    refresh_content_features,
+    tech_id_overlap
+)
+
+
+@pytest.fixture
+def created_content_ids(app):
+    """Content ids a test created; their analysis and feature rows are removed afterwards"""
+    content_ids = []
+    yield content_ids
+    with app.app_context():
+        db.session.rollback()
+        for model in (ContentFeatures, ContentAnalysis):
+            db.session.query(model).filter(model.content_id.in_(content_ids)).delete(synchronize_session=False)
+        db.session.query(SavedContent).filter(SavedContent.id.in_(content_ids)).delete(synchronize_session=False)
+        db.session.commit()
+
+
+def test_extract_feature_terms_merges_and_normalizes():
+    content = SimpleNamespace(tags="Docker, python")
+    analysis = SimpleNamespace(
+        technology_tags="Python, Flask",
+        analysis_data={"technologies": ["flask ", "SQLAlchemy"], "key_concepts": ["ORM"], "difficulty": "advanced"},
+        key_concepts="REST, ORM",
+        content_type="tutorial",
+        difficulty_level="beginner"
+    )
+
+    terms = extract_feature_terms(content, analysis)
+
+    assert sorted(terms['technologies']) == ["docker", "flask", "python", "sqlalchemy"]
+    assert sorted(terms['key_concepts']) == ["ORM", "REST"]
+    assert terms['content_type'] == "tutorial"
+    assert terms['difficulty'] == "advanced"
+
+
+def test_feature_source_hash_reads_only_loaded_columns():
+    # No extracted_text attribute: the digest must not touch the deferred column
+    content = SimpleNamespace(tags="python", quality_score=7, content_hash="a" * 64)
+    analysis = SimpleNamespace(id=3, updated_at=None)
+
+    digest = feature_source_hash(content, analysis)
+    rescraped = SimpleNamespace(tags="python", quality_score=7, content_hash="b" * 64)
+
+    assert digest == feature_source_hash(content, analysis)
+    assert digest != feature_source_hash(rescraped, analysis)
+
+
+@pytest.mark.unit
+@pytest.mark.requires_db
+def test_feature_row_roundtrip_and_id_overlap(test_user, app, created_content_ids):
+    with app.app_context():
+        feature_vocabulary.clear()
+        content = SavedContent(
+            user_id=test_user['id'],
+            url='https://example.com/flask-sqlalchemy',
+            title='Flask and SQLAlchemy in practice',
+            extracted_text='Building   a REST API\nwith Flask and SQLAlchemy.',
+            tags='python',
+            quality_score=8
+        )
+        db.session.add(content)
+        db.session.commit()
+        created_content_ids.append(content.id)
+
+        analysis = ContentAnalysis(
+            content_id=content.id,
+            analysis_data={"technologies": ["Flask", "SQLAlchemy"], "content_type": "Podcast"},
+            key_concepts="REST",
+            technology_tags="Flask",
+            difficulty_level="intermediate",
+            relevance_score=70
+        )
+        db.session.add(analysis)
+        db.session.commit()
+
+        assert refresh_content_features(db.session, content, analysis) is True
+        # Rewriting the same bookmark updates in place
+        assert refresh_content_features(db.session, content, analysis) is True
+        assert db.session.query(ContentFeatures).filter_by(content_id=content.id).count() == 1
+
+        columns = load_feature_columns(db.session, [content.id])
+        row = columns.index[content.id]
+        assert CONTENT_TYPES[columns.content_type[row]] == "other"
+        assert DIFFICULTIES[columns.difficulty[row]] == "intermediate"
+        assert columns.quality_score[row] == 8
+        assert columns.snippets[row] == "Building a REST API with Flask and SQLAlchemy."
+
+        terms = feature_vocabulary.terms_for(db.session, TECH, columns.tech_ids[row])
+        assert sorted(terms.values()) == ["flask", "python", "sqlalchemy"]
+
+        request_ids = feature_vocabulary.cached_ids(TECH, ["flask", "python", "golang"])
+        assert tech_id_overlap(columns.tech_ids[row], request_ids) == 2
+
+
+@pytest.mark.unit
+@pytest.mark.requires_db
+def test_feature_rows_ignored_once_inputs_change(test_user, app, created_content_ids):
+    with app.app_context():
+        feature_vocabulary.clear()
+        content = SavedContent(
+            user_id=test_user['id'],
+            url='https://example.com/stale-features',
+            title='Feature staleness',
+            extracted_text='Original text about Django.',
+            tags='python',
+            quality_score=7
+        )
+        db.session.add(content)
+        db.session.commit()
+        created_content_ids.append(content.id)
+        analysis = ContentAnalysis(content_id=content.id, analysis_data={"technologies": ["Django"]}, relevance_score=50)
+        db.session.add(analysis)
+        db.session.commit()
+        assert refresh_content_features(db.session, content, analysis) is True
+
+        current = {content.id: feature_source_hash(content, analysis)}
+        columns = load_feature_columns(db.session, current.keys(), current)
+        tech_terms, _ = decode_feature_terms(db.session, columns)
+        assert sorted(tech_terms.values()) == ["django", "python"]
+
+        # A tag edit (or rescrape) without a new analysis makes the stored row stale
+        content.tags = 'python, rust'
+        db.session.commit()
+        edited = {content.id: feature_source_hash(content, analysis)}
+        assert len(load_feature_columns(db.session, edited.keys(), edited)) == 0
@@ -0,0 +1,84 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import patch
+from models import SavedContent, BookmarkEvent, db
+from utils.event_bus import PipelineEventSink, publish_pipeline_event
+
+
+def _row(event_id, bookmark_id, user_id, sequence=1, pipeline_run_id="run_test"):
+    return {
+        "event_id": event_id, "bookmark_id": bookmark_id, "user_id": user_id,
+        "pipeline_run_id": pipeline_run_id, "sequence": sequence, "type": "bookmark.pipeline.scraping.started",
+        "schema_version": 1, "data": {"n": sequence}, "error": None, "metadata_json": None,
+        "created_at": datetime.now(timezone.utc)
+    }
+
+
+@pytest.fixture
+def bookmark(test_user, app):
+    with app.app_context():
+        content = SavedContent(user_id=test_user['id'], url='https://example.com/events', title='Events')
+        db.session.add(content)
+        db.session.commit()
+        yield content.id, test_user['id']
+        db.session.query(BookmarkEvent).filter_by(bookmark_id=content.id).delete()
+        db.session.delete(db.session.get(SavedContent, content.id))
+        db.session.commit()
+
+
+@pytest.mark.unit
+@pytest.mark.requires_db
+def test_buffered_sink_flushes_on_size_and_explicitly(bookmark, app):
+    bookmark_id, user_id = bookmark
+    with app.app_context():
+        sink = PipelineEventSink(flush_size=3, flush_interval=3600)
+        sink.enable_buffering()
+        # Count only this test's rows: other tests may leave events for a reused bookmark id
+        run_id = "run_flush_size"
+        stored = db.session.query(BookmarkEvent).filter_by(pipeline_run_id=run_id)
+
+        for i in range(2):
+            sink.record(_row(f"evt_size_{i}", bookmark_id, user_id, i, run_id))
+        assert sink.pending == 2
+        assert stored.count() == 0
+
+        sink.record(_row("evt_size_2", bookmark_id, user_id, 2, run_id))
+        assert sink.pending == 0
+        assert stored.count() == 3
+
+        sink.record(_row("evt_size_3", bookmark_id, user_id, 3, run_id))
+        assert sink.flush() == 1
+        assert sink.flush() == 0
+
+
+@pytest.mark.unit
+@pytest.mark.requires_db
+def test_rejected_row_does_not_drop_batch(bookmark, app):
+    bookmark_id, user_id = bookmark
+    with app.app_context():
+        sink = PipelineEventSink(flush_size=100, flush_interval=3600)
+        sink.enable_buffering()
+        run_id = "run_rejected_row"
+        sink.record(_row("evt_dup", bookmark_id, user_id, 1, run_id))
+        sink.record(_row("evt_dup", bookmark_id, user_id, 2, run_id))  # violates unique event_id
+        sink.record(_row("evt_ok", bookmark_id, user_id, 3, run_id))
+
+        assert sink.flush() == 2
+        stored = {e.event_id for e in db.session.query(BookmarkEvent).filter_by(pipeline_run_id=run_id)}
+        assert stored == {"evt_dup", "evt_ok"}
+
+
+@pytest.mark.unit
+@pytest.mark.requires_db
+def test_publish_writes_through_by_default(bookmark, app):
+    bookmark_id, user_id = bookmark
+    with app.app_context():
+        sink = PipelineEventSink()
+        with patch('utils.event_bus.event_sink', sink):
+            public = publish_pipeline_event(
+                "bookmark.pipeline.scraping.completed", bookmark_id, user_id, "run_test", 2, data={"ok": True}
+            )
+
+        assert public['category'] == 'success'
+        record = db.session.query(BookmarkEvent).filter_by(event_id=public['event_id']).one()
+        assert record.data == {"ok": True} and record.sequence == 2
@@ -35,3 +35,51 @@ class TestLinkedIn:
         data = response.json
         assert data['success'] is True
         assert data['data']['overall_status'] == 'operational'
+
+
+@pytest.mark.unit
+@pytest.mark.requires_db
+class TestLinkedInBatchExtract:
+    """Concurrent batch extraction with URL cache"""
+
+    @pytest.fixture
+    def fake_scrape(self, monkeypatch):
+        from scrapers.easy_linkedin_scraper import EasyLinkedInScraper
+        from utils.redis_utils import redis_cache
+
+        calls = []
+        store = {}
+
+        def scrape_post(self, url):
+            calls.append(url)
+            return {'success': 'fail' not in url, 'title': url[-1], 'content': 'post body', 'quality_score': 7,
+                    'method_used': 'Direct scraping'}
+
+        monkeypatch.setattr(EasyLinkedInScraper, 'scrape_post', scrape_post)
+        monkeypatch.setattr(redis_cache, 'get', store.get)
+        monkeypatch.setattr(redis_cache, 'set_cache', lambda key, value, ttl=3600: store.__setitem__(key, value))
+        return calls
+
+    def test_batch_results_keep_input_order_and_hit_cache(self, client, auth_headers, fake_scrape):
+        urls = ['https://www.linkedin.com/posts/a', 'https://evil.com/b', 'https://www.linkedin.com/posts/fail-c']
+        response = client.post('/api/linkedin/batch-extract', json={'urls': urls}, headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json['data']
+        assert [r['url'] for r in data['results']] == urls
+        assert [r['success'] for r in data['results']] == [True, False, False]
+        assert data['results'][1]['error'] == 'Invalid LinkedIn URL'
+        assert (data['successful'], data['failed']) == (1, 2)
+
+        # Successful extractions are cached by URL; failures are retried
+        response = client.post('/api/linkedin/batch-extract', json={'urls': urls}, headers=auth_headers)
+        assert response.json['data']['results'][0]['data']['cached'] is True
+        assert sorted(fake_scrape) == sorted([urls[0], urls[2], urls[2]])
+
+    def test_batch_streams_json_lines(self, client, auth_headers, fake_scrape):
+        import json
+        urls = ['https://www.linkedin.com/posts/x', 'https://m.linkedin.com/posts/y']
+        response = client.post('/api/linkedin/batch-extract?stream=1', json={'urls': urls}, headers=auth_headers)
+        assert response.mimetype == 'application/x-ndjson'
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert {line['index'] for line in lines if line['type'] == 'result'} == {0, 1}
+        assert lines[-1] == {'type': 'summary', 'total_urls': 2, 'successful': 2, 'failed': 0}
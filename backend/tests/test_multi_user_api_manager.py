@@ -58,10 +58,28 @@ def test_get_user_api_key_revoked_returns_none():
 def test_rate_limiting_redis():
     mock_redis = MagicMock()
     mock_redis.connected = True
-    mock_redis.get_cache.return_value = "5"
+    # Quota script result: allowed, retry_after, then minute/day/month usage
+    mock_redis.redis_client.register_script.return_value.return_value = [1, 0, 5, 5, 5]
 
     manager = MultiUserAPIManager(redis_client=mock_redis)
     status = manager.check_user_rate_limit(user_id=1)
 
     assert status['can_make_request'] is True
     assert status['requests_last_minute'] == 5
+    assert status['remaining']['minute'] == 10
+
+
+@pytest.mark.unit
+def test_reserve_user_request_memory_fallback():
+    mock_redis = MagicMock()
+    mock_redis.connected = False
+
+    manager = MultiUserAPIManager(redis_client=mock_redis)
+    manager.REQUESTS_PER_MINUTE = 3
+
+    assert manager.reserve_user_request(user_id=7, n=2)['reserved'] == 2
+    denied = manager.reserve_user_request(user_id=7, n=2)
+    assert denied['can_make_request'] is False
+    assert denied['reserved'] == 0
+    assert denied['wait_time_seconds'] > 0
+    assert manager.check_user_rate_limit(user_id=7)['requests_last_minute'] == 2
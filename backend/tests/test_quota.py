@@ -0,0 +1,93 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from core.quota import RedisQuota, QuotaWindow
+
+WINDOWS = (QuotaWindow("minute", 5, 60), QuotaWindow("day", 100, 86400))
+
+
+@pytest.fixture(autouse=True)
+def frozen_clock():
+    # Pin the clock mid-bucket so window rollover cannot make results flaky
+    with patch('core.quota.time.time', return_value=1200.5):
+        yield
+
+
+def _offline_quota(namespace="test"):
+    offline = MagicMock()
+    offline.connected = False
+    return RedisQuota(namespace, redis_client=offline)
+
+
+def test_quota_reserve_is_all_or_nothing():
+    quota = _offline_quota()
+
+    granted = quota.reserve("u1", WINDOWS, n=4)
+    assert granted.allowed is True
+    assert granted.remaining == {"minute": 1, "day": 96}
+
+    denied = quota.reserve("u1", WINDOWS, n=2)
+    assert denied.allowed is False
+    assert denied.retry_after > 0
+    # Nothing was taken from the day window either
+    assert quota.peek("u1", WINDOWS).used == {"minute": 4, "day": 4}
+
+
+def test_quota_record_counts_past_limit_and_peek_is_read_only():
+    quota = _offline_quota()
+
+    quota.record("u2", WINDOWS, n=6)
+    status = quota.peek("u2", WINDOWS)
+    assert status.allowed is False
+    assert status.used["minute"] == 6
+    assert quota.peek("u2", WINDOWS).used["minute"] == 6
+
+
+def test_quota_release_gives_back_unspent_units():
+    quota = _offline_quota()
+    quota.reserve("u4", WINDOWS, n=5)
+    assert quota.reserve("u4", WINDOWS).allowed is False
+
+    released = quota.release("u4", WINDOWS, n=2)
+    assert released.used == {"minute": 3, "day": 3}
+    assert quota.reserve("u4", WINDOWS, n=2).allowed is True
+    # Never drops below what the current bucket holds
+    assert quota.release("u4", WINDOWS, n=50).used == {"minute": 0, "day": 0}
+
+
+def test_quota_subjects_are_isolated():
+    quota = _offline_quota()
+    quota.reserve("a", WINDOWS, n=5)
+    assert quota.reserve("b", WINDOWS).allowed is True
+
+
+def test_quota_single_script_call_against_redis():
+    mock_script = MagicMock(return_value=[1, 0, 3, 10])
+    mock_client = MagicMock()
+    mock_client.register_script.return_value = mock_script
+
+    with patch('core.quota.redis_cache') as mock_cache:
+        mock_cache.connected = True
+        mock_cache.redis_client = mock_client
+        decision = RedisQuota("gemini").reserve("global", WINDOWS, n=3)
+
+    assert decision.allowed is True
+    assert decision.used == {"minute": 3, "day": 10}
+    mock_script.assert_called_once_with(
+        keys=[
+            "fuze:quota:gemini:global:minute:20", "fuze:quota:gemini:global:minute:19",
+            "fuze:quota:gemini:global:day:0", "fuze:quota:gemini:global:day:-1",
+        ],
+        args=[3, "reserve", "1200.5", 5, 60, 100, 86400]
+    )
+
+
+def test_quota_falls_back_to_memory_on_bad_script_result():
+    mock_client = MagicMock()
+    mock_client.register_script.return_value = MagicMock(side_effect=ConnectionError("down"))
+    cache = MagicMock()
+    cache.connected = True
+    cache.redis_client = mock_client
+
+    quota = RedisQuota("test", redis_client=cache)
+    assert quota.reserve("u3", WINDOWS, n=5).allowed is True
+    assert quota.reserve("u3", WINDOWS).allowed is False
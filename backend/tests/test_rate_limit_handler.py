@@ -43,7 +43,9 @@ def test_shared_rate_handler_across_functions():
 def test_rate_limit_redis_counters():
     mock_redis = MagicMock()
     mock_redis.connected = True
-    mock_redis.get_cache.side_effect = ["16", "100"]  # minute=16 (limit=15), day=100
+    # Quota script result: denied, retry in 30s, minute=16 (limit=15), day=100
+    mock_redis.redis_client.register_script.return_value.return_value = [0, 30, 16, 100]
 
     handler = RateLimitHandler(redis_client=mock_redis)
     assert handler.can_make_request() is False
+    assert handler.get_wait_time() == 30
@@ -0,0 +1,72 @@
+import json
+import pytest
+from utils.realtime_bus import RealtimeBus, Subscription, publish_progress, realtime_bus
+
+
+@pytest.fixture
+def bus(monkeypatch):
+    bus = RealtimeBus()
+    # Messages are injected through dispatch(); no subscriber thread
+    monkeypatch.setattr(bus, "_ensure_listener", lambda: None)
+    return bus
+
+
+@pytest.mark.unit
+def test_dispatch_fans_out_to_the_channel_owner_only(bus):
+    first, second, other = bus.subscribe(1), bus.subscribe(1), bus.subscribe(2)
+
+    delivered = bus.dispatch(b"fuze:events:channel:1", json.dumps({"type": "progress.import"}).encode())
+
+    assert delivered == 2
+    assert first.get(timeout=0) == {"type": "progress.import"}
+    assert second.get(timeout=0) == {"type": "progress.import"}
+    assert other.get(timeout=0) is None
+    assert bus.dispatch("fuze:events:channel:3", "{}") == 0
+    assert bus.dispatch("fuze:events:channel:1", "not json") == 0
+
+
+@pytest.mark.unit
+def test_subscription_context_unregisters_and_full_queue_drops_oldest(bus):
+    with bus.subscribe(5) as subscription:
+        assert bus.subscriber_count == 1
+        slow = Subscription(bus, 5, maxsize=2)
+        for n in range(3):
+            slow.put({"n": n})
+        assert [slow.get(timeout=0)["n"], slow.get(timeout=0)["n"]] == [1, 2]
+    assert bus.subscriber_count == 0
+
+
+@pytest.mark.unit
+def test_publish_progress_stores_snapshot_and_publishes(patch_redis_for_tests):
+    client = patch_redis_for_tests.redis_client
+
+    publish_progress(7, "import", {"status": "processing", "processed": 3})
+
+    key, ttl, _ = client.setex.call_args.args
+    assert (key, ttl) == ("import_progress:7", 3600)
+    channel, payload = client.publish.call_args.args
+    assert channel == "fuze:events:channel:7"
+    assert json.loads(payload) == {"type": "progress.import", "data": {"status": "processing", "processed": 3}}
+
+
+@pytest.mark.unit
+@pytest.mark.requires_db
+def test_import_progress_stream_is_pushed_by_the_bus(client, auth_headers, test_user, monkeypatch):
+    monkeypatch.setattr(realtime_bus, "_ensure_listener", lambda: None)
+
+    response = client.get('/api/bookmarks/import/progress/stream', headers=auth_headers)
+    chunks = response.response
+    first = next(chunks)
+    first = first.decode() if isinstance(first, bytes) else first
+    assert json.loads(first[len("data: "):])["status"] == "no_import"
+
+    realtime_bus.dispatch(
+        f"fuze:events:channel:{test_user['id']}",
+        json.dumps({"type": "progress.import", "data": {"status": "completed", "processed": 2}})
+    )
+    update = next(chunks)
+    update = update.decode() if isinstance(update, bytes) else update
+    assert json.loads(update[len("data: "):]) == {"status": "completed", "processed": 2}
+    with pytest.raises(StopIteration):
+        next(chunks)
+    assert realtime_bus.subscriber_count == 0
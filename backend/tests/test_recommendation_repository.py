@@ -57,3 +57,29 @@ def test_recommendation_repository_distinct_and_dict_stats(test_user, app):
 
         paginated_bms = repo.get_user_bookmarks(test_user['id'], limit=10, offset=0)
         assert len(paginated_bms) >= 1
+
+
+@pytest.mark.unit
+@pytest.mark.requires_db
+def test_recommendation_repository_loads_deferred_columns_it_returns(test_user, app):
+    with app.app_context():
+        repo = RecommendationRepository(db.session)
+        bookmark = SavedContent(user_id=test_user['id'], url='https://example.com/deferred',
+                                title='Deferred', tags='python', extracted_text='Body to analyze')
+        repo.add_bookmark(bookmark)
+        db.session.commit()
+        bookmark_id = bookmark.id
+        db.session.expunge_all()
+
+        try:
+            # Loaded in the query itself, not lazily per row
+            unanalyzed = repo.get_unanalyzed_bookmarks(test_user['id'], limit=100)
+            assert all('extracted_text' in bm.__dict__ for bm in unanalyzed)
+            paginated = repo.get_user_bookmarks(test_user['id'], limit=100)
+            assert all('extracted_text' in bm.__dict__ and 'embedding' in bm.__dict__ for bm in paginated)
+
+            recent = repo.get_recent_bookmarks_for_learning(test_user['id'])
+            assert recent[0]._fields == ('id', 'tags', 'saved_at')
+        finally:
+            db.session.query(SavedContent).filter_by(id=bookmark_id).delete()
+            db.session.commit()
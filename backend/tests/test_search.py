@@ -48,6 +48,26 @@ class TestSearch:
         
         assert response.status_code == 400
     
+    def test_hybrid_search(self, client, auth_headers, test_user, app):
+        """Test hybrid search returns fused result cards"""
+        from models import db, SavedContent
+
+        with app.app_context():
+            bookmark = SavedContent(
+                user_id=test_user['id'],
+                url='https://example.com/hybrid',
+                title='Hybrid Retrieval Notes',
+                extracted_text='Reciprocal rank fusion for Python search'
+            )
+            db.session.add(bookmark)
+            db.session.commit()
+
+        response = client.post('/api/search/hybrid', json={'query': 'Hybrid', 'limit': 5}, headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json
+        assert data['engine'] == 'hybrid_rrf'
+        assert all('extracted_text' not in r for r in data['results'])
+
     def test_text_search(self, client, auth_headers, test_user, app):
         """Test text search"""
         from models import db, SavedContent
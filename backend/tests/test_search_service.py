@@ -1,6 +1,8 @@
 import pytest
 from unittest.mock import MagicMock, patch
-from services.search_service import SearchService, MAX_QUERY_LENGTH
+from services.search_service import (
+    SearchService, MAX_QUERY_LENGTH, HYBRID_SEARCH_SQL, HYBRID_SEARCH_EXACT_SQL
+)
 
 
 @pytest.mark.unit
@@ -51,3 +53,100 @@ def test_supabase_semantic_search_with_injected_client():
         assert res['source'] in ('supabase', 'supabase_rpc')
         assert len(res['results']) == 1
         assert res['results'][0]['id'] == 1
+
+
+@pytest.mark.unit
+def test_text_search_uses_ranked_fulltext_results():
+    mock_uow = MagicMock()
+    ranked = [MagicMock(id=2, title='Flask', url='u2', notes='', saved_at=None, has_content=True)]
+    mock_uow.bookmarks.full_text_search.return_value = ranked
+    service = SearchService(mock_uow)
+
+    res = service.text_search(user_id=1, query="flask -django", limit=5)
+
+    mock_uow.bookmarks.full_text_search.assert_called_once_with(1, "flask -django", 5)
+    mock_uow.session.query.assert_not_called()
+    assert [r['id'] for r in res] == [2]
+
+
+@pytest.mark.unit
+def test_text_search_falls_back_to_ilike_without_fulltext_index():
+    from sqlalchemy.exc import ProgrammingError
+
+    mock_uow = MagicMock()
+    mock_uow.bookmarks.full_text_search.side_effect = ProgrammingError("stmt", {}, Exception("no column search_vector"))
+    service = SearchService(mock_uow)
+
+    with patch.object(service, '_fallback_text_search', return_value=[]) as fallback:
+        assert service.text_search(user_id=1, query="flask") == []
+
+    mock_uow.session.rollback.assert_called_once()
+    fallback.assert_called_once_with(1, "flask", 10)
+
+
+@pytest.mark.unit
+def test_reciprocal_rank_fusion_rewards_agreement():
+    from services.search_service import reciprocal_rank_fusion
+
+    fused = reciprocal_rank_fusion([[1, 2, 3], [3, 4, 1]], k=60)
+
+    assert [item_id for item_id, _, _ in fused][:2] == [1, 3]
+    assert fused[0][2] == [1, 3]
+    assert dict((item_id, ranks) for item_id, _, ranks in fused)[4] == [None, 2]
+
+
+@pytest.mark.unit
+def test_hybrid_search_is_one_statement_on_postgres():
+    mock_uow = MagicMock()
+    mock_uow.session.get_bind.return_value.dialect.name = 'postgresql'
+    row = MagicMock(id=7, title='T', url='u', notes='n', saved_at=None, has_content=True,
+                    score=0.0325, vector_rank=1, text_rank=2)
+    mock_uow.session.execute.return_value.fetchall.return_value = [row]
+    service = SearchService(mock_uow)
+
+    with patch('services.search_service.get_embedding', return_value=[0.5] * 384), \
+            patch('services.search_service.prepare_ann_scan', return_value=False) as prepare:
+        res = service.hybrid_search(user_id=3, query="flask auth", limit=5)
+
+    prepare.assert_called_once_with(mock_uow.session, 3, 40)
+    assert mock_uow.session.execute.call_count == 1
+    assert mock_uow.session.execute.call_args[0][0] is HYBRID_SEARCH_SQL
+    params = mock_uow.session.execute.call_args[0][1]
+    assert params['query'] == "flask auth" and params['candidates'] == 40 and params['limit'] == 5
+    assert res == [{
+        'id': 7, 'title': 'T', 'url': 'u', 'description': 'n', 'saved_at': None,
+        'has_content': True, 'score': 0.0325, 'vector_rank': 1, 'text_rank': 2
+    }]
+
+
+@pytest.mark.unit
+def test_hybrid_search_uses_exact_scan_for_small_libraries():
+    mock_uow = MagicMock()
+    mock_uow.session.get_bind.return_value.dialect.name = 'postgresql'
+    mock_uow.session.execute.return_value.fetchall.return_value = []
+    service = SearchService(mock_uow)
+
+    with patch('services.search_service.get_embedding', return_value=[0.5] * 384), \
+            patch('services.search_service.prepare_ann_scan', return_value=True):
+        service.hybrid_search(user_id=3, query="flask auth", limit=5)
+
+    assert mock_uow.session.execute.call_args[0][0] is HYBRID_SEARCH_EXACT_SQL
+    assert "ORDER BY (embedding <=> CAST(:embedding AS vector(384))) + 0" in str(HYBRID_SEARCH_EXACT_SQL)
+
+
+@pytest.mark.unit
+def test_hybrid_search_fuses_fallback_rankings():
+    mock_uow = MagicMock()
+    mock_uow.session.get_bind.return_value.dialect.name = 'sqlite'
+    a = MagicMock(id=1, title='A', url='a', notes='', saved_at=None, has_content=True)
+    b = MagicMock(id=2, title='B', url='b', notes='', saved_at=None, has_content=False)
+    service = SearchService(mock_uow)
+
+    with patch('services.search_service.get_embedding', return_value=[0.5] * 384), \
+            patch.object(service, '_fallback_semantic_ranking', return_value=[a, b]), \
+            patch.object(service, '_fallback_text_search', return_value=[b]):
+        res = service.hybrid_search(user_id=3, query="b", limit=5)
+
+    assert [r['id'] for r in res] == [2, 1]
+    assert res[0]['vector_rank'] == 2 and res[0]['text_rank'] == 1
+    assert res[1]['text_rank'] is None
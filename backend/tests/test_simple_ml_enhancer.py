@@ -0,0 +1,99 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from ml.simple_ml_enhancer import (
+    UserTfidfCorpus,
+    get_user_tfidf_similarities,
+    invalidate_user_tfidf_corpus,
+    _doc_digest
+)
+
+DOCS = {
+    1: "Flask REST API tutorial with SQLAlchemy and Python",
+    2: "React hooks and state management in the browser",
+    3: "Docker compose for Python web services",
+    4: "Kubernetes deployment patterns for web services",
+    5: "Intro to pandas dataframes for data analysis in Python",
+}
+
+
+def _digests(docs):
+    return {cid: _doc_digest(text) for cid, text in docs.items()}
+
+
+def test_corpus_scores_match_query_terms():
+    corpus = UserTfidfCorpus.fit(DOCS, _digests(DOCS))
+    scores = corpus.similarities("python flask api")
+
+    assert set(scores) == set(DOCS)
+    assert max(scores, key=scores.get) == 1
+    assert scores[2] == 0.0
+
+
+def test_corpus_sync_is_incremental():
+    corpus = UserTfidfCorpus.fit(DOCS, _digests(DOCS))
+
+    same, changed = corpus.sync(DOCS, _digests(DOCS))
+    assert same is corpus and changed is False
+
+    docs = dict(DOCS)
+    del docs[2]
+    docs[6] = "FastAPI async Python API"
+    updated, changed = corpus.sync(docs, _digests(docs))
+    assert changed is True
+    assert updated.vectorizer is corpus.vectorizer  # no refit for one new row
+    assert sorted(updated.ids) == [1, 3, 4, 5, 6]
+    assert updated.similarities("python api")[6] > 0
+
+
+def test_corpus_refits_after_many_additions():
+    corpus = UserTfidfCorpus.fit(DOCS, _digests(DOCS))
+    docs = dict(DOCS)
+    docs.update({100 + i: f"golang concurrency channels lesson {i}" for i in range(5)})
+
+    refit, changed = corpus.sync(docs, _digests(docs))
+    assert changed is True
+    assert refit.vectorizer is not corpus.vectorizer
+    assert "golang" in refit.vectorizer.vocabulary_
+
+
+def test_corpus_roundtrips_through_bytes():
+    corpus = UserTfidfCorpus.fit(DOCS, _digests(DOCS))
+    restored = UserTfidfCorpus.from_bytes(corpus.to_bytes())
+
+    assert restored.ids == corpus.ids
+    assert restored.similarities("docker web services") == pytest.approx(
+        corpus.similarities("docker web services")
+    )
+
+
+def test_get_user_tfidf_similarities_reuses_model():
+    invalidate_user_tfidf_corpus(4242)
+    first = get_user_tfidf_similarities(4242, DOCS, "kubernetes deployment")
+    second = get_user_tfidf_similarities(4242, DOCS, "kubernetes deployment")
+
+    assert first == second
+    assert max(first, key=first.get) == 4
+
+
+def test_invalidation_bumps_corpus_version_for_every_process():
+    store = {}
+    redis = MagicMock()
+    redis.connected = True
+    redis.redis_client.get.side_effect = store.get
+    redis.redis_client.setex.side_effect = lambda key, ttl, value: store.__setitem__(key, value)
+    redis.redis_client.pipeline.return_value.incr.side_effect = (
+        lambda key: store.__setitem__(key, str(int(store.get(key) or 0) + 1).encode())
+    )
+
+    with patch('utils.redis_utils.redis_cache', redis):
+        get_user_tfidf_similarities(4343, DOCS, "kubernetes deployment")
+        assert "fuze:tfidf:4343:0" in store
+
+        invalidate_user_tfidf_corpus(4343)
+        docs = dict(DOCS)
+        docs[6] = "Helm charts for kubernetes deployment"
+        scores = get_user_tfidf_similarities(4343, docs, "kubernetes deployment")
+
+    assert store["fuze:tfidf:version:4343"] == b"1"
+    assert "fuze:tfidf:4343:1" in store
+    assert set(scores) == set(docs)
@@ -4,8 +4,11 @@ from services.task_queue import (
     get_redis_connection,
     get_queue,
     enqueue_bookmark_processing,
+    enqueue_many,
     get_job_status,
-    is_rq_available
+    is_rq_available,
+    job_id_for,
+    sample_queue_depths
 )
 
 
@@ -29,13 +32,66 @@ def test_enqueue_bookmark_unique_job_id():
     mock_job.id = "bookmark_process_10_abc123"
     mock_queue.enqueue.return_value = mock_job
 
-    with patch('services.task_queue.get_queue', return_value=mock_queue):
+    with patch('services.task_queue.get_queue', return_value=mock_queue), \
+         patch('services.task_queue.find_active_job', return_value=None):
         job = enqueue_bookmark_processing(bookmark_id=10, url="https://example.com", user_id=1)
         assert job is not None
         mock_queue.enqueue.assert_called_once()
         job_id_arg = mock_queue.enqueue.call_args[1]['job_id']
         assert job_id_arg.startswith("bookmark_process_10_")
 
+        # Same bookmark and URL always map to the same id
+        enqueue_bookmark_processing(bookmark_id=10, url="https://example.com", user_id=1)
+        assert mock_queue.enqueue.call_args[1]['job_id'] == job_id_arg
+
+
+@pytest.mark.unit
+def test_enqueue_bookmark_returns_active_job():
+    mock_queue = MagicMock()
+    active_job = MagicMock()
+    active_job.id = "bookmark_process_10_abc"
+
+    with patch('services.task_queue.get_queue', return_value=mock_queue), \
+         patch('services.task_queue.find_active_job', return_value=active_job):
+        job = enqueue_bookmark_processing(bookmark_id=10, url="https://example.com", user_id=1)
+
+    assert job is active_job
+    mock_queue.enqueue.assert_not_called()
+    mock_queue.connection.set.assert_not_called()
+
+
+@pytest.mark.unit
+def test_enqueue_many_skips_active_and_repeated_ids():
+    from rq import Queue
+    mock_queue = MagicMock()
+    mock_queue.enqueue_many.side_effect = lambda datas, pipeline: [MagicMock(id=d.job_id) for d in datas]
+    active_job = MagicMock(id="job_1")
+    active_job.get_status.return_value = "started"
+    datas = [Queue.prepare_data(print, args=(i,), job_id=f"job_{i}") for i in (1, 2, 2, 3)]
+
+    with patch('services.task_queue.get_queue', return_value=mock_queue), \
+         patch('rq.job.Job.fetch_many', return_value=[active_job, None, None, None]):
+        jobs = enqueue_many('default', datas)
+
+    enqueued = mock_queue.enqueue_many.call_args[0][0]
+    assert [d.job_id for d in enqueued] == ["job_2", "job_3"]
+    assert [job.id for job in jobs] == ["job_1", "job_2", "job_3"]
+    assert job_id_for("cache_warm", 7) == "cache_warm_7"
+
+
+@pytest.mark.unit
+def test_sample_queue_depths_is_throttled():
+    mock_conn = MagicMock()
+    pipe = mock_conn.pipeline.return_value.__enter__.return_value
+    pipe.execute.return_value = [3, 0, 0, 1, 0]
+
+    with patch('services.task_queue.get_redis_connection', return_value=mock_conn):
+        depths = sample_queue_depths(force=True)
+        assert depths['default'] == 3
+        assert depths['background_analysis'] == 1
+        assert sample_queue_depths() is None
+    assert pipe.llen.call_count == 5
+
 
 @pytest.mark.unit
 def test_get_job_status_sanitization():
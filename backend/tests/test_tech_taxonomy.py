@@ -0,0 +1,31 @@
+from utils.tech_taxonomy import tech_taxonomy, TechTaxonomy
+
+
+def test_match_returns_canonical_names_and_categories():
+    matches = tech_taxonomy.match("Deploying a React Native app with Node.js and K8s; JS tooling, ci/cd")
+
+    assert matches.names == ('react native', 'node.js', 'kubernetes', 'javascript', 'ci/cd')
+    assert matches.categories == {'mobile', 'backend', 'cloud', 'frontend', 'devops'}
+    assert matches.ids == {tech_taxonomy.ids[name] for name in matches.names}
+
+
+def test_match_respects_word_boundaries():
+    assert tech_taxonomy.extract("a googled javascriptish jsonify reactive") == []
+    # 'go' is too common a word to match in prose; its alias still does
+    assert tech_taxonomy.extract("let's go build it in golang") == ['go']
+    assert tech_taxonomy.extract("C++ and C# code") == ['c++', 'c#']
+
+
+def test_term_lookup_by_alias():
+    assert tech_taxonomy.canonicalize(" JS ") == 'javascript'
+    assert tech_taxonomy.canonicalize("cobol") is None
+    assert tech_taxonomy.category_of("postgres") == 'database'
+    assert tech_taxonomy.category_of("go") == 'backend'
+
+
+def test_custom_taxonomy_prefers_longest_alias():
+    taxonomy = TechTaxonomy({
+        'spring': ('backend', ('spring boot',)),
+        'springfield': ('other', ()),
+    })
+    assert taxonomy.extract("spring boot in springfield, spring") == ['spring', 'springfield']
@@ -0,0 +1,88 @@
+import pytest
+from datetime import datetime, timedelta
+from models import SavedContent, Project, UserStats, UserStatsDaily, db
+from services.user_stats_service import UserStatsService
+from uow.unit_of_work import UnitOfWork
+
+COUNTERS = ('bookmark_count', 'content_count', 'analyzed_count', 'quality_count',
+            'scraping_count', 'embedding_count', 'analyzing_count', 'project_count')
+
+
+@pytest.fixture(autouse=True)
+def clean_stats(test_user, app):
+    # SQLite does not enforce ON DELETE CASCADE: drop rows left by a previous user with the same id
+    def clean():
+        with app.app_context():
+            db.session.query(UserStatsDaily).filter_by(user_id=test_user['id']).delete()
+            db.session.query(UserStats).filter_by(user_id=test_user['id']).delete()
+            db.session.commit()
+    clean()
+    yield
+    clean()
+
+
+def _counters(user_id):
+    stats = db.session.get(UserStats, user_id, populate_existing=True)
+    return {name: getattr(stats, name) for name in COUNTERS}
+
+
+@pytest.mark.unit
+@pytest.mark.requires_db
+def test_counters_follow_orm_writes_without_drift(test_user, app):
+    user_id = test_user['id']
+    with app.app_context():
+        with UnitOfWork() as uow:
+            assert UserStatsService(uow).get_stats(user_id).bookmark_count == 0
+
+        bookmark = SavedContent(user_id=user_id, url='https://example.com/stats-a', title='A', extracted_text='body')
+        bare = SavedContent(user_id=user_id, url='https://example.com/stats-b', title='B')
+        db.session.add_all([bookmark, bare, Project(user_id=user_id, title='P')])
+        db.session.commit()
+
+        # Status change on an expired instance: stored values are read back for the delta
+        bookmark.analysis_status = 'SUCCESS'
+        bookmark.quality_score = 8
+        bare.scrape_status = 'RUNNING'
+        db.session.commit()
+        bare.extracted_text = 'scraped later'
+        bare.scrape_status = 'SUCCESS'
+        db.session.commit()
+
+        assert _counters(user_id) == {
+            'bookmark_count': 2, 'content_count': 2, 'analyzed_count': 1, 'quality_count': 1,
+            'scraping_count': 0, 'embedding_count': 0, 'analyzing_count': 0, 'project_count': 1,
+        }
+
+        db.session.delete(db.session.get(SavedContent, bookmark.id))
+        db.session.commit()
+        incremental = _counters(user_id)
+        assert incremental['bookmark_count'] == 1 and incremental['quality_count'] == 0
+
+        with UnitOfWork() as uow:
+            UserStatsService(uow).reconcile(user_id)
+        assert _counters(user_id) == incremental
+        assert db.session.get(UserStats, user_id).saved_total == 2
+
+
+@pytest.mark.unit
+@pytest.mark.requires_db
+def test_snapshots_backfill_once_and_drive_weekly_saves(test_user, app, client, auth_headers):
+    user_id = test_user['id']
+    now = datetime.utcnow()
+    with app.app_context():
+        for days, url in ((40, 'old'), (10, 'last-week'), (1, 'this-week')):
+            db.session.add(SavedContent(user_id=user_id, url=f'https://example.com/{url}', title=url,
+                                        saved_at=now - timedelta(days=days)))
+        db.session.commit()
+
+        with UnitOfWork() as uow:
+            service = UserStatsService(uow)
+            snapshots = service.snapshots(user_id, service.get_stats(user_id), (7, 14, 30))
+        assert [snapshots[n].bookmark_count for n in (7, 14, 30)] == [2, 1, 1]
+        assert db.session.query(UserStatsDaily).filter_by(user_id=user_id).count() == 4  # today + 3 backfills
+
+        response = client.get('/api/bookmarks/dashboard/stats', headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json['total_bookmarks']['value'] == 3
+        assert response.json['weekly_saves']['value'] == 1
+        assert db.session.query(UserStatsDaily).filter_by(user_id=user_id).count() == 4
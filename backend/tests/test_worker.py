@@ -23,3 +23,88 @@ def test_worker_unique_name_formatting():
     assert hostname in worker_name
     assert str(pid) in worker_name
     assert queue in worker_name
+
+
+@pytest.mark.unit
+def test_parse_worker_scaling_defaults_unlisted_queues():
+    from worker import parse_worker_scaling, QueueBounds
+
+    bounds = parse_worker_scaling("default=1:4, high=2")
+    assert bounds['default'] == QueueBounds(1, 4)
+    assert bounds['high'] == QueueBounds(2, 2)
+    assert bounds['low'] == QueueBounds(0, 1)
+    assert set(bounds) == ALLOWED_QUEUES
+
+    with pytest.raises(ValueError):
+        parse_worker_scaling("invalid_queue=0:1")
+    with pytest.raises(ValueError):
+        parse_worker_scaling("default=3:1")
+
+
+@pytest.mark.unit
+def test_desired_worker_count_tracks_depth_and_age():
+    from worker import desired_worker_count, QueueBounds, JOBS_PER_WORKER, MAX_JOB_AGE
+
+    bounds = QueueBounds(1, 4)
+    assert desired_worker_count(0, None, 3, bounds) == 1
+    assert desired_worker_count(JOBS_PER_WORKER * 2, 1.0, 1, bounds) == 2
+    assert desired_worker_count(JOBS_PER_WORKER * 100, 1.0, 1, bounds) == 4
+    # A stale head job adds a process even when the backlog is short
+    assert desired_worker_count(1, MAX_JOB_AGE + 1, 2, bounds) == 3
+    assert desired_worker_count(0, None, 0, QueueBounds(0, 2)) == 0
+
+
+@pytest.mark.unit
+def test_in_process_worker_stops_past_rss_limit(monkeypatch):
+    import worker
+    from unittest.mock import MagicMock, patch
+
+    monkeypatch.setattr(worker, 'MAX_RSS_MB', 100)
+    monkeypatch.setattr(worker, '_peak_rss_mb', lambda: 150.0)
+    instance = worker.FuzeInProcessWorker.__new__(worker.FuzeInProcessWorker)
+    instance._stop_requested = False
+    instance.name = 'test-worker'
+
+    with patch.object(worker.FuzeWorker, 'perform_job', return_value=True):
+        assert instance.perform_job(MagicMock(), MagicMock()) is True
+    assert instance._stop_requested is True
+
+
+@pytest.mark.unit
+def test_worker_pool_replaces_recycled_children(monkeypatch):
+    import argparse
+    import signal
+    import worker
+
+    started = []
+    handlers = {}
+
+    class FakeProcess:
+        def __init__(self, target, args):
+            self.index = args[1]
+            self.pid = 1000 + len(started)
+            self.exitcode = 0
+            self.alive = True
+
+        def start(self):
+            started.append(self)
+
+        def is_alive(self):
+            return self.alive
+
+        def join(self):
+            self.alive = False
+
+    def fake_sleep(_):
+        if len(started) == 2:
+            started[0].alive = False  # reached WORKER_MAX_JOBS
+        else:
+            handlers[signal.SIGINT](signal.SIGINT, None)
+
+    monkeypatch.setattr(worker.multiprocessing, 'Process', FakeProcess)
+    monkeypatch.setattr(worker.time, 'sleep', fake_sleep)
+    monkeypatch.setattr(worker.signal, 'signal', lambda signum, handler: handlers.__setitem__(signum, handler))
+
+    worker.run_worker_pool(argparse.Namespace(queue='default', workers=2, burst=False))
+
+    assert [p.index for p in started] == [1, 2, 1]
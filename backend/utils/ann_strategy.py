@@ -0,0 +1,100 @@
+"""
+Per-user ANN scan strategy for pgvector queries filtered by user_id.
+
+The HNSW index on saved_content.embedding is global: it returns the globally
+nearest rows and the user_id filter is applied afterwards, so a user whose
+bookmarks are a small share of the table gets too few (or the wrong) neighbours.
+ann_prepare_scan_v2 (migration 0016) picks the scan for each query:
+
+  - small libraries: exact KNN. Callers order by distance + 0, which the HNSW
+    index cannot serve, so Postgres scans the user's rows via the user_id index.
+  - large libraries: HNSW with ef_search sized to k and iterative index scans,
+    set transaction-locally.
+
+The choice depends on the user's embedded row count (capped just above the exact
+scan limit). Each process caches it per user for ROW_COUNT_TTL seconds: a cached
+small library needs no database call at all, and a cached large one only passes
+the count back so the function sets up HNSW without counting again.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Tuple
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Users with at most this many embedded bookmarks get an exact scan
+EXACT_SCAN_MAX_ROWS = int(os.environ.get("ANN_EXACT_SCAN_MAX_ROWS", 5000))
+
+# How long a user's row count is reused, and how many users each process remembers
+ROW_COUNT_TTL = int(os.environ.get("ANN_ROW_COUNT_TTL_SECONDS", 60))
+ROW_COUNT_CACHE_SIZE = 4096
+
+PREPARE_SCAN_SQL = text("SELECT ann_prepare_scan_v2(:user_id, :k, :exact_max_rows, :known_rows)")
+
+_row_counts: "OrderedDict[int, Tuple[int, float]]" = OrderedDict()
+_row_counts_lock = threading.Lock()
+
+
+def clear_row_count_cache():
+    with _row_counts_lock:
+        _row_counts.clear()
+
+
+def _cached_row_count(user_id: int):
+    now = time.monotonic()
+    with _row_counts_lock:
+        entry = _row_counts.get(user_id)
+        if entry is None or entry[1] <= now:
+            return None
+        _row_counts.move_to_end(user_id)
+        return entry[0]
+
+
+def _store_row_count(user_id: int, rows: int):
+    with _row_counts_lock:
+        _row_counts[user_id] = (rows, time.monotonic() + ROW_COUNT_TTL)
+        _row_counts.move_to_end(user_id)
+        while len(_row_counts) > ROW_COUNT_CACHE_SIZE:
+            _row_counts.popitem(last=False)
+
+
+def prepare_ann_scan(session, user_id: int, k: int) -> bool:
+    """
+    Configure the current transaction for a user-filtered vector query.
+    Returns True when the caller should run an exact scan (order by distance + 0).
+    Outside PostgreSQL, or before migration 0016, returns False and changes nothing.
+    """
+    if session.get_bind().dialect.name != 'postgresql':
+        return False
+
+    known_rows = _cached_row_count(user_id)
+    if known_rows is not None and known_rows <= EXACT_SCAN_MAX_ROWS:
+        # Exact scans need no session settings
+        return True
+    try:
+        with session.begin_nested():
+            rows = session.execute(PREPARE_SCAN_SQL, {
+                "user_id": user_id,
+                "k": k,
+                "exact_max_rows": EXACT_SCAN_MAX_ROWS,
+                "known_rows": known_rows,
+            }).scalar()
+        if rows is None:
+            return False
+        if known_rows is None:
+            _store_row_count(user_id, rows)
+        return rows <= EXACT_SCAN_MAX_ROWS
+    except (OperationalError, ProgrammingError) as db_err:
+        logger.info("ann_prepare_scan_unavailable", extra={"user_id": user_id, "error": str(db_err)})
+        return False
+
+
+def ann_order_sql(distance_sql: str, exact: bool) -> str:
+    """ORDER BY expression for a distance; exact scans hide it from the HNSW index."""
+    return f"({distance_sql}) + 0" if exact else distance_sql
@@ -109,6 +109,8 @@ def _initialize_embedding_model_robust():
             test_embedding = model.encode(["test"])
             if test_embedding is not None and len(test_embedding) > 0:
                 logger.info("embedding_model_loaded_successfully", extra={"model_name": model_name})
+                if not getattr(model, 'model_name', None):
+                    model.model_name = model_name
                 return model
         except Exception as e:
             logger.warning("failed_to_load_embedding_model", extra={"model_name": model_name, "error": str(e)})
@@ -246,6 +248,17 @@ def is_embedding_available() -> bool:
         return False
 
 
+def get_embedding_model_version() -> str:
+    """Identifier of the active embedding model, recorded with stored embeddings to detect model changes."""
+    try:
+        model = get_embedding_model()
+        if model is None or getattr(model, 'is_fallback_model', False):
+            return "fallback"
+        return getattr(model, 'model_name', None) or type(model).__name__
+    except Exception:
+        return "fallback"
+
+
 def get_embedding_model_info() -> str:
     """Get description of active embedding model."""
     try:
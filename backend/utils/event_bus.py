@@ -4,10 +4,12 @@ Handles event publishing, Redis Streams append (XADD), persistent database loggi
 event translation, and Last-Event-ID replay for real-time SSE consumers.
 """
 
+import os
 import time
 import uuid
 import json
-from datetime import datetime
+import threading
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List
 from core.logging_config import get_logger
 
@@ -15,6 +17,10 @@ logger = get_logger(__name__)
 
 STREAM_MAX_LEN = 10000
 
+# Buffered audit writes: flush at this many pending rows or this age (seconds)
+EVENT_FLUSH_SIZE = int(os.environ.get("EVENT_FLUSH_SIZE", 100))
+EVENT_FLUSH_INTERVAL = float(os.environ.get("EVENT_FLUSH_INTERVAL", 2.0))
+
 def generate_event_id() -> str:
     """Generate a globally unique, time-ordered event ID."""
     return f"evt_{uuid.uuid4().hex}"
@@ -57,6 +63,120 @@ class EventTranslator:
         }
 
 
+class PipelineEventSink:
+    """
+    Destination for pipeline events: the per-user Redis stream and the
+    bookmark_events audit table.
+
+    Delivery semantics:
+      - Redis stream + user channel: appended and published on publish, so SSE
+        consumers see progress live. At-most-once; a failed XADD/PUBLISH is
+        logged, not retried.
+      - bookmark_events: write-through by default. With buffering enabled (RQ
+        workers), rows are held in process memory and written in one multi-row
+        INSERT when EVENT_FLUSH_SIZE rows are pending, when the oldest pending row
+        is EVENT_FLUSH_INTERVAL seconds old (checked on publish), after every job
+        and on worker shutdown. Rows keep their publish time as created_at.
+        At-most-once: a hard-killed process loses its unflushed rows, and rows the
+        database rejects (e.g. the bookmark was deleted mid-pipeline) are dropped
+        and logged without failing the rest of the batch.
+    """
+
+    def __init__(self, flush_size: int = EVENT_FLUSH_SIZE, flush_interval: float = EVENT_FLUSH_INTERVAL):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.buffered = False
+        self._rows: List[Dict[str, Any]] = []
+        self._oldest: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def enable_buffering(self):
+        self.buffered = True
+
+    @property
+    def pending(self) -> int:
+        return len(self._rows)
+
+    def append_stream(self, user_id: int, event_payload: Dict[str, Any]):
+        """
+        XADD the event into the user's capped Redis stream (replay) and PUBLISH its
+        public form on the user's channel (live SSE), in one round-trip.
+        """
+        try:
+            from utils.redis_utils import redis_cache
+            from utils.realtime_bus import user_channel
+            if redis_cache and redis_cache.client:
+                pipe = redis_cache.client.pipeline(transaction=False)
+                pipe.xadd(
+                    f"fuze:events:stream:{user_id}",
+                    {"event": json.dumps(event_payload)},
+                    maxlen=STREAM_MAX_LEN,
+                    approximate=True
+                )
+                pipe.publish(user_channel(user_id), json.dumps(EventTranslator.translate_to_public(event_payload)))
+                pipe.execute()
+        except Exception as redis_err:
+            logger.warning(f"redis_stream_xadd_failed: {redis_err}", extra={"event_id": event_payload.get("event_id")})
+
+    def record(self, row: Dict[str, Any]):
+        """Queue one bookmark_events row; writes through unless buffering is enabled."""
+        now = time.monotonic()
+        with self._lock:
+            self._rows.append(row)
+            if self._oldest is None:
+                self._oldest = now
+            due = (
+                not self.buffered
+                or len(self._rows) >= self.flush_size
+                or now - self._oldest >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write all pending rows. Returns the number of rows persisted."""
+        with self._lock:
+            rows, self._rows = self._rows, []
+            self._oldest = None
+        if not rows:
+            return 0
+        return self._write(rows)
+
+    def _write(self, rows: List[Dict[str, Any]]) -> int:
+        from sqlalchemy import insert
+        from uow.unit_of_work import UnitOfWork
+        from models import BookmarkEvent
+
+        try:
+            with UnitOfWork() as uow:
+                uow.session.execute(insert(BookmarkEvent), rows)
+            return len(rows)
+        except Exception as batch_err:
+            if len(rows) == 1:
+                logger.warning(f"bookmark_event_db_persist_failed: {batch_err}", extra={"event_id": rows[0]["event_id"]})
+                return 0
+            logger.warning(f"bookmark_event_batch_failed_retrying_rows: {batch_err}", extra={"rows": len(rows)})
+
+        # One bad row must not drop the batch: retry each under a savepoint
+        written = 0
+        try:
+            with UnitOfWork() as uow:
+                for row in rows:
+                    try:
+                        with uow.session.begin_nested():
+                            uow.session.execute(insert(BookmarkEvent), [row])
+                        written += 1
+                    except Exception as row_err:
+                        logger.warning(f"bookmark_event_db_persist_failed: {row_err}", extra={"event_id": row["event_id"]})
+        except Exception as db_err:
+            logger.warning(f"bookmark_event_batch_persist_failed: {db_err}", extra={"rows": len(rows)})
+            return 0
+        return written
+
+
+event_sink = PipelineEventSink()
+
+
 def publish_pipeline_event(
     event_type: str,
     bookmark_id: int,
@@ -69,11 +189,12 @@ def publish_pipeline_event(
 ) -> Optional[Dict[str, Any]]:
     """
     Publish an event after a database commit.
-    Appends event to Redis Stream and persists event record to bookmark_events table.
+    Appends event to Redis Stream and records the bookmark_events audit row through
+    event_sink (see PipelineEventSink for buffering and delivery semantics).
     """
     try:
         event_id = generate_event_id()
-        timestamp_str = datetime.utcnow().isoformat()
+        created_at = datetime.now(timezone.utc)
 
         event_payload = {
             "event_id": event_id,
@@ -86,46 +207,26 @@ def publish_pipeline_event(
             "data": data or {},
             "error": error,
             "metadata": metadata or {},
-            "timestamp": timestamp_str
+            "timestamp": created_at.replace(tzinfo=None).isoformat()
         }
 
-        # 1. Append to Redis Stream (XADD) for real-time SSE gateway
-        try:
-            from utils.redis_utils import redis_cache
-            if redis_cache and redis_cache.client:
-                user_stream_key = f"fuze:events:stream:{user_id}"
-                raw_json = json.dumps(event_payload)
-                
-                # XADD into user-specific Redis Stream with capped length
-                redis_cache.client.xadd(
-                    user_stream_key,
-                    {"event": raw_json},
-                    maxlen=STREAM_MAX_LEN,
-                    approximate=True
-                )
-        except Exception as redis_err:
-            logger.warning(f"redis_stream_xadd_failed: {redis_err}", extra={"event_id": event_id})
+        # 1. Append to Redis Stream (XADD) and publish to the live SSE channel
+        event_sink.append_stream(user_id, event_payload)
 
-        # 2. Persist event to DB for audit logging
-        try:
-            from uow.unit_of_work import UnitOfWork
-            from models import BookmarkEvent
-            with UnitOfWork() as uow:
-                evt_record = BookmarkEvent(
-                    event_id=event_id,
-                    bookmark_id=bookmark_id,
-                    user_id=user_id,
-                    pipeline_run_id=pipeline_run_id,
-                    sequence=sequence,
-                    type=event_type,
-                    schema_version=1,
-                    data=data,
-                    error=error,
-                    metadata_json=metadata
-                )
-                uow.session.add(evt_record)
-        except Exception as db_err:
-            logger.warning(f"bookmark_event_db_persist_failed: {db_err}", extra={"event_id": event_id})
+        # 2. Record event for DB audit logging (buffered in workers)
+        event_sink.record({
+            "event_id": event_id,
+            "bookmark_id": bookmark_id,
+            "user_id": user_id,
+            "pipeline_run_id": pipeline_run_id,
+            "sequence": sequence,
+            "type": event_type,
+            "schema_version": 1,
+            "data": data,
+            "error": error,
+            "metadata_json": metadata,
+            "created_at": created_at
+        })
 
         # 3. Emit Prometheus metrics alongside events
         try:
@@ -7,6 +7,7 @@ import google.generativeai as genai
 from core.logging_config import get_logger
 
 from core.circuit_breaker import gemini_circuit_breaker
+from utils.tech_taxonomy import tech_taxonomy
 
 logger = get_logger(__name__)
 
@@ -226,8 +227,7 @@ class GeminiAnalyzer:
     def _get_fallback_analysis(self, title: str, description: str, content: str) -> Dict:
         """Deterministic fallback analysis when AI is unavailable."""
         text = f"{title or ''} {description or ''} {content or ''}".lower()
-        common_techs = ['python', 'javascript', 'typescript', 'react', 'node', 'sql', 'docker', 'aws']
-        detected = [t.capitalize() for t in common_techs if t in text]
+        detected = [t.capitalize() for t in tech_taxonomy.extract(text)]
 
         return {
             "technologies": detected or ["General"],
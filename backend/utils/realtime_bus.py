@@ -0,0 +1,202 @@
+"""
+Realtime Bus: per-process Redis pub/sub fan-out for Server-Sent Events.
+
+Every SSE connection used to own a Redis pub/sub connection (or poll a progress
+key once a second). Instead, one subscriber thread per process psubscribes to all
+user channels and hands each message to in-memory queues, one per open stream;
+a stream blocks on its queue and costs nothing while idle. Under the gevent
+gunicorn worker the thread and the queues are cooperative (monkey-patched).
+
+Producers publish through publish_user_event / publish_progress. Progress
+snapshots are still stored under import_progress:{user_id} and
+analysis_progress:{user_id} so a stream (or the polling endpoints) can read the
+current state once on connect.
+
+Delivery is at-most-once: messages published while the subscriber is
+reconnecting, or while a slow stream's queue is full, are lost. Streams resync
+from the stored snapshot on reconnect.
+"""
+
+import json
+import queue
+import threading
+import time
+from typing import Any, Dict, Optional, Set
+from core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+CHANNEL_PREFIX = "fuze:events:channel:"
+QUEUE_MAXSIZE = 256
+PROGRESS_TTL = 3600
+RECONNECT_MAX_DELAY = 30.0
+
+
+def user_channel(user_id: int) -> str:
+    return f"{CHANNEL_PREFIX}{user_id}"
+
+
+def progress_key(kind: str, user_id: int) -> str:
+    """Redis key of the latest progress snapshot; kind is 'import' or 'analysis'."""
+    return f"{kind}_progress:{user_id}"
+
+
+def _get_client():
+    from utils.redis_utils import redis_cache
+    return getattr(redis_cache, 'client', None) if redis_cache else None
+
+
+def publish_user_event(user_id: int, payload: Dict[str, Any]) -> bool:
+    """PUBLISH a JSON payload on the user's channel. Returns False without Redis."""
+    client = _get_client()
+    if not client:
+        return False
+    try:
+        client.publish(user_channel(user_id), json.dumps(payload, default=str))
+        return True
+    except Exception as e:
+        logger.warning("realtime_publish_failed", extra={"user_id": user_id, "error": str(e)})
+        return False
+
+
+def publish_progress(user_id: int, kind: str, progress: Dict[str, Any], ttl: int = PROGRESS_TTL) -> bool:
+    """Store the progress snapshot and push it to the user's open streams as progress.{kind}."""
+    from utils.redis_utils import redis_cache
+    stored = redis_cache.set_cache(progress_key(kind, user_id), progress, ttl=ttl)
+    publish_user_event(user_id, {'type': f'progress.{kind}', 'data': progress})
+    return stored
+
+
+class Subscription:
+    """One open stream's view of the bus: a bounded queue of decoded messages."""
+
+    def __init__(self, bus: 'RealtimeBus', user_id: int, maxsize: int = QUEUE_MAXSIZE):
+        self.bus = bus
+        self.user_id = user_id
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Next message for this user, or None after timeout seconds."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def put(self, message: Dict[str, Any]):
+        # A stalled client must not back up the shared subscriber: drop its oldest message
+        while True:
+            try:
+                self.queue.put_nowait(message)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class RealtimeBus:
+    """Process-wide subscriber that fans user-channel messages out to Subscriptions."""
+
+    def __init__(self, poll_timeout: float = 1.0):
+        self.poll_timeout = poll_timeout
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def available(self) -> bool:
+        return _get_client() is not None
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subs) for subs in self._subscriptions.values())
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(self, int(user_id))
+        with self._lock:
+            self._subscriptions.setdefault(subscription.user_id, set()).add(subscription)
+        self._ensure_listener()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subs = self._subscriptions.get(subscription.user_id)
+            if subs is not None:
+                subs.discard(subscription)
+                if not subs:
+                    del self._subscriptions[subscription.user_id]
+
+    def dispatch(self, channel: Any, data: Any) -> int:
+        """Deliver one pub/sub message to the channel owner's subscriptions."""
+        if isinstance(channel, bytes):
+            channel = channel.decode('utf-8')
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        try:
+            user_id = int(channel[len(CHANNEL_PREFIX):])
+        except (TypeError, ValueError):
+            return 0
+
+        with self._lock:
+            targets = list(self._subscriptions.get(user_id, ()))
+        if not targets:
+            return 0
+
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning("realtime_message_undecodable", extra={"user_id": user_id})
+            return 0
+        for subscription in targets:
+            subscription.put(message)
+        return len(targets)
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._listen, name="realtime-bus", daemon=True)
+            self._thread.start()
+
+    def _listen(self):
+        delay = 1.0
+        while True:
+            client = _get_client()
+            if client is None:
+                time.sleep(RECONNECT_MAX_DELAY)
+                continue
+
+            pubsub = None
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                logger.info("realtime_bus_subscribed", extra={"pattern": f"{CHANNEL_PREFIX}*"})
+                delay = 1.0
+                while True:
+                    message = pubsub.get_message(timeout=self.poll_timeout)
+                    if message and message.get('type') == 'pmessage':
+                        self.dispatch(message['channel'], message['data'])
+            except Exception as e:
+                logger.warning("realtime_bus_disconnected", extra={"error": str(e), "retry_in": delay})
+                time.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+
+realtime_bus = RealtimeBus()
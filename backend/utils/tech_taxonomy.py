@@ -0,0 +1,190 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+# canonical name -> (category, aliases). Canonical names are matched in text too,
+# except those listed in _CANONICAL_NOT_IN_TEXT (common English words).
+TECH_TAXONOMY: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    # frontend
+    'javascript': ('frontend', ('js', 'es6', 'es2015', 'ecmascript')),
+    'typescript': ('frontend', ('ts',)),
+    'react': ('frontend', ('reactjs', 'react.js', 'jsx', 'tsx')),
+    'vue': ('frontend', ('vuejs', 'vue.js')),
+    'angular': ('frontend', ('angularjs',)),
+    'svelte': ('frontend', ()),
+    'next.js': ('frontend', ('nextjs',)),
+    'html': ('frontend', ('html5',)),
+    'css': ('frontend', ('css3',)),
+    'sass': ('frontend', ('scss',)),
+    'tailwind': ('frontend', ('tailwindcss',)),
+    'bootstrap': ('frontend', ()),
+    # backend
+    'node.js': ('backend', ('node', 'nodejs')),
+    'express': ('backend', ('expressjs', 'express.js')),
+    'python': ('backend', ('python3', 'py')),
+    'django': ('backend', ()),
+    'flask': ('backend', ()),
+    'fastapi': ('backend', ()),
+    'java': ('backend', ('jvm',)),
+    'spring': ('backend', ('spring boot', 'springboot')),
+    'php': ('backend', ()),
+    'laravel': ('backend', ()),
+    'ruby': ('backend', ()),
+    'rails': ('backend', ('ruby on rails',)),
+    'go': ('backend', ('golang',)),
+    'rust': ('backend', ()),
+    'c++': ('backend', ('cpp',)),
+    'c#': ('backend', ('csharp', '.net', 'dotnet')),
+    'api': ('backend', ()),
+    'rest': ('backend', ('rest api', 'restful')),
+    'graphql': ('backend', ()),
+    'microservices': ('backend', ()),
+    'serverless': ('backend', ()),
+    # database
+    'postgresql': ('database', ('postgres',)),
+    'mysql': ('database', ()),
+    'mongodb': ('database', ('mongo',)),
+    'redis': ('database', ()),
+    'sqlite': ('database', ()),
+    'sql': ('database', ()),
+    'oracle': ('database', ()),
+    # cloud
+    'aws': ('cloud', ('amazon web services',)),
+    'azure': ('cloud', ()),
+    'gcp': ('cloud', ('google cloud',)),
+    'docker': ('cloud', ()),
+    'kubernetes': ('cloud', ('k8s',)),
+    'terraform': ('cloud', ()),
+    'firebase': ('cloud', ()),
+    'heroku': ('cloud', ()),
+    'netlify': ('cloud', ()),
+    'vercel': ('cloud', ()),
+    'lambda': ('cloud', ('aws lambda',)),
+    # mobile
+    'react native': ('mobile', ('react-native',)),
+    'flutter': ('mobile', ()),
+    'ios': ('mobile', ()),
+    'android': ('mobile', ()),
+    'swift': ('mobile', ()),
+    'kotlin': ('mobile', ()),
+    'dart': ('mobile', ()),
+    'mobile': ('mobile', ()),
+    # ml_ai
+    'tensorflow': ('ml_ai', ()),
+    'pytorch': ('ml_ai', ()),
+    'scikit-learn': ('ml_ai', ('sklearn',)),
+    'pandas': ('ml_ai', ()),
+    'numpy': ('ml_ai', ()),
+    'machine learning': ('ml_ai', ('ml',)),
+    'deep learning': ('ml_ai', ()),
+    'ai': ('ml_ai', ('artificial intelligence',)),
+    'data science': ('ml_ai', ()),
+    'analytics': ('ml_ai', ()),
+    'visualization': ('ml_ai', ()),
+    # devops
+    'jenkins': ('devops', ()),
+    'github actions': ('devops', ()),
+    'ci/cd': ('devops', ('cicd',)),
+    'linux': ('devops', ()),
+    'bash': ('devops', ()),
+    'git': ('devops', ()),
+    'github': ('devops', ()),
+    'gitlab': ('devops', ()),
+}
+
+_CANONICAL_NOT_IN_TEXT = frozenset({'go'})
+
+
+@dataclass(frozen=True)
+class TechMatches:
+    """Technologies found in one pass over a text."""
+    ids: FrozenSet[int]
+    names: Tuple[str, ...]
+    categories: FrozenSet[str]
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """Compile literal words into one regex shaped like their prefix trie."""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def emit(node: Dict) -> str:
+        terminal = '' in node
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if terminal:
+            # Optional tail: the regex tries the longer spelling first
+            return body + '?' if len(branches) == 1 and len(branches[0]) == 1 else '(?:' + body + ')?'
+        return body
+
+    return emit(trie)
+
+
+class TechTaxonomy:
+    """
+    Canonical technology vocabulary with aliases and categories.
+    All surface forms are compiled once into a single trie-shaped regex, so
+    extraction is one left-to-right scan of the text instead of a loop of
+    substring checks per keyword.
+    """
+
+    def __init__(self, taxonomy: Dict[str, Tuple[str, Tuple[str, ...]]] = TECH_TAXONOMY):
+        self.names: Tuple[str, ...] = tuple(sorted(taxonomy))
+        self.ids: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.categories: Tuple[str, ...] = tuple(taxonomy[name][0] for name in self.names)
+
+        # surface form -> canonical id
+        self._aliases: Dict[str, int] = {}
+        in_text: List[str] = []
+        for name in self.names:
+            term_id = self.ids[name]
+            forms = (name,) + taxonomy[name][1]
+            for form in forms:
+                self._aliases[form] = term_id
+                if form not in _CANONICAL_NOT_IN_TEXT:
+                    in_text.append(form)
+
+        self._regex = re.compile(r'(?<!\w)' + _trie_pattern(in_text) + r'(?!\w)')
+
+    def canonical_id(self, term: str) -> Optional[int]:
+        """Id of a single technology term or alias, e.g. 'JS' -> id of 'javascript'."""
+        if not term:
+            return None
+        return self._aliases.get(term.strip().lower())
+
+    def canonicalize(self, term: str) -> Optional[str]:
+        term_id = self.canonical_id(term)
+        return self.names[term_id] if term_id is not None else None
+
+    def category_of(self, term: str) -> Optional[str]:
+        term_id = self.canonical_id(term)
+        return self.categories[term_id] if term_id is not None else None
+
+    def match(self, text: str) -> TechMatches:
+        """Find every known technology in text, in order of first mention."""
+        if not text:
+            return TechMatches(frozenset(), (), frozenset())
+
+        seen: Dict[int, None] = {}
+        for form in self._regex.findall(text.lower()):
+            seen.setdefault(self._aliases[form], None)
+
+        ids = tuple(seen)
+        return TechMatches(
+            ids=frozenset(ids),
+            names=tuple(self.names[i] for i in ids),
+            categories=frozenset(self.categories[i] for i in ids)
+        )
+
+    def extract(self, text: str) -> List[str]:
+        """Canonical names of the technologies mentioned in text."""
+        return list(self.match(text).names)
+
+
+tech_taxonomy = TechTaxonomy()
@@ -4,18 +4,37 @@ RQ Worker Script for Fuze
 Starts background workers that process queue jobs with unique worker naming,
 multiprocessing support for --workers, queue validation, and graceful signal handling.
 
+Each worker process warms the embedding model, job modules, extractor registry and
+DB pool once before its first job (in the supervisor parent when forked from it),
+then runs jobs in-process. It exits after WORKER_MAX_JOBS jobs, or once its peak RSS
+passes WORKER_MAX_RSS_MB, so leaks are bounded; the supervisor, the --workers pool
+parent or the process manager starts a fresh one.
+
+--supervise runs one parent that preloads the Flask app and embedding model, then
+forks worker processes for every queue, scaling each between its min and max by
+queue depth and the age of its oldest job. Bounds come from WORKER_SCALING, e.g.
+"default=1:4,high=1:2,low=0:1". Scale-down sends SIGTERM, which RQ handles as a
+warm shutdown: the worker finishes its current job, then exits.
+
 Usage:
     python backend/worker.py
     python backend/worker.py --queue default --workers 4
+    python backend/worker.py --supervise
 """
 
+import gc
 import os
+import resource
 import sys
+import math
+import time
 import socket
 import signal
 import argparse
 import multiprocessing
-from rq import Worker, Queue
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from rq import Worker, SimpleWorker, Queue
+from rq.job import Job
 from core.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -30,14 +49,63 @@ if parent_dir not in sys.path:
 
 ALLOWED_QUEUES = {'default', 'high', 'low', 'background_analysis', 'recommendations'}
 
+# Run jobs inside the worker process instead of a forked work horse, so per-process
+# resources (the scraper browser pool) stay warm across jobs
+IN_PROCESS_JOBS = os.environ.get('WORKER_IN_PROCESS_JOBS', 'true').lower() == 'true'
+
+# Recycle a worker process after this many jobs (0 = never) or past this peak RSS (0 = no limit)
+MAX_JOBS_PER_PROCESS = int(os.environ.get('WORKER_MAX_JOBS', '500'))
+MAX_RSS_MB = int(os.environ.get('WORKER_MAX_RSS_MB', '0'))
+
+# Imported once per process so jobs' lazy imports hit sys.modules; the pipeline import registers extractor plugins
+WORKER_PRELOAD_MODULES = (
+    'services.bookmark_processing_service',
+    'background.embed_worker',
+    'background.cache_warmer',
+    'jobs.project_ml_job',
+    'scrapers.extractor_pipeline',
+    'scrapers.acquisition_engine',
+)
+
+# Supervisor: per-queue "name=min:max" bounds; queues left out get 0:1
+DEFAULT_WORKER_SCALING = "default=1:4,high=1:2,low=0:1,background_analysis=0:2,recommendations=0:1"
+SUPERVISOR_INTERVAL = float(os.environ.get('WORKER_SUPERVISOR_INTERVAL', '5'))
+JOBS_PER_WORKER = int(os.environ.get('WORKER_JOBS_PER_PROCESS', '10'))  # backlog one process is expected to absorb
+MAX_JOB_AGE = float(os.environ.get('WORKER_MAX_JOB_AGE', '60'))  # seconds the oldest job may wait before adding a process
+SCALE_DOWN_COOLDOWN = float(os.environ.get('WORKER_SCALE_DOWN_COOLDOWN', '120'))
+DRAIN_TIMEOUT = float(os.environ.get('WORKER_DRAIN_TIMEOUT', '600'))  # matches the longest job_timeout
+
+
+def flush_pipeline_events():
+    """Write buffered bookmark_events rows; called after every job and on shutdown."""
+    try:
+        from utils.event_bus import event_sink
+        event_sink.flush()
+    except Exception as e:
+        logger.warning("worker_event_flush_failed", error=str(e))
+
+
+def shutdown_browser_pool():
+    """Close the scraper browser pool; called when the worker stops."""
+    try:
+        from scrapers.fetchers.browser_pool import browser_pool
+        browser_pool.shutdown()
+    except Exception as e:
+        logger.warning("worker_browser_pool_shutdown_failed", error=str(e))
+
 
 class FuzeWorker(Worker):
-    """Custom RQ Worker that ensures SQLAlchemy session cleanup after every job."""
+    """
+    Custom RQ Worker that flushes buffered pipeline events and ensures
+    SQLAlchemy session cleanup after every job.
+    """
 
     def perform_job(self, job, queue):
         try:
             return super().perform_job(job, queue)
         finally:
+            # Work horses exit without running atexit hooks, so flush here
+            flush_pipeline_events()
             try:
                 from models import db
                 db.session.remove()
@@ -45,8 +113,61 @@ class FuzeWorker(Worker):
                 pass
 
 
-def run_single_worker(args, worker_index: int = 1):
-    """Run a single RQ worker instance within a process context."""
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class FuzeInProcessWorker(FuzeWorker, SimpleWorker):
+    """FuzeWorker that performs jobs in its own process (no fork per job)."""
+
+    def perform_job(self, job, queue):
+        try:
+            return super().perform_job(job, queue)
+        finally:
+            if MAX_RSS_MB and _peak_rss_mb() > MAX_RSS_MB:
+                logger.warning("worker_rss_limit_reached", worker_name=self.name, peak_rss_mb=round(_peak_rss_mb()))
+                self._stop_requested = True
+
+
+def warm_worker_state(app) -> None:
+    """Import job modules and load the embedding model so the first job pays no startup cost."""
+    import importlib
+    started = time.monotonic()
+    for module in WORKER_PRELOAD_MODULES:
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            logger.warning("worker_preload_module_failed", module=module, error=str(e))
+    with app.app_context():
+        try:
+            from utils.embedding_utils import get_embedding_model
+            get_embedding_model()
+        except Exception as e:
+            logger.warning("worker_preload_embedding_failed", error=str(e))
+    logger.info("worker_state_warmed", seconds=round(time.monotonic() - started, 2))
+
+
+def warm_db_pool(app) -> None:
+    """Open this process's first pooled DB connection before taking jobs."""
+    try:
+        from models import db
+        from sqlalchemy import text
+        with app.app_context():
+            with db.engine.connect() as conn:
+                conn.execute(text('SELECT 1'))
+    except Exception as e:
+        logger.warning("worker_db_warm_failed", error=str(e))
+
+
+def run_single_worker(args, worker_index: int = 1, app=None):
+    """
+    Run a single RQ worker instance within a process context.
+    app is the supervisor's preloaded Flask app when this process was forked from it.
+    """
+    if app is not None:
+        _reset_after_fork(app)
+
     from services.task_queue import get_queue_connection
     rq_redis = get_queue_connection()
 
@@ -56,7 +177,8 @@ def run_single_worker(args, worker_index: int = 1):
 
     worker_name = f"fuze-worker-{args.queue}-{socket.gethostname()}-{os.getpid()}-{worker_index}"
 
-    worker = FuzeWorker(
+    worker_class = FuzeInProcessWorker if IN_PROCESS_JOBS else FuzeWorker
+    worker = worker_class(
         [args.queue],
         connection=rq_redis,
         name=worker_name
@@ -70,31 +192,315 @@ def run_single_worker(args, worker_index: int = 1):
     signal.signal(signal.SIGINT, handle_shutdown)
 
     # Initialize Flask application context
+    if app is None:
+        try:
+            from run_production import create_app
+            app = create_app()
+        except Exception as e:
+            logger.error("worker_flask_context_failed", error=str(e))
+            sys.exit(1)
+        warm_worker_state(app)
+    warm_db_pool(app)
+    logger.info("worker_flask_context_ready", worker_name=worker_name)
+
+    # Batch bookmark_events audit rows instead of one commit per event
+    from utils.event_bus import event_sink
+    event_sink.enable_buffering()
+
     try:
-        from run_production import create_app
-        app = create_app()
-        logger.info("worker_flask_context_ready", worker_name=worker_name)
+        with app.app_context():
+            logger.info("worker_listening", worker_name=worker_name, queue=args.queue, burst=args.burst)
+            try:
+                # The scheduler moves rate-limit-deferred jobs back onto the queue when due
+                max_jobs = getattr(args, 'max_jobs', MAX_JOBS_PER_PROCESS) or None
+                worker.work(burst=args.burst, with_scheduler=True, max_jobs=max_jobs)
+            finally:
+                flush_pipeline_events()
+                shutdown_browser_pool()
     except Exception as e:
-        logger.error("worker_flask_context_failed", error=str(e))
+        logger.error("worker_execution_error", worker_name=worker_name, error=str(e))
         sys.exit(1)
 
+
+class QueueBounds(NamedTuple):
+    min_workers: int
+    max_workers: int
+
+
+def parse_worker_scaling(spec: str) -> Dict[str, QueueBounds]:
+    """Parse "queue=min:max,..." into bounds for every allowed queue."""
+    bounds = {queue: QueueBounds(0, 1) for queue in ALLOWED_QUEUES}
+    for entry in filter(None, (part.strip() for part in spec.split(','))):
+        queue, _, limits = entry.partition('=')
+        queue = queue.strip()
+        if queue not in ALLOWED_QUEUES:
+            raise ValueError(f"Unknown queue in WORKER_SCALING: {queue}")
+        low, _, high = limits.partition(':')
+        min_workers = int(low)
+        max_workers = int(high) if high else min_workers
+        if min_workers < 0 or max_workers < min_workers:
+            raise ValueError(f"Invalid bounds for {queue}: {limits}")
+        bounds[queue] = QueueBounds(min_workers, max_workers)
+    return bounds
+
+
+def desired_worker_count(depth: int, oldest_age: Optional[float], current: int, bounds: QueueBounds) -> int:
+    """
+    Processes a queue should have: one per JOBS_PER_WORKER queued jobs, plus one
+    more than now while the oldest job has waited past MAX_JOB_AGE, within bounds.
+    """
+    target = math.ceil(depth / JOBS_PER_WORKER) if depth else 0
+    if depth and oldest_age is not None and oldest_age > MAX_JOB_AGE:
+        target = max(target, current + 1)
+    return max(bounds.min_workers, min(bounds.max_workers, target))
+
+
+def _reset_after_fork(app) -> None:
+    """Drop connections inherited from the supervisor; each process opens its own."""
     try:
+        from models import db
         with app.app_context():
-            logger.info("worker_listening", worker_name=worker_name, queue=args.queue, burst=args.burst)
-            worker.work(burst=args.burst)
+            db.engine.dispose(close=False)
     except Exception as e:
-        logger.error("worker_execution_error", worker_name=worker_name, error=str(e))
+        logger.warning("worker_engine_reset_failed", error=str(e))
+    import services.task_queue as task_queue
+    task_queue._redis_conn = None
+
+
+def preload_worker_state():
+    """Build and warm the Flask app once, before any worker is forked."""
+    from run_production import create_app
+    app = create_app()
+    warm_worker_state(app)
+    with app.app_context():
+        from models import db
+        db.engine.dispose()
+    # Keep preloaded objects out of the collector so children do not dirty their shared pages
+    gc.freeze()
+    return app
+
+
+class WorkerSupervisor:
+    """Forks and retires RQ worker processes per queue from queue depth and job age."""
+
+    def __init__(self, app, bounds: Dict[str, QueueBounds], connection, interval: float = SUPERVISOR_INTERVAL):
+        self.app = app
+        self.bounds = bounds
+        self.connection = connection
+        self.interval = interval
+        self._context = multiprocessing.get_context('fork')
+        self._workers: Dict[str, List[multiprocessing.Process]] = {queue: [] for queue in bounds}
+        self._draining: List[Tuple[multiprocessing.Process, float]] = []
+        self._last_scale_up: Dict[str, float] = {queue: 0.0 for queue in bounds}
+        self._next_index = 0
+        self._stopping = False
+
+    def sample_queues(self) -> Dict[str, Tuple[int, Optional[float]]]:
+        """(depth, oldest job age in seconds) per queue, in two pipelined round-trips."""
+        from rq.utils import utcparse, utcnow
+        queues = list(self.bounds)
+        with self.connection.pipeline(transaction=False) as pipe:
+            for queue in queues:
+                key = f"{Queue.redis_queue_namespace_prefix}{queue}"
+                pipe.llen(key)
+                pipe.lindex(key, 0)
+            replies = pipe.execute()
+        depths = replies[0::2]
+        heads = replies[1::2]
+
+        heads = [head.decode() if isinstance(head, bytes) else head for head in heads]
+        enqueued = [None] * len(heads)
+        waiting = [i for i, head in enumerate(heads) if head]
+        if waiting:
+            with self.connection.pipeline(transaction=False) as pipe:
+                for i in waiting:
+                    pipe.hget(f"{Job.redis_job_namespace_prefix}{heads[i]}", 'enqueued_at')
+                for i, value in zip(waiting, pipe.execute()):
+                    enqueued[i] = value
+
+        now = utcnow()
+        stats = {}
+        for queue, depth, head, enqueued_at in zip(queues, depths, heads, enqueued):
+            age = None
+            if enqueued_at:
+                try:
+                    raw = enqueued_at.decode() if isinstance(enqueued_at, bytes) else enqueued_at
+                    age = (now - utcparse(raw)).total_seconds()
+                except Exception:
+                    age = None
+            stats[queue] = (int(depth or 0), age)
+        return stats
+
+    def _spawn(self, queue: str) -> None:
+        self._next_index += 1
+        args = argparse.Namespace(queue=queue, burst=False, max_jobs=MAX_JOBS_PER_PROCESS)
+        process = self._context.Process(
+            target=run_single_worker, args=(args, self._next_index, self.app),
+            name=f"fuze-worker-{queue}-{self._next_index}"
+        )
+        process.start()
+        self._workers[queue].append(process)
+        logger.info("supervisor_worker_started", queue=queue, pid=process.pid)
+
+    def _retire(self, queue: str) -> None:
+        process = self._workers[queue].pop()
+        os.kill(process.pid, signal.SIGTERM)
+        self._draining.append((process, time.monotonic()))
+        logger.info("supervisor_worker_draining", queue=queue, pid=process.pid)
+
+    def _reap(self) -> None:
+        for queue, processes in self._workers.items():
+            for process in [p for p in processes if not p.is_alive()]:
+                process.join()
+                processes.remove(process)
+                if process.exitcode == 0:
+                    # Reached WORKER_MAX_JOBS or the RSS limit; scale_once starts a fresh fork
+                    logger.info("supervisor_worker_recycled", queue=queue, pid=process.pid)
+                else:
+                    logger.warning("supervisor_worker_exited", queue=queue, pid=process.pid, exitcode=process.exitcode)
+
+        still_draining = []
+        for process, since in self._draining:
+            if not process.is_alive():
+                process.join()
+            elif time.monotonic() - since > DRAIN_TIMEOUT:
+                logger.warning("supervisor_worker_drain_timeout", pid=process.pid)
+                process.kill()
+                process.join()
+            else:
+                still_draining.append((process, since))
+        self._draining = still_draining
+
+    def scale_once(self) -> None:
+        """Reap exited processes and move every queue one step toward its desired count."""
+        self._reap()
+        try:
+            stats = self.sample_queues()
+        except Exception as e:
+            logger.warning("supervisor_queue_sample_failed", error=str(e))
+            stats = {queue: (0, None) for queue in self.bounds}
+
+        now = time.monotonic()
+        for queue, bounds in self.bounds.items():
+            depth, oldest_age = stats[queue]
+            current = len(self._workers[queue])
+            desired = desired_worker_count(depth, oldest_age, current, bounds)
+            if desired > current:
+                for _ in range(desired - current):
+                    self._spawn(queue)
+                self._last_scale_up[queue] = now
+                logger.info("supervisor_scaled_up", queue=queue, depth=depth, oldest_age=oldest_age, workers=desired)
+            elif desired < current and now - self._last_scale_up[queue] >= SCALE_DOWN_COOLDOWN:
+                # One at a time, so a brief lull does not drain the whole pool
+                self._retire(queue)
+
+    def stop(self, *_) -> None:
+        self._stopping = True
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        logger.info("supervisor_started", bounds={q: tuple(b) for q, b in self.bounds.items()})
+        while not self._stopping:
+            self.scale_once()
+            time.sleep(self.interval)
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        """Warm-stop every worker and wait for in-flight jobs to finish."""
+        for queue in self._workers:
+            while self._workers[queue]:
+                self._retire(queue)
+        deadline = time.monotonic() + DRAIN_TIMEOUT
+        for process, _ in self._draining:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.kill()
+                process.join()
+        self._draining = []
+        logger.info("supervisor_stopped")
+
+
+def run_supervisor():
+    """Preload shared state, then supervise worker processes for every queue."""
+    try:
+        bounds = parse_worker_scaling(os.environ.get('WORKER_SCALING', DEFAULT_WORKER_SCALING))
+    except ValueError as e:
+        logger.error("invalid_worker_scaling", error=str(e))
         sys.exit(1)
 
+    from services.task_queue import get_queue_connection
+    rq_redis = get_queue_connection()
+    if not rq_redis:
+        logger.error("worker_redis_connection_failed")
+        sys.exit(1)
+
+    app = preload_worker_state()
+    WorkerSupervisor(app, bounds, rq_redis).run()
+
+
+def run_worker_pool(args) -> None:
+    """
+    Keep args.workers processes on one queue. A child that exits on its own (WORKER_MAX_JOBS,
+    the RSS limit, or a crash) is replaced at the next poll, unless running in burst mode.
+    """
+    logger.info("spawning_multiprocess_workers", count=args.workers, queue=args.queue)
+    stopping = False
+
+    def spawn(index: int) -> multiprocessing.Process:
+        process = multiprocessing.Process(target=run_single_worker, args=(args, index))
+        process.start()
+        return process
+
+    def handle_term(signum, frame):
+        nonlocal stopping
+        stopping = True
+        # SIGINT from a terminal already reaches the whole process group; a second
+        # signal would make RQ cold-stop the child, so only TERM is forwarded
+        if signum == signal.SIGTERM:
+            for process in processes.values():
+                if process.is_alive():
+                    os.kill(process.pid, signal.SIGTERM)
+
+    processes = {index: spawn(index) for index in range(1, args.workers + 1)}
+    signal.signal(signal.SIGTERM, handle_term)
+    signal.signal(signal.SIGINT, handle_term)
+
+    while not stopping and processes:
+        time.sleep(SUPERVISOR_INTERVAL)
+        for index, process in list(processes.items()):
+            if process.is_alive():
+                continue
+            process.join()
+            del processes[index]
+            if stopping or args.burst:
+                continue
+            if process.exitcode == 0:
+                logger.info("worker_recycled", queue=args.queue, pid=process.pid)
+            else:
+                logger.warning("worker_exited", queue=args.queue, pid=process.pid, exitcode=process.exitcode)
+            processes[index] = spawn(index)
+
+    for process in processes.values():
+        process.join()
+
 
 def main():
     parser = argparse.ArgumentParser(description='Start RQ worker for background tasks')
     parser.add_argument('--queue', type=str, default='default', help='Queue name to listen to')
     parser.add_argument('--workers', type=int, default=1, help='Number of worker processes')
     parser.add_argument('--burst', action='store_true', help='Run in burst mode (exit when empty)')
+    parser.add_argument('--max-jobs', type=int, default=MAX_JOBS_PER_PROCESS,
+                        help='Exit after this many jobs so a fresh process replaces it (0 = never)')
+    parser.add_argument('--supervise', action='store_true',
+                        help='Autoscale worker processes for every queue within WORKER_SCALING bounds')
 
     args = parser.parse_args()
 
+    if args.supervise:
+        run_supervisor()
+        return
+
     if args.queue not in ALLOWED_QUEUES:
         logger.error("invalid_queue_name", queue=args.queue, allowed=list(ALLOWED_QUEUES))
         sys.exit(1)
@@ -107,15 +513,7 @@ def main():
         logger.warning("worker_task_handler_verification_warning", error=str(e))
 
     if args.workers > 1:
-        logger.info("spawning_multiprocess_workers", count=args.workers, queue=args.queue)
-        processes = []
-        for i in range(args.workers):
-            p = multiprocessing.Process(target=run_single_worker, args=(args, i + 1))
-            p.start()
-            processes.append(p)
-
-        for p in processes:
-            p.join()
+        run_worker_pool(args)
     else:
         run_single_worker(args, 1)
 